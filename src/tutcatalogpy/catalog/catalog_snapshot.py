@@ -0,0 +1,338 @@
+"""An in-memory copy of the tutorials of the catalog in NumPy columns, to filter, sort and total them without SQL.
+
+The snapshot has a row per folder listed by the tutorials model, ordered by
+folder id. The texts are dictionary encoded, the booleans of the folders
+are bits of a flags column, and the disks are kept in their own small
+columns. Searching the words of the search text stays in SQLite, with the
+full text index, and the facets of the tags dock are bitmaps of the facet
+index; see TutorialsModel.
+
+NumPy is optional: the snapshot is only available if it is installed.
+"""
+
+import logging
+import string
+from typing import Dict, Final, Iterable, List, Optional, Sequence
+
+from sqlalchemy import String, cast, select
+from sqlalchemy.orm import Session
+
+from tutcatalogpy.catalog.tutorial_filters import FieldFilter
+from tutcatalogpy.common.db.author import Author
+from tutcatalogpy.common.db.base import FIELD_SEPARATOR
+from tutcatalogpy.common.db.dal import tutorial_author_table
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.facet_index import to_bytes
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.tutorial import Tutorial
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# the folders loaded by statement, below the limit of the SQL variables of SQLite
+REFRESH_BATCH_SIZE: Final[int] = 500
+
+
+# NOCASE only ignores the case of the ASCII letters
+_NOCASE: Final = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def snapshot_available() -> bool:
+    return np is not None
+
+
+class Flag:
+    """The bits of the flags column."""
+    CHECKED: Final[int] = 1
+    HAS_COVER: Final[int] = 2
+    HAS_INFO_TC: Final[int] = 4
+    HAS_ERROR: Final[int] = 8
+    IS_COMPLETE: Final[int] = 16
+
+
+class TextDictionary:
+    """The distinct texts of a column, and their order ignoring the case like the NOCASE collation."""
+
+    def __init__(self) -> None:
+        self.__values: List[str] = []
+        self.__codes: Dict[str, int] = {}
+        self.__ranks = None
+
+    def encode(self, values: Iterable[Optional[str]]) -> 'np.ndarray':
+        codes = []
+        for value in values:
+            value = value or ''
+            code = self.__codes.get(value)
+            if code is None:
+                code = len(self.__values)
+                self.__codes[value] = code
+                self.__values.append(value)
+                self.__ranks = None
+            codes.append(code)
+        return np.array(codes, dtype=np.int32)
+
+    def code(self, value: str) -> int:
+        """Return the code of a text, -1 if no row has it."""
+        return self.__codes.get(value, -1)
+
+    def decode(self, code: int) -> str:
+        return self.__values[code]
+
+    def ranks(self) -> 'np.ndarray':
+        """The rank of each code in the sorted texts; equal texts have the same rank."""
+        if self.__ranks is None:
+            keys = [value.translate(_NOCASE) for value in self.__values]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            ranks = np.zeros(len(keys), dtype=np.int32)
+            rank = 0
+            for i, code in enumerate(order):
+                if i > 0 and keys[code] != keys[order[i - 1]]:
+                    rank += 1
+                ranks[code] = rank
+            self.__ranks = ranks
+        return self.__ranks
+
+
+class CatalogSnapshot:
+    """The columns of the tutorials, refreshed with the folders changed by the scans."""
+
+    # the columns of the rows and their type; the texts are codes of their dictionary
+    COLUMNS: Final[Dict[str, str]] = {
+        'folder_id': 'int64',
+        'disk': 'int32',  # the row of the disk in the disk columns
+        'flags': 'uint8',
+        'level': 'int8',
+        'rating': 'int8',
+        'duration': 'int32',
+        'released_on': 'int32',
+        'size': 'int64',  # -1 if unknown, like NULL sorting first
+        'video_duration': 'int64',  # -1 if unknown
+        'publisher': 'int32',
+        'folder_parent': 'int32',
+        'folder_name': 'int32',
+        'title': 'int32',
+        'authors': 'int32',
+        'created': 'int32',  # the dates as stored, sorting like the dates
+        'modified': 'int32',
+    }
+    TEXT_COLUMNS: Final[List[str]] = ['publisher', 'folder_parent', 'folder_name', 'title', 'authors', 'created', 'modified']
+
+    def __init__(self) -> None:
+        if np is None:
+            raise RuntimeError('The catalog snapshot needs NumPy.')
+        self.__clear()
+
+    def __clear(self) -> None:
+        self.__texts: Dict[str, TextDictionary] = {name: TextDictionary() for name in self.TEXT_COLUMNS}
+        self.__columns: Dict[str, np.ndarray] = {name: np.zeros(0, dtype) for name, dtype in self.COLUMNS.items()}
+        self.__disk_ids = np.zeros(0, np.int64)
+        self.__disk_checked = np.zeros(0, bool)
+        self.__disk_online = np.zeros(0, bool)
+        self.__disk_names = TextDictionary()
+        self.__disk_name_codes = np.zeros(0, np.int32)
+        self.__disk_locations = np.zeros(0, np.int32)
+
+    def __len__(self) -> int:
+        return len(self.__columns['folder_id'])
+
+    @property
+    def folder_ids(self) -> 'np.ndarray':
+        return self.__columns['folder_id']
+
+    def load(self, session: Session) -> None:
+        """Load all the tutorials of the catalog."""
+        self.__clear()
+        self.refresh_disks(session)
+        self.__columns = self.__select_rows(session, None)
+        log.info('Loaded %s tutorials in the catalog snapshot.', len(self))
+
+    def refresh(self, session: Session, folder_ids: Sequence[int]) -> None:
+        """Load the folders again, after a scan changed or deleted them."""
+        if not folder_ids:
+            return
+        changed = np.unique(np.array(folder_ids, dtype=np.int64))
+        self.refresh_disks(session)
+
+        rows = [self.__select_rows(session, changed[i:i + REFRESH_BATCH_SIZE]) for i in range(0, len(changed), REFRESH_BATCH_SIZE)]
+        kept = ~np.isin(self.folder_ids, changed)
+        columns = {
+            name: np.concatenate([column[kept]] + [batch[name] for batch in rows])
+            for name, column in self.__columns.items()
+        }
+        order = np.argsort(columns['folder_id'], kind='stable')
+        self.__columns = {name: column[order] for name, column in columns.items()}
+        log.debug('Refreshed %s folders of the catalog snapshot.', len(changed))
+
+    def refresh_disks(self, session: Session) -> None:
+        """Load the disks again; their state changes without a scan."""
+        disks = session.execute(
+            select(Disk.id_, Disk.checked, Disk.online, Disk.disk_name, Disk.location).order_by(Disk.id_)
+        ).all()
+        ids, checked, online, names, locations = zip(*disks) if disks else ([], [], [], [], [])
+        old_ids = self.__disk_ids
+        self.__disk_ids = np.array(ids, dtype=np.int64)
+        self.__disk_checked = np.array([bool(value) for value in checked], dtype=bool)
+        self.__disk_online = np.array([bool(value) for value in online], dtype=bool)
+        self.__disk_name_codes = self.__disk_names.encode(names)
+        # the remote disks after the local ones, like their names
+        self.__disk_locations = np.array([location != Disk.Location.LOCAL for location in locations], dtype=np.int32)
+        if len(self) and not np.array_equal(old_ids, self.__disk_ids):
+            rows = self.__columns['disk']
+            self.__columns['disk'] = np.searchsorted(self.__disk_ids, old_ids[rows]).astype(np.int32)
+
+    def __select_rows(self, session: Session, folder_ids: Optional['np.ndarray']) -> Dict[str, 'np.ndarray']:
+        # like the inner joins of the query of the tutorials model; one lookup, not one per folder
+        with_author = select(tutorial_author_table.c.tutorial_id).join(Author, tutorial_author_table.c.author_id == Author.id_)
+        query = (
+            select(
+                Folder.id_, Folder.disk_id, Folder.checked, Folder.cover_id != None, Tutorial.size != None,  # noqa: E711
+                Folder.error != None, Tutorial.is_complete, Tutorial.level, Tutorial.rating, Tutorial.duration,  # noqa: E711
+                Tutorial.released_on, Folder.size, Folder.video_duration,
+                cast(Folder.created, String), cast(Folder.modified, String),
+                Publisher.name, Folder.folder_parent, Folder.folder_name, Tutorial.title, Tutorial.all_authors,
+            )
+            .join(Disk, Folder.disk_id == Disk.id_)
+            .join(Tutorial, Folder.tutorial_id == Tutorial.id_)
+            .join(Publisher, Tutorial.publisher_id == Publisher.id_)
+            .where(Tutorial.id_.in_(with_author))
+            .order_by(Folder.id_)
+        )
+        if folder_ids is not None:
+            query = query.where(Folder.id_.in_(folder_ids.tolist()))
+        rows = session.execute(query).all()
+        values = list(zip(*rows)) if rows else [[] for _ in query.selected_columns]
+        (
+            ids, disk_ids, checked, has_cover, has_info_tc, has_error, is_complete, levels, ratings, durations,
+            released_on, sizes, video_durations, created, modified, publishers, folder_parents,
+            folder_names, titles, authors
+        ) = values
+
+        flags = (
+            np.array(checked, dtype=bool) * Flag.CHECKED
+            | np.array(has_cover, dtype=bool) * Flag.HAS_COVER
+            | np.array(has_info_tc, dtype=bool) * Flag.HAS_INFO_TC
+            | np.array(has_error, dtype=bool) * Flag.HAS_ERROR
+            | np.array(is_complete, dtype=bool) * Flag.IS_COMPLETE
+        )
+        return {
+            'folder_id': np.array(ids, dtype=np.int64),
+            'disk': np.searchsorted(self.__disk_ids, np.array(disk_ids, dtype=np.int64)).astype(np.int32),
+            'flags': flags.astype(np.uint8),
+            'level': np.array([value or 0 for value in levels], dtype=np.int8),
+            'rating': np.array([value or 0 for value in ratings], dtype=np.int8),
+            'duration': np.array([value or 0 for value in durations], dtype=np.int32),
+            'released_on': np.array([value or 0 for value in released_on], dtype=np.int32),
+            'size': np.array([-1 if value is None else value for value in sizes], dtype=np.int64),
+            'video_duration': np.array([-1 if value is None else value for value in video_durations], dtype=np.int64),
+            'publisher': self.__texts['publisher'].encode(publishers),
+            'folder_parent': self.__texts['folder_parent'].encode(folder_parents),
+            'folder_name': self.__texts['folder_name'].encode(folder_names),
+            'title': self.__texts['title'].encode(titles),
+            'authors': self.__texts['authors'].encode(authors),
+            'created': self.__texts['created'].encode(created),
+            'modified': self.__texts['modified'].encode(modified),
+        }
+
+    # filters, returning a boolean per row
+
+    def all_rows(self) -> 'np.ndarray':
+        return np.ones(len(self), dtype=bool)
+
+    @staticmethod
+    def rows(mask: 'np.ndarray') -> 'np.ndarray':
+        return np.flatnonzero(mask)
+
+    def has_flag(self, flag: int) -> 'np.ndarray':
+        return (self.__columns['flags'] & flag) != 0
+
+    def disk_checked(self) -> 'np.ndarray':
+        return self.__disk_checked[self.__columns['disk']]
+
+    def disk_online(self) -> 'np.ndarray':
+        return self.__disk_online[self.__columns['disk']]
+
+    def in_folders(self, folder_ids: Iterable[int]) -> 'np.ndarray':
+        return np.isin(self.folder_ids, np.fromiter(folder_ids, dtype=np.int64))
+
+    def folder_values(self, values: Dict[int, float], default: float) -> 'np.ndarray':
+        """Return a column with the values of some folders, the default for the others."""
+        result = np.full(len(self), default, dtype=np.float64)
+        if values:
+            ids = np.fromiter(values.keys(), dtype=np.int64, count=len(values))
+            positions = np.minimum(np.searchsorted(self.folder_ids, ids), max(len(self) - 1, 0))
+            found = self.folder_ids[positions] == ids if len(self) else np.zeros(len(ids), dtype=bool)
+            result[positions[found]] = np.fromiter(values.values(), dtype=np.float64, count=len(values))[found]
+        return result
+
+    def in_bitmap(self, bitmap: int) -> 'np.ndarray':
+        """Which rows have their folder in a bitmap of the facet index."""
+        bits = np.unpackbits(np.frombuffer(to_bytes(bitmap), dtype=np.uint8), bitorder='little').astype(bool)
+        folder_ids = self.folder_ids
+        result = np.zeros(len(folder_ids), dtype=bool)
+        inside = folder_ids < len(bits)
+        result[inside] = bits[folder_ids[inside]]
+        return result
+
+    def in_range(self, name: str, low: Optional[int], high: Optional[int]) -> 'np.ndarray':
+        column = self.__columns[name]
+        result = np.ones(len(column), dtype=bool)
+        if low is not None:
+            result &= column >= low
+        if high is not None:
+            result &= column <= high
+        return result
+
+    def matches(self, field_filter: FieldFilter) -> 'np.ndarray':
+        if field_filter.mask is not None:
+            return (self.__columns[field_filter.field] & field_filter.mask) == field_filter.mask
+        return self.in_range(field_filter.field, field_filter.low, field_filter.high)
+
+    # sorting
+
+    def sort_key(self, name: str) -> 'np.ndarray':
+        """Return the values of a column in an order comparable like SQLite, the texts ignoring the case."""
+        if name == 'disk_name':
+            return self.__disk_names.ranks()[self.__disk_name_codes][self.__columns['disk']]
+        if name == 'disk_location':
+            return self.__disk_locations[self.__columns['disk']]
+        if name == 'disk_online':
+            return self.disk_online().astype(np.int8)
+        if name in self.TEXT_COLUMNS:
+            return self.__texts[name].ranks()[self.__columns[name]]
+        flags = {
+            'checked': Flag.CHECKED, 'has_cover': Flag.HAS_COVER, 'has_info_tc': Flag.HAS_INFO_TC,
+            'has_error': Flag.HAS_ERROR, 'is_complete': Flag.IS_COMPLETE,
+        }
+        if name in flags:
+            return self.has_flag(flags[name]).astype(np.int8)
+        return self.__columns[name]
+
+    def is_empty_text(self, name: str) -> 'np.ndarray':
+        """Which rows have an empty text, or an empty list of authors."""
+        empty = self.__texts[name].code(FIELD_SEPARATOR * 2 if name == 'authors' else '')
+        return self.__columns[name] == empty
+
+    def sort(
+        self, rows: 'np.ndarray', key: 'np.ndarray', ascending: bool = True, missing: Optional['np.ndarray'] = None
+    ) -> 'np.ndarray':
+        """Sort the rows by the key, then by folder name; the rows missing a value come last."""
+        key = key[rows].astype(np.float64)
+        keys = [self.sort_key('folder_name')[rows], key if ascending else -key]
+        if missing is not None:
+            keys.append(missing[rows])
+        return rows[np.lexsort(keys)]
+
+    def total_size(self, rows: 'np.ndarray') -> int:
+        sizes = self.__columns['size'][rows]
+        return int(sizes[sizes > 0].sum())
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
@@ -8,6 +8,9 @@ from PySide2.QtCore import QObject, Signal
 
 from tutcatalogpy.common.db.dal import dal
 from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.facet_index import folder_facets, update_facet_index
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.disk_probe import probe_paths
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
@@ -16,6 +19,8 @@ log.addHandler(logging.NullHandler())
 class Config(QObject):
 
     file_name: Optional[str] = None
+    # filter and sort the tutorials in memory, see CatalogSnapshot
+    in_memory: bool = False
 
     loaded = Signal()
 
@@ -41,10 +46,12 @@ class Config(QObject):
         self.__config_disks(data.get('disks', []))
 
     def clear(self):
+        self.in_memory = False
         dal.disconnect()
 
     def __config_cache(self, file_name: str, data) -> None:
         cache_type = data.get('type')
+        self.in_memory = bool(data.get('in_memory', False))
 
         if cache_type is None:
             cache_type = Config.CacheType.SQLITE.value
@@ -79,6 +86,7 @@ class Config(QObject):
             .update({Disk.status: Disk.Status.UNKNOWN})
         )
 
+        disks = []
         for index, d in enumerate(data):
             path = d['path']
             if path == '' or path is None:
@@ -97,13 +105,21 @@ class Config(QObject):
             disk.location = Disk.Location(d.get('location', Disk.Location.REMOTE))
             disk.role = Disk.Role(d.get('role', Disk.Role.DEFAULT))
             disk.depth = int(d.get('depth', 1))
-            disk.online = path.exists()
             disk.status = Disk.Status.OK
+            disks.append(disk)
+
+        # probe all disks concurrently, so a dead mount can't block loading the catalog
+        states = probe_paths(disk.path() for disk in disks)
+        for disk in disks:
+            disk.set_path_state(states[disk.path()])
 
         # delete disks that still have their status set to UNKNOWN
         # we must use 'session.delete()' to make sqlachemy delete the associated folders
+        folder_ids = [folder_id for folder_id, in session.query(Folder.id_).join(Disk).filter(Disk.status == Disk.Status.UNKNOWN)]
+        facets = folder_facets(session, folder_ids)
         for disk in session.query(Disk).filter(Disk.status == Disk.Status.UNKNOWN):
             session.delete(disk)
+        update_facet_index(session, folder_ids, facets)
 
         session.commit()
 
@@ -43,6 +43,9 @@ class DisksModel(QAbstractTableModel):
     OFFLINE_ICON: Final[str] = relative_path(__file__, '../../resources/icons/offline.svg')
     REMOTE_ICON: Final[str] = relative_path(__file__, '../../resources/icons/remote.svg')
 
+    OFFLINE_TIP: Final[str] = 'Offline'
+    UNRESPONSIVE_TIP: Final[str] = 'Offline (unresponsive)'
+
     disk_checked_changed = Signal(int)
 
     def __init__(self) -> None:
@@ -96,6 +99,9 @@ class DisksModel(QAbstractTableModel):
         elif role == Qt.CheckStateRole:
             if column == Columns.CHECKED.value:
                 return Qt.Checked if disk.checked else Qt.Unchecked
+        elif role == Qt.ToolTipRole:
+            if column == Columns.ONLINE.value and not disk.online:
+                return self.UNRESPONSIVE_TIP if disk.status == Disk.Status.UNRESPONSIVE else self.OFFLINE_TIP
         elif role == Qt.ForegroundRole:
             if column == Columns.NAME.value and not disk.online:
                 return QBrush(Qt.red)
@@ -5,10 +5,16 @@ from PySide2.QtCore import QAbstractItemModel, QModelIndex, Qt, Signal
 from sqlalchemy.sql.functions import func
 from sqlalchemy.sql.schema import Table
 
+from tutcatalogpy.catalog.tutorial_filters import search_value_condition
 from tutcatalogpy.common.db.author import Author
 from tutcatalogpy.common.db.dal import dal, tutorial_author_table
+from tutcatalogpy.common.db.facet_index import Facet, facet_counts
+from tutcatalogpy.common.db.learning_path import LearningPath
 from tutcatalogpy.common.db.publisher import Publisher
-from tutcatalogpy.common.db.search_flag import Search, SearchFlag, SearchValue
+from tutcatalogpy.common.db.search_flag import (
+    DURATION_SEARCH_VALUES, LEVEL_SEARCH_VALUES, RATING_SEARCH_VALUES, RELEASED_SEARCH_VALUES, Search, SearchFlag, SearchValue
+)
+from tutcatalogpy.common.db.tag import Tag
 from tutcatalogpy.common.db.tutorial import Tutorial
 
 log = logging.getLogger(__name__)
@@ -16,12 +22,16 @@ log.addHandler(logging.NullHandler())
 
 
 AUTHORS_LABEL: Final[str] = 'authors'
+DURATIONS_LABEL: Final[str] = 'durations'
 FLAGS_LABEL: Final[str] = 'flags'
+LEVELS_LABEL: Final[str] = 'levels'
+RATINGS_LABEL: Final[str] = 'ratings'
+RELEASED_LABEL: Final[str] = 'released'
 LEARNING_PATHS_LABEL: Final[str] = 'learning paths'
 PUBLISHERS_LABEL: Final[str] = 'publishers'
 
 CUSTOM_TAGS_LABEL: Final[str] = 'tags (custom)'
-PUBLISHER_TAGS_LABEL: Final[str] = 'tags (publishes)'
+PUBLISHER_TAGS_LABEL: Final[str] = 'tags (publisher)'
 
 NO_NAME_LABEL: Final[str] = '(no name)'
 UNKNOWN_AUTHOR_LABEL: Final[str] = '(unknown author)'
@@ -127,20 +137,100 @@ class PublishersItem(GroupItem):
             self.append(TagsItem(f'{name} ({count})', publisher))
 
 
+class FacetItem(GroupItem):
+    """The values of a facet having tutorials, with their number from the facet index."""
+    _no_name_label = NO_NAME_LABEL
+    _facet: Facet
+
+    def _values(self) -> List[Any]:
+        return []
+
+    def _populate(self) -> None:
+        counts = facet_counts(dal.session, self._facet)
+        for value in self._values():
+            count = counts.get(value.id_, 0)
+            if count == 0:
+                continue
+            self.append(TagsItem(f'{value.name or self._no_name_label} ({count})', value))
+
+
+class TagsOfSourceItem(FacetItem):
+    _facet = Facet.TAG
+    _source: Tag.Source
+
+    def _values(self) -> List[Any]:
+        return dal.session.query(Tag).filter(Tag.source == self._source).order_by(Tag.name.collate('NOCASE').asc()).all()
+
+
+class PublisherTagsItem(TagsOfSourceItem):
+    _label = PUBLISHER_TAGS_LABEL
+    _source = Tag.Source.PUBLISHER
+
+
+class CustomTagsItem(TagsOfSourceItem):
+    _label = CUSTOM_TAGS_LABEL
+    _source = Tag.Source.PERSONAL
+
+
+class LearningPathsItem(FacetItem):
+    _label = LEARNING_PATHS_LABEL
+    _facet = Facet.LEARNING_PATH
+
+    def _values(self) -> List[Any]:
+        return dal.session.query(LearningPath).order_by(LearningPath.name.collate('NOCASE').asc()).all()
+
+
 class SearchFlagItem(GroupItem):
     _label = FLAGS_LABEL
 
     def _populate(self) -> None:
-        flags = dal.session.query(SearchFlag).all()
+        flags = [
+            flag for flag in dal.session.query(SearchFlag)
+            if search_value_condition(SearchValue(flag.value)) is None
+        ]
         flags.sort(key=lambda flag: SearchValue(flag.value).label)
         for flag in flags:
             name = SearchValue(flag.value).label
             self.append(TagsItem(name, flag))
 
 
+class TutorialFlagItem(GroupItem):
+    """The flags of a field of the tutorials, in the order of `_values`, with the number of tutorials they match."""
+    _values: List[SearchValue] = []
+
+    def _populate(self) -> None:
+        flags = {flag.value: flag for flag in dal.session.query(SearchFlag).filter(SearchFlag.value.in_(self._values))}
+        for value in self._values:
+            flag = flags.get(value)
+            if flag is None:
+                continue
+            count = dal.session.query(func.count(Tutorial.id_)).filter(search_value_condition(value)).scalar()
+            self.append(TagsItem(f'{value.label} ({count})', flag))
+
+
+class LevelsItem(TutorialFlagItem):
+    _label = LEVELS_LABEL
+    _values = LEVEL_SEARCH_VALUES
+
+
+class RatingsItem(TutorialFlagItem):
+    _label = RATINGS_LABEL
+    _values = RATING_SEARCH_VALUES
+
+
+class DurationsItem(TutorialFlagItem):
+    _label = DURATIONS_LABEL
+    _values = DURATION_SEARCH_VALUES
+
+
+class ReleasedItem(TutorialFlagItem):
+    _label = RELEASED_LABEL
+    _values = RELEASED_SEARCH_VALUES
+
+
 class TagsModel(QAbstractItemModel):
 
-    TOP_TABLES: Final = (Author, Publisher, SearchFlag)
+    TOP_TABLES: Final = (Author, Publisher, Tag, LearningPath, SearchFlag)
 
     search_changed = Signal()
 
@@ -150,12 +240,20 @@ class TagsModel(QAbstractItemModel):
 
         self.__authors_item = AuthorsItem()
         self.__publishers_item = PublishersItem()
+        self.__learning_paths_item = LearningPathsItem()
         self.__search_flags_item = SearchFlagItem()
 
         self.__top_items = [
             self.__authors_item,
             self.__publishers_item,
+            PublisherTagsItem(),
+            CustomTagsItem(),
+            self.__learning_paths_item,
             self.__search_flags_item,
+            LevelsItem(),
+            RatingsItem(),
+            DurationsItem(),
+            ReleasedItem(),
         ]
 
         for item in self.__top_items:
@@ -265,21 +363,23 @@ class TagsModel(QAbstractItemModel):
         self.dataChanged.emit(index, index)
         self.search_changed.emit()
 
-    def __index_of_table(self, table: Table) -> QModelIndex:
+    def __indexes_of_table(self, table: Table) -> List[QModelIndex]:
+        indexes = []
         for row in range(self.rowCount(QModelIndex())):
             child_index = self.index(row, 0, QModelIndex())
             item = child_index.internalPointer()
             if (
                 (table == Author and item == self.__authors_item)
                 or (table == Publisher and item == self.__publishers_item)
-                or (table == SearchFlag and item == self.__search_flags_item)
+                or (table == Tag and isinstance(item, TagsOfSourceItem))
+                or (table == LearningPath and item == self.__learning_paths_item)
+                or (table == SearchFlag and isinstance(item, (SearchFlagItem, TutorialFlagItem)))
             ):
-                return child_index
-        return QModelIndex()
+                indexes.append(child_index)
+        return indexes
 
     def __index_of_table_id(self, table: Table, id: int) -> QModelIndex:
-        index = self.__index_of_table(table)
-        if index.isValid():
+        for index in self.__indexes_of_table(table):
             for row in range(self.rowCount(index)):
                 child_index = self.index(row, 0, index)
                 item = child_index.internalPointer()
@@ -1,25 +1,35 @@
 import enum
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, Final, Optional
+from time import perf_counter
+from typing import Any, Dict, Final, List, Optional, Set
 
 from humanize import naturalsize
 from PySide2.QtCore import QAbstractTableModel, QDateTime, QModelIndex, Qt, Signal
 from PySide2.QtGui import QIcon
-from sqlalchemy.orm import Query
+from sqlalchemy import case, literal_column, not_, or_, select
+from sqlalchemy.orm import Query, contains_eager, selectinload
 from sqlalchemy.sql.functions import func
+from sqlalchemy.sql import ClauseElement
 from sqlalchemy.sql.schema import Column
 
+from tutcatalogpy.catalog.catalog_snapshot import CatalogSnapshot, Flag, snapshot_available
+from tutcatalogpy.catalog.query_language import QueryCompiler, QueryError, parse, required_text_terms, text_terms
+from tutcatalogpy.catalog.tutorial_filters import search_value_condition, search_value_filter
 from tutcatalogpy.catalog.widgets.search_dock import SearchDock
 from tutcatalogpy.common.db.author import Author
 from tutcatalogpy.common.db.base import FIELD_SEPARATOR
 from tutcatalogpy.common.db.dal import dal, tutorial_author_table
 from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.facet_index import bitmap_folders, searched_facets
+from tutcatalogpy.common.db.file import File
 from tutcatalogpy.common.db.folder import Folder
 from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.search_index import SearchTerm, folder_ranks, fuzzy_matches, matching_folders
 from tutcatalogpy.common.db.tutorial import Tutorial
 from tutcatalogpy.common.db.search_flag import Search, SearchFlag, SearchValue
 from tutcatalogpy.common.files import relative_path
+from tutcatalogpy.common.lru_cache import LruCache
 from tutcatalogpy.common.tutorial_data import TutorialData, TutorialLevel
 
 log = logging.getLogger(__name__)
@@ -64,11 +74,14 @@ class Columns(bytes, enum.Enum):
     PUBLISHER = (12, 'Publisher', Publisher.name)
     TITLE = (13, 'Title', Tutorial.title)
     AUTHORS = (14, 'Authors', Tutorial.all_authors)
-    RELEASED = (15, 'Released', Tutorial.released)
+    RELEASED = (15, 'Released', Tutorial.released_on)
     DURATION = (16, 'Duration', Tutorial.duration)
     SIZE = (17, 'Size', Folder.size)
     CREATED = (18, 'Created', Folder.created)
     MODIFIED = (19, 'Modified', Folder.modified)
+    VIDEO_DURATION = (20, 'Video Duration', Folder.video_duration)
+    # how well the folders match the search text, only for sorting
+    RELEVANCE = (21, 'Relevance', literal_column('NULL'))
 
 
 class TutorialsModel(QAbstractTableModel):
@@ -90,16 +103,66 @@ class TutorialsModel(QAbstractTableModel):
         TutorialLevel.ANY: relative_path(__file__, '../../resources/icons/level_111.svg'),
     }
 
+    # the rows are fetched by pages; only the recently used pages are kept
+    PAGE_SIZE: Final[int] = 100
+    MAX_CACHED_PAGES: Final[int] = 50
+
+    # the columns of the catalog snapshot sorting like the columns of the table
+    SNAPSHOT_SORT_KEYS: Final[Dict[int, str]] = {
+        Columns.CHECKED.value: 'checked',
+        Columns.INDEX.value: 'folder_id',
+        Columns.ONLINE.value: 'disk_online',
+        Columns.LOCATION.value: 'disk_location',
+        Columns.HAS_COVER.value: 'has_cover',
+        Columns.HAS_INFO_TC.value: 'has_info_tc',
+        Columns.HAS_ERROR.value: 'has_error',
+        Columns.IS_COMPLETE.value: 'is_complete',
+        Columns.LEVEL.value: 'level',
+        Columns.DISK_NAME.value: 'disk_name',
+        Columns.FOLDER_PARENT.value: 'folder_parent',
+        Columns.FOLDER_NAME.value: 'folder_name',
+        Columns.PUBLISHER.value: 'publisher',
+        Columns.TITLE.value: 'title',
+        Columns.AUTHORS.value: 'authors',
+        Columns.RELEASED.value: 'released_on',
+        Columns.DURATION.value: 'duration',
+        Columns.SIZE.value: 'size',
+        Columns.CREATED.value: 'created',
+        Columns.MODIFIED.value: 'modified',
+        Columns.VIDEO_DURATION.value: 'video_duration',
+    }
+
+    # the folders have an id; false() would also drop the join conditions of the query
+    NO_MATCH: Final[ClauseElement] = Folder.id_.is_(None)
+
     summary_changed = Signal(str)
 
     def __init__(self):
         super().__init__()
-        self.__query_results_cache: Dict[int, QueryResult] = {}
+        self.__pages: LruCache[int, List[QueryResult]] = LruCache(self.MAX_CACHED_PAGES, lambda page: 1)
         self.__row_count: int = 0
         self.__sort_column: int = 0
         self.__sort_ascending: bool = True
         self.__search_text: str = ''
         self.__only_show_checked_disks: bool = False
+        self.__search_files: bool = False
+        self.__fuzzy: bool = False
+        # the rank of the folders similar to the search text, None unless searching fuzzily
+        self.__fuzzy_ranks: Optional[Dict[int, int]] = None
+        # the terms the fuzzy ranks were computed from
+        self.__fuzzy_terms: Set[SearchTerm] = set()
+        # the search text compiled by __update_cached_query, None if it's empty
+        self.__search_condition: Optional[ClauseElement] = None
+        # the FTS5 query of the words of the search text, for the relevance
+        self.__rank_query: Optional[str] = None
+        self.__cached_query: Optional[Query] = None
+        # the in-memory catalog filtered and sorted instead of the query, see set_snapshot_enabled
+        self.__snapshot: Optional[CatalogSnapshot] = None
+        self.__snapshot_bind = None
+        # the ids of the displayed folders, in order, when using the snapshot
+        self.__snapshot_ids: List[int] = []
+        self.__min_duration: int = 0
+        self.__max_duration: int = 0
         self.__no_cover_icon: Optional[QIcon] = None
 
     def init_icons(self) -> None:
@@ -115,15 +178,48 @@ class TutorialsModel(QAbstractTableModel):
             self.__level_icon[key] = QIcon(value) if value is not None else None
 
     def search(self, search_dock: SearchDock, force: bool = False) -> None:
-        if search_dock.text == self.__search_text and search_dock.only_show_checked_disks == self.__only_show_checked_disks and not force:
+        if (
+            search_dock.text == self.__search_text
+            and search_dock.only_show_checked_disks == self.__only_show_checked_disks
+            and search_dock.search_files == self.__search_files
+            and search_dock.fuzzy == self.__fuzzy
+            and search_dock.min_duration == self.__min_duration
+            and search_dock.max_duration == self.__max_duration
+            and not force
+        ):
             return
 
         self.__search_text: str = search_dock.text
         self.__only_show_checked_disks: bool = search_dock.only_show_checked_disks
-
-        log.info("Search for: '%s' (only show checked disks: %s)", self.__search_text, self.__only_show_checked_disks)
+        self.__search_files: bool = search_dock.search_files
+        self.__fuzzy: bool = search_dock.fuzzy
+        self.__min_duration: int = search_dock.min_duration
+        self.__max_duration: int = search_dock.max_duration
+
+        log.info(
+            "Search for: '%s' (only show checked disks: %s, search files: %s, fuzzy: %s, video duration: %s-%s min)",
+            self.__search_text, self.__only_show_checked_disks, self.__search_files, self.__fuzzy,
+            self.__min_duration, self.__max_duration
+        )
         self.refresh()
 
+    def set_snapshot_enabled(self, enabled: bool) -> None:
+        """Filter and sort an in-memory copy of the catalog instead of querying the database for each search."""
+        if enabled and not snapshot_available():
+            log.warning('The in-memory catalog needs NumPy; querying the database instead.')
+            enabled = False
+        if enabled == (self.__snapshot is not None):
+            return
+        self.__snapshot = CatalogSnapshot() if enabled else None
+        self.__snapshot_bind = None
+        self.__snapshot_ids = []
+        log.info('In-memory catalog: %s.', enabled)
+
+    def update_folders(self, folder_ids: List[int]) -> None:
+        """Load the folders changed by a scan into the snapshot; the next refresh displays them."""
+        if self.__snapshot is not None and dal.connected and self.__snapshot_bind is dal.session.bind:
+            self.__snapshot.refresh(dal.session, folder_ids)
+
     def columnCount(self, index) -> int:
         return len(Columns)
 
@@ -139,7 +235,7 @@ class TutorialsModel(QAbstractTableModel):
 
         return super().headerData(section, orientation, role)
 
-    def rowCount(self, index) -> int:
+    def rowCount(self, index: QModelIndex = QModelIndex()) -> int:
         return self.__row_count
 
     def refresh(self) -> None:
@@ -204,6 +300,10 @@ class TutorialsModel(QAbstractTableModel):
                 return folder.tutorial.released
             elif column == Columns.DURATION.value:
                 return TutorialData.duration_to_text(folder.tutorial.duration)
+            elif column == Columns.VIDEO_DURATION.value:
+                value = folder.video_duration
+                # rounded like the durations of info.tc
+                return TutorialData.duration_to_text((value + 30) // 60) if value else ''
 
     def setData(self, index: QModelIndex, value: Any, role: int) -> bool:
         row = index.row()
@@ -219,7 +319,8 @@ class TutorialsModel(QAbstractTableModel):
             if column == Columns.CHECKED.value:
                 folder.checked = (value == Qt.Checked)
                 dal.session.commit()
-                del self.__query_results_cache[row]
+                self.update_folders([folder.id_])
+                self.__pages.remove(row // self.PAGE_SIZE)
                 return True
         return False
 
@@ -247,10 +348,28 @@ class TutorialsModel(QAbstractTableModel):
 
         return query
 
-    def __query_result(self, row: int) -> QueryResult:
-        query = self.__cached_query
-        folder, has_cover, has_info, has_error = query.offset(row).limit(1).first()
-        return QueryResult(folder, has_cover, has_info, has_error)
+    def __query_page(self, page: int) -> List[QueryResult]:
+        if self.__snapshot is not None:
+            return self.__query_snapshot_page(page)
+
+        query = (
+            self.__cached_query
+            .options(selectinload(Folder.cover).selectinload('thumbnails'))
+            .offset(page * self.PAGE_SIZE)
+            .limit(self.PAGE_SIZE)
+        )
+        return [QueryResult(folder, has_cover, has_info, has_error) for folder, has_cover, has_info, has_error in query]
+
+    def __query_snapshot_page(self, page: int) -> List[QueryResult]:
+        folder_ids = self.__snapshot_ids[page * self.PAGE_SIZE:(page + 1) * self.PAGE_SIZE]
+        query = (
+            self.__joined_query(self.__base_query())
+            .options(selectinload(Folder.cover).selectinload('thumbnails'))
+            .filter(Folder.id_.in_(folder_ids))
+        )
+        results = {folder.id_: QueryResult(folder, has_cover, has_info, has_error) for folder, has_cover, has_info, has_error in query}
+        # a folder deleted since the snapshot was refreshed leaves an empty row
+        return [results.get(folder_id, QueryResult()) for folder_id in folder_ids]
 
     def __joined_query(self, query: Query) -> Query:
         query = (
@@ -258,6 +377,11 @@ class TutorialsModel(QAbstractTableModel):
             .join(Disk)
             .join(Tutorial)
             .join(Publisher)
+            # the rows are displayed from the joined columns, without a query per row
+            .options(
+                contains_eager(Folder.disk),
+                contains_eager(Folder.tutorial).contains_eager(Tutorial.publisher),
+            )
             .filter(
                 Folder.tutorial_id == Tutorial.id_,
                 Tutorial.publisher_id == Publisher.id_,
@@ -273,13 +397,14 @@ class TutorialsModel(QAbstractTableModel):
         if self.__only_show_checked_disks:
             query = query.filter(Disk.checked == True)  # noqa: E712
 
-        if len(self.__search_text):
-            for key in self.__search_text.split():
-                query = (
-                    query
-                    .filter((Disk.disk_parent + '/' + Disk.disk_name + '/' + Folder.folder_parent + '/' + Folder.folder_name)
-                    .like(f'%{key}%'))
-                )
+        if self.__search_condition is not None:
+            query = query.filter(self.__search_condition)
+
+        # in minutes, 0 for no limit; the folders not measured yet have no duration
+        if self.__min_duration:
+            query = query.filter(Folder.video_duration >= self.__min_duration * 60)
+        if self.__max_duration:
+            query = query.filter(Folder.video_duration <= self.__max_duration * 60)
 
         search_flag_column = {
             SearchValue.IS_COMPLETE: Tutorial.is_complete,
@@ -290,31 +415,33 @@ class TutorialsModel(QAbstractTableModel):
             SearchValue.IS_DISK_ONLINE: Disk.online,
         }
         for search_flag in dal.session.query(SearchFlag):
-            if search_flag.search != Search.IGNORED:
+            if search_flag.search == Search.IGNORED:
+                continue
+            condition = search_value_condition(search_flag.value)
+            if condition is None:
                 query = query.filter(search_flag_column[search_flag.value] == (search_flag.search == Search.INCLUDE))
+            else:
+                query = query.filter(condition if search_flag.search == Search.INCLUDE else not_(condition))
 
-        for publisher in dal.session.query(Publisher).filter(Publisher.search == Search.INCLUDE):
-            query = query.filter(Publisher.id_ == publisher.id_)
-
-        for publisher in dal.session.query(Publisher).filter(Publisher.search == Search.EXCLUDE):
-            query = query.filter(Publisher.id_ != publisher.id_)
-
-        for author in dal.session.query(Author).filter(Author.search == Search.INCLUDE):
-            query = query.filter(Tutorial.all_authors.like(f'%{FIELD_SEPARATOR}{author.name}{FIELD_SEPARATOR}%'))
-
-        for author in dal.session.query(Author).filter(Author.search == Search.EXCLUDE):
-            query = query.filter(Tutorial.all_authors.not_like(f'%{FIELD_SEPARATOR}{author.name}{FIELD_SEPARATOR}%'))
+        # the authors, tags, publishers and learning paths, combined with their bitmaps
+        included, excluded = searched_facets(dal.session)
+        if included is not None:
+            query = query.filter(Folder.id_.in_(bitmap_folders(included)))
+        if excluded:
+            query = query.filter(Folder.id_.not_in(bitmap_folders(excluded)))
 
         return query
 
     def __sorted_query(self, query: Query) -> Query:
+        if self.__sort_column == Columns.RELEVANCE.value:
+            return self.__sorted_by_relevance_query(query)
+
         column: Column = Columns(self.__sort_column).column
 
         # handle missing values
         if column in [
             Columns.TITLE.column,
             Columns.PUBLISHER.column,
-            Columns.RELEASED.column,
         ]:
             query = query.order_by(column.is_(None), column.is_(''))
         elif column in [
@@ -322,7 +449,9 @@ class TutorialsModel(QAbstractTableModel):
         ]:
             query = query.order_by(column.is_(None), column.is_(FIELD_SEPARATOR * 2))
         elif column in [
+            Columns.RELEASED.column,
             Columns.DURATION.column,
+            Columns.VIDEO_DURATION.column,
             Columns.LEVEL.column,
         ]:
             query = query.order_by(column.is_(None), column.is_(0))
@@ -335,35 +464,182 @@ class TutorialsModel(QAbstractTableModel):
 
         return query
 
+    def __text_condition(self, term: SearchTerm) -> ClauseElement:
+        """Match a word or phrase of the search text without a field."""
+        if self.__fuzzy_ranks is not None and term in self.__fuzzy_terms:
+            condition = Folder.id_.in_(list(self.__fuzzy_ranks))
+        else:
+            condition = Folder.id_.in_(matching_folders(term.query))
+        if self.__search_files:
+            # the file index of the last scan, by the start of the names so the index is used; the disks aren't touched
+            condition = or_(condition, Folder.id_.in_(select(File.folder_id).where(File.name_starts_with(term.text))))
+        return condition
+
+    def __compile_search(self) -> None:
+        """Compile the search text into the condition of the query; a text with an error matches nothing."""
+        start = perf_counter()
+        self.__fuzzy_ranks = None
+        self.__fuzzy_terms = set()
+        self.__search_condition = None
+        self.__rank_query = None
+        try:
+            node = parse(self.__search_text)
+        except QueryError as ex:
+            log.warning("Invalid search '%s': %s", self.__search_text, ex)
+            self.__search_condition = self.NO_MATCH
+            return
+
+        terms = text_terms(node)
+        if terms:
+            self.__rank_query = ' '.join(term.query for term in terms)
+        # the negated and alternative terms match exactly; their folders aren't in the fuzzy matches of the others
+        fuzzy_terms = required_text_terms(node)
+        if self.__fuzzy and fuzzy_terms:
+            matches = fuzzy_matches(dal.session, ' '.join(term.text for term in fuzzy_terms))
+            self.__fuzzy_ranks = {folder_id: rank for rank, (folder_id, _) in enumerate(matches)}
+            self.__fuzzy_terms = set(fuzzy_terms)
+        if node is not None:
+            try:
+                self.__search_condition = QueryCompiler(self.__text_condition).compile(node)
+            except QueryError as ex:
+                log.warning("Invalid search '%s': %s", self.__search_text, ex)
+                self.__search_condition = self.NO_MATCH
+        log.debug("Planned the search '%s' in %.1f ms.", self.__search_text, (perf_counter() - start) * 1000)
+
+    def search_sql(self) -> str:
+        """Return the SQL of the displayed folders, to see how the search text is queried."""
+        if not dal.connected:
+            return ''
+        query = self.__cached_query if self.__cached_query is not None else self.__query()
+        return str(query.statement.compile(dal.session.bind, compile_kwargs={'literal_binds': True}))
+
+    def log_sql(self) -> None:
+        log.info("SQL of the search '%s':\n%s", self.__search_text, self.search_sql())
+
+    def __sorted_by_relevance_query(self, query: Query) -> Query:
+        search = self.__rank_query
+        if self.__fuzzy_ranks:
+            rank = case(self.__fuzzy_ranks, value=Folder.id_, else_=len(self.__fuzzy_ranks))
+            query = query.order_by(rank.asc() if self.__sort_ascending else rank.desc())
+        elif search is not None:
+            # the BM25 rank is lower for the better matches; the folders only matched by their files come last
+            ranks = folder_ranks(search).subquery()
+            query = query.outerjoin(ranks, ranks.c.folder_id == Folder.id_)
+            query = query.order_by(ranks.c.rank.is_(None), ranks.c.rank.asc() if self.__sort_ascending else ranks.c.rank.desc())
+        return query.order_by(Folder.folder_name.collate('NOCASE').asc())
+
+    def __query(self) -> Query:
+        return self.__sorted_query(self.__filtered_query(self.__joined_query(self.__base_query())))
+
     def __update_cached_query(self) -> None:
         if dal.connected:
-            self.__cached_query = self.__sorted_query(self.__filtered_query(self.__joined_query(self.__base_query())))
-            self.__row_count = self.__cached_query.count()
-            total_size = self.__total_size()
+            self.__compile_search()
+            if self.__snapshot is not None:
+                self.__cached_query = None
+                total_size = self.__update_snapshot_ids()
+                self.__row_count = len(self.__snapshot_ids)
+            else:
+                self.__cached_query = self.__query()
+                self.__row_count = self.__cached_query.count()
+                total_size = self.__total_size()
         else:
             self.__cached_query = None
+            self.__snapshot_ids = []
             self.__row_count = 0
             total_size = 0
-        self.__query_results_cache.clear()
+        self.__pages.clear()
 
         total_size = naturalsize(total_size) if total_size > 0 else '0'
         self.summary_changed.emit(f'F: {self.__row_count} ({total_size})')
 
-    def __cached_query_result(self, row: int) -> QueryResult:
-        if row < 0 or row >= self.__row_count:
-            return QueryResult()
+    def __update_snapshot_ids(self) -> int:
+        """Filter and sort the snapshot like the query of the folders; return the total size of the folders."""
+        start = perf_counter()
+        snapshot = self.__snapshot
+        if self.__snapshot_bind is not dal.session.bind:
+            # another catalog
+            snapshot.load(dal.session)
+            self.__snapshot_bind = dal.session.bind
+        else:
+            snapshot.refresh_disks(dal.session)
 
-        result = self.__query_results_cache.get(row, QueryResult())
+        rows = snapshot.rows(self.__snapshot_mask(snapshot))
+        rows = self.__sorted_snapshot_rows(snapshot, rows)
+        self.__snapshot_ids = snapshot.folder_ids[rows].tolist()
+        log.debug('Filtered the in-memory catalog in %.1f ms.', (perf_counter() - start) * 1000)
+        return snapshot.total_size(rows)
 
-        if result.folder is None:
-            result = self.__query_result(row)
+    def __snapshot_mask(self, snapshot: CatalogSnapshot):
+        mask = snapshot.all_rows()
+        if self.__only_show_checked_disks:
+            mask &= snapshot.disk_checked()
+
+        if self.__search_condition is not None:
+            # the words are searched with the full text index; only the matching ids are kept in memory
+            query = dal.session.query(Folder.id_).join(Tutorial).join(Publisher).filter(self.__search_condition)
+            mask &= snapshot.in_folders(folder_id for folder_id, in query)
+
+        # in minutes, 0 for no limit; the folders not measured yet have no duration
+        if self.__min_duration or self.__max_duration:
+            mask &= snapshot.in_range('video_duration', self.__min_duration * 60, self.__max_duration * 60 or None)
+
+        search_flag_bits = {
+            SearchValue.IS_COMPLETE: lambda: snapshot.has_flag(Flag.IS_COMPLETE),
+            SearchValue.HAS_ERROR: lambda: snapshot.has_flag(Flag.HAS_ERROR),
+            SearchValue.HAS_INFO_TC: lambda: snapshot.has_flag(Flag.HAS_INFO_TC),
+            SearchValue.HAS_COVER: lambda: snapshot.has_flag(Flag.HAS_COVER),
+            SearchValue.IS_CHECKED: lambda: snapshot.has_flag(Flag.CHECKED),
+            SearchValue.IS_DISK_ONLINE: snapshot.disk_online,
+        }
+        for search_flag in dal.session.query(SearchFlag):
+            if search_flag.search == Search.IGNORED:
+                continue
+            field_filter = search_value_filter(search_flag.value)
+            matches = search_flag_bits[search_flag.value]() if field_filter is None else snapshot.matches(field_filter)
+            mask &= matches if search_flag.search == Search.INCLUDE else ~matches
+
+        included, excluded = searched_facets(dal.session)
+        if included is not None:
+            mask &= snapshot.in_bitmap(included)
+        if excluded:
+            mask &= ~snapshot.in_bitmap(excluded)
+
+        return mask
+
+    def __sorted_snapshot_rows(self, snapshot: CatalogSnapshot, rows):
+        if self.__sort_column == Columns.RELEVANCE.value:
+            if self.__fuzzy_ranks:
+                key = snapshot.folder_values(self.__fuzzy_ranks, len(self.__fuzzy_ranks))
+                return snapshot.sort(rows, key, self.__sort_ascending)
+            if self.__rank_query is not None:
+                # the folders only matched by their files come last
+                ranks = dict(dal.session.execute(folder_ranks(self.__rank_query)).all())
+                key = snapshot.folder_values(ranks, 0)
+                return snapshot.sort(rows, key, self.__sort_ascending, ~snapshot.in_folders(ranks))
+            return snapshot.sort(rows, snapshot.sort_key('folder_name'))
+
+        name = self.SNAPSHOT_SORT_KEYS[self.__sort_column]
+        key = snapshot.sort_key(name)
+        missing = None
+        if self.__sort_column in [Columns.TITLE.value, Columns.PUBLISHER.value, Columns.AUTHORS.value]:
+            missing = snapshot.is_empty_text(name)
+        elif self.__sort_column in [
+            Columns.RELEASED.value, Columns.DURATION.value, Columns.VIDEO_DURATION.value, Columns.LEVEL.value,
+        ]:
+            missing = key <= 0
+        return snapshot.sort(rows, key, self.__sort_ascending, missing)
 
-            if result.folder is None:
-                return QueryResult()
+    def __cached_query_result(self, row: int) -> QueryResult:
+        if row < 0 or row >= self.__row_count:
+            return QueryResult()
 
-        self.__query_results_cache[row] = result
+        page, offset = divmod(row, self.PAGE_SIZE)
+        results = self.__pages.get(page)
+        if results is None:
+            results = self.__query_page(page)
+            self.__pages.put(page, results)
 
-        return result
+        return results[offset] if offset < len(results) else QueryResult()
 
     def folder(self, row: int) -> Optional[Folder]:
         return self.__cached_query_result(row).folder
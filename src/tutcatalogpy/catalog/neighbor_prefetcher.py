@@ -0,0 +1,85 @@
+"""Load the tutorials next to the selected one, so moving the selection shows them at once."""
+
+import logging
+from typing import Callable, Final, List, Optional
+
+from PySide2.QtCore import QObject, QTimer
+
+from tutcatalogpy.common.db.dal import dal
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.lru_cache import LruCache
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class NeighborPrefetcher(QObject):
+    """Load the folders with their details, one per idle tick of the event loop.
+
+    The folders are objects of the session of the GUI thread, so they are
+    loaded there; the handlers start the expensive work, like decoding the
+    cover or rendering the description, in the thread pool.
+    """
+
+    DISTANCE: Final[int] = 2
+    MAX_FOLDERS: Final[int] = 16
+
+    def __init__(self, parent: Optional[QObject] = None, max_folders: int = MAX_FOLDERS) -> None:
+        super().__init__(parent)
+        self.__folders: LruCache[int, Folder] = LruCache(max_folders, lambda _: 1)
+        self.__queue: List[int] = []
+        self.__handlers: List[Callable[[Folder], None]] = []
+
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(0)
+        self.__timer.timeout.connect(self.__prefetch_next)
+
+    def add_handler(self, handler: Callable[[Folder], None]) -> None:
+        """Call `handler` with each prefetched folder."""
+        self.__handlers.append(handler)
+
+    def prefetch(self, folder_ids: List[int]) -> None:
+        """Replace the folders waiting to be prefetched; the first ones are prefetched first."""
+        self.__queue = list(folder_ids)
+        if self.__queue:
+            self.__timer.start()
+        else:
+            self.__timer.stop()
+
+    def get(self, folder_id: int) -> Optional[Folder]:
+        """Return the folder with its details, loading it if it wasn't prefetched."""
+        folder = self.__folders.get(folder_id)
+        if folder is None:
+            session = dal.session
+            if session is None:
+                return None
+            folder = Folder.get(session, folder_id, details=True)
+            if folder is not None:
+                self.__folders.put(folder_id, folder)
+        return folder
+
+    def clear(self) -> None:
+        """Forget the folders, e.g. when the catalog changed."""
+        self.__timer.stop()
+        self.__queue = []
+        self.__folders.clear()
+
+    def __prefetch_next(self) -> None:
+        if not self.__queue:
+            return
+        folder_id = self.__queue.pop(0)
+        folder = self.get(folder_id)
+        if folder is not None:
+            for handler in self.__handlers:
+                try:
+                    handler(folder)
+                except Exception:
+                    log.exception('Prefetching folder %s failed.', folder_id)
+        if self.__queue:
+            self.__timer.start()
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
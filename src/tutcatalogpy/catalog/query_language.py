@@ -0,0 +1,348 @@
+"""The search language of the search dock, compiled into the conditions of a single SQL query.
+
+    rigging blender              the tutorials matching both words, by prefix
+    "face rig"                   the words of a phrase, in order
+    author:"raul perez"          a field: title, description, author, tag, path or publisher
+    level:beginner               the level of the tutorial, see TutorialLevel
+    duration:>2h rating:>=3      comparisons: >, >=, <, <=, =
+    released:2019..2021/06       ranges; either bound can be left out
+    size:>10GB                   sizes in B, KB, MB, GB, TB or KiB, MiB, GiB, TiB
+    blender OR -zbrush           OR binds looser than AND, which is implicit;
+    NOT (a OR b)                 - and NOT negate
+
+The words and the text fields are matched with the full text index; the
+other fields compare indexed columns, see tutorial_filters.
+"""
+
+import logging
+import re
+from typing import Callable, Dict, Final, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import and_, not_, or_, true
+from sqlalchemy.sql import ClauseElement
+
+from tutcatalogpy.catalog.tutorial_filters import level_condition, range_condition, released_condition, released_range
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.search_index import SearchTerm, matching_folders, search_terms
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.tutorial_data import TEXT_TO_TUTORIAL_LEVEL, TutorialLevel
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class QueryError(ValueError):
+    """The search text isn't a valid query; `position` is where in the text."""
+
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(f'{message} (at {position + 1})')
+        self.position = position
+
+
+class Term(NamedTuple):
+    field: Optional[str]  # None for the words and phrases matched on all the text fields
+    value: str
+    phrase: bool
+    position: int
+
+
+class Not(NamedTuple):
+    node: 'Node'
+
+
+class And(NamedTuple):
+    nodes: List['Node']
+
+
+class Or(NamedTuple):
+    nodes: List['Node']
+
+
+Node = Union[Term, Not, And, Or]
+
+# the fields matched with the full text index, and their column in it
+TEXT_FIELDS: Final[Dict[str, str]] = {
+    'title': 'title',
+    'description': 'description',
+    'author': 'authors',
+    'tag': 'tags',
+    'path': 'path',
+}
+
+SIZE_UNITS: Final[Dict[str, int]] = {
+    '': 1, 'b': 1,
+    'kb': 1000, 'mb': 1000 ** 2, 'gb': 1000 ** 3, 'tb': 1000 ** 4,
+    'kib': 1024, 'mib': 1024 ** 2, 'gib': 1024 ** 3, 'tib': 1024 ** 4,
+}
+
+# the range of the INTEGER columns of SQLite
+_MIN_INTEGER: Final[int] = -2 ** 63
+_MAX_INTEGER: Final[int] = 2 ** 63 - 1
+
+_TOKEN_REGEX: Final = re.compile(r'''
+    \s*(?:
+        (?P<open>\()
+        | (?P<close>\))
+        | (?P<negation>-)(?=[^\s)])
+        | (?:(?P<field>[A-Za-z]+):(?=[^\s)]))?
+          (?:"(?P<phrase>[^"]*)"?|(?P<word>[^\s()"]+))
+    )
+''', re.VERBOSE)
+
+_COMPARISON_REGEX: Final = re.compile(r'^(?P<operator>>=|<=|>|<|=)?(?P<value>.*)$')
+_DURATION_REGEX: Final = re.compile(r'^(?:(?P<hours>\d+)h)?(?:(?P<minutes>\d+)m?)?$')
+_SIZE_REGEX: Final = re.compile(r'^(?P<number>\d+(?:\.\d+)?)(?P<unit>[a-z]*)$')
+_RELEASED_REGEX: Final = re.compile(r'^\d{4}(?:[/-]\d{1,2}(?:[/-]\d{1,2})?)?$')
+
+_Token = Tuple[str, Optional[str], Optional[str], int]  # kind, field, value, position
+
+
+def _tokenize(text: str) -> List[_Token]:
+    tokens: List[_Token] = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_REGEX.match(text, position)
+        if match is None or match.end() == position:
+            if text[position:].strip():
+                raise QueryError(f"Unexpected '{text[position]}'", position)
+            break
+        start = match.start(match.lastgroup) if match.lastgroup else match.start()
+        if match['open']:
+            tokens.append(('(', None, None, start))
+        elif match['close']:
+            tokens.append((')', None, None, start))
+        elif match['negation']:
+            tokens.append(('-', None, None, start))
+        elif match['phrase'] is not None:
+            tokens.append(('phrase', match['field'], match['phrase'], match.start('phrase') - 1))
+        elif match['word'] in ('AND', 'OR', 'NOT') and match['field'] is None:
+            tokens.append((match['word'], None, None, start))
+        else:
+            field_start = match.start('field') if match['field'] else match.start('word')
+            tokens.append(('word', match['field'], match['word'], field_start))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: List[_Token]) -> None:
+        self.__tokens = tokens
+        self.__index = 0
+
+    def parse(self) -> Optional[Node]:
+        node = self.__or() if self.__tokens else None
+        if self.__index < len(self.__tokens):
+            raise QueryError("Unexpected ')'", self.__tokens[self.__index][3])
+        return node
+
+    def __peek(self) -> Optional[str]:
+        return self.__tokens[self.__index][0] if self.__index < len(self.__tokens) else None
+
+    def __or(self) -> Node:
+        nodes = [self.__and()]
+        while self.__peek() == 'OR':
+            self.__index += 1
+            nodes.append(self.__and())
+        return nodes[0] if len(nodes) == 1 else Or(nodes)
+
+    def __and(self) -> Node:
+        nodes = [self.__unary()]
+        while self.__peek() not in (None, ')', 'OR'):
+            if self.__peek() == 'AND':
+                self.__index += 1
+            nodes.append(self.__unary())
+        return nodes[0] if len(nodes) == 1 else And(nodes)
+
+    def __unary(self) -> Node:
+        kind = self.__peek()
+        if kind in ('-', 'NOT'):
+            self.__index += 1
+            return Not(self.__unary())
+        return self.__primary()
+
+    def __primary(self) -> Node:
+        if self.__index >= len(self.__tokens):
+            position = self.__tokens[-1][3] if self.__tokens else 0
+            raise QueryError('Missing a search term', position)
+        kind, field, value, position = self.__tokens[self.__index]
+        self.__index += 1
+        if kind == '(':
+            node = self.__or()
+            # a missing closing parenthesis ends the text, like when typing
+            if self.__peek() == ')':
+                self.__index += 1
+            return node
+        if kind in ('word', 'phrase'):
+            return Term(field.lower() if field else None, value, kind == 'phrase', position)
+        raise QueryError(f"Unexpected '{kind}'", position)
+
+
+def parse(text: str) -> Optional[Node]:
+    """Parse the search text; return None if it's empty, raise QueryError if it's invalid."""
+    return _Parser(_tokenize(text)).parse()
+
+
+def text_terms(node: Optional[Node]) -> List[SearchTerm]:
+    """Return the words and phrases searched on all the text fields, without the negated ones."""
+    if node is None or isinstance(node, Not):
+        return []
+    if isinstance(node, Term):
+        if node.field is not None:
+            return []
+        return search_terms(f'"{node.value}"' if node.phrase else node.value)
+    return [term for child in node.nodes for term in text_terms(child)]
+
+
+def required_text_terms(node: Optional[Node]) -> List[SearchTerm]:
+    """Return the words and phrases without a field that all the matching folders have, not negated nor in an alternative."""
+    if isinstance(node, Term):
+        return text_terms(node)
+    if isinstance(node, And):
+        return [term for child in node.nodes for term in required_text_terms(child)]
+    return []
+
+
+TextCondition = Callable[[SearchTerm], ClauseElement]
+
+
+def full_text_condition(term: SearchTerm) -> ClauseElement:
+    return Folder.id_.in_(matching_folders(term.query))
+
+
+class QueryCompiler:
+    """Compile the nodes of a query into an SQL condition on the joined folders, tutorials and publishers."""
+
+    def __init__(self, text_condition: TextCondition = full_text_condition) -> None:
+        """`text_condition` matches the words and phrases without a field."""
+        self.__text_condition = text_condition
+
+    def compile(self, node: Node) -> ClauseElement:
+        if isinstance(node, Not):
+            return not_(self.compile(node.node))
+        if isinstance(node, And):
+            return and_(*[self.compile(child) for child in node.nodes])
+        if isinstance(node, Or):
+            return or_(*[self.compile(child) for child in node.nodes])
+        return self.__term(node)
+
+    def __term(self, term: Term) -> ClauseElement:
+        value = f'"{term.value}"' if term.phrase else term.value
+        if term.field is None:
+            terms = search_terms(value)
+            # like the tokenizer of the index, ignore the punctuation
+            if not terms:
+                return true()
+            return and_(*[self.__text_condition(search_term) for search_term in terms])
+
+        column = TEXT_FIELDS.get(term.field)
+        if column is not None:
+            terms = search_terms(value)
+            if not terms:
+                raise QueryError(f"Nothing to search in '{term.value}'", term.position)
+            return and_(*[Folder.id_.in_(matching_folders(f'{column} : {search_term.query}')) for search_term in terms])
+
+        compile_field = getattr(self, f'_QueryCompiler__{term.field}', None)
+        if compile_field is None:
+            raise QueryError(f"Unknown field '{term.field}'", term.position)
+        try:
+            return compile_field(term.value)
+        except ValueError as ex:
+            raise QueryError(f"Invalid {term.field} '{term.value}': {ex}", term.position) from ex
+
+    def __publisher(self, value: str) -> ClauseElement:
+        return Publisher.name.like(f'%{value}%')
+
+    def __level(self, value: str) -> ClauseElement:
+        mask = TutorialLevel.UNKNOWN
+        for name in value.lower().split(','):
+            level = TEXT_TO_TUTORIAL_LEVEL.get(name)
+            if level is None or level == TutorialLevel.UNKNOWN:
+                raise ValueError(f'use {", ".join(name for name in TEXT_TO_TUTORIAL_LEVEL if name)}')
+            mask |= level
+        return level_condition(mask)
+
+    def __duration(self, value: str) -> ClauseElement:
+        # in minutes, as written in info.tc
+        return _compare(Tutorial.duration, value, _parse_duration)
+
+    def __rating(self, value: str) -> ClauseElement:
+        return _compare(Tutorial.rating, value, int)
+
+    def __size(self, value: str) -> ClauseElement:
+        return _compare(Folder.size, value, _parse_size)
+
+    def __released(self, value: str) -> ClauseElement:
+        # a year or a month includes all its days
+        if '..' in value:
+            low, high = value.split('..', 1)
+            if not low and not high:
+                raise ValueError('missing the bounds of the range')
+            return released_condition(
+                _parse_released(low)[0] if low else None,
+                _parse_released(high)[1] if high else None,
+            )
+
+        match = _COMPARISON_REGEX.match(value)
+        first, last = _parse_released(match['value'])
+        return released_condition(*{
+            '>': (last + 1, None),
+            '>=': (first, None),
+            '<': (None, first - 1),
+            '<=': (None, last),
+            '=': (first, last),
+        }[match['operator'] or '='])
+
+
+def _compare(column, value: str, convert: Callable[[str], Union[int, float]]) -> ClauseElement:
+    def parse(text: str) -> int:
+        return _integer(convert(text))
+
+    if '..' in value:
+        low, high = value.split('..', 1)
+        if not low and not high:
+            raise ValueError('missing the bounds of the range')
+        return range_condition(column, parse(low) if low else None, parse(high) if high else None)
+
+    match = _COMPARISON_REGEX.match(value)
+    operator = match['operator'] or '='
+    number = parse(match['value'])
+    return {
+        '>': column > number,
+        '>=': column >= number,
+        '<': column < number,
+        '<=': column <= number,
+        '=': column == number,
+    }[operator]
+
+
+def _integer(number: Union[int, float]) -> int:
+    if not _MIN_INTEGER <= number <= _MAX_INTEGER:
+        raise ValueError('the number is too large')
+    return int(number)
+
+
+def _parse_released(value: str) -> Tuple[int, int]:
+    if not _RELEASED_REGEX.match(value):
+        raise ValueError('use yyyy, yyyy/mm or yyyy/mm/dd')
+    return released_range(*map(int, re.split(r'[/-]', value)))
+
+
+def _parse_duration(value: str) -> int:
+    match = _DURATION_REGEX.match(value.lower())
+    if match is None or not value:
+        raise ValueError('use 90, 90m, 2h or 1h30m')
+    return int(match['hours'] or 0) * 60 + int(match['minutes'] or 0)
+
+
+def _parse_size(value: str) -> float:
+    match = _SIZE_REGEX.match(value.lower())
+    if match is None or match['unit'] not in SIZE_UNITS:
+        raise ValueError(f'use a number and one of {", ".join(unit.upper() for unit in SIZE_UNITS if unit)}')
+    # in bytes, rounded down by _integer()
+    return float(match['number']) * SIZE_UNITS[match['unit']]
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
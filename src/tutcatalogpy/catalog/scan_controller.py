@@ -1,14 +1,14 @@
-from typing import List, Tuple
+from typing import List
 
 from PySide2.QtCore import QObject, QThread, Signal
 
+from tutcatalogpy.common.folder_queue import FolderPriority
 from tutcatalogpy.common.scan_config import ScanConfig
 from tutcatalogpy.common.scan_worker import ScanWorker
 
 
 class ScanController(QObject):
     __scan = Signal(ScanConfig.Mode)
-    __update_folder_details = Signal(list)
 
     def __init__(self) -> None:
         super().__init__()
@@ -17,7 +17,6 @@ class ScanController(QObject):
         self.__worker = ScanWorker()
         self.__worker.moveToThread(self.__worker_thread)
         self.__scan.connect(self.__worker.scan)
-        self.__update_folder_details.connect(self.__worker.update_folder_details)
 
     def scan_startup(self) -> None:
         self.__scan.emit(ScanConfig.Mode.STARTUP)
@@ -28,8 +27,12 @@ class ScanController(QObject):
     def scan_extended(self) -> None:
         self.__scan.emit(ScanConfig.Mode.EXTENDED)
 
-    def update_folder_details(self, folders: List[Tuple[str, str, str]]) -> None:
-        self.__update_folder_details.emit(folders)
+    def update_folder_details(self, folder_ids: List[int]) -> None:
+        # doesn't go through the worker thread, which is busy while a scan runs
+        self.__worker.update_folder_details(folder_ids)
+
+    def prioritize_folders(self, folder_ids: List[int], priority: FolderPriority) -> None:
+        self.__worker.prioritize_folders(folder_ids, priority)
 
     def setup(self) -> None:
         self.__worker_thread.start()
@@ -38,6 +41,7 @@ class ScanController(QObject):
         self.__worker.cancel()
         self.__worker_thread.quit()
         self.__worker_thread.wait()
+        self.__worker.shutdown()
 
     @property
     def worker(self) -> ScanWorker:
@@ -0,0 +1,111 @@
+"""Conditions on the indexed fields of the tutorials, shared by the search language and the tags dock."""
+
+import logging
+from datetime import date
+from typing import Final, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, true
+from sqlalchemy.sql import ClauseElement
+
+from tutcatalogpy.common.db.search_flag import SearchValue
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.tutorial_data import TutorialLevel
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# the highest month and day of a date with a missing month or day, see Tutorial.released_on
+_WHOLE_YEAR: Final[int] = 9999
+_WHOLE_MONTH: Final[int] = 99
+
+
+def level_condition(mask: int) -> ClauseElement:
+    """Match the tutorials of all the levels of the mask.
+
+    A bitwise and can't use an index, but there are only eight levels, so
+    the condition lists the levels having the bits of the mask.
+    """
+    levels = [level for level in range(TutorialLevel.ANY + 1) if level & mask == mask]
+    return Tutorial.level.in_(levels)
+
+
+def range_condition(column, low: Optional[int], high: Optional[int]) -> ClauseElement:
+    """Match the values between low and high included; None leaves a side open."""
+    conditions = []
+    if low is not None:
+        conditions.append(column >= low)
+    if high is not None:
+        conditions.append(column <= high)
+    return and_(*conditions) if conditions else true()
+
+
+def released_range(year: int, month: int = 0, day: int = 0) -> Tuple[int, int]:
+    """Return the first and last values of Tutorial.released_on in a year, month or day."""
+    if month == 0:
+        return year * 10000, year * 10000 + _WHOLE_YEAR
+    if day == 0:
+        return year * 10000 + month * 100, year * 10000 + month * 100 + _WHOLE_MONTH
+    value = year * 10000 + month * 100 + day
+    return value, value
+
+
+def released_condition(low: Optional[int], high: Optional[int]) -> ClauseElement:
+    """Match the tutorials released between the Tutorial.released_on values, without the unknown dates."""
+    return range_condition(Tutorial.released_on, max(low or 0, 1), high)
+
+
+class FieldFilter(NamedTuple):
+    """A range of a column of the tutorials, or the bits a column must have."""
+    field: str  # the name of the column of Tutorial
+    low: Optional[int] = None
+    high: Optional[int] = None
+    mask: Optional[int] = None
+
+    def condition(self) -> ClauseElement:
+        column = getattr(Tutorial, self.field)
+        if self.mask is not None:
+            return level_condition(self.mask) if self.field == 'level' else column.op('&')(self.mask) == self.mask
+        return range_condition(column, self.low, self.high)
+
+
+def _released_since(today: date, years: int) -> FieldFilter:
+    # from the start of the month, as many dates don't have a day
+    return FieldFilter('released_on', released_range(today.year - years, today.month)[0])
+
+
+def search_value_filter(value: SearchValue, today: Optional[date] = None) -> Optional[FieldFilter]:
+    """Return the filter of a search flag on the fields of the tutorials, None for the other flags."""
+    today = today or date.today()
+    filters = {
+        SearchValue.LEVEL_BEGINNER: lambda: FieldFilter('level', mask=TutorialLevel.BEGINNER),
+        SearchValue.LEVEL_INTERMEDIATE: lambda: FieldFilter('level', mask=TutorialLevel.INTERMEDIATE),
+        SearchValue.LEVEL_ADVANCED: lambda: FieldFilter('level', mask=TutorialLevel.ADVANCED),
+        SearchValue.RATING_AT_LEAST_1: lambda: FieldFilter('rating', 1),
+        SearchValue.RATING_AT_LEAST_2: lambda: FieldFilter('rating', 2),
+        SearchValue.RATING_AT_LEAST_3: lambda: FieldFilter('rating', 3),
+        SearchValue.RATING_AT_LEAST_4: lambda: FieldFilter('rating', 4),
+        SearchValue.RATING_5: lambda: FieldFilter('rating', 5, 5),
+        SearchValue.RATING_NEGATIVE: lambda: FieldFilter('rating', high=-1),
+        # in minutes; the tutorials without a duration aren't under 1h
+        SearchValue.DURATION_UNDER_1H: lambda: FieldFilter('duration', 1, 59),
+        SearchValue.DURATION_1H_TO_3H: lambda: FieldFilter('duration', 60, 179),
+        SearchValue.DURATION_3H_TO_10H: lambda: FieldFilter('duration', 180, 599),
+        SearchValue.DURATION_OVER_10H: lambda: FieldFilter('duration', 600),
+        SearchValue.RELEASED_LAST_YEAR: lambda: _released_since(today, 1),
+        SearchValue.RELEASED_LAST_3_YEARS: lambda: _released_since(today, 3),
+        SearchValue.RELEASED_LAST_10_YEARS: lambda: _released_since(today, 10),
+        SearchValue.RELEASED_UNKNOWN: lambda: FieldFilter('released_on', 0, 0),
+    }
+    field_filter = filters.get(value)
+    return field_filter() if field_filter is not None else None
+
+
+def search_value_condition(value: SearchValue, today: Optional[date] = None) -> Optional[ClauseElement]:
+    """Return the condition of a search flag on the fields of the tutorials, None for the other flags."""
+    field_filter = search_value_filter(value, today)
+    return field_filter.condition() if field_filter is not None else None
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
@@ -1,8 +1,8 @@
 import logging
 from typing import Final, Optional
 
-from PySide2.QtCore import QMargins, Qt
-from PySide2.QtGui import QPixmap
+from PySide2.QtCore import QMargins, QSize, Qt, Signal
+from PySide2.QtGui import QPixmap, QResizeEvent
 from PySide2.QtWidgets import QGridLayout, QHBoxLayout, QLabel, QWidget
 from PySide2.QtSvg import QSvgWidget
 
@@ -37,6 +37,12 @@ class CoverDock(DockWidget):
     _dock_icon: Final[str] = relative_path(__file__, '../../resources/icons/cover.svg')
     _dock_status_tip: Final[str] = 'Toggle cover dock'
 
+    # the dock grew larger than the shown rendition of the cover
+    larger_cover_needed = Signal()
+
+    __pixmap: Optional[QPixmap] = None
+    __cover_size: Optional[QSize] = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -90,16 +96,33 @@ class CoverDock(DockWidget):
     def __setup_actions(self) -> None:
         self._setup_dock_toolbar()
 
-    def set_cover(self, pixmap: Optional[QPixmap]) -> None:
+    def cover_box(self) -> QSize:
+        """Return the size, in device pixels, that a cover needs to fill the dock."""
+        return self.__cover.size() * self.__cover.devicePixelRatioF()
+
+    def set_cover(self, pixmap: Optional[QPixmap], cover_size: Optional[QSize] = None) -> None:
+        """Show a rendition of the cover; `cover_size` is the size of the original, if the pixmap is a thumbnail."""
+        self.__pixmap = pixmap
+        self.__cover_size = cover_size if cover_size is not None or pixmap is None else pixmap.size()
         self.__cover.setPixmap(pixmap)
         if pixmap is None:
             self.__size_label.setText('')
         else:
-            text = f'{pixmap.width()} x {pixmap.height()}'
-            if pixmap.width() > self.MAX_COVER_WIDTH:
+            size = self.__cover_size
+            text = f'{size.width()} x {size.height()}'
+            if size.width() > self.MAX_COVER_WIDTH:
                 text = '<p style="color:red;">' + text + '</p>'
             self.__size_label.setText(text)
 
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super().resizeEvent(event)
+        pixmap = self.__pixmap
+        if pixmap is None or self.__cover_size is None or pixmap.width() >= self.__cover_size.width():
+            return
+        box = self.cover_box()
+        if pixmap.width() < box.width() and pixmap.height() < box.height():
+            self.larger_cover_needed.emit()
+
     def set_has_cover(self, has_cover: bool) -> None:
         self.__no_cover.setVisible(not has_cover)
 
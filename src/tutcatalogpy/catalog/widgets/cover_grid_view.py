@@ -0,0 +1,155 @@
+import logging
+from typing import Final, Hashable, Optional
+
+from PySide2.QtCore import QModelIndex, QPoint, QRect, QSize, Qt
+from PySide2.QtGui import QGuiApplication, QImage, QPainter
+from PySide2.QtSvg import QSvgRenderer
+from PySide2.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from tutcatalogpy.catalog.models.tutorials_model import Columns, TutorialsModel
+from tutcatalogpy.common.db.cover import Cover
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.files import relative_path
+from tutcatalogpy.common.image_loader import image_loader
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class CoverGridDelegate(QStyledItemDelegate):
+    """Paint a tile with the cover thumbnail and the title of a tutorial.
+
+    The thumbnails are decoded by the image loader; a tile without its
+    thumbnail is painted again when the thumbnail is ready.
+    """
+
+    IMAGE_LOADER_GROUP: Final[str] = 'cover_grid'
+
+    NO_COVER_SVG: Final[str] = relative_path(__file__, '../../resources/icons/no_cover.svg')
+    NO_COVER_ICON_SIZE: Final[int] = 32
+
+    COVER_SIZE: Final[QSize] = QSize(150, 150)
+    MARGIN: Final[int] = 4
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.__no_cover = QSvgRenderer(self.NO_COVER_SVG)
+
+    def tile_size(self, option: QStyleOptionViewItem) -> QSize:
+        text_height = option.fontMetrics.height() * 2
+        return QSize(self.COVER_SIZE.width() + 2 * self.MARGIN, self.COVER_SIZE.height() + text_height + 3 * self.MARGIN)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        # the same for all tiles, so the view doesn't need to ask every row
+        return self.tile_size(option)
+
+    def cover_image(self, folder: Optional[Folder], device_pixel_ratio: float) -> Optional[QImage]:
+        """Return the thumbnail of the folder, or None if it has no cover or is still decoding."""
+        if folder is None or folder.cover is None:
+            return None
+        cover: Cover = folder.cover
+        box = self.COVER_SIZE * device_pixel_ratio
+        rendition = cover.rendition(box.width(), box.height())
+        key: Hashable = (self.IMAGE_LOADER_GROUP, folder.id_, cover.modified, rendition.width)
+        return image_loader.load(self.IMAGE_LOADER_GROUP, key, rendition.blob_hash, box)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        view = option.widget
+        style = view.style() if view is not None else None
+        if style is not None:
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, view)
+
+        rect: QRect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        cover_rect = QRect(rect.topLeft(), self.COVER_SIZE)
+
+        model: TutorialsModel = index.model()
+        folder = model.folder(index.row())
+        if folder is None:
+            return
+
+        device_pixel_ratio = painter.device().devicePixelRatioF()
+        image = self.cover_image(folder, device_pixel_ratio)
+        if image is not None and not image.isNull():
+            size = image.size() / device_pixel_ratio
+            size.scale(self.COVER_SIZE, Qt.KeepAspectRatio)
+            target = QRect(QPoint(0, 0), size)
+            target.moveCenter(cover_rect.center())
+            painter.drawImage(target, image)
+        elif folder.cover is None:
+            icon_rect = QRect(0, 0, self.NO_COVER_ICON_SIZE, self.NO_COVER_ICON_SIZE)
+            icon_rect.moveCenter(cover_rect.center())
+            self.__no_cover.render(painter, icon_rect)
+
+        text_rect = QRect(rect.left(), cover_rect.bottom() + self.MARGIN, rect.width(), rect.bottom() - cover_rect.bottom() - self.MARGIN)
+        text = folder.tutorial.title or folder.folder_name
+        text = option.fontMetrics.elidedText(text, Qt.ElideRight, text_rect.width() * 2 - option.fontMetrics.averageCharWidth())
+        palette = view.palette() if view is not None else QGuiApplication.palette()
+        if option.state & QStyle.State_Selected:
+            painter.setPen(palette.highlightedText().color())
+        else:
+            painter.setPen(palette.text().color())
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap, text)
+
+
+class CoverGridView(QListView):
+    """Show the tutorials as a grid of covers.
+
+    Only the visible tiles are painted, and the model fetches the rows by
+    pages, so large catalogs don't load all the covers into memory.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.__delegate = CoverGridDelegate(self)
+        self.setItemDelegate(self.__delegate)
+
+        # a static, wrapping list lays out uniform tiles without asking every row for its size
+        self.setViewMode(QListView.ListMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setGridSize(self.__delegate.tile_size(self.viewOptions()))
+
+        image_loader.loaded.connect(self.__on_image_loaded)
+
+    def setModel(self, model: TutorialsModel) -> None:
+        super().setModel(model)
+        self.setModelColumn(Columns.TITLE.value)
+
+    def visible_rows(self) -> range:
+        model = self.model()
+        if model is None:
+            return range(0)
+        grid = self.gridSize()
+        columns = max(1, self.viewport().width() // grid.width())
+        first_line = self.verticalOffset() // grid.height()
+        last_line = (self.verticalOffset() + self.viewport().height() - 1) // grid.height()
+        first_row = first_line * columns
+        last_row = min(model.rowCount(), (last_line + 1) * columns)
+        return range(first_row, last_row)
+
+    def scrolling_stopped(self) -> None:
+        """Forget the covers that were scrolled past; load the visible ones, then the next screen."""
+        image_loader.cancel(CoverGridDelegate.IMAGE_LOADER_GROUP)
+        model: TutorialsModel = self.model()
+        if model is None:
+            return
+        visible = self.visible_rows()
+        device_pixel_ratio = self.viewport().devicePixelRatioF()
+        for row in range(visible.start, min(model.rowCount(), visible.stop + len(visible))):
+            self.__delegate.cover_image(model.folder(row), device_pixel_ratio)
+
+    def __on_image_loaded(self, group: str, key: Hashable, image: QImage) -> None:
+        if group == CoverGridDelegate.IMAGE_LOADER_GROUP and self.isVisible():
+            self.viewport().update()
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
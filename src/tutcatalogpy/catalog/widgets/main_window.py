@@ -1,15 +1,16 @@
 import logging
 from pathlib import Path
-from typing import Final, List, Optional
+from typing import Final, Hashable, List, Optional, Union
 
 from PySide2.QtCore import QModelIndex, QSize, QTimer, Qt
-from PySide2.QtGui import QCloseEvent, QIcon, QKeySequence, QPixmap
+from PySide2.QtGui import QCloseEvent, QIcon, QImage, QKeySequence, QPixmap
 from PySide2.QtWidgets import QAction, QFileDialog, QFrame, QLabel, QMenu, QMenuBar, QToolBar
 
 from tutcatalogpy.catalog.config import config
 from tutcatalogpy.catalog.models.disks_model import disks_model
-from tutcatalogpy.catalog.models.tags_model import UNKNOWN_AUTHOR_LABEL, UNKNOWN_PUBLISHER_LABEL, tags_model
+from tutcatalogpy.catalog.models.tags_model import NO_NAME_LABEL, UNKNOWN_AUTHOR_LABEL, UNKNOWN_PUBLISHER_LABEL, tags_model
 from tutcatalogpy.catalog.models.tutorials_model import tutorials_model
+from tutcatalogpy.catalog.neighbor_prefetcher import NeighborPrefetcher
 from tutcatalogpy.catalog.scan_controller import scan_controller
 from tutcatalogpy.catalog.widgets.cover_dock import CoverDock
 from tutcatalogpy.catalog.widgets.disks_dock import DisksDock
@@ -23,10 +24,16 @@ from tutcatalogpy.common.db.cover import Cover
 from tutcatalogpy.common.db.dal import dal
 from tutcatalogpy.common.db.disk import Disk
 from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.learning_path import LearningPath
 from tutcatalogpy.common.db.publisher import Publisher
 from tutcatalogpy.common.db.search_flag import Search, SearchFlag, SearchValue
+from tutcatalogpy.common.db.tag import Tag
+from tutcatalogpy.common.db.thumbnail import Thumbnail
 from tutcatalogpy.common.desktop_services import open_path
+from tutcatalogpy.common.file_listing import decode_file_listing
+from tutcatalogpy.common.folder_queue import FolderPriority
 from tutcatalogpy.common.files import relative_path
+from tutcatalogpy.common.image_loader import image_loader
 from tutcatalogpy.common.recent_files import RecentFiles
 from tutcatalogpy.common.widgets.file_browser_dock import FileBrowserDock
 from tutcatalogpy.common.widgets.info_tc_dock import InfoTcDock
@@ -73,8 +80,22 @@ class MainWindow(CommonMainWindow):
     OPEN_FOLDER_TIP: Final[str] = 'Open folder in external file browser'
     OPEN_TC_ICON: Final[str] = relative_path(__file__, '../../resources/icons/open_info_tc.svg')
     OPEN_TC_TIP: Final[str] = 'Open info.tc in external viewer'
+    UPDATE_FOLDER_ICON: Final[str] = relative_path(__file__, '../../resources/icons/scan.svg')
+    UPDATE_FOLDER_TIP: Final[str] = 'Update details of the selected folders'
+
+    COVER_LOADER_GROUP: Final[str] = 'cover_dock'
+    COVER_LOADER_PREFETCH_GROUP: Final[str] = 'cover_dock_prefetch'
+
+    # the description, images and files are shown when the selection stops changing
+    SELECTION_SETTLE_MSEC: Final[int] = 150
 
     __current_folder_id: Optional[int] = None
+    # loaded once per selection and shared by the docks and the actions
+    __current_folder: Optional[Folder] = None
+    # image loader key of the cover shown in the cover dock
+    __cover_key: Optional[Hashable] = None
+    __cover_size: Optional[QSize] = None
+    __selected_folder_ids: List[int] = []
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -88,6 +109,11 @@ class MainWindow(CommonMainWindow):
         tutorials_model.init_icons()
 
         self.__recent_files = RecentFiles(self)
+        self.__prefetcher = NeighborPrefetcher(self)
+
+        self.__selection_settled_timer = QTimer(self)
+        self.__selection_settled_timer.setSingleShot(True)
+        self.__selection_settled_timer.setInterval(self.SELECTION_SETTLE_MSEC)
 
         self._setup_statusbar()
         self._setup_docks()
@@ -182,6 +208,12 @@ class MainWindow(CommonMainWindow):
         self.__open_tc_action.setStatusTip(self.OPEN_TC_TIP)
         self.__open_tc_action.triggered.connect(self.__on_open_tc_triggered)
 
+        self.__update_folder_action = QAction()
+        self.__update_folder_action.setIcon(QIcon(self.UPDATE_FOLDER_ICON))
+        self.__update_folder_action.setStatusTip(self.UPDATE_FOLDER_TIP)
+        self.__update_folder_action.setEnabled(False)
+        self.__update_folder_action.triggered.connect(self.__on_update_folder_triggered)
+
         self.__scan_actions = [
             self.__scan_startup_action,
             self.__scan_normal_action,
@@ -192,6 +224,7 @@ class MainWindow(CommonMainWindow):
             self.__open_parent_folder_action,
             self.__open_folder_action,
             self.__open_tc_action,
+            self.__update_folder_action,
         ]
 
     def __setup_menus(self) -> None:
@@ -249,21 +282,29 @@ class MainWindow(CommonMainWindow):
 
     def __setup_connections(self) -> None:
         self.__search_dock.search.connect(lambda: tutorials_model.search(self.__search_dock))
+        self.__search_dock.show_sql.connect(tutorials_model.log_sql)
         self.__search_dock.search_tags.tag_clicked.connect(tags_model.clear_search_tag)
         disks_model.disk_checked_changed.connect(lambda: tutorials_model.search(self.__search_dock, True))
         tags_model.search_changed.connect(self.__on_tags_model_search_changed)
 
         self.__tutorials_dock.selection_changed.connect(self.__on_tutorials_dock_selection_changed)
+        self.__tutorials_dock.visible_changed.connect(self.__on_tutorials_dock_visible_changed)
         self.__recent_files.triggered.connect(self.__load_config)
         self.__scan_dialog.finished.connect(self.__on_scan_dialog_finished)
 
         self.__info_tc_dock.tag_clicked.connect(tags_model.include_search_tag)
+        self.__cover_dock.larger_cover_needed.connect(self.__on_cover_dock_larger_cover_needed)
+        self.__selection_settled_timer.timeout.connect(self.__on_selection_settled_timer_timeout)
+        self.__prefetcher.add_handler(self.__info_tc_dock.prefetch)
+        self.__prefetcher.add_handler(self.__prefetch_cover)
+        image_loader.loaded.connect(self.__on_image_loaded)
 
         config.loaded.connect(self.__on_config_loaded)
 
         scan_worker = scan_controller.worker
         scan_worker.scan_started.connect(self.__on_scan_worker_scan_started)
         scan_worker.scan_finished.connect(self.__on_scan_worker_scan_finished)
+        scan_worker.folders_changed.connect(tutorials_model.update_folders)
 
         tutorials_model.summary_changed.connect(self.__on_tutorials_model_summary_changed)
 
@@ -276,6 +317,7 @@ class MainWindow(CommonMainWindow):
         self.__scan_dialog.set_scan_worker(scan_controller.worker)
 
     def __refresh_models(self) -> None:
+        self.__prefetcher.clear()
         disks_model.refresh()
         tutorials_model.refresh()
         tags_model.refresh()
@@ -298,6 +340,7 @@ class MainWindow(CommonMainWindow):
 
         self.__scan_dialog.reset()
         self.__scan_dialog.show()
+        self.__prioritize_visible_folders()
         QTimer.singleShot(500, self.__check_scan_finished_too_quickly)
 
     def __on_scan_worker_scan_finished(self) -> None:
@@ -335,28 +378,56 @@ class MainWindow(CommonMainWindow):
         else:
             self.setWindowTitle(self.WINDOW_TITLE)
 
+        tutorials_model.set_snapshot_enabled(config.in_memory)
         self.__refresh_models()
 
     def __on_tutorials_dock_selection_changed(self, tutorials: List[int]) -> None:
         self.__selected_one_folder = (len(tutorials) == 1)
         self.__current_folder_id = tutorials[0] if self.__selected_one_folder else None
-        self.__update_ui_with_current_folder()
+        self.__selected_folder_ids = tutorials
+        self.__update_folder_action.setEnabled(len(tutorials) > 0)
+        # e.g. holding an arrow key: only show what is cheap until the selection settles
+        self.__update_ui_with_current_folder(details=False)
+        image_loader.cancel(self.COVER_LOADER_PREFETCH_GROUP)
+        image_loader.cancel(InfoTcDock.IMAGE_LOADER_PREFETCH_GROUP)
+        self.__prefetcher.prefetch([])
+        self.__selection_settled_timer.start()
+        if scan_controller.worker.scanning:
+            scan_controller.prioritize_folders(tutorials, FolderPriority.SELECTED)
+
+    def __on_selection_settled_timer_timeout(self) -> None:
+        self.__update_ui_details()
+        # the next selection is likely a neighbor of this one
+        neighbors = self.__tutorials_dock.neighbor_folders(NeighborPrefetcher.DISTANCE) if self.__selected_one_folder else []
+        self.__prefetcher.prefetch(neighbors)
+
+    def __on_tutorials_dock_visible_changed(self) -> None:
+        # only useful while a scan is running; the hints are dropped when it finishes
+        if scan_controller.worker.scanning:
+            self.__prioritize_visible_folders()
+
+    def __prioritize_visible_folders(self) -> None:
+        scan_controller.prioritize_folders(self.__selected_folder_ids, FolderPriority.SELECTED)
+        scan_controller.prioritize_folders(self.__tutorials_dock.visible_folders(), FolderPriority.VISIBLE)
+
+    def __on_update_folder_triggered(self) -> None:
+        scan_controller.update_folder_details(self.__selected_folder_ids)
 
     def __on_open_folder_triggered(self) -> None:
-        folder: Optional[Folder] = self.__get_current_folder(self.__current_folder_id)
+        folder: Optional[Folder] = self.__current_folder
         if folder is not None:
             path = folder.path()
             if path.exists():
                 open_path(path)
 
     def __on_open_parent_folder_triggered(self) -> None:
-        folder: Optional[Folder] = self.__get_current_folder(self.__current_folder_id)
+        folder: Optional[Folder] = self.__current_folder
         if folder is not None:
             path = folder.path()
             open_path(path, in_parent=True)
 
     def __on_open_tc_triggered(self) -> None:
-        folder: Optional[Folder] = self.__get_current_folder(self.__current_folder_id)
+        folder: Optional[Folder] = self.__current_folder
         if folder is not None:
             path = folder.path()
             if path.exists():
@@ -367,56 +438,113 @@ class MainWindow(CommonMainWindow):
                         f.write('\n')
                 open_path(tc_path)
 
-    def __update_ui_with_current_folder(self) -> None:
-        folder_id = self.__current_folder_id
-        folder = self.__get_current_folder(folder_id)
+    def __update_ui_with_current_folder(self, details: bool = True) -> None:
+        """Show the current folder; without `details`, only the fields that are quick to show."""
+        folder = self.__load_current_folder(self.__current_folder_id)
+        self.__current_folder = folder
         online = (folder is not None and folder.disk.online)
 
-        self.__info_tc_dock.set_folder(folder_id)
-        self.__update_cover_dock(folder_id)
-        self.__update_file_browser_dock(folder_id)
+        self.__info_tc_dock.set_folder(folder, details=False)
+        self.__update_cover_dock(folder, load=False)
+        if details:
+            self.__selection_settled_timer.stop()
+            self.__update_ui_details()
+        else:
+            # don't show the files of the previous folder until the new ones are listed
+            self.__file_browser_dock.set_path(None)
+            self.__file_browser_dock.set_offline(False)
 
-        selected_one_folder = (folder_id is not None)
+        selected_one_folder = (folder is not None)
         self.__open_parent_folder_action.setEnabled(selected_one_folder and online)
         self.__open_folder_action.setEnabled(selected_one_folder and online)
         self.__open_tc_action.setEnabled(selected_one_folder and online)
 
-    def __get_current_folder(self, folder_id: Optional[int]) -> Optional[Folder]:
-        session = dal.session
-        if session is not None and folder_id is not None:
-            return session.query(Folder).filter(Folder.id_ == folder_id).first()
+    def __update_ui_details(self) -> None:
+        folder = self.__current_folder
+        self.__info_tc_dock.show_details()
+        if self.__cover_key is not None and image_loader.cache.get(self.__cover_key) is None:
+            self.__update_cover_dock(folder)
+        self.__update_file_browser_dock(folder)
+
+    def __load_current_folder(self, folder_id: Optional[int]) -> Optional[Folder]:
+        if folder_id is not None:
+            return self.__prefetcher.get(folder_id)
         return None
 
-    def __update_file_browser_dock(self, folder_id: Optional[int]) -> None:
+    def __update_file_browser_dock(self, folder: Optional[Folder]) -> None:
         path: Optional[Path] = None
         offline = False
-        folder: Optional[Folder] = self.__get_current_folder(folder_id)
         if folder is not None:
             disk: Disk = folder.disk
             offline = not disk.online
             path = folder.path()
 
-        self.__file_browser_dock.set_path(path)
+        # don't touch offline disks: they might be unresponsive network mounts
+        self.__file_browser_dock.set_path(None if offline else path)
         self.__file_browser_dock.set_offline(offline and path is not None)
-
-    def __update_cover_dock(self, folder_id: Optional[int]) -> None:
-        session = dal.session
-        pixmap: Optional[QPixmap] = None
+        if offline and folder.file_listing is not None:
+            try:
+                self.__file_browser_dock.set_listing(decode_file_listing(folder.file_listing))
+            except ValueError as ex:
+                log.warning("Couldn't show the files of %s: %s", path, ex)
+
+    def __update_cover_dock(self, folder: Optional[Folder], load: bool = True) -> None:
+        """Show the cover of the folder; without `load`, only if it is already decoded."""
+        image_loader.cancel(self.COVER_LOADER_GROUP)
+        self.__cover_key = None
+        self.__cover_size = None
+        image: Optional[QImage] = None
+        has_cover = False
         offline = False
         file_format: Cover.FileFormat = Cover.FileFormat.NONE
-        if session is not None and folder_id is not None:
-            cover = session.query(Cover).join(Folder, Folder.cover_id == Cover.id_).filter(Folder.id_ == folder_id).first()
+        if folder is not None:
+            cover: Optional[Cover] = folder.cover
             if cover is not None:
-                if cover.data is not None:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(cover.data)
+                box = self.__cover_dock.cover_box()
+                rendition = cover.rendition(box.width(), box.height())
+                if rendition.blob_hash is not None:
+                    has_cover = True
+                    if cover.width:
+                        self.__cover_size = QSize(cover.width, cover.height)
                     file_format = Cover.FileFormat(cover.file_format)
-                offline = not cover.folder.disk.online
-
-        self.__cover_dock.set_cover(pixmap)
-        self.__cover_dock.set_has_cover(pixmap is not None or folder_id is None)
+                    self.__cover_key = self.__cover_loader_key(folder, rendition)
+                    if load:
+                        # decoded in the background unless cached; see __on_image_loaded()
+                        image = image_loader.load(self.COVER_LOADER_GROUP, self.__cover_key, rendition.blob_hash, box)
+                    else:
+                        image = image_loader.cache.get(self.__cover_key)
+                offline = not folder.disk.online
+
+        self.__set_cover_image(image)
+        self.__cover_dock.set_has_cover(has_cover or folder is None)
         self.__cover_dock.set_cover_format(file_format)
-        self.__cover_dock.set_offline(offline and folder_id is not None)
+        self.__cover_dock.set_offline(offline)
+
+    def __prefetch_cover(self, folder: Folder) -> None:
+        cover: Optional[Cover] = folder.cover
+        if cover is not None:
+            box = self.__cover_dock.cover_box()
+            rendition = cover.rendition(box.width(), box.height())
+            key = self.__cover_loader_key(folder, rendition)
+            image_loader.load(self.COVER_LOADER_PREFETCH_GROUP, key, rendition.blob_hash, box)
+
+    @staticmethod
+    def __cover_loader_key(folder: Folder, rendition: Union[Cover, Thumbnail]) -> Hashable:
+        return folder.id_, folder.cover.modified, rendition.width
+
+    def __set_cover_image(self, image: Optional[QImage]) -> None:
+        pixmap = QPixmap.fromImage(image) if image is not None and not image.isNull() else None
+        self.__cover_dock.set_cover(pixmap, self.__cover_size)
+
+    def __on_image_loaded(self, group: str, key: Hashable, image: QImage) -> None:
+        if group == self.COVER_LOADER_GROUP and key == self.__cover_key:
+            self.__set_cover_image(image)
+
+    def __on_cover_dock_larger_cover_needed(self) -> None:
+        # the cached cover was decoded for a smaller dock
+        if self.__cover_key is not None:
+            image_loader.cache.remove(self.__cover_key)
+        self.__update_cover_dock(self.__current_folder)
 
     def show(self) -> None:
         super().show()
@@ -461,6 +589,20 @@ class MainWindow(CommonMainWindow):
                 name = ('+' if publisher.search == Search.INCLUDE else '-') + (publisher.name if publisher.name else UNKNOWN_PUBLISHER_LABEL)
                 tags_view.add_publisher(name, publisher.id_)
 
+            tag: Tag
+            group_label = 'tags:'
+            for tag in dal.session.query(Tag).filter(Tag.search != Search.IGNORED).order_by(Tag.name.collate('NOCASE')):
+                add_label()
+                name = ('+' if tag.search == Search.INCLUDE else '-') + (tag.name if tag.name else NO_NAME_LABEL)
+                tags_view.add_tutorial_tag(name, tag.id_)
+
+            learning_path: LearningPath
+            group_label = 'learning paths:'
+            for learning_path in dal.session.query(LearningPath).filter(LearningPath.search != Search.IGNORED).order_by(LearningPath.name.collate('NOCASE')):
+                add_label()
+                name = ('+' if learning_path.search == Search.INCLUDE else '-') + (learning_path.name if learning_path.name else NO_NAME_LABEL)
+                tags_view.add_tutorial_learning_path(name, learning_path.id_)
+
             search_flag: SearchFlag
             group_label = 'flags:'
             for search_flag in dal.session.query(SearchFlag).filter(SearchFlag.search != Search.IGNORED):
@@ -3,7 +3,7 @@ from typing import Final, List, Tuple
 
 from PySide2.QtCore import Qt
 from PySide2.QtGui import QPixmap
-from PySide2.QtWidgets import QCheckBox, QGridLayout, QLabel, QVBoxLayout, QWidget
+from PySide2.QtWidgets import QCheckBox, QComboBox, QFormLayout, QGridLayout, QLabel, QSpinBox, QVBoxLayout, QWidget
 
 from tutcatalogpy.common.files import relative_path
 from tutcatalogpy.common.scan_config import ScanConfig, scan_config
@@ -25,6 +25,13 @@ class ScanConfigDock(DockWidget):
         ('Extended scan', relative_path(__file__, '../../resources/icons/scan_more.svg')),
     ]
 
+    THROTTLE_PRESETS: Final[List[Tuple[str, ScanConfig.ThrottlePreset]]] = [
+        ('Custom', ScanConfig.ThrottlePreset.CUSTOM),
+        ('Idle priority', ScanConfig.ThrottlePreset.IDLE),
+    ]
+
+    MEGABYTE: Final[int] = 1024 * 1024
+
     _dock_icon: Final[str] = relative_path(__file__, '../../resources/icons/scan_config.svg')
     _dock_status_tip: Final[str] = 'Toggle scan config dock'
 
@@ -75,8 +82,53 @@ class ScanConfigDock(DockWidget):
                 checkbox.toggled.connect(self.__on_checkbox_toggled)
                 grid.addWidget(checkbox, row_index + 1, column_index + 1, Qt.AlignHCenter)
 
+        form = QFormLayout()
+        layout.addLayout(form)
+
+        form.addRow(QLabel('<b>Throttle I/O</b>'))
+
+        self.__throttle_preset = QComboBox()
+        for text, preset in self.THROTTLE_PRESETS:
+            self.__throttle_preset.addItem(text, preset)
+        self.__throttle_preset.setCurrentIndex(self.__throttle_preset.findData(scan_config.throttle_preset))
+        self.__throttle_preset.currentIndexChanged.connect(self.__on_throttle_changed)
+        form.addRow('Preset:', self.__throttle_preset)
+
+        self.__throttle_bytes = QSpinBox()
+        self.__throttle_bytes.setRange(0, 10_000)
+        self.__throttle_bytes.setSuffix(' MB/s')
+        self.__throttle_bytes.setSpecialValueText('Unlimited')
+        self.__throttle_bytes.setValue(scan_config.throttle_bytes_per_sec // self.MEGABYTE)
+        self.__throttle_bytes.valueChanged.connect(self.__on_throttle_changed)
+        form.addRow('Read:', self.__throttle_bytes)
+
+        self.__throttle_ops = QSpinBox()
+        self.__throttle_ops.setRange(0, 100_000)
+        self.__throttle_ops.setSuffix(' ops/s')
+        self.__throttle_ops.setSpecialValueText('Unlimited')
+        self.__throttle_ops.setValue(scan_config.throttle_ops_per_sec)
+        self.__throttle_ops.valueChanged.connect(self.__on_throttle_changed)
+        form.addRow('Operations:', self.__throttle_ops)
+
+        self.__update_throttle_widgets()
+
         layout.addStretch()
 
+    def __update_throttle_widgets(self) -> None:
+        custom = scan_config.throttle_preset == ScanConfig.ThrottlePreset.CUSTOM
+        self.__throttle_bytes.setEnabled(custom)
+        self.__throttle_ops.setEnabled(custom)
+
+    def __on_throttle_changed(self) -> None:
+        scan_config.throttle_preset = ScanConfig.ThrottlePreset(self.__throttle_preset.currentData())
+        scan_config.throttle_bytes_per_sec = self.__throttle_bytes.value() * self.MEGABYTE
+        scan_config.throttle_ops_per_sec = self.__throttle_ops.value()
+        self.__update_throttle_widgets()
+        log.info(
+            'throttle set to %s, %s bytes/s, %s ops/s',
+            scan_config.throttle_preset.name, scan_config.throttle_bytes_per_sec, scan_config.throttle_ops_per_sec
+        )
+
     def __on_checkbox_toggled(self) -> None:
         checkbox: ScanConfigDock.CheckBox = self.sender()
         scan_config.option[checkbox.mode] ^= checkbox.option
@@ -55,6 +55,11 @@ class ScanDialog(QDialog):
         grid.addWidget(self.__elapsed_time, row, 1)
         row += 1
 
+        self.__io_rate = QLabel()
+        grid.addWidget(QLabel('I/O:'), row, 0)
+        grid.addWidget(self.__io_rate, row, 1)
+        row += 1
+
         self.__folder_progress = QProgressBar()
         self.__folder_progress.setEnabled(False)
         self.__folder_progress.setMaximum(0)
@@ -101,6 +106,7 @@ class ScanDialog(QDialog):
         self.__tutorial_path.set_text(progress.folder_parent)
         self.__tutorial_name.set_text(progress.folder_name)
         self.__elapsed_time.setText(self.__scan_worker.elapsed_time_str)
+        self.__io_rate.setText(progress.io_rate)
 
         if progress.folder_count > 0:
             self.__folder_progress.setMaximum(progress.folder_count)
@@ -115,6 +121,7 @@ class ScanDialog(QDialog):
         self.__tutorial_path.clear()
         self.__tutorial_name.clear()
         self.__elapsed_time.clear()
+        self.__io_rate.clear()
         self.__folder_progress.setEnabled(False)
         self.__folder_progress.reset()
 
@@ -3,7 +3,7 @@ from typing import Final
 
 from PySide2.QtCore import QSettings, Signal
 from PySide2.QtGui import QIcon
-from PySide2.QtWidgets import QCheckBox, QHBoxLayout, QLineEdit, QSizePolicy, QToolButton, QVBoxLayout, QWidget
+from PySide2.QtWidgets import QAction, QCheckBox, QHBoxLayout, QLabel, QLineEdit, QSizePolicy, QSpinBox, QToolButton, QVBoxLayout, QWidget
 
 from tutcatalogpy.common.files import relative_path
 from tutcatalogpy.common.widgets.dock_widget import DockWidget
@@ -17,18 +17,37 @@ class SearchDock(DockWidget):
     SETTINGS_GROUP: Final[str] = 'search_dock'
     SETTINGS_SEARCH_TEXT: Final[str] = 'search_text'
     SETTINGS_ONLY_SHOW_CHECKED_DISKS: Final[str] = 'only_show_checked_disks'
+    SETTINGS_SEARCH_FILES: Final[str] = 'search_files'
+    SETTINGS_FUZZY: Final[str] = 'fuzzy'
+    SETTINGS_MIN_DURATION: Final[str] = 'min_duration'
+    SETTINGS_MAX_DURATION: Final[str] = 'max_duration'
 
     DOCK_TITLE: Final[str] = 'Search'
     DOCK_OBJECT_NAME: Final[str] = 'search_dock'
 
     SEARCH_ICON: Final[str] = relative_path(__file__, '../../resources/icons/search.svg')
+    SHOW_SQL_ICON: Final[str] = relative_path(__file__, '../../resources/icons/log.svg')
+
+    SEARCH_TIP: Final[str] = (
+        'Search the titles, descriptions, authors, tags and paths; quote words to search a phrase, '
+        'e.g. author:"raul perez" tag:rigging level:beginner duration:>2h released:2019..2021 size:<10GB rating:>=3 -zbrush'
+    )
+    SHOW_SQL_TIP: Final[str] = 'Show the SQL of the search in the log'
 
     ONLY_SHOW_CHECKED_DISKS_TEXT: Final[str] = 'Only show folders from checked disks'
+    SEARCH_FILES_TEXT: Final[str] = 'Also search the names of the files'
+    SEARCH_FILES_TIP: Final[str] = 'Search the start of the names of the files listed by the last scan of the folders'
+    FUZZY_TEXT: Final[str] = 'Tolerate typos and accents'
+    FUZZY_TIP: Final[str] = 'Find the titles, authors and folder names similar to the search text'
+    DURATION_TEXT: Final[str] = 'Video duration:'
+    DURATION_TIP: Final[str] = 'Only show the tutorials whose videos last that many minutes, as measured by the last scan'
+    MAX_DURATION_MINUTES: Final[int] = 100 * 60
 
     _dock_icon: Final[str] = relative_path(__file__, '../../resources/icons/search.svg')
     _dock_status_tip: Final[str] = 'Toggle search dock'
 
     search = Signal()
+    show_sql = Signal()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -47,6 +66,24 @@ class SearchDock(DockWidget):
     def only_show_checked_disks(self) -> bool:
         return self.__only_show_checked_disks.isChecked()
 
+    @property
+    def search_files(self) -> bool:
+        return self.__search_files.isChecked()
+
+    @property
+    def fuzzy(self) -> bool:
+        return self.__fuzzy.isChecked()
+
+    @property
+    def min_duration(self) -> int:
+        """The minimum video duration in minutes, 0 for any."""
+        return self.__min_duration.value()
+
+    @property
+    def max_duration(self) -> int:
+        """The maximum video duration in minutes, 0 for any."""
+        return self.__max_duration.value()
+
     def __setup_widgets(self) -> None:
         widget = QWidget()
         self.setWidget(widget)
@@ -61,6 +98,7 @@ class SearchDock(DockWidget):
         self.__search_edit = QLineEdit()
         search_layout.addWidget(self.__search_edit)
         self.__search_edit.setClearButtonEnabled(True)
+        self.__search_edit.setStatusTip(self.SEARCH_TIP)
         self.__search_edit.editingFinished.connect(self.search)
         self.__search_edit.textChanged.connect(self.__on_search_edit_text_changed)
 
@@ -73,6 +111,26 @@ class SearchDock(DockWidget):
         layout.addWidget(self.__only_show_checked_disks)
         self.__only_show_checked_disks.toggled.connect(self.search)
 
+        self.__search_files = QCheckBox(self.SEARCH_FILES_TEXT)
+        layout.addWidget(self.__search_files)
+        self.__search_files.setStatusTip(self.SEARCH_FILES_TIP)
+        self.__search_files.toggled.connect(self.search)
+
+        self.__fuzzy = QCheckBox(self.FUZZY_TEXT)
+        layout.addWidget(self.__fuzzy)
+        self.__fuzzy.setStatusTip(self.FUZZY_TIP)
+        self.__fuzzy.toggled.connect(self.search)
+
+        duration_layout = QHBoxLayout()
+        layout.addLayout(duration_layout)
+        duration_layout.setMargin(0)
+        duration_layout.addWidget(QLabel(self.DURATION_TEXT))
+        self.__min_duration = self.__create_duration_spin_box('at least any')
+        duration_layout.addWidget(self.__min_duration)
+        self.__max_duration = self.__create_duration_spin_box('at most any')
+        duration_layout.addWidget(self.__max_duration)
+        duration_layout.addStretch(1)
+
         self.__search_tags = TagsFlowView()
         layout.addWidget(self.__search_tags)
 
@@ -81,12 +139,29 @@ class SearchDock(DockWidget):
         policy = QSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.Fixed)
         widget.setSizePolicy(policy)
 
+    def __create_duration_spin_box(self, any_text: str) -> QSpinBox:
+        spin_box = QSpinBox()
+        spin_box.setRange(0, self.MAX_DURATION_MINUTES)
+        spin_box.setSingleStep(15)
+        spin_box.setSpecialValueText(any_text)
+        spin_box.setSuffix(' min')
+        spin_box.setStatusTip(self.DURATION_TIP)
+        spin_box.editingFinished.connect(self.search)
+        return spin_box
+
     @property
     def search_tags(self) -> TagsFlowView:
         return self.__search_tags
 
     def __setup_actions(self) -> None:
-        self._setup_dock_toolbar()
+        self.__show_sql = QAction()
+        self.__show_sql.setIcon(QIcon(self.SHOW_SQL_ICON))
+        self.__show_sql.setStatusTip(self.SHOW_SQL_TIP)
+        self.__show_sql.triggered.connect(self.show_sql)
+
+        self._setup_dock_toolbar([
+            self.__show_sql
+        ])
 
     def __on_search_edit_text_changed(self) -> None:
         if len(self.text) == 0:
@@ -96,17 +171,29 @@ class SearchDock(DockWidget):
         settings.beginGroup(self.SETTINGS_GROUP)
         settings.setValue(self.SETTINGS_SEARCH_TEXT, self.__search_edit.text())
         settings.setValue(self.SETTINGS_ONLY_SHOW_CHECKED_DISKS, self.__only_show_checked_disks.isChecked())
+        settings.setValue(self.SETTINGS_SEARCH_FILES, self.__search_files.isChecked())
+        settings.setValue(self.SETTINGS_FUZZY, self.__fuzzy.isChecked())
+        settings.setValue(self.SETTINGS_MIN_DURATION, self.__min_duration.value())
+        settings.setValue(self.SETTINGS_MAX_DURATION, self.__max_duration.value())
         settings.endGroup()
 
     def load_settings(self, settings: QSettings):
         settings.beginGroup(self.SETTINGS_GROUP)
         self.__search_edit.setText(settings.value(self.SETTINGS_SEARCH_TEXT, ''))
         self.__only_show_checked_disks.setChecked(settings.value(self.SETTINGS_ONLY_SHOW_CHECKED_DISKS, False, type=bool))
+        self.__search_files.setChecked(settings.value(self.SETTINGS_SEARCH_FILES, False, type=bool))
+        self.__fuzzy.setChecked(settings.value(self.SETTINGS_FUZZY, False, type=bool))
+        self.__min_duration.setValue(settings.value(self.SETTINGS_MIN_DURATION, 0, type=int))
+        self.__max_duration.setValue(settings.value(self.SETTINGS_MAX_DURATION, 0, type=int))
         settings.endGroup()
         self.search.emit()
 
     def clear(self):
         self.__only_show_checked_disks.setChecked(False)
+        self.__search_files.setChecked(False)
+        self.__fuzzy.setChecked(False)
+        self.__min_duration.setValue(0)
+        self.__max_duration.setValue(0)
         self.__search_edit.clear()
         self.__search_tags.clear()
 
@@ -1,10 +1,12 @@
 import logging
-from typing import Final
+from typing import Final, List
 
-from PySide2.QtCore import QByteArray, QItemSelection, QModelIndex, QSettings, Qt, Signal
-from PySide2.QtWidgets import QAction, QMenu, QTableView
+from PySide2.QtCore import QByteArray, QItemSelection, QModelIndex, QSettings, QTimer, Qt, Signal
+from PySide2.QtGui import QIcon
+from PySide2.QtWidgets import QAction, QMenu, QStackedWidget, QTableView
 
 from tutcatalogpy.catalog.models.tutorials_model import TutorialsModel, Columns
+from tutcatalogpy.catalog.widgets.cover_grid_view import CoverGridView
 from tutcatalogpy.common.files import relative_path
 from tutcatalogpy.common.widgets.dock_widget import DockWidget
 
@@ -16,16 +18,25 @@ class TutorialsDock(DockWidget):
     SETTINGS_GROUP: Final[str] = 'tutorial_list_dock'
     SETTINGS_HEADER_STATE: Final[str] = 'header_state'
     SETTINGS_VERTICAL_HEADER_VISIBLE: Final[str] = 'vertical_header_visible'
+    SETTINGS_GRID_VIEW: Final[str] = 'grid_view'
 
     DOCK_TITLE: Final[str] = 'Tutorials'
     DOCK_OBJECT_NAME: Final[str] = 'tutorial_list_dock'
 
     TUTORIALS_VIEW_OBJECT_NAME: Final[str] = 'tutorials_view'
+    GRID_VIEW_OBJECT_NAME: Final[str] = 'tutorials_grid_view'
+
+    GRID_VIEW_ICON: Final[str] = relative_path(__file__, '../../resources/icons/grid_view.svg')
+    GRID_VIEW_TIP: Final[str] = 'Show the covers in a grid'
+
+    # wait until scrolling stops before reporting the visible tutorials
+    VISIBLE_CHANGED_DELAY_MSEC: Final[int] = 250
 
     _dock_icon: Final[str] = relative_path(__file__, '../../resources/icons/tutorials.svg')
     _dock_status_tip: Final[str] = 'Toggle tutorials dock'
 
     selection_changed = Signal(list)
+    visible_changed = Signal()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -51,10 +62,35 @@ class TutorialsDock(DockWidget):
         horizontal_header.setContextMenuPolicy(Qt.CustomContextMenu)
         horizontal_header.customContextMenuRequested.connect(self.__on_header_custom_context_menu_requested)
 
-        self.setWidget(self.__tutorials_view)
+        self.__grid_view = CoverGridView()
+        self.__grid_view.setObjectName(self.GRID_VIEW_OBJECT_NAME)
+
+        self.__visible_changed_timer = QTimer(self)
+        self.__visible_changed_timer.setSingleShot(True)
+        self.__visible_changed_timer.setInterval(self.VISIBLE_CHANGED_DELAY_MSEC)
+        self.__visible_changed_timer.timeout.connect(self.__on_visible_changed_timer_timeout)
+        self.__tutorials_view.verticalScrollBar().valueChanged.connect(self.__visible_changed_timer.start)
+        self.__grid_view.verticalScrollBar().valueChanged.connect(self.__visible_changed_timer.start)
+
+        self.__views = QStackedWidget()
+        self.__views.addWidget(self.__tutorials_view)
+        self.__views.addWidget(self.__grid_view)
+        self.setWidget(self.__views)
 
     def __setup_actions(self) -> None:
-        self._setup_dock_toolbar()
+        self.__grid_view_action = QAction()
+        self.__grid_view_action.setIcon(QIcon(self.GRID_VIEW_ICON))
+        self.__grid_view_action.setStatusTip(self.GRID_VIEW_TIP)
+        self.__grid_view_action.setCheckable(True)
+        self.__grid_view_action.toggled.connect(self.__on_grid_view_action_toggled)
+
+        self._setup_dock_toolbar([
+            self.__grid_view_action
+        ])
+
+    @property
+    def grid_view_shown(self) -> bool:
+        return self.__views.currentWidget() is self.__grid_view
 
     def __setup_context_menu(self) -> None:
         header = self.__tutorials_view.horizontalHeader()
@@ -84,19 +120,72 @@ class TutorialsDock(DockWidget):
     def set_model(self, model) -> None:
         self.__tutorials_view.setModel(model)
         self.__tutorials_view.selectionModel().selectionChanged.connect(self.__on_tutorials_view_selection_changed)
+        # both views show the same selection
+        self.__grid_view.setModel(model)
+        self.__grid_view.setSelectionModel(self.__tutorials_view.selectionModel())
+        model.modelReset.connect(self.__visible_changed_timer.start)
+        model.layoutChanged.connect(self.__visible_changed_timer.start)
+
+    def visible_folders(self) -> List[int]:
+        data_model: TutorialsModel = self.__tutorials_view.model()
+        if data_model is None or type(data_model) is not TutorialsModel:
+            return []
+
+        if self.grid_view_shown:
+            rows = self.__grid_view.visible_rows()
+        else:
+            first_row = self.__tutorials_view.rowAt(0)
+            if first_row < 0:
+                return []
+            last_row = self.__tutorials_view.rowAt(self.__tutorials_view.viewport().height() - 1)
+            if last_row < 0:
+                last_row = data_model.rowCount() - 1
+            rows = range(first_row, last_row + 1)
+
+        folders = []
+        for row in rows:
+            folder = data_model.folder(row)
+            if folder is not None:
+                folders.append(folder.id_)
+        return folders
+
+    def neighbor_folders(self, distance: int) -> List[int]:
+        """Return the folders up to `distance` rows around the current one, nearest first."""
+        data_model: TutorialsModel = self.__tutorials_view.model()
+        if data_model is None or type(data_model) is not TutorialsModel:
+            return []
+
+        current = self.__tutorials_view.selectionModel().currentIndex()
+        if not current.isValid():
+            return []
+
+        row_count = data_model.rowCount()
+        folders = []
+        for offset in range(1, distance + 1):
+            # moving down is more common than moving up
+            for row in (current.row() + offset, current.row() - offset):
+                if 0 <= row < row_count:
+                    folder = data_model.folder(row)
+                    if folder is not None:
+                        folders.append(folder.id_)
+        return folders
 
     def save_settings(self, settings: QSettings):
         settings.beginGroup(self.SETTINGS_GROUP)
         settings.setValue(self.SETTINGS_HEADER_STATE, self.__tutorials_view.horizontalHeader().saveState())
         settings.setValue(self.SETTINGS_VERTICAL_HEADER_VISIBLE, self.__tutorials_view.verticalHeader().isVisible())
+        settings.setValue(self.SETTINGS_GRID_VIEW, self.grid_view_shown)
         settings.endGroup()
 
     def load_settings(self, settings: QSettings):
         settings.beginGroup(self.SETTINGS_GROUP)
         self.__tutorials_view.horizontalHeader().restoreState(QByteArray(settings.value(self.SETTINGS_HEADER_STATE, b'')))
         vertical_header_visible = settings.value(self.SETTINGS_VERTICAL_HEADER_VISIBLE, True, type=bool)
+        grid_view = settings.value(self.SETTINGS_GRID_VIEW, False, type=bool)
         settings.endGroup()
 
+        self.__grid_view_action.setChecked(grid_view)
+
         self.__setup_context_menu()
         self.__tutorials_view.verticalHeader().setVisible(vertical_header_visible)
         self.__vertical_header_visible_action.setChecked(vertical_header_visible)
@@ -112,6 +201,20 @@ class TutorialsDock(DockWidget):
             header = self.__tutorials_view.horizontalHeader()
             header.setSectionHidden(self.sender().data(), not checked)
 
+    def __on_grid_view_action_toggled(self, checked: bool) -> None:
+        current = self.__views.currentWidget()
+        view = self.__grid_view if checked else self.__tutorials_view
+        self.__views.setCurrentWidget(view)
+        index = current.currentIndex()
+        if index.isValid():
+            view.scrollTo(index)
+        self.__visible_changed_timer.start()
+
+    def __on_visible_changed_timer_timeout(self) -> None:
+        if self.grid_view_shown:
+            self.__grid_view.scrolling_stopped()
+        self.visible_changed.emit()
+
     def __on_tutorials_view_selection_changed(self, selected: QItemSelection, deselected: QItemSelection) -> None:
         data_model: TutorialsModel = self.__tutorials_view.model()
         if data_model is None or type(data_model) is not TutorialsModel:
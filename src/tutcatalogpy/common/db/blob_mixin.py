@@ -0,0 +1,35 @@
+from typing import Optional
+
+from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import deferred
+from sqlalchemy.schema import Column
+from sqlalchemy.sql.sqltypes import LargeBinary, Text
+
+from tutcatalogpy.common.db.dal import dal
+
+
+class BlobMixin:
+    """Keep the `data` of a row in the blob store of the catalog."""
+
+    blob_hash = Column(Text, default=None, nullable=True)
+
+    @declared_attr
+    def legacy_data(cls):
+        # catalogs created before the blob store kept the data in the table; see DataAccessLayer.migrate_blobs()
+        return deferred(Column('data', LargeBinary, default=None, nullable=True))
+
+    @property
+    def data(self) -> Optional[bytes]:
+        if self.blob_hash is not None:
+            return dal.blobs.get(self.blob_hash)
+        return self.legacy_data
+
+    @data.setter
+    def data(self, data: Optional[bytes]) -> None:
+        self.blob_hash = None if data is None else dal.blobs.put(data)
+        self.legacy_data = None
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
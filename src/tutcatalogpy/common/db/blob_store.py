@@ -0,0 +1,166 @@
+"""Content addressed storage for the images of the catalog.
+
+Blobs are keyed by the SHA-256 of their content, so identical images
+(e.g. covers of a tutorial copied to several backup disks) are stored once.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, Optional, Set
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class BlobStore:
+    @staticmethod
+    def key(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def put(self, data: bytes) -> str:
+        """Store the data, if not already stored, and return its key."""
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def map(self, key: str) -> ContextManager[Optional[memoryview]]:
+        """Give access to the data without copying it; the view is only valid inside the context."""
+        raise NotImplementedError
+
+    def contains(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def keys(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def remove_unreferenced(self, referenced: Set[str]) -> int:
+        """Delete the blobs that are not in `referenced`; return how many were deleted."""
+        unreferenced = [key for key in self.keys() if key not in referenced]
+        for key in unreferenced:
+            self.delete(key)
+        if unreferenced:
+            log.info('Removed %s unreferenced blobs.', len(unreferenced))
+        return len(unreferenced)
+
+
+class MemoryBlobStore(BlobStore):
+    """Blob store of in memory catalogs."""
+
+    def __init__(self) -> None:
+        self.__blobs: Dict[str, bytes] = {}
+        self.__lock = threading.Lock()
+
+    def put(self, data: bytes) -> str:
+        key = self.key(data)
+        with self.__lock:
+            self.__blobs.setdefault(key, bytes(data))
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.__lock:
+            return self.__blobs.get(key)
+
+    @contextmanager
+    def map(self, key: str) -> Iterator[Optional[memoryview]]:
+        data = self.get(key)
+        yield None if data is None else memoryview(data)
+
+    def contains(self, key: str) -> bool:
+        with self.__lock:
+            return key in self.__blobs
+
+    def delete(self, key: str) -> None:
+        with self.__lock:
+            self.__blobs.pop(key, None)
+
+    def keys(self) -> Iterator[str]:
+        with self.__lock:
+            keys = list(self.__blobs)
+        return iter(keys)
+
+
+class DirectoryBlobStore(BlobStore):
+    """One file per blob in a sharded directory: <root>/ab/cd/abcd...
+
+    Files are written under a temporary name and renamed, so a blob is
+    either complete or missing, even if several threads store it at once.
+    """
+
+    TEMP_SUFFIX = '.tmp'
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / key
+
+    def put(self, data: bytes) -> str:
+        key = self.key(data)
+        path = self.path(key)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f'{key}.{uuid.uuid4().hex}{self.TEMP_SUFFIX}')
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            log.warning('Missing blob %s', key)
+            return None
+
+    @contextmanager
+    def map(self, key: str) -> Iterator[Optional[memoryview]]:
+        try:
+            f = open(self.path(key), 'rb')
+        except FileNotFoundError:
+            log.warning('Missing blob %s', key)
+            yield None
+            return
+
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # empty files can't be mapped
+                yield memoryview(b'')
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def contains(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def delete(self, key: str) -> None:
+        try:
+            self.path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def keys(self) -> Iterator[str]:
+        if not self.root.exists():
+            return
+        for path in self.root.glob('*/*/*'):
+            if not path.name.endswith(self.TEMP_SUFFIX):
+                yield path.name
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
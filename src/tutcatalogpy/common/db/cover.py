@@ -1,13 +1,15 @@
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
 
 from sqlalchemy.schema import Column
-from sqlalchemy.sql.sqltypes import DateTime, Integer, LargeBinary, Text
+from sqlalchemy.sql.sqltypes import DateTime, Integer, Text
 
 from tutcatalogpy.common.db.base import Base
+from tutcatalogpy.common.db.blob_mixin import BlobMixin
+from tutcatalogpy.common.db.thumbnail import Thumbnail
 
 
-class Cover(Base):
+class Cover(BlobMixin, Base):
 
     class FileFormat(bytes, Enum):
         file_name: Optional[str]  # file name
@@ -26,16 +28,26 @@ class Cover(Base):
 
     id_ = Column('id', Integer, primary_key=True)
     system_id = Column(Text, default=None, nullable=True)
-    file_format = Column(Integer, default=FileFormat.NONE, nullable=False)
+    file_format = Column(Integer, default=FileFormat.NONE.value, nullable=False)
     created = Column(DateTime, default=None, nullable=True)
     modified = Column(DateTime, default=None, nullable=True)
     size = Column(Integer, default=None, nullable=True)
-    data = Column(LargeBinary, default=None, nullable=True)
+    # size of the image; 0 if the data is not an image, None if the thumbnails weren't made yet
+    width = Column(Integer, default=None, nullable=True)
+    height = Column(Integer, default=None, nullable=True)
 
     @property
     def name(self) -> Optional[str]:
         return Cover.FileFormat(self.file_format).file_name
 
+    def rendition(self, width: int, height: int) -> Union['Cover', Thumbnail]:
+        """Return the smallest thumbnail that fills a width x height box without upscaling, or the cover itself."""
+        thumbnail: Thumbnail
+        for thumbnail in self.thumbnails:
+            if thumbnail.width >= width or thumbnail.height >= height:
+                return thumbnail
+        return self
+
 
 if __name__ == '__main__':
     from tutcatalogpy.catalog.main import run
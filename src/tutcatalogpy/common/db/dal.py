@@ -1,14 +1,18 @@
 import logging
-from typing import Optional
+from pathlib import Path
+from typing import Final, Optional, Set
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, select
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.schema import Column, ForeignKey, Table
 from sqlalchemy.sql.sqltypes import Integer
 
 from tutcatalogpy.common.db.base import Base
+from tutcatalogpy.common.db.blob_store import BlobStore, DirectoryBlobStore, MemoryBlobStore
+from tutcatalogpy.common.db.search_index import create_search_index, register_search_functions
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
@@ -30,41 +34,184 @@ tutorial_tag_table = Table(
 
 
 class DataAccessLayer:
+    BLOBS_SUFFIX: Final[str] = '.blobs'
+    BLOB_TABLES: Final[Set[str]] = {'cover', 'image'}
+    BLOB_MIGRATION_BATCH_SIZE: Final[int] = 100
+    # the scans of the disks and the GUI write at the same time; a writer waits for the others this long
+    BUSY_TIMEOUT: Final[float] = 30.0  # seconds
 
     def __init__(self):
         self.__engine: Optional[Engine] = None
+        self.__in_memory: bool = False
         self.session: Optional[Session] = None
+        self.blobs: BlobStore = MemoryBlobStore()
 
     def connect(self, connection: str):
         from tutcatalogpy.common.db.author import Author  # noqa: F401
         from tutcatalogpy.common.db.cover import Cover  # noqa: F401
         from tutcatalogpy.common.db.disk import Disk  # noqa: F401
+        from tutcatalogpy.common.db.facet_index import FacetBitmap  # noqa: F401
+        from tutcatalogpy.common.db.file import File  # noqa: F401
         from tutcatalogpy.common.db.folder import Folder  # noqa: F401
         from tutcatalogpy.common.db.image import Image  # noqa: F401
         from tutcatalogpy.common.db.learning_path import LearningPath  # noqa: F401
+        from tutcatalogpy.common.db.media import Media  # noqa: F401
         from tutcatalogpy.common.db.publisher import Publisher  # noqa: F401
         from tutcatalogpy.common.db.search_flag import SearchFlag  # noqa: F401
         from tutcatalogpy.common.db.tag import Tag  # noqa: F401
+        from tutcatalogpy.common.db.thumbnail import Thumbnail  # noqa: F401
         from tutcatalogpy.common.db.tutorial_learning_path import TutorialLearningPath  # noqa: F401
         from tutcatalogpy.common.db.tutorial import Tutorial  # noqa: F401
 
         self.disconnect()
 
         log.info('Creating engine %s', connection)
-        self.__engine = create_engine(connection)
+        self.__in_memory = connection in ['sqlite://', 'sqlite:///:memory:']
+        if self.__in_memory:
+            # share the database with the scan threads; each connection would get its own empty database
+            self.__engine = create_engine(connection, poolclass=StaticPool, connect_args={'check_same_thread': False})
+        else:
+            self.__engine = create_engine(connection, connect_args={'timeout': self.BUSY_TIMEOUT})
+            # the readers don't wait for the writers, and the other way around
+            event.listen(self.__engine, 'connect', DataAccessLayer.__use_write_ahead_log)
+        register_search_functions(self.__engine)
+        if self.__in_memory or not self.__engine.url.database:
+            self.blobs = MemoryBlobStore()
+        else:
+            self.blobs = DirectoryBlobStore(Path(self.__engine.url.database + self.BLOBS_SUFFIX))
+
+        self.__add_missing_columns()
         Base.metadata.create_all(self.__engine)
+        self.__add_missing_indexes()
+        self.__fill_released_dates()
+        create_search_index(self.__engine)
+        self.migrate_blobs()
 
         self.Session = sessionmaker(bind=self.__engine)
+        self.__fill_facet_index()
 
         self.session = self.Session()
 
         self.__init_tables_with_default_values()
 
+    @staticmethod
+    def __use_write_ahead_log(dbapi_connection, connection_record) -> None:
+        dbapi_connection.execute('PRAGMA journal_mode=WAL')
+
     def __init_tables_with_default_values(self) -> None:
         from tutcatalogpy.common.db.search_flag import SearchFlag  # noqa: F401
 
         SearchFlag.init_with_default_values(self.session)
 
+    def __add_missing_columns(self) -> None:
+        """Add the columns that were added to the models after the catalog was created."""
+        inspector = inspect(self.__engine)
+        table_names = set(inspector.get_table_names())
+        with self.__engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                if table.name not in table_names:
+                    continue
+                column_names = [column['name'] for column in inspector.get_columns(table.name)]
+                for column in table.columns:
+                    if column.name in column_names:
+                        continue
+                    if not column.nullable:
+                        log.warning('Cannot add the NOT NULL column %s to %s.', column.name, table.name)
+                        continue
+                    log.info('Adding %s column to %s.', column.name, table.name)
+                    column_type = column.type.compile(dialect=self.__engine.dialect)
+                    connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
+
+    def __add_missing_indexes(self) -> None:
+        """Add the indexes that were added to the models after the catalog was created."""
+        inspector = inspect(self.__engine)
+        for table in Base.metadata.sorted_tables:
+            index_names = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in index_names:
+                    log.info('Adding %s index to %s.', index.name, table.name)
+                    index.create(self.__engine)
+
+    def __fill_released_dates(self) -> None:
+        """Convert the released texts of the catalogs created before Tutorial.released_on."""
+        # the texts were validated as yyyy, yyyy/mm or yyyy/mm/dd; casting '' gives 0
+        with self.__engine.begin() as connection:
+            result = connection.exec_driver_sql(
+                'UPDATE tutorial SET released_on = '
+                'CAST(substr(released, 1, 4) AS INTEGER) * 10000 '
+                '+ CAST(substr(released, 6, 2) AS INTEGER) * 100 '
+                '+ CAST(substr(released, 9, 2) AS INTEGER) '
+                'WHERE released_on IS NULL'
+            )
+            if result.rowcount > 0:
+                log.info('Converted the released dates of %s tutorials.', result.rowcount)
+
+    def __fill_facet_index(self) -> None:
+        """Build the facet bitmaps of the catalogs created before them."""
+        from tutcatalogpy.common.db.facet_index import FacetBitmap, rebuild_facet_index
+        from tutcatalogpy.common.db.folder import Folder
+
+        session = self.Session()
+        try:
+            if session.query(FacetBitmap).first() is None and session.query(Folder).filter(Folder.tutorial_id != None).first() is not None:  # noqa: E711
+                rebuild_facet_index(session)
+                session.commit()
+        finally:
+            session.close()
+
+    def migrate_blobs(self) -> int:
+        """Move the images stored in the catalog tables to the blob store; return how many were moved."""
+        moved = 0
+        for table in sorted(self.BLOB_TABLES):
+            while True:
+                with self.__engine.begin() as connection:
+                    rows = connection.exec_driver_sql(
+                        f'SELECT id, data FROM {table} WHERE data IS NOT NULL LIMIT {self.BLOB_MIGRATION_BATCH_SIZE}'
+                    ).fetchall()
+                    for id_, data in rows:
+                        connection.exec_driver_sql(
+                            f'UPDATE {table} SET blob_hash = ?, data = NULL WHERE id = ?', (self.blobs.put(data), id_)
+                        )
+                moved += len(rows)
+                if len(rows) < self.BLOB_MIGRATION_BATCH_SIZE:
+                    break
+
+        if moved > 0:
+            log.info('Moved %s images to the blob store; compacting the catalog.', moved)
+            with self.__engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+                connection.exec_driver_sql('VACUUM')
+        return moved
+
+    def remove_unreferenced_blobs(self) -> int:
+        from tutcatalogpy.common.db.cover import Cover
+        from tutcatalogpy.common.db.image import Image
+        from tutcatalogpy.common.db.thumbnail import Thumbnail
+
+        session = self.Session()
+        try:
+            referenced: Set[str] = set()
+            for model in [Cover, Image, Thumbnail]:
+                referenced.update(key for key, in session.query(model.blob_hash).filter(model.blob_hash != None))  # noqa: E711
+        finally:
+            session.close()
+        return self.blobs.remove_unreferenced(referenced)
+
+    def remove_unreferenced_media(self) -> int:
+        """Delete the media details of the videos no longer in the file index; return how many were deleted."""
+        from tutcatalogpy.common.db.file import File
+        from tutcatalogpy.common.db.media import Media
+
+        session = self.Session()
+        try:
+            referenced = select(File.media_id).where(File.media_id != None)  # noqa: E711
+            count = session.query(Media).filter(Media.id_.not_in(referenced)).delete(synchronize_session=False)
+            session.commit()
+        finally:
+            session.close()
+        if count > 0:
+            log.info('Deleted the media details of %s videos.', count)
+        return count
+
     def renew_session(self) -> None:
         if self.session is not None:
             self.session.close()
@@ -84,6 +231,11 @@ class DataAccessLayer:
     def connected(self) -> bool:
         return self.__engine is not None and self.session is not None
 
+    @property
+    def concurrent(self) -> bool:
+        """Can several threads use the database at the same time?"""
+        return not self.__in_memory
+
     @property
     def url(self) -> str:
         return str(self.__engine.url) if self.__engine is not None else ''
@@ -5,6 +5,7 @@ from sqlalchemy import Boolean, Column, Enum, Integer, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from tutcatalogpy.common.db.base import Base
+from tutcatalogpy.common.disk_probe import PathState
 
 
 class Disk(Base):
@@ -21,6 +22,7 @@ class Disk(Base):
     class Status(enum.IntEnum):
         UNKNOWN = -1
         OK = 0
+        UNRESPONSIVE = 1  # the last probe timed out (e.g. stale network mount)
 
     __tablename__ = 'disk'
     id_ = Column('id', Integer, primary_key=True)
@@ -43,3 +45,7 @@ class Disk(Base):
 
     def path(self) -> Path:
         return Path(self.disk_parent) / self.disk_name
+
+    def set_path_state(self, state: PathState) -> None:
+        self.online = (state == PathState.ONLINE)
+        self.status = Disk.Status.UNRESPONSIVE if state == PathState.UNRESPONSIVE else Disk.Status.OK
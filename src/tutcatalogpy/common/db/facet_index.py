@@ -0,0 +1,223 @@
+"""Bitmaps of the folders of each author, tag, publisher and learning path, kept in sync by the scanner.
+
+A bitmap is an int with the bit n set for the folder with the id n; it is
+stored compressed with zlib in the facet_bitmap table. Combining the facets
+included and excluded in the tags dock is an AND, OR and AND NOT of ints,
+and the number of tutorials of a facet is the number of bits of its bitmap.
+
+The scanner reads the facets of the folders before changing or deleting
+them, with folder_facets(), then passes them to update_facet_index(), so
+only the bitmaps of those facets are updated.
+"""
+
+import enum
+import json
+import logging
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, Final, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import Column
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.sqltypes import Integer, LargeBinary
+
+from tutcatalogpy.common.db.author import Author
+from tutcatalogpy.common.db.base import Base
+from tutcatalogpy.common.db.dal import tutorial_author_table, tutorial_tag_table
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.learning_path import LearningPath
+from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.search_flag import Search
+from tutcatalogpy.common.db.tag import Tag
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.db.tutorial_learning_path import TutorialLearningPath
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# folders read by statement, below the limit of the SQL variables of SQLite
+UPDATE_BATCH_SIZE: Final[int] = 500
+
+
+class Facet(enum.IntEnum):
+    AUTHOR = 0
+    TAG = 1
+    PUBLISHER = 2
+    LEARNING_PATH = 3
+
+
+# the tables of the values of the facets, with their search column
+FACET_TABLES: Final = {
+    Facet.AUTHOR: Author,
+    Facet.TAG: Tag,
+    Facet.PUBLISHER: Publisher,
+    Facet.LEARNING_PATH: LearningPath,
+}
+
+_FACET_VALUES: Final[Dict[Facet, Callable[[], Select]]] = {
+    Facet.AUTHOR: lambda: (
+        select(Folder.id_, tutorial_author_table.c.author_id)
+        .join(tutorial_author_table, tutorial_author_table.c.tutorial_id == Folder.tutorial_id)
+    ),
+    Facet.TAG: lambda: (
+        select(Folder.id_, tutorial_tag_table.c.tag_id)
+        .join(tutorial_tag_table, tutorial_tag_table.c.tutorial_id == Folder.tutorial_id)
+    ),
+    Facet.PUBLISHER: lambda: (
+        select(Folder.id_, Tutorial.publisher_id)
+        .join(Tutorial, Tutorial.id_ == Folder.tutorial_id)
+        .where(Tutorial.publisher_id != None)  # noqa: E711
+    ),
+    Facet.LEARNING_PATH: lambda: (
+        select(Folder.id_, TutorialLearningPath.learning_path_id)
+        .join(TutorialLearningPath, TutorialLearningPath.tutorial_id == Folder.tutorial_id)
+    ),
+}
+
+FolderFacet = Tuple[Facet, int, int]  # facet, value id, folder id
+
+
+class FacetBitmap(Base):
+
+    __tablename__ = 'facet_bitmap'
+
+    facet = Column(Integer, primary_key=True)
+    value_id = Column(Integer, primary_key=True)
+    bitmap = Column(LargeBinary, nullable=False)
+
+
+def to_bitmap(folder_ids: Iterable[int]) -> int:
+    data = bytearray()
+    for folder_id in folder_ids:
+        byte = folder_id >> 3
+        if byte >= len(data):
+            data.extend(bytes(byte + 1 - len(data)))
+        data[byte] |= 1 << (folder_id & 7)
+    return int.from_bytes(data, 'little')
+
+
+def to_bytes(bitmap: int) -> bytes:
+    """Return the bitmap as bytes, the folder n being the bit n % 8 of the byte n // 8."""
+    return bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+
+
+def bitmap_folder_ids(bitmap: int) -> List[int]:
+    return [
+        byte_index * 8 + bit
+        for byte_index, byte in enumerate(to_bytes(bitmap)) if byte
+        for bit in range(8) if byte >> bit & 1
+    ]
+
+
+def bitmap_count(bitmap: int) -> int:
+    return bin(bitmap).count('1')
+
+
+def bitmap_folders(bitmap: int) -> Select:
+    """Select the ids of the folders of a bitmap, passed as a single JSON parameter rather than a parameter per folder."""
+    folder_ids = func.json_each(json.dumps(bitmap_folder_ids(bitmap))).table_valued('value')
+    return select(folder_ids.c.value)
+
+
+def _encode(bitmap: int) -> bytes:
+    return zlib.compress(to_bytes(bitmap))
+
+
+def _decode(data: bytes) -> int:
+    return int.from_bytes(zlib.decompress(data), 'little')
+
+
+def folder_facets(session: Session, folder_ids: Iterable[int]) -> Set[FolderFacet]:
+    """Return the facets of the folders."""
+    folder_ids = list(folder_ids)
+    facets: Set[FolderFacet] = set()
+    for start in range(0, len(folder_ids), UPDATE_BATCH_SIZE):
+        batch = folder_ids[start:start + UPDATE_BATCH_SIZE]
+        for facet, values in _FACET_VALUES.items():
+            facets.update((facet, value_id, folder_id) for folder_id, value_id in session.execute(values().where(Folder.id_.in_(batch))))
+    return facets
+
+
+def update_facet_index(session: Session, folder_ids: Iterable[int], old_facets: Set[FolderFacet]) -> None:
+    """Update the bitmaps of the folders, after their tutorial changed or they were deleted.
+
+    `old_facets` are the facets of the folders before the change, see folder_facets().
+    """
+    folder_ids = list(folder_ids)
+    if not folder_ids:
+        return
+    session.flush()
+    new_facets = folder_facets(session, folder_ids)
+    if new_facets == old_facets:
+        return
+
+    changed = to_bitmap(folder_ids)
+    new_folders: Dict[Tuple[Facet, int], List[int]] = defaultdict(list)
+    for facet, value_id, folder_id in new_facets:
+        new_folders[(facet, value_id)].append(folder_id)
+
+    for facet, value_id in {(facet, value_id) for facet, value_id, _ in old_facets | new_facets}:
+        row = session.get(FacetBitmap, (facet, value_id))
+        bitmap = _decode(row.bitmap) if row is not None else 0
+        bitmap = (bitmap & ~changed) | to_bitmap(new_folders.get((facet, value_id), []))
+        if bitmap == 0:
+            if row is not None:
+                session.delete(row)
+        elif row is None:
+            session.add(FacetBitmap(facet=facet, value_id=value_id, bitmap=_encode(bitmap)))
+        else:
+            row.bitmap = _encode(bitmap)
+
+
+def rebuild_facet_index(session: Session) -> None:
+    """Build the bitmaps of all the folders again."""
+    session.query(FacetBitmap).delete()
+    count = 0
+    for facet, values in _FACET_VALUES.items():
+        folders: Dict[int, List[int]] = defaultdict(list)
+        for folder_id, value_id in session.execute(values()):
+            folders[value_id].append(folder_id)
+        session.add_all(
+            FacetBitmap(facet=facet, value_id=value_id, bitmap=_encode(to_bitmap(folder_ids)))
+            for value_id, folder_ids in folders.items()
+        )
+        count += len(folders)
+    log.info('Built the bitmaps of %s facets.', count)
+
+
+def facet_bitmaps(session: Session, facet: Facet, value_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+    """Return the bitmaps of the values of a facet, of all of them if `value_ids` is None."""
+    query = session.query(FacetBitmap.value_id, FacetBitmap.bitmap).filter(FacetBitmap.facet == facet)
+    if value_ids is not None:
+        query = query.filter(FacetBitmap.value_id.in_(list(value_ids)))
+    return {value_id: _decode(data) for value_id, data in query}
+
+
+def facet_counts(session: Session, facet: Facet) -> Dict[int, int]:
+    """Return the number of folders of each value of a facet."""
+    return {value_id: bitmap_count(bitmap) for value_id, bitmap in facet_bitmaps(session, facet).items()}
+
+
+def searched_facets(session: Session) -> Tuple[Optional[int], int]:
+    """Return the folders having all the included facets, None if none is included, and the folders having any excluded one."""
+    included: Optional[int] = None
+    excluded = 0
+    for facet, table in FACET_TABLES.items():
+        searches = dict(session.query(table.id_, table.search).filter(table.search.in_([Search.INCLUDE, Search.EXCLUDE])))
+        if not searches:
+            continue
+        bitmaps = facet_bitmaps(session, facet, searches)
+        for value_id, search in searches.items():
+            bitmap = bitmaps.get(value_id, 0)
+            if search == Search.INCLUDE:
+                included = bitmap if included is None else included & bitmap
+            else:
+                excluded |= bitmap
+    return included, excluded
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
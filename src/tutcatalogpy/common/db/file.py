@@ -0,0 +1,51 @@
+from sqlalchemy.orm import backref, relationship
+from sqlalchemy.schema import Column, ForeignKey, Index
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.sql.sqltypes import Integer, Text
+
+from tutcatalogpy.common.db.base import Base
+
+
+class File(Base):
+    """A file of a tutorial folder, to search the files without the disks; see file_listing."""
+
+    __tablename__ = 'file'
+
+    id_ = Column('id', Integer, primary_key=True)
+    folder_id = Column(Integer, ForeignKey('folder.id'), nullable=False)
+    directory = Column(Text, nullable=False)  # relative to the folder, '' for its root
+    # without case, so searching names by prefix can use the index
+    name = Column(Text(collation='NOCASE'), nullable=False)
+    extension = Column(Text, nullable=False)  # lowercase, without the dot
+    size = Column(Integer, nullable=False)
+    modified = Column(Integer, nullable=False)  # seconds since the epoch
+    media_id = Column(Integer, ForeignKey('media.id'))  # the videos only
+
+    folder = relationship('Folder', backref=backref('files', cascade='all, delete-orphan'))
+    media = relationship('Media')
+
+    __table_args__ = (
+        Index('ix_file_folder_id_directory_name', 'folder_id', 'directory', 'name'),
+        Index('ix_file_extension', 'extension'),
+        Index('ix_file_name', 'name'),
+    )
+
+    @property
+    def path(self) -> str:
+        return f'{self.directory}/{self.name}' if self.directory else self.name
+
+    @staticmethod
+    def name_starts_with(prefix: str) -> ClauseElement:
+        """Match the names starting with the prefix, without case; the wildcards of the prefix are matched as is."""
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return File.name.like(escaped + '%', escape='\\')
+
+    @staticmethod
+    def extension_of(name: str) -> str:
+        stem, dot, extension = name.rpartition('.')
+        return extension.lower() if dot and stem else ''
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
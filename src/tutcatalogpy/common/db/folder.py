@@ -1,10 +1,11 @@
 import enum
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
-from sqlalchemy.orm import backref, relationship
+from sqlalchemy.orm import Session, backref, deferred, joinedload, relationship, selectinload
 from sqlalchemy.schema import Column, ForeignKey, UniqueConstraint
-from sqlalchemy.sql.sqltypes import Boolean, DateTime, Integer, Text
+from sqlalchemy.sql.sqltypes import Boolean, DateTime, Integer, LargeBinary, Text
 
 from tutcatalogpy.common.db.base import Base
 
@@ -31,9 +32,13 @@ class Folder(Base):
     status = Column(Integer, default=Status.OK, nullable=False)
     created = Column(DateTime, default=datetime.today(), nullable=False)
     modified = Column(DateTime, default=datetime.today(), nullable=False)
-    size = Column(Integer)
+    size = Column(Integer, index=True)
+    # the total of the videos measured by the details scan, None before
+    video_duration = Column(Integer)  # seconds
     checked = Column(Boolean, default=False, nullable=False)
     error = Column(Text)
+    # the files of the folder at the last details scan; see file_listing
+    file_listing = deferred(Column(LargeBinary))
 
     disk = relationship('Disk', back_populates='folders')
     cover = relationship('Cover', backref=backref('folder', uselist=False), cascade='all, delete')
@@ -44,6 +49,19 @@ class Folder(Base):
         UniqueConstraint('disk_id', 'system_id'),
     )
 
+    @staticmethod
+    def get(session: Session, folder_id: int, details: bool = False) -> Optional['Folder']:
+        """Load a folder with its disk, cover, thumbnails and tutorial.
+
+        The heavy columns are deferred; `details` also loads the tutorial
+        description, its HTML and the images, for the views that render them.
+        """
+        tutorial = joinedload(Folder.tutorial)
+        options = [joinedload(Folder.disk), joinedload(Folder.cover).selectinload('thumbnails'), tutorial]
+        if details:
+            options.extend([tutorial.undefer('description'), tutorial.undefer('description_html'), selectinload('images')])
+        return session.query(Folder).options(*options).filter(Folder.id_ == folder_id).first()
+
     def path(self) -> Path:
         if self.disk is not None:
             return self.disk.path() / self.folder_parent / self.folder_name
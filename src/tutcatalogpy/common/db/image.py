@@ -1,11 +1,12 @@
 from sqlalchemy.orm import backref, relationship
 from sqlalchemy.schema import Column, ForeignKey
-from sqlalchemy.sql.sqltypes import DateTime, Integer, LargeBinary, Text
+from sqlalchemy.sql.sqltypes import DateTime, Integer, Text
 
 from tutcatalogpy.common.db.base import Base
+from tutcatalogpy.common.db.blob_mixin import BlobMixin
 
 
-class Image(Base):
+class Image(BlobMixin, Base):
 
     __tablename__ = 'image'
 
@@ -16,7 +17,6 @@ class Image(Base):
     created = Column(DateTime, nullable=True)
     modified = Column(DateTime, nullable=True)
     size = Column(Integer, nullable=True)
-    data = Column(LargeBinary, nullable=True)
 
     folder = relationship('Folder', backref=backref('images'))
 
@@ -0,0 +1,34 @@
+from sqlalchemy.schema import Column, UniqueConstraint
+from sqlalchemy.sql.sqltypes import Integer, Text
+
+from tutcatalogpy.common.db.base import Base
+
+
+class Media(Base):
+    """The media details of a video file, by the stat of the file, so rescans don't read the video again.
+
+    The rows no longer linked to a file are deleted after each scan, see DataAccessLayer.remove_unreferenced_media().
+    """
+
+    __tablename__ = 'media'
+
+    id_ = Column('id', Integer, primary_key=True)
+    # the inodes of the files of different disks can be the same
+    device = Column(Integer, nullable=False)
+    inode = Column(Integer, nullable=False)
+    size = Column(Integer, nullable=False)
+    modified = Column(Integer, nullable=False)  # seconds since the epoch
+    # None if the file couldn't be read as a video, so it isn't read again
+    duration = Column(Integer)  # milliseconds
+    width = Column(Integer)
+    height = Column(Integer)
+    codec = Column(Text)
+
+    __table_args__ = (
+        UniqueConstraint('device', 'inode', 'size', 'modified'),
+    )
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
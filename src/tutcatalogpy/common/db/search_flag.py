@@ -1,4 +1,6 @@
 import enum
+from typing import Final, List
+
 from sqlalchemy.orm.session import Session
 
 from sqlalchemy.schema import Column
@@ -30,6 +32,40 @@ class SearchValue(LabeledIntEnum):
     HAS_COVER = (3, 'cover')
     IS_CHECKED = (4, 'checked')
     IS_DISK_ONLINE = (5, 'disk online')
+    # the filters of the fields of the tutorials; see tutorial_filters
+    LEVEL_BEGINNER = (6, 'beginner')
+    LEVEL_INTERMEDIATE = (7, 'intermediate')
+    LEVEL_ADVANCED = (8, 'advanced')
+    RATING_AT_LEAST_1 = (9, '1 star or more')
+    RATING_AT_LEAST_2 = (10, '2 stars or more')
+    RATING_AT_LEAST_3 = (11, '3 stars or more')
+    RATING_AT_LEAST_4 = (12, '4 stars or more')
+    RATING_5 = (13, '5 stars')
+    RATING_NEGATIVE = (14, 'bad stars')
+    DURATION_UNDER_1H = (15, 'under 1h')
+    DURATION_1H_TO_3H = (16, '1h to 3h')
+    DURATION_3H_TO_10H = (17, '3h to 10h')
+    DURATION_OVER_10H = (18, 'over 10h')
+    RELEASED_LAST_YEAR = (19, 'in the last year')
+    RELEASED_LAST_3_YEARS = (20, 'in the last 3 years')
+    RELEASED_LAST_10_YEARS = (21, 'in the last 10 years')
+    RELEASED_UNKNOWN = (22, 'unknown')
+
+
+LEVEL_SEARCH_VALUES: Final[List[SearchValue]] = [
+    SearchValue.LEVEL_BEGINNER, SearchValue.LEVEL_INTERMEDIATE, SearchValue.LEVEL_ADVANCED,
+]
+RATING_SEARCH_VALUES: Final[List[SearchValue]] = [
+    SearchValue.RATING_AT_LEAST_1, SearchValue.RATING_AT_LEAST_2, SearchValue.RATING_AT_LEAST_3,
+    SearchValue.RATING_AT_LEAST_4, SearchValue.RATING_5, SearchValue.RATING_NEGATIVE,
+]
+DURATION_SEARCH_VALUES: Final[List[SearchValue]] = [
+    SearchValue.DURATION_UNDER_1H, SearchValue.DURATION_1H_TO_3H, SearchValue.DURATION_3H_TO_10H, SearchValue.DURATION_OVER_10H,
+]
+RELEASED_SEARCH_VALUES: Final[List[SearchValue]] = [
+    SearchValue.RELEASED_LAST_YEAR, SearchValue.RELEASED_LAST_3_YEARS, SearchValue.RELEASED_LAST_10_YEARS,
+    SearchValue.RELEASED_UNKNOWN,
+]
 
 
 class SearchFlag(Base):
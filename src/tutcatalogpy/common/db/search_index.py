@@ -0,0 +1,257 @@
+"""Full text search of the tutorials, with SQLite FTS5 tables kept in sync by the scanner.
+
+The indexes have a row per folder, with the folder id as its rowid. The
+scanner updates the rows of the folders it changes; triggers remove the rows
+of the deleted folders and update the paths of the renamed disks.
+
+The words index matches words by prefix and ranks with BM25. The trigram
+index tolerates typos and transliterations: the titles, authors and folder
+names are stored without accents and case, and the folders sharing the most
+trigrams with the search text are ranked by their similarity.
+"""
+
+import itertools
+import logging
+import math
+import re
+from typing import Dict, Final, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select, column, func, select, table
+
+from unidecode import unidecode
+
+from tutcatalogpy.common.db.base import FIELD_SEPARATOR
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+SEARCH_INDEX_TABLE: Final[str] = 'tutorial_search'
+TRIGRAM_INDEX_TABLE: Final[str] = 'tutorial_trigram'
+TRIGRAM_VOCABULARY_TABLE: Final[str] = 'tutorial_trigram_vocabulary'
+# folders indexed by statement, below the limit of the SQL variables of SQLite
+UPDATE_BATCH_SIZE: Final[int] = 500
+
+# bm25 weights of the columns, in the order of the table
+COLUMN_WEIGHTS: Final[List[float]] = [10.0, 1.0, 5.0, 5.0, 2.0]
+
+# the most similar folders returned
+FUZZY_MATCHES: Final[int] = 1000
+# the part of the trigrams of the search text a folder must have
+FUZZY_THRESHOLD: Final[float] = 0.5
+
+_CREATE_TABLE: Final[str] = f"""
+CREATE VIRTUAL TABLE {SEARCH_INDEX_TABLE} USING fts5(
+    title, description, authors, tags, path,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+_SELECT_ROWS: Final[str] = f"""
+SELECT
+    folder.id,
+    coalesce(tutorial.title, ''),
+    coalesce(tutorial.description, ''),
+    replace(coalesce(tutorial.all_authors, ''), '{FIELD_SEPARATOR}', ' '),
+    replace(coalesce(tutorial.all_tags, ''), '{FIELD_SEPARATOR}', ' '),
+    coalesce(disk.disk_name || '/', '') || folder.folder_parent || '/' || folder.folder_name
+FROM folder
+LEFT JOIN tutorial ON tutorial.id = folder.tutorial_id
+LEFT JOIN disk ON disk.id = folder.disk_id
+"""
+
+_INSERT_ROWS: Final[str] = f'INSERT INTO {SEARCH_INDEX_TABLE} (rowid, title, description, authors, tags, path) {_SELECT_ROWS}'
+
+# the trigrams are only matched, so their positions aren't stored
+_CREATE_TRIGRAM_TABLE: Final[str] = f"""
+CREATE VIRTUAL TABLE {TRIGRAM_INDEX_TABLE} USING fts5(text, tokenize = 'trigram', detail = 'none')
+"""
+
+# how many folders have each trigram
+_CREATE_TRIGRAM_VOCABULARY_TABLE: Final[str] = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {TRIGRAM_VOCABULARY_TABLE} USING fts5vocab({TRIGRAM_INDEX_TABLE}, 'row')
+"""
+
+# search_normalize() is registered on the connections by register_search_functions()
+_INSERT_TRIGRAM_ROWS: Final[str] = f"""
+INSERT INTO {TRIGRAM_INDEX_TABLE} (rowid, text)
+SELECT
+    folder.id,
+    search_normalize(coalesce(tutorial.title, '') || ' ' || coalesce(tutorial.all_authors, '') || ' ' || folder.folder_name)
+FROM folder
+LEFT JOIN tutorial ON tutorial.id = folder.tutorial_id
+"""
+
+_TABLES: Final[Dict[str, Tuple[str, str]]] = {
+    SEARCH_INDEX_TABLE: (_CREATE_TABLE, _INSERT_ROWS),
+    TRIGRAM_INDEX_TABLE: (_CREATE_TRIGRAM_TABLE, _INSERT_TRIGRAM_ROWS),
+}
+
+_CREATE_TRIGGERS: Final[List[str]] = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS folder_search_delete AFTER DELETE ON folder BEGIN
+        DELETE FROM {SEARCH_INDEX_TABLE} WHERE rowid = old.id;
+        DELETE FROM {TRIGRAM_INDEX_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS disk_search_update AFTER UPDATE OF disk_name ON disk BEGIN
+        DELETE FROM {SEARCH_INDEX_TABLE} WHERE rowid IN (SELECT id FROM folder WHERE disk_id = new.id);
+        {_INSERT_ROWS} WHERE folder.disk_id = new.id;
+    END
+    """,
+]
+
+# a quoted phrase, or a word
+_TERM_REGEX: Final = re.compile(r'"([^"]*)"?|(\S+)')
+_NOT_WORD_REGEX: Final = re.compile(r'[\W_]+')
+
+_search_index = table(SEARCH_INDEX_TABLE, column('rowid'), column(SEARCH_INDEX_TABLE))
+
+
+def normalize_search_text(value: str) -> str:
+    """Return the words of the text without accents and case, separated by a space."""
+    return _NOT_WORD_REGEX.sub(' ', unidecode(value).casefold()).strip()
+
+
+def _padded_search_text(value: Optional[str]) -> str:
+    # the spaces make trigrams of the first and last letters of the text
+    return f' {normalize_search_text(value or "")} '
+
+
+def trigrams(value: str) -> Set[str]:
+    """Return the trigrams of the words of the text, as the trigram index stores them."""
+    result = set()
+    for word in normalize_search_text(value).split():
+        padded = f' {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def register_search_functions(engine: Engine) -> None:
+    """Register the SQL functions of the indexes on the connections of the engine, before it connects."""
+    def on_connect(dbapi_connection, connection_record) -> None:
+        dbapi_connection.create_function('search_normalize', 1, _padded_search_text, deterministic=True)
+
+    event.listen(engine, 'connect', on_connect)
+
+
+def create_search_index(engine: Engine) -> None:
+    """Create the indexes of a catalog that doesn't have them, and index its folders."""
+    table_names = inspect(engine).get_table_names()
+    with engine.begin() as connection:
+        for table_name, (create_table, insert_rows) in _TABLES.items():
+            if table_name not in table_names:
+                log.info('Creating the search index %s.', table_name)
+                connection.exec_driver_sql(create_table)
+                connection.exec_driver_sql(insert_rows)
+        connection.exec_driver_sql(_CREATE_TRIGRAM_VOCABULARY_TABLE)
+        for trigger in _CREATE_TRIGGERS:
+            connection.exec_driver_sql(trigger)
+
+
+def update_search_index(session: Session, folder_ids: Iterable[int]) -> None:
+    """Index the folders again, after their tutorial or path changed."""
+    folder_ids = list(folder_ids)
+    if not folder_ids:
+        return
+    session.flush()
+    for start in range(0, len(folder_ids), UPDATE_BATCH_SIZE):
+        batch = folder_ids[start:start + UPDATE_BATCH_SIZE]
+        ids = {f'id_{i}': folder_id for i, folder_id in enumerate(batch)}
+        placeholders = ', '.join(f':{name}' for name in ids)
+        for table_name, (_, insert_rows) in _TABLES.items():
+            session.execute(text(f'DELETE FROM {table_name} WHERE rowid IN ({placeholders})'), ids)
+            session.execute(text(f'{insert_rows} WHERE folder.id IN ({placeholders})'), ids)
+
+
+class SearchTerm(NamedTuple):
+    text: str  # a word or the words of a phrase, without the quotes
+    query: str  # the FTS5 query matching it
+
+
+def search_terms(search_text: str) -> List[SearchTerm]:
+    """Split the search text into terms: the words match by prefix, the quoted phrases exactly."""
+    terms = []
+    for match in _TERM_REGEX.finditer(search_text):
+        phrase, word = match.groups()
+        value = phrase if phrase is not None else word
+        # the tokenizer drops the punctuation; a term without a token would match nothing
+        if not re.search(r'\w', value):
+            continue
+        quoted = '"' + value.replace('"', '""') + '"'
+        terms.append(SearchTerm(value, quoted if phrase is not None else quoted + '*'))
+    return terms
+
+
+def search_query(search_text: str) -> Optional[str]:
+    """Return the FTS5 query matching all the terms of the search text, None if it has none."""
+    terms = search_terms(search_text)
+    return ' '.join(term.query for term in terms) if terms else None
+
+
+def matching_folders(query: str) -> Select:
+    """Select the ids of the folders matching an FTS5 query."""
+    return select(_search_index.c.rowid).where(_search_index.c[SEARCH_INDEX_TABLE].op('MATCH')(query))
+
+
+def folder_ranks(query: str) -> Select:
+    """Select the ids of the folders matching an FTS5 query and their BM25 rank, lower is better."""
+    rank = func.bm25(_search_index.c[SEARCH_INDEX_TABLE], *COLUMN_WEIGHTS)
+    return (
+        select(_search_index.c.rowid.label('folder_id'), rank.label('rank'))
+        .where(_search_index.c[SEARCH_INDEX_TABLE].op('MATCH')(query))
+    )
+
+
+def fuzzy_matches(session: Session, search_text: str) -> List[Tuple[int, float]]:
+    """Return the folders similar to the search text and their similarity, the most similar first.
+
+    The similarity is the part of the trigrams of the search text the folder
+    has. A folder missing at most n trigrams has two of any n + 2 trigrams,
+    so the index only returns the folders with two of the rarest ones, and
+    SQLite counts the trigrams they share with the search text.
+    """
+    search_trigrams = sorted(trigrams(search_text))
+    if not search_trigrams:
+        return []
+
+    names = {f'trigram_{i}': trigram for i, trigram in enumerate(search_trigrams)}
+    placeholders = ', '.join(f':{name}' for name in names)
+    folder_counts: Dict[str, int] = dict(session.execute(
+        text(f'SELECT term, doc FROM {TRIGRAM_VOCABULARY_TABLE} WHERE term IN ({placeholders})'),
+        names,
+    ).all())
+
+    needed = max(1, math.ceil(len(search_trigrams) * FUZZY_THRESHOLD))
+    missing = len(search_trigrams) - needed
+    rarest = sorted(
+        (trigram for trigram in search_trigrams if trigram in folder_counts),
+        key=lambda trigram: folder_counts[trigram],
+    )[:missing + 2]
+    phrases = ['"' + trigram.replace('"', '""') + '"' for trigram in rarest]
+    if needed == 1:
+        query = ' OR '.join(phrases)
+    else:
+        query = ' OR '.join(f'({a} AND {b})' for a, b in itertools.combinations(phrases, 2))
+    if not query:
+        return []
+
+    shared = ' + '.join(f'(instr(text, :{name}) > 0)' for name in names)
+    rows = session.execute(
+        text(
+            f'SELECT rowid, {shared} AS shared FROM {TRIGRAM_INDEX_TABLE} '
+            f'WHERE {TRIGRAM_INDEX_TABLE} MATCH :query AND shared >= :needed '
+            'ORDER BY shared DESC, rowid LIMIT :limit'
+        ),
+        {'query': query, 'needed': needed, 'limit': FUZZY_MATCHES, **names},
+    )
+    return [(folder_id, shared / len(search_trigrams)) for folder_id, shared in rows]
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
@@ -0,0 +1,27 @@
+from sqlalchemy.orm import backref, relationship
+from sqlalchemy.schema import Column, ForeignKey
+from sqlalchemy.sql.sqltypes import Integer
+
+from tutcatalogpy.common.db.base import Base
+from tutcatalogpy.common.db.blob_mixin import BlobMixin
+
+
+class Thumbnail(BlobMixin, Base):
+
+    __tablename__ = 'thumbnail'
+
+    id_ = Column('id', Integer, primary_key=True)
+    cover_id = Column(Integer, ForeignKey('cover.id'), index=True)
+    size = Column(Integer, nullable=False)  # the longest side the thumbnail was made for
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+
+    cover = relationship(
+        'Cover',
+        backref=backref('thumbnails', order_by='Thumbnail.size', cascade='all, delete-orphan'),
+    )
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
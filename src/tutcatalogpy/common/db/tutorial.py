@@ -1,7 +1,7 @@
 import enum
 from typing import Optional
 
-from sqlalchemy.orm import backref, relationship
+from sqlalchemy.orm import backref, deferred, relationship
 from sqlalchemy.sql.schema import Column, ForeignKey
 from sqlalchemy.sql.sqltypes import Boolean, DateTime, Integer, Text
 
@@ -43,16 +43,22 @@ class Tutorial(Base):
     publisher_id = Column(Integer, ForeignKey('publisher.id'))
     title = Column(Text, default='', nullable=False)
     released = Column(Text, default='', nullable=False)
-    duration = Column(Integer, default=0, nullable=False)
-    level = Column(Integer, default=0, nullable=False)
+    # released as yyyymmdd, with 00 for the month or day info.tc doesn't give, 0 if unknown; for sorting and ranges
+    released_on = Column(Integer, default=0, index=True)
+    # indexed for the filters of the search; see tutorial_filters
+    duration = Column(Integer, default=0, nullable=False, index=True)
+    level = Column(Integer, default=0, nullable=False, index=True)
     url = Column(Text, default='', nullable=False)
-    description = Column(Text, default='', nullable=False)
+    # only loaded when rendered; see Folder.get()
+    description = deferred(Column(Text, default='', nullable=False))
+    # rendered by the scanner when it parses info.tc; None in catalogs scanned before it did
+    description_html = deferred(Column(Text))
 
     is_complete = Column(Boolean, default=True, nullable=False)
     is_online = Column(Boolean, default=False, nullable=False)
     todo = Column(Boolean, default=False, nullable=False)
     progress = Column(Integer, default=Progress.NOT_STARTED.value, nullable=False)
-    rating = Column(Integer, default=0, nullable=False)
+    rating = Column(Integer, default=0, nullable=False, index=True)
 
     # aggregate fields used by models to search and filter and by view to display
     # separator: base.FIELD_SEPARATOR
@@ -0,0 +1,60 @@
+"""Convert the Markdown descriptions of the tutorials to HTML, with a cache of the results."""
+
+import logging
+import threading
+from typing import Final, Hashable, Optional
+
+from markdown import Markdown
+from markdown.extensions import admonition, fenced_code, nl2br, sane_lists, tables
+
+from tutcatalogpy.common.lru_cache import LruCache
+from tutcatalogpy.common.thread_pool import run_in_thread_pool
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class DescriptionRenderer:
+    """Render descriptions from any thread; each thread has its own Markdown converter."""
+
+    CACHE_SIZE: Final[int] = 4 * 1024 * 1024  # characters of HTML
+
+    def __init__(self, cache_size: int = CACHE_SIZE) -> None:
+        self.cache: LruCache[Hashable, str] = LruCache(cache_size, len)
+        self.__local = threading.local()
+
+    def to_html(self, description: str) -> str:
+        md: Optional[Markdown] = getattr(self.__local, 'md', None)
+        if md is None:
+            md = Markdown(extensions=[
+                admonition.AdmonitionExtension(),
+                fenced_code.FencedCodeExtension(),
+                nl2br.Nl2BrExtension(),
+                sane_lists.SaneListExtension(),
+                tables.TableExtension(),
+            ])
+            self.__local.md = md
+        html = md.convert(description)
+        md.reset()
+        return html
+
+    def render(self, key: Hashable, description: str) -> str:
+        """Return the HTML of the description; `key` must change when the description changes."""
+        html = self.cache.get(key)
+        if html is None:
+            html = self.to_html(description)
+            self.cache.put(key, html)
+        return html
+
+    def render_later(self, key: Hashable, description: str) -> None:
+        """Render the description in the thread pool, so it is cached when it is shown."""
+        if key not in self.cache:
+            run_in_thread_pool(lambda: self.render(key, description))
+
+
+description_renderer = DescriptionRenderer()
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
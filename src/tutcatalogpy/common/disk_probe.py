@@ -0,0 +1,76 @@
+"""Check if disks are online without blocking on dead mounts.
+
+A stale NFS/SMB mount can block `Path.exists()` for minutes, so every
+path is probed in its own daemon thread and the caller only waits
+until the timeout expires. Probes that didn't finish in time are
+reported as unresponsive and are left to finish in the background.
+"""
+
+import enum
+import logging
+import threading
+from pathlib import Path
+from time import monotonic
+from typing import Dict, Final, Iterable, Set
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+PROBE_TIMEOUT_SEC: Final[float] = 3.0
+
+
+class PathState(enum.IntEnum):
+    OFFLINE = 0
+    ONLINE = 1
+    UNRESPONSIVE = 2
+
+
+# paths with a probe that is still blocked in the OS; we don't start another one until it returns
+_pending: Set[Path] = set()
+_lock = threading.Lock()
+
+
+def probe_paths(paths: Iterable[Path], timeout: float = PROBE_TIMEOUT_SEC) -> Dict[Path, PathState]:
+    """Return the state of each path, waiting at most `timeout` seconds in total."""
+    paths = set(paths)
+    results: Dict[Path, PathState] = {}
+    threads: Dict[Path, threading.Thread] = {}
+
+    def probe(path: Path) -> None:
+        try:
+            state = PathState.ONLINE if path.exists() else PathState.OFFLINE
+        except OSError as ex:
+            log.warning('Could not probe %s: %s', path, str(ex))
+            state = PathState.OFFLINE
+        with _lock:
+            results[path] = state
+            _pending.discard(path)
+
+    for path in paths:
+        with _lock:
+            if path in _pending:
+                log.warning('Previous probe of %s did not return yet.', path)
+                continue
+            _pending.add(path)
+        thread = threading.Thread(target=probe, args=(path,), name=f'probe {path}', daemon=True)
+        threads[path] = thread
+        thread.start()
+
+    deadline = monotonic() + timeout
+    for thread in threads.values():
+        thread.join(max(0.0, deadline - monotonic()))
+
+    with _lock:
+        states = dict(results)
+
+    for path in paths:
+        if path not in states:
+            log.warning('%s did not respond in %s seconds; marking it as offline.', path, timeout)
+            states[path] = PathState.UNRESPONSIVE
+
+    return states
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
@@ -0,0 +1,181 @@
+"""Listings of the files of a tutorial folder, stored in the catalog so offline disks stay browsable.
+
+The listing is encoded densely: the entries are sorted by path, each path
+only stores what differs from the previous one, the numbers are varints,
+and the whole is compressed with zlib.
+"""
+
+import logging
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Final, Iterable, List, NamedTuple, Optional, Tuple
+
+from tutcatalogpy.common.io_throttle import IoThrottle
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+FORMAT_VERSION: Final[int] = 1
+SEPARATOR: Final[str] = '/'
+
+
+class FileEntry(NamedTuple):
+    path: str  # relative to the folder, separated by SEPARATOR
+    size: int  # 0 for folders
+    modified: int  # seconds since the epoch
+    is_dir: bool
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit(SEPARATOR, 1)[-1]
+
+    @property
+    def parent(self) -> str:
+        """The path of the parent folder, '' at the root of the listing."""
+        return self.path.rpartition(SEPARATOR)[0]
+
+
+def list_files(path: Path, throttle: Optional[IoThrottle] = None, previous: Optional[Iterable[FileEntry]] = None) -> List[FileEntry]:
+    """List the files and folders under path, sorted by path.
+
+    The subfolders of `previous` with the same modification time are not
+    listed again: adding, removing or renaming a file changes the
+    modification time of its folder. A file changed in place keeps its
+    previous size and time until its folder changes.
+    """
+    previous_children: Dict[str, List[FileEntry]] = {}
+    previous_modified: Dict[str, int] = {}
+    for entry in previous or []:
+        previous_children.setdefault(entry.parent, []).append(entry)
+        if entry.is_dir:
+            previous_modified[entry.path] = entry.modified
+
+    entries: List[FileEntry] = []
+    # absolute and relative paths, and modification time of the folders to list
+    folders: List[Tuple[str, str, Optional[int]]] = [(str(path), '', None)]
+    while folders:
+        folder, relative, modified = folders.pop()
+        if throttle is not None:
+            throttle.consume()
+
+        if modified is not None and previous_modified.get(relative) == modified:
+            for entry in previous_children.get(relative, []):
+                if entry.is_dir:
+                    entry_path = os.path.join(folder, entry.name)
+                    try:
+                        entry = entry._replace(modified=int(os.stat(entry_path, follow_symlinks=False).st_mtime))
+                    except OSError:
+                        # removed since the folder was listed; its folder will be listed again
+                        continue
+                    folders.append((entry_path, entry.path, entry.modified))
+                entries.append(entry)
+            continue
+
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    entry_path = f'{relative}{SEPARATOR}{entry.name}' if relative else entry.name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError as ex:
+                        log.warning("Couldn't stat %s: %s", entry.path, ex)
+                        continue
+                    if throttle is not None:
+                        throttle.consume()
+                    entries.append(FileEntry(entry_path, 0 if is_dir else stat.st_size, int(stat.st_mtime), is_dir))
+                    if is_dir:
+                        folders.append((entry.path, entry_path, int(stat.st_mtime)))
+        except OSError as ex:
+            log.warning("Couldn't list %s: %s", folder, ex)
+
+    entries.sort(key=lambda e: e.path)
+    return entries
+
+
+def folder_size(entries: Iterable[FileEntry]) -> int:
+    return sum(entry.size for entry in entries if not entry.is_dir)
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def encode_file_listing(entries: Iterable[FileEntry]) -> bytes:
+    out = bytearray()
+    previous_path = b''
+    previous_modified = 0
+    for entry in sorted(entries, key=lambda e: e.path):
+        # names that aren't valid UTF-8 come from os.scandir() as surrogates
+        path = entry.path.encode('utf-8', 'surrogateescape')
+        prefix = os.path.commonprefix([previous_path, path])
+        _encode_varint(len(prefix), out)
+        _encode_varint(len(path) - len(prefix), out)
+        out += path[len(prefix):]
+        _encode_varint(entry.size * 2 + entry.is_dir, out)
+        # the files of a folder are often modified about the same time
+        _encode_varint(_zigzag(entry.modified - previous_modified), out)
+        previous_path = path
+        previous_modified = entry.modified
+    return bytes([FORMAT_VERSION]) + zlib.compress(bytes(out), 9)
+
+
+def decode_file_listing(data: bytes) -> List[FileEntry]:
+    """Decode a listing; raise ValueError if it isn't one."""
+    if not data or data[0] != FORMAT_VERSION:
+        raise ValueError('Unknown file listing format')
+    try:
+        raw = zlib.decompress(data[1:])
+    except zlib.error as ex:
+        raise ValueError(f'Corrupted file listing: {ex}') from ex
+
+    entries: List[FileEntry] = []
+    previous_path = b''
+    previous_modified = 0
+    pos = 0
+    try:
+        while pos < len(raw):
+            prefix_length, pos = _decode_varint(raw, pos)
+            suffix_length, pos = _decode_varint(raw, pos)
+            path = previous_path[:prefix_length] + raw[pos:pos + suffix_length]
+            pos += suffix_length
+            if pos > len(raw):
+                raise IndexError()
+            size_and_dir, pos = _decode_varint(raw, pos)
+            modified_delta, pos = _decode_varint(raw, pos)
+            modified = previous_modified + _unzigzag(modified_delta)
+            entries.append(FileEntry(path.decode('utf-8', 'surrogateescape'), size_and_dir >> 1, modified, bool(size_and_dir & 1)))
+            previous_path = path
+            previous_modified = modified
+    except IndexError as ex:
+        raise ValueError('Truncated file listing') from ex
+    return entries
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
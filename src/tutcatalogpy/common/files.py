@@ -6,11 +6,15 @@ import platform
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Set
+from typing import Final, Optional, Set
+
+from tutcatalogpy.common.io_throttle import IoThrottle
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+READ_CHUNK_SIZE: Final[int] = 256 * 1024
+
 
 def relative_path(reference: str, name: str) -> str:
     """Return a file located in the same dir with reference.
@@ -39,19 +43,21 @@ def get_modification_datetime(stat: os.stat_result) -> datetime:
     return datetime.fromtimestamp(stat.st_mtime)
 
 
-def get_folder_size(path: Path) -> int:
-    """Compute the size of a folder and its subfolders."""
-    size: int = 0
-    count: int = 0
-
-    for root, _, files in os.walk(path):
-        p = Path(root)
-        for name in files:
-            size += (p / name).stat().st_size
-            count += 1
-
-    log.debug('Folder size: %s: %d (%d files)', path, size, count)
-    return size
+def read_file(path: Path, throttle: Optional[IoThrottle] = None) -> bytes:
+    """Read a binary file in chunks, so a throttle can pace the reads."""
+    if throttle is None:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    chunks = []
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            throttle.consume(len(chunk))
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b''.join(chunks)
 
 
 def get_images(path: Path) -> Set[Path]:
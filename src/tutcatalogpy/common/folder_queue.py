@@ -0,0 +1,107 @@
+"""Thread safe priority queue of folders waiting for a details update."""
+
+import enum
+import heapq
+import itertools
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class FolderPriority(enum.IntEnum):
+    """Lower values are processed first."""
+    USER = 0  # explicitly requested by the user
+    SELECTED = 1  # selected in the tutorials dock
+    VISIBLE = 2  # visible in the tutorials dock
+    BACKGROUND = 3  # part of a scan
+
+
+class FolderQueue:
+    """Each folder is queued at most once, with the best priority it was given.
+
+    Folders with the same priority come out in the order they were pushed.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__heap: List[Tuple[FolderPriority, int, int]] = []
+        # current priority of every queued folder; heap entries that don't match it are stale
+        self.__priority: Dict[int, FolderPriority] = {}
+        # priorities given to folders before they were queued
+        self.__hints: Dict[int, FolderPriority] = {}
+        self.__counter = itertools.count()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__priority)
+
+    def __contains__(self, folder_id: int) -> bool:
+        with self.__lock:
+            return folder_id in self.__priority
+
+    def push(self, folder_ids: Iterable[int], priority: FolderPriority) -> None:
+        """Queue the folders, or raise their priority if they are already queued."""
+        with self.__lock:
+            for folder_id in folder_ids:
+                current = self.__priority.get(folder_id)
+                if current is None:
+                    self.__push(folder_id, min(priority, self.__hints.pop(folder_id, priority)))
+                elif priority < current:
+                    self.__push(folder_id, priority)
+
+    def promote(self, folder_ids: Iterable[int], priority: FolderPriority) -> None:
+        """Raise the priority of the folders, without queueing them.
+
+        Folders that are not queued yet get the priority when they are pushed.
+        """
+        with self.__lock:
+            for folder_id in folder_ids:
+                current = self.__priority.get(folder_id)
+                if current is None:
+                    self.__hints[folder_id] = min(priority, self.__hints.get(folder_id, priority))
+                elif priority < current:
+                    self.__push(folder_id, priority)
+
+    def pop(self, lowest: FolderPriority = FolderPriority.BACKGROUND) -> Optional[Tuple[int, FolderPriority]]:
+        """Return the next (folder id, priority), or None if nothing at `lowest` priority or better is queued."""
+        with self.__lock:
+            while self.__heap:
+                priority, _, folder_id = self.__heap[0]
+                if self.__priority.get(folder_id) != priority:
+                    heapq.heappop(self.__heap)
+                    continue
+                if priority > lowest:
+                    return None
+                heapq.heappop(self.__heap)
+                del self.__priority[folder_id]
+                return folder_id, priority
+            return None
+
+    def discard(self, folder_id: int) -> None:
+        with self.__lock:
+            self.__priority.pop(folder_id, None)
+
+    def clear(self, keep: Optional[FolderPriority] = None) -> None:
+        """Remove all folders and hints, except the folders with `keep` priority or better."""
+        with self.__lock:
+            self.__hints.clear()
+            if keep is None:
+                self.__priority.clear()
+            else:
+                self.__priority = {
+                    folder_id: priority for folder_id, priority in self.__priority.items() if priority <= keep
+                }
+            self.__heap = [entry for entry in self.__heap if self.__priority.get(entry[2]) == entry[0]]
+            heapq.heapify(self.__heap)
+
+    def __push(self, folder_id: int, priority: FolderPriority) -> None:
+        self.__priority[folder_id] = priority
+        heapq.heappush(self.__heap, (priority, next(self.__counter), folder_id))
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
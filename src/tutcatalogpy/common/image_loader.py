@@ -0,0 +1,121 @@
+"""Decode the images of the catalog in a thread pool, so the GUI doesn't stutter on large covers."""
+
+import logging
+import threading
+from typing import Dict, Final, Hashable, Optional
+
+from PySide2.QtCore import QBuffer, QByteArray, QIODevice, QObject, QSize, Qt, QThreadPool, Signal
+from PySide2.QtGui import QImage, QImageReader
+
+from tutcatalogpy.common.db.dal import dal
+from tutcatalogpy.common.lru_cache import LruCache
+from tutcatalogpy.common.thread_pool import run_in_thread_pool
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def decode_image(data: bytes, size: Optional[QSize] = None) -> QImage:
+    """Decode the image; if it doesn't fit in `size`, it is decoded directly at the scaled size."""
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)
+    if size is not None:
+        original = reader.size()
+        if original.isValid() and (original.width() > size.width() or original.height() > size.height()):
+            reader.setScaledSize(original.scaled(size, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        log.warning('Could not decode image: %s', reader.errorString())
+    return image
+
+
+class ImageLoader(QObject):
+    """Decode blobs in the background and keep the decoded images in a LRU cache.
+
+    Requests belong to a group, e.g. the cover dock. Cancelling a group,
+    usually because the selection moved on, drops the results of its
+    pending requests.
+    """
+
+    CACHE_SIZE: Final[int] = 64 * 1024 * 1024
+
+    # group, key, image
+    loaded = Signal(str, object, QImage)
+
+    # key, image
+    __decoded = Signal(object, QImage)
+
+    def __init__(self, cache_size: int = CACHE_SIZE, pool: Optional[QThreadPool] = None) -> None:
+        super().__init__()
+        self.cache: LruCache[Hashable, QImage] = LruCache(cache_size, lambda image: image.sizeInBytes())
+        self.__pool = pool if pool is not None else QThreadPool.globalInstance()
+        self.__lock = threading.Lock()
+        self.__generations: Dict[str, int] = {}
+        # the groups, with their generation, waiting for each image being decoded
+        self.__pending: Dict[Hashable, Dict[str, int]] = {}
+        self.__decoded.connect(self.__on_decoded, Qt.QueuedConnection)
+
+    def load(self, group: str, key: Hashable, blob_hash: Optional[str], size: Optional[QSize] = None) -> Optional[QImage]:
+        """Return the cached image, or start decoding it and return None; `loaded` is emitted when it is ready.
+
+        An image that is already decoding for any group is not decoded again.
+        """
+        image = self.cache.get(key)
+        if image is not None:
+            return image
+        if blob_hash is None:
+            return None
+
+        with self.__lock:
+            requests = self.__pending.get(key)
+            decoding = requests is not None and self.__is_wanted(requests)
+            if requests is None:
+                requests = self.__pending[key] = {}
+            requests[group] = self.__generations.get(group, 0)
+        if decoding:
+            return None
+
+        size = QSize(size) if size is not None else None
+
+        def decode() -> None:
+            data = dal.blobs.get(blob_hash) if self.__wanted(key) else None
+            self.__decoded.emit(key, QImage() if data is None else decode_image(data, size))
+
+        run_in_thread_pool(decode, self.__pool)
+        return None
+
+    def cancel(self, group: str) -> None:
+        with self.__lock:
+            self.__generations[group] = self.__generations.get(group, 0) + 1
+
+    def __is_wanted(self, requests: Dict[str, int]) -> bool:
+        return any(self.__generations.get(group, 0) == generation for group, generation in requests.items())
+
+    def __wanted(self, key: Hashable) -> bool:
+        """Is a group still waiting for the image?"""
+        with self.__lock:
+            requests = self.__pending.get(key)
+            return requests is not None and self.__is_wanted(requests)
+
+    def __on_decoded(self, key: Hashable, image: QImage) -> None:
+        with self.__lock:
+            requests = self.__pending.pop(key, {})
+            groups = [group for group, generation in requests.items() if self.__generations.get(group, 0) == generation]
+        if not groups:
+            log.debug('Dropped stale image %s', key)
+            return
+        if not image.isNull():
+            self.cache.put(key, image)
+        for group in groups:
+            self.loaded.emit(group, key, image)
+
+
+image_loader = ImageLoader()
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
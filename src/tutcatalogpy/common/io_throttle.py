@@ -0,0 +1,102 @@
+"""Limit and measure the disk I/O done by the scanner."""
+
+import logging
+import time
+from typing import Callable, Final, Optional, Tuple
+
+from humanize import naturalsize
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class IoThrottle:
+    """Token buckets for bytes and operations per second.
+
+    A budget of 0 means unlimited; the throttle then only measures the rates.
+    """
+
+    RATE_WINDOW_SEC: Final[float] = 2.0
+
+    def __init__(
+        self,
+        bytes_per_sec: int = 0,
+        ops_per_sec: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.bytes_per_sec = bytes_per_sec
+        self.ops_per_sec = ops_per_sec
+        self.__clock = clock
+        self.__sleep = sleep
+
+        now = clock()
+        self.__last_refill = now
+        # buckets hold at most one second worth of budget
+        self.__bytes_allowance: float = bytes_per_sec
+        self.__ops_allowance: float = ops_per_sec
+
+        self.__window_start = now
+        self.__window_bytes: int = 0
+        self.__window_ops: int = 0
+        self.__rate: Optional[Tuple[float, float]] = None
+
+    @property
+    def throttled(self) -> bool:
+        return self.bytes_per_sec > 0 or self.ops_per_sec > 0
+
+    def consume(self, size: int = 0, ops: int = 1) -> None:
+        """Account for `ops` operations moving `size` bytes; sleep if over budget."""
+        self.__window_bytes += size
+        self.__window_ops += ops
+
+        if self.throttled:
+            self.__refill()
+            delay = 0.0
+            if self.bytes_per_sec > 0:
+                self.__bytes_allowance -= size
+                if self.__bytes_allowance < 0:
+                    delay = max(delay, -self.__bytes_allowance / self.bytes_per_sec)
+            if self.ops_per_sec > 0:
+                self.__ops_allowance -= ops
+                if self.__ops_allowance < 0:
+                    delay = max(delay, -self.__ops_allowance / self.ops_per_sec)
+            if delay > 0:
+                self.__sleep(delay)
+
+        self.__update_rate()
+
+    def rate(self) -> Tuple[float, float]:
+        """Return the measured (bytes/s, ops/s) over the last complete window."""
+        if self.__rate is None:
+            elapsed = self.__clock() - self.__window_start
+            return (self.__window_bytes / elapsed, self.__window_ops / elapsed) if elapsed > 0 else (0.0, 0.0)
+        return self.__rate
+
+    def rate_str(self) -> str:
+        bytes_per_sec, ops_per_sec = self.rate()
+        text = f'{naturalsize(bytes_per_sec)}/s, {ops_per_sec:.0f} ops/s'
+        return text + ' (throttled)' if self.throttled else text
+
+    def __refill(self) -> None:
+        now = self.__clock()
+        elapsed = now - self.__last_refill
+        self.__last_refill = now
+        if self.bytes_per_sec > 0:
+            self.__bytes_allowance = min(self.bytes_per_sec, self.__bytes_allowance + elapsed * self.bytes_per_sec)
+        if self.ops_per_sec > 0:
+            self.__ops_allowance = min(self.ops_per_sec, self.__ops_allowance + elapsed * self.ops_per_sec)
+
+    def __update_rate(self) -> None:
+        now = self.__clock()
+        elapsed = now - self.__window_start
+        if elapsed >= self.RATE_WINDOW_SEC:
+            self.__rate = (self.__window_bytes / elapsed, self.__window_ops / elapsed)
+            self.__window_start = now
+            self.__window_bytes = 0
+            self.__window_ops = 0
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
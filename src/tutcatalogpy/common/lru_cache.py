@@ -0,0 +1,80 @@
+"""Least recently used cache bounded by the total size of its values."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LruCache(Generic[K, V]):
+    """Evict the least recently used values when the total size exceeds `max_size`.
+
+    A value larger than `max_size` is not cached at all.
+    """
+
+    def __init__(self, max_size: int, size_of: Callable[[V], int]) -> None:
+        self.max_size = max_size
+        self.__size_of = size_of
+        self.__items: 'OrderedDict[K, V]' = OrderedDict()
+        self.__sizes: Dict[K, int] = {}
+        self.__size: int = 0
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__items)
+
+    def __contains__(self, key: K) -> bool:
+        with self.__lock:
+            return key in self.__items
+
+    @property
+    def size(self) -> int:
+        with self.__lock:
+            return self.__size
+
+    def get(self, key: K) -> Optional[V]:
+        with self.__lock:
+            value = self.__items.get(key)
+            if value is not None:
+                self.__items.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        size = self.__size_of(value)
+        with self.__lock:
+            self.__remove(key)
+            if size > self.max_size:
+                log.debug('Not caching %s: %s bytes is over the limit.', key, size)
+                return
+            self.__items[key] = value
+            self.__sizes[key] = size
+            self.__size += size
+            while self.__size > self.max_size:
+                self.__remove(next(iter(self.__items)))
+
+    def remove(self, key: K) -> None:
+        with self.__lock:
+            self.__remove(key)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__items.clear()
+            self.__sizes.clear()
+            self.__size = 0
+
+    def __remove(self, key: K) -> None:
+        if key in self.__items:
+            del self.__items[key]
+            self.__size -= self.__sizes.pop(key)
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
@@ -0,0 +1,96 @@
+"""Read the duration, resolution and codec of the videos of the tutorials.
+
+Parsing a video reads its headers, which is slow on spinning and network
+disks and holds the GIL in pymediainfo, so the videos are read in a pool
+of processes.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Final, FrozenSet, Iterator, List, NamedTuple, Optional
+
+from pymediainfo import MediaInfo
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+VIDEO_EXTENSIONS: Final[FrozenSet[str]] = frozenset([
+    'avi', 'flv', 'm2ts', 'm4v', 'mkv', 'mov', 'mp4', 'mpeg', 'mpg', 'mts', 'ts', 'webm', 'wmv',
+])
+
+
+class MediaDetails(NamedTuple):
+    duration: int  # milliseconds
+    width: int
+    height: int
+    codec: str
+
+
+def _to_int(value) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def read_media_details(path: str) -> Optional[MediaDetails]:
+    """Return the details of the first video track, None if the file has no video or can't be read."""
+    try:
+        info = MediaInfo.parse(path)
+    except (OSError, RuntimeError, ValueError) as ex:
+        log.warning("Couldn't read the media details of %s: %s", path, ex)
+        return None
+
+    if not info.video_tracks:
+        return None
+    video = info.video_tracks[0]
+    duration = _to_int(video.duration)
+    if duration == 0 and info.general_tracks:
+        duration = _to_int(info.general_tracks[0].duration)
+    return MediaDetails(duration, _to_int(video.width), _to_int(video.height), video.format or '')
+
+
+class MediaReader:
+    """Read the media details of many files in a pool of processes, shared by the scans of the disks."""
+
+    MAX_WORKERS: Final[int] = 4
+
+    def __init__(self, max_workers: int = min(MAX_WORKERS, os.cpu_count() or 1)) -> None:
+        self.__max_workers = max_workers
+        self.__executor: Optional[Executor] = None
+        self.__lock = threading.Lock()
+
+    def __get_executor(self) -> Executor:
+        with self.__lock:
+            if self.__executor is None:
+                # forking a process with the threads of Qt running isn't safe
+                context = multiprocessing.get_context('spawn')
+                self.__executor = ProcessPoolExecutor(self.__max_workers, mp_context=context)
+            return self.__executor
+
+    def submit(self, paths: List[str]) -> Iterator[Optional[MediaDetails]]:
+        """Start reading the files; iterating the result waits for their details, in the order of `paths`."""
+        if not paths:
+            return iter([])
+        return self.__get_executor().map(read_media_details, paths)
+
+    def read(self, paths: List[str]) -> List[Optional[MediaDetails]]:
+        """Return the details of the files, in the order of `paths`."""
+        return list(self.submit(paths))
+
+    def shutdown(self) -> None:
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(cancel_futures=True)
+                self.__executor = None
+
+
+media_reader = MediaReader()
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
@@ -1,52 +1,90 @@
 from enum import IntEnum
+from typing import Any, Dict, List, NamedTuple, Optional
 
-from natsort import os_sorted
-from PySide2.QtCore import QModelIndex, QSortFilterProxyModel, Qt
+from natsort import os_sort_keygen
+from PySide2.QtCore import QAbstractItemModel, QModelIndex, QSortFilterProxyModel, Qt
 from PySide2.QtWidgets import QFileSystemModel
 
 
+# the order of the file browser of the OS, e.g. 'file 2' before 'file 10'
+natural_sort_key = os_sort_keygen()
+
+
+class SortKey(NamedTuple):
+    is_dir: bool
+    name: Any  # natural sort key of the lowercase file name
+    size: int
+
+
 class FileBrowserFilterProxyModel(QSortFilterProxyModel):
+    """Sort folders first, and the names in the natural order of the file browser of the OS.
+
+    The sort keys are computed once per row, as sorting compares each row many times.
+    """
+
     class Column(IntEnum):
         NAME = 0
         SIZE = 1
         KIND = 2
         MODIFIED = 3
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # by the internal id of the source rows, which is the same for all their columns
+        self.__sort_keys: Dict[int, SortKey] = {}
+
+    def setSourceModel(self, model: Optional[QAbstractItemModel]) -> None:
+        old_model = self.sourceModel()
+        if old_model is not None:
+            for signal in self.__invalidating_signals(old_model):
+                signal.disconnect(self.__clear_sort_keys)
+        self.__clear_sort_keys()
+        super().setSourceModel(model)
+        if model is not None:
+            for signal in self.__invalidating_signals(model):
+                signal.connect(self.__clear_sort_keys)
+
+    @staticmethod
+    def __invalidating_signals(model: QAbstractItemModel) -> List:
+        # removed rows free their ids for new rows
+        return [model.rowsInserted, model.rowsRemoved, model.dataChanged, model.layoutChanged, model.modelReset]
+
+    def __clear_sort_keys(self, *args) -> None:
+        self.__sort_keys.clear()
+
+    def __sort_key(self, fsm: QFileSystemModel, index: QModelIndex) -> SortKey:
+        key = self.__sort_keys.get(index.internalId())
+        if key is None:
+            key = SortKey(fsm.isDir(index), natural_sort_key(fsm.fileName(index).lower()), fsm.size(index))
+            self.__sort_keys[index.internalId()] = key
+        return key
+
     def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
-        def sort_by_name(ascending, left_info, right_info):
-            left_name = left_info.fileName().lower()
-            right_name = right_info.fileName().lower()
-            s = os_sorted((left_name, right_name), reverse=not ascending)
-            return s[0] == left_name
+        def sort_by_name(ascending: bool) -> bool:
+            if ascending:
+                return left_key.name < right_key.name
+            return right_key.name < left_key.name
 
         fsm: QFileSystemModel = self.sourceModel()
         if fsm is not None:
             column = self.sortColumn()
             ascending = (self.sortOrder() == Qt.AscendingOrder)
-            left_info = fsm.fileInfo(left)
-            right_info = fsm.fileInfo(right)
+            left_key = self.__sort_key(fsm, left)
+            right_key = self.__sort_key(fsm, right)
 
             if column == self.Column.NAME.value:
-                if left_info.isDir() and not right_info.isDir():
-                    return ascending
-                elif not left_info.isDir() and right_info.isDir():
-                    return not ascending
-                else:
-                    return sort_by_name(True, left_info, right_info)
+                if left_key.is_dir != right_key.is_dir:
+                    return left_key.is_dir == ascending
+                return sort_by_name(True)
 
             elif column == self.Column.SIZE.value:
-                if left_info.isDir() and not right_info.isDir():
-                    return True
-                elif not left_info.isDir() and right_info.isDir():
-                    return False
-                elif left_info.isDir() and right_info.isDir():
-                    return sort_by_name(ascending, left_info, right_info)
-                else:
-                    left_size = left_info.size()
-                    right_size = right_info.size()
-                    if left_size == right_size:
-                        return sort_by_name(ascending, left_info, right_info)
-                    return left_size < right_size
+                if left_key.is_dir != right_key.is_dir:
+                    return left_key.is_dir
+                elif left_key.is_dir:
+                    return sort_by_name(ascending)
+                elif left_key.size == right_key.size:
+                    return sort_by_name(ascending)
+                return left_key.size < right_key.size
 
         return super().lessThan(left, right)
 
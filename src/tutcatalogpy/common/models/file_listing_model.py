@@ -0,0 +1,82 @@
+from typing import Dict, Final, List
+
+from humanize import naturalsize
+from PySide2.QtCore import QDateTime, Qt
+from PySide2.QtGui import QStandardItem, QStandardItemModel
+from PySide2.QtWidgets import QFileIconProvider
+
+from tutcatalogpy.common.file_listing import FileEntry
+from tutcatalogpy.common.models.file_browser_filter_proxy_model import natural_sort_key
+
+
+class FileListingModel(QStandardItemModel):
+    """The files of a folder from its stored listing, with the columns and order of the file browser."""
+
+    SORT_ROLE: Final[int] = Qt.UserRole + 1
+    # the rank of the names in descending order, the folders still first
+    DESCENDING_NAME_ROLE: Final[int] = Qt.UserRole + 2
+
+    NAME_COLUMN: Final[int] = 0
+
+    HEADERS: Final[List[str]] = ['Name', 'Size', 'Kind', 'Date Modified']
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.setSortRole(self.SORT_ROLE)
+        self.setHorizontalHeaderLabels(self.HEADERS)
+        self.__icons = QFileIconProvider()
+
+    def set_entries(self, entries: List[FileEntry]) -> None:
+        self.removeRows(0, self.rowCount())
+        folder_icon = self.__icons.icon(QFileIconProvider.Folder)
+        file_icon = self.__icons.icon(QFileIconProvider.File)
+
+        # the folders sort first in both orders, the names in natural order
+        names = sorted(entries, key=lambda e: natural_sort_key(e.name.lower()))
+        folders = [entry for entry in names if entry.is_dir]
+        files = [entry for entry in names if not entry.is_dir]
+        name_ranks = {entry.path: rank for rank, entry in enumerate(folders + files)}
+        descending_name_ranks = {entry.path: rank for rank, entry in enumerate(folders[::-1] + files[::-1])}
+
+        parents: Dict[str, QStandardItem] = {'': self.invisibleRootItem()}
+        for entry in entries:
+            parent = parents.get(entry.parent)
+            if parent is None:
+                continue
+
+            name = QStandardItem(folder_icon if entry.is_dir else file_icon, entry.name)
+            name.setData(name_ranks[entry.path], self.SORT_ROLE)
+            name.setData(descending_name_ranks[entry.path], self.DESCENDING_NAME_ROLE)
+
+            size = QStandardItem('--' if entry.is_dir else naturalsize(entry.size))
+            size.setData(-1 if entry.is_dir else entry.size, self.SORT_ROLE)
+            size.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+            suffix = entry.name.rpartition('.')[2] if '.' in entry.name else ''
+            kind = QStandardItem('Folder' if entry.is_dir else f'{suffix} File'.strip())
+            kind.setData(kind.text().lower(), self.SORT_ROLE)
+
+            modified = QDateTime.fromSecsSinceEpoch(entry.modified)
+            date = QStandardItem(modified.toString(Qt.SystemLocaleShortDate))
+            date.setData(entry.modified, self.SORT_ROLE)
+
+            row = [name, size, kind, date]
+            for item in row:
+                item.setEditable(False)
+            parent.appendRow(row)
+            if entry.is_dir:
+                parents[entry.path] = name
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        if column != self.NAME_COLUMN or order == Qt.AscendingOrder:
+            super().sort(column, order)
+            return
+        # like the file browser, only the names are reversed and the folders stay first
+        self.setSortRole(self.DESCENDING_NAME_ROLE)
+        super().sort(column, Qt.AscendingOrder)
+        self.setSortRole(self.SORT_ROLE)
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
@@ -1,5 +1,5 @@
 from enum import IntEnum, IntFlag, auto
-from typing import Final
+from typing import Final, Tuple
 
 from PySide2.QtCore import QSettings
 
@@ -9,6 +9,9 @@ class ScanConfig:
     SETTINGS_STARTUP: Final[str] = 'startup'
     SETTINGS_NORMAL: Final[str] = 'normal'
     SETTINGS_EXTENDED: Final[str] = 'extended'
+    SETTINGS_THROTTLE_PRESET: Final[str] = 'throttle_preset'
+    SETTINGS_THROTTLE_BYTES_PER_SEC: Final[str] = 'throttle_bytes_per_sec'
+    SETTINGS_THROTTLE_OPS_PER_SEC: Final[str] = 'throttle_ops_per_sec'
 
     class Mode(IntEnum):
         STARTUP = auto()
@@ -21,6 +24,11 @@ class ScanConfig:
         REMOTE_DISKS = auto()
         UNCHECKED_DISKS = auto()
         FOLDER_DETAILS = auto()
+        THROTTLE_IO = auto()
+
+    class ThrottlePreset(IntEnum):
+        CUSTOM = 0
+        IDLE = auto()  # small budgets and idle thread priority
 
     DEFAULT_STARTUP: Final = (
         Option.NOTHING
@@ -38,12 +46,22 @@ class ScanConfig:
         | Option.FOLDER_DETAILS
     )
 
+    # per disk budgets; 0 means unlimited
+    DEFAULT_THROTTLE_BYTES_PER_SEC: Final[int] = 20 * 1024 * 1024
+    DEFAULT_THROTTLE_OPS_PER_SEC: Final[int] = 500
+    IDLE_THROTTLE_BYTES_PER_SEC: Final[int] = 2 * 1024 * 1024
+    IDLE_THROTTLE_OPS_PER_SEC: Final[int] = 50
+
     option: dict[Mode, Option] = {
         Mode.STARTUP: DEFAULT_STARTUP,
         Mode.NORMAL: DEFAULT_NORMAL,
         Mode.EXTENDED: DEFAULT_EXTENDED,
     }
 
+    throttle_preset: ThrottlePreset = ThrottlePreset.CUSTOM
+    throttle_bytes_per_sec: int = DEFAULT_THROTTLE_BYTES_PER_SEC
+    throttle_ops_per_sec: int = DEFAULT_THROTTLE_OPS_PER_SEC
+
     def save_settings(self, settings: QSettings) -> None:
         settings.beginGroup(self.SETTINGS_GROUP)
         for key, mode in [
@@ -52,6 +70,9 @@ class ScanConfig:
             (ScanConfig.SETTINGS_EXTENDED, ScanConfig.Mode.EXTENDED),
         ]:
             settings.setValue(key, int(self.option[mode]))
+        settings.setValue(ScanConfig.SETTINGS_THROTTLE_PRESET, int(self.throttle_preset))
+        settings.setValue(ScanConfig.SETTINGS_THROTTLE_BYTES_PER_SEC, self.throttle_bytes_per_sec)
+        settings.setValue(ScanConfig.SETTINGS_THROTTLE_OPS_PER_SEC, self.throttle_ops_per_sec)
         settings.endGroup()
 
     def load_settings(self, settings: QSettings) -> None:
@@ -62,10 +83,30 @@ class ScanConfig:
             (ScanConfig.SETTINGS_EXTENDED, ScanConfig.Mode.EXTENDED, ScanConfig.DEFAULT_EXTENDED),
         ]:
             self.option[mode] = ScanConfig.Option(settings.value(key, defaultValue=int(default_value), type=int))
+        self.throttle_preset = ScanConfig.ThrottlePreset(
+            settings.value(ScanConfig.SETTINGS_THROTTLE_PRESET, defaultValue=int(ScanConfig.ThrottlePreset.CUSTOM), type=int)
+        )
+        self.throttle_bytes_per_sec = settings.value(
+            ScanConfig.SETTINGS_THROTTLE_BYTES_PER_SEC, defaultValue=ScanConfig.DEFAULT_THROTTLE_BYTES_PER_SEC, type=int
+        )
+        self.throttle_ops_per_sec = settings.value(
+            ScanConfig.SETTINGS_THROTTLE_OPS_PER_SEC, defaultValue=ScanConfig.DEFAULT_THROTTLE_OPS_PER_SEC, type=int
+        )
         settings.endGroup()
 
     def can_scan(self, mode: Mode, option: Option) -> bool:
         return bool(self.option[mode] & option)
 
+    def throttle_budget(self, mode: Mode) -> Tuple[int, int]:
+        """Return the (bytes/s, ops/s) budget per disk; (0, 0) if the mode isn't throttled."""
+        if not self.can_scan(mode, ScanConfig.Option.THROTTLE_IO):
+            return (0, 0)
+        if self.throttle_preset == ScanConfig.ThrottlePreset.IDLE:
+            return (ScanConfig.IDLE_THROTTLE_BYTES_PER_SEC, ScanConfig.IDLE_THROTTLE_OPS_PER_SEC)
+        return (self.throttle_bytes_per_sec, self.throttle_ops_per_sec)
+
+    def idle_priority(self, mode: Mode) -> bool:
+        return self.can_scan(mode, ScanConfig.Option.THROTTLE_IO) and self.throttle_preset == ScanConfig.ThrottlePreset.IDLE
+
 
 scan_config = ScanConfig()
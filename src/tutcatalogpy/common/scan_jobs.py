@@ -0,0 +1,228 @@
+"""Run scan jobs concurrently when they don't touch the same disks."""
+
+import enum
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Final, FrozenSet, Iterable, List, Optional
+
+from PySide2.QtCore import QObject, Signal
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class CancellationToken:
+    def __init__(self) -> None:
+        self.__event = threading.Event()
+
+    def cancel(self) -> None:
+        self.__event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.__event.is_set()
+
+
+class Job:
+    class Kind(enum.Enum):
+        SCAN = 'scan'  # runs the other jobs of a scan
+        DISKS = 'disks'
+        FOLDERS = 'folders'
+        FOLDER_DETAILS = 'folder details'
+        MAINTENANCE = 'maintenance'
+
+    def __init__(
+        self,
+        kind: Kind,
+        name: str,
+        disk_ids: Optional[Iterable[int]],
+        func: Callable[[CancellationToken], None],
+        token: Optional[CancellationToken] = None,
+    ) -> None:
+        """`disk_ids` are the disks locked by the job; None locks all disks."""
+        self.kind = kind
+        self.name = name
+        self.disk_ids: Optional[FrozenSet[int]] = None if disk_ids is None else frozenset(disk_ids)
+        self.token = token if token is not None else CancellationToken()
+        self.__func = func
+        self.__done = threading.Event()
+
+    def __repr__(self) -> str:
+        return f'Job({self.kind.value}: {self.name})'
+
+    def conflicts_with(self, other: 'Job') -> bool:
+        if self.disk_ids is None:
+            return other.disk_ids is None or len(other.disk_ids) > 0
+        if other.disk_ids is None:
+            return len(self.disk_ids) > 0
+        return not self.disk_ids.isdisjoint(other.disk_ids)
+
+    def run(self) -> None:
+        try:
+            if not self.token.cancelled:
+                self.__func(self.token)
+        finally:
+            self.__done.set()
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def finish(self) -> None:
+        """Mark a job as done without running it."""
+        self.__done.set()
+
+    @property
+    def done(self) -> bool:
+        return self.__done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.__done.wait(timeout)
+
+
+class JobScheduler(QObject):
+    """Start the jobs in order, as soon as they don't conflict with the running jobs.
+
+    A job waits for the conflicting jobs that were submitted before it,
+    so jobs on the same disk always run in the order they were submitted.
+    """
+
+    MAX_WORKERS: Final[int] = 4
+
+    busy_changed = Signal(bool)
+
+    def __init__(self, max_workers: int = MAX_WORKERS) -> None:
+        super().__init__()
+        self.max_workers = max_workers
+        self.__condition = threading.Condition()
+        self.__pending: List[Job] = []
+        # jobs run by the caller of run(); they start themselves when they can
+        self.__waiting: List[Job] = []
+        self.__running: List[Job] = []
+        self.__pool_job_count: int = 0
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__executor_workers: int = 0
+        self.__busy: bool = False
+
+    @property
+    def busy(self) -> bool:
+        with self.__condition:
+            return len(self.__pending) > 0 or len(self.__running) > 0
+
+    def running_jobs(self) -> List[Job]:
+        with self.__condition:
+            return list(self.__running)
+
+    def submit(self, job: Job) -> Job:
+        """Run the job in the thread pool."""
+        with self.__condition:
+            self.__add_pending(job)
+            self.__start_ready_jobs()
+        return job
+
+    def run(self, job: Job) -> None:
+        """Run the job in the calling thread and return when it is done."""
+        with self.__condition:
+            self.__add_pending(job)
+            self.__waiting.append(job)
+            self.__condition.wait_for(lambda: job.token.cancelled or self.__can_start(job))
+            self.__waiting.remove(job)
+            self.__pending.remove(job)
+            cancelled = job.token.cancelled
+            if cancelled:
+                job.finish()
+                self.__start_ready_jobs()
+                self.__emit_if_idle()
+            else:
+                self.__running.append(job)
+
+        if not cancelled:
+            self.__execute(job)
+
+    def cancel_all(self) -> None:
+        with self.__condition:
+            for job in self.__pending + self.__running:
+                job.cancel()
+            self.__start_ready_jobs()
+            self.__emit_if_idle()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all jobs are done; return False on timeout."""
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not self.__pending and not self.__running, timeout)
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self.wait()
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    # the busy state is emitted with the lock held, so the receivers see the changes in order
+    def __add_pending(self, job: Job) -> None:
+        self.__pending.append(job)
+        log.debug('Queued %s', job)
+        if not self.__busy:
+            self.__busy = True
+            self.busy_changed.emit(True)
+
+    def __emit_if_idle(self) -> None:
+        if self.__busy and not self.__pending and not self.__running:
+            self.__busy = False
+            self.busy_changed.emit(False)
+
+    def __can_start(self, job: Job) -> bool:
+        for other in self.__running:
+            if job.conflicts_with(other):
+                return False
+        for other in self.__pending:
+            if other is job:
+                break
+            if job.conflicts_with(other):
+                return False
+        return True
+
+    def __start_ready_jobs(self) -> None:
+        for job in list(self.__pending):
+            if job in self.__waiting:
+                continue
+            if job.token.cancelled:
+                log.debug('Dropped cancelled %s', job)
+                self.__pending.remove(job)
+                job.finish()
+                continue
+            if self.__pool_job_count >= self.max_workers:
+                break
+            if self.__can_start(job):
+                self.__pending.remove(job)
+                self.__running.append(job)
+                self.__pool_job_count += 1
+                if self.__executor is None or self.__executor_workers != self.max_workers:
+                    # the jobs running in the old pool finish there
+                    if self.__executor is not None:
+                        self.__executor.shutdown(wait=False)
+                    self.__executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='scan')
+                    self.__executor_workers = self.max_workers
+                self.__executor.submit(self.__execute, job, True)
+        # wake up the waiting run() calls and wait()
+        self.__condition.notify_all()
+
+    def __execute(self, job: Job, in_pool: bool = False) -> None:
+        log.debug('Started %s', job)
+        try:
+            job.run()
+        except Exception:
+            log.exception('%s failed.', job)
+        finally:
+            log.debug('Finished %s', job)
+            with self.__condition:
+                self.__running.remove(job)
+                if in_pool:
+                    self.__pool_job_count -= 1
+                self.__start_ready_jobs()
+                self.__emit_if_idle()
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
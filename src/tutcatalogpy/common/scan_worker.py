@@ -1,21 +1,41 @@
 import logging
+import os
+import threading
+from contextlib import contextmanager
+from copy import copy
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 from time import perf_counter_ns
-from typing import Final, List, NamedTuple, Tuple, Optional
+from typing import Callable, Dict, Final, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from humanize import precisedelta
-from PySide2.QtCore import QObject, QThread, Signal
+from PySide2.QtCore import QObject, QThread, Qt, Signal
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.session import Session
 
 from tutcatalogpy.common.db.cover import Cover
 from tutcatalogpy.common.db.dal import dal
 from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.facet_index import FolderFacet, folder_facets, update_facet_index
+from tutcatalogpy.common.db.file import File
 from tutcatalogpy.common.db.image import Image
+from tutcatalogpy.common.db.media import Media
+from tutcatalogpy.common.db.search_index import UPDATE_BATCH_SIZE, update_search_index
 from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.thumbnail import Thumbnail
 from tutcatalogpy.common.db.tutorial import Tutorial
-from tutcatalogpy.common.files import get_creation_datetime, get_modification_datetime, get_folder_size, get_images
+from tutcatalogpy.common.description_renderer import description_renderer
+from tutcatalogpy.common.disk_probe import probe_paths
+from tutcatalogpy.common.file_listing import FileEntry, decode_file_listing, encode_file_listing, folder_size, list_files
+from tutcatalogpy.common.files import get_creation_datetime, get_modification_datetime, get_images, read_file
+from tutcatalogpy.common.folder_queue import FolderPriority, FolderQueue
+from tutcatalogpy.common.io_throttle import IoThrottle
+from tutcatalogpy.common.media_info import VIDEO_EXTENSIONS, MediaReader, media_reader
 from tutcatalogpy.common.scan_config import ScanConfig, scan_config
+from tutcatalogpy.common.scan_jobs import CancellationToken, Job, JobScheduler
+from tutcatalogpy.common.thumbnails import ImageSize, ThumbnailData, make_thumbnails
 from tutcatalogpy.common.tutorial_data import TutorialData
 
 log = logging.getLogger(__name__)
@@ -38,9 +58,26 @@ def get_path_stats(path: Path) -> PathStats:
     return PathStats(modified, created, id, size)
 
 
-def get_image_data(path: Path) -> bytes:
-    with open(path, 'rb') as f:
-        return f.read()
+class CoverFile(NamedTuple):
+    """A cover file read by ScanWorker.read_folder_cover()."""
+    file_format: Cover.FileFormat
+    stats: PathStats
+    data: Optional[bytes]  # None if the stored cover is the same file
+    thumbnails: Optional[Tuple[Optional[ImageSize], Tuple[ThumbnailData, ...]]]  # None if the stored ones are current
+
+
+class FolderDetails(NamedTuple):
+    """The details of a folder read before any write, see ScanWorker.read_folder_details()."""
+    folder: Folder
+    throttle: Optional[IoThrottle]
+    facets: Set[FolderFacet]  # before the update
+    entries: List[FileEntry]
+    media: Callable[[], Dict[str, Media]]  # waits for the videos being read
+    cover: Optional[CoverFile]
+
+
+def get_image_data(path: Path, throttle: Optional[IoThrottle] = None) -> bytes:
+    return read_file(path, throttle)
 
 
 class ScanWorker(QObject):
@@ -51,22 +88,41 @@ class ScanWorker(QObject):
         folder_name: str = ''
         folder_count: int = 0
         folder_index: int = 0
+        io_rate: str = ''
 
     COVER_NAMES: Final[List[Cover.FileFormat]] = [Cover.FileFormat.JPG, Cover.FileFormat.PNG]
     INFO_TC_NAME: Final[str] = 'info.tc'
 
     scan_started = Signal()
     scan_finished = Signal()
+    # the ids of the folders added, changed or deleted by the scan, emitted before scan_finished
+    folders_changed = Signal(list)
     progress_changed = Signal(Progress)
 
     def __init__(self):
         super().__init__()
-        self.__scanning: bool = False
-        self.__cancel: bool = False
+        self.__mode: ScanConfig.Mode = ScanConfig.Mode.STARTUP
+        self.__throttles: Dict[int, IoThrottle] = {}
+        self.__throttles_lock = threading.Lock()
+        self.__queues: Dict[int, FolderQueue] = {}
+        self.__queues_lock = threading.Lock()
+        self.__changed_folders: Set[int] = set()
+        self.__changed_folders_lock = threading.Lock()
+        self.__scan_job: Optional[Job] = None
+        self.__scan_start = perf_counter_ns()
+        self.__progress = self.Progress()
+        self.__progress_lock = threading.Lock()
+
+        self.__scheduler = JobScheduler()
+        self.__scheduler.busy_changed.connect(self.__on_scheduler_busy_changed, Qt.DirectConnection)
 
     @property
     def scanning(self) -> bool:
-        return self.__scanning
+        return self.__scheduler.busy
+
+    @property
+    def scheduler(self) -> JobScheduler:
+        return self.__scheduler
 
     @property
     def elapsed_time_str(self) -> str:
@@ -81,189 +137,330 @@ class ScanWorker(QObject):
         return (perf_counter_ns() - self.__scan_start) // 1_000_000
 
     def cancel(self) -> None:
-        self.__cancel = True
+        self.__scheduler.cancel_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all jobs are done; return False on timeout."""
+        return self.__scheduler.wait(timeout)
+
+    def shutdown(self) -> None:
+        self.__scheduler.shutdown()
+        media_reader.shutdown()
+
+    def folder_queue(self, disk_id: int) -> FolderQueue:
+        with self.__queues_lock:
+            queue = self.__queues.get(disk_id)
+            if queue is None:
+                queue = FolderQueue()
+                self.__queues[disk_id] = queue
+            return queue
+
+    def __on_scheduler_busy_changed(self, busy: bool) -> None:
+        if busy:
+            self.__scan_start = perf_counter_ns()
+            self.scan_started.emit()
+        else:
+            with self.__changed_folders_lock:
+                changed_folders = sorted(self.__changed_folders)
+                self.__changed_folders.clear()
+            if changed_folders:
+                self.folders_changed.emit(changed_folders)
+            self.scan_finished.emit()
+
+    def __folders_changed(self, folder_ids: Iterable[int]) -> None:
+        with self.__changed_folders_lock:
+            self.__changed_folders.update(folder_ids)
+
+    def __emit_progress(
+        self, progress: Progress, disk_name: str, folder: Folder, io_rate: Optional[str] = None, count: bool = False
+    ) -> None:
+        """Update the progress, shared by the jobs of the disks, and emit a copy of it."""
+        with self.__progress_lock:
+            progress.disk_name = disk_name
+            progress.folder_parent = folder.folder_parent
+            progress.folder_name = folder.folder_name
+            if io_rate is not None:
+                progress.io_rate = io_rate
+            emitted = copy(progress)
+            if count:
+                progress.folder_index += 1
+        self.progress_changed.emit(emitted)
+
+    def __update_max_workers(self) -> None:
+        # in memory databases share a single connection between the threads
+        self.__scheduler.max_workers = JobScheduler.MAX_WORKERS if dal.concurrent else 1
+
+    @contextmanager
+    def __thread_priority(self) -> Iterator[None]:
+        thread = QThread.currentThread()
+        priority = thread.priority()
+        if scan_config.idle_priority(self.__mode):
+            thread.setPriority(QThread.IdlePriority)
+        try:
+            yield
+        finally:
+            if thread.priority() != priority:
+                thread.setPriority(priority)
 
     def scan(self, mode: ScanConfig.Mode) -> None:
-        if self.__scanning:
+        """Scan the disks and return when done; folder updates requested meanwhile run concurrently."""
+        if self.__scan_job is not None and not self.__scan_job.done:
             log.warning('scan already in progress; ignoring new scan request.')
             return
 
-        self.scan_started.emit()
-
         log.info('Starting %s scan.', mode.name)
-        self.__scan_start = perf_counter_ns()
-        self.__scanning = True
-        self.__cancel = False
-
-        self.__progress = self.Progress()
+        self.__update_max_workers()
+        job = Job(Job.Kind.SCAN, mode.name, [], partial(self.__scan, mode))
+        self.__scan_job = job
+        self.__scheduler.run(job)
 
-        session = None
-
-        try:
-            session = dal.Session()
-            self.__scan(session, mode)
-        except Exception:
-            log.exception('Scan failed.')
-        finally:
-            if session:
-                session.close()
-
-        if self.__cancel:
+        if job.token.cancelled:
             log.warning('Scan canceled.')
         else:
             log.debug('Scan finished.')
 
-        self.__scanning = False
+    def update_folder_details(self, folder_ids: List[int]) -> None:
+        """Update the folders as soon as possible, even if a scan is running."""
+        self.__update_max_workers()
+        for disk_id, ids in self.__folders_by_disk(folder_ids).items():
+            # a running scan of the disk processes them before its other folders
+            self.folder_queue(disk_id).push(ids, FolderPriority.USER)
+            self.__scheduler.submit(
+                Job(Job.Kind.FOLDER_DETAILS, f'{len(ids)} folders', [disk_id], partial(self.__update_user_folders, disk_id))
+            )
 
-        self.scan_finished.emit()
+    def prioritize_folders(self, folder_ids: List[int], priority: FolderPriority) -> None:
+        """Process the folders earlier if they are waiting for the running scan."""
+        for disk_id, ids in self.__folders_by_disk(folder_ids).items():
+            self.folder_queue(disk_id).promote(ids, priority)
 
-    def update_folder_details(self, folders: List[Tuple[str, str, str]]) -> None:
-        if self.__scanning:
-            log.warning('scan already in progress; ignoring new scan request.')
+    def __folders_by_disk(self, folder_ids: List[int]) -> Dict[int, List[int]]:
+        result: Dict[int, List[int]] = {}
+        if not folder_ids:
+            return result
+        session = dal.Session()
+        try:
+            disk_ids = dict(session.query(Folder.id_, Folder.disk_id).filter(Folder.id_.in_(folder_ids)))
+        finally:
+            session.close()
+        for folder_id in folder_ids:
+            if folder_id in disk_ids:
+                result.setdefault(disk_ids[folder_id], []).append(folder_id)
+            else:
+                log.warning('Could not find folder in db: %s', folder_id)
+        return result
+
+    def __update_user_folders(self, disk_id: int, token: CancellationToken) -> None:
+        queue = self.folder_queue(disk_id)
+        job = queue.pop(FolderPriority.USER)
+        if job is None:
+            # already done by a scan
             return
 
-        self.scan_started.emit()
-
-        self.__scan_start = perf_counter_ns()
-        self.__scanning = True
-        self.__cancel = False
-
         progress = self.Progress()
         progress.step_name = 'Updating Folder Details'
-        progress.folder_count = len(folders)
-
-        session: Optional[Session] = None
+        progress.folder_count = len(queue) + 1
 
+        session = dal.Session()
         try:
-            session = dal.Session()
-            for index, (disk_parent, disk_name, folder_parent, folder_name) in enumerate(folders, start=1):
-                progress.disk_name = disk_name
-                progress.folder_parent = folder_parent
-                progress.folder_name = folder_name
-                progress.folder_index = index
-                self.progress_changed.emit(progress)
-
-                if self.__cancel:
-                    break
-                query = (
-                    session
-                    .query(
-                        Folder,
-                        Disk)
-                    .join(Disk)
-                    .filter(
-                        Disk.disk_parent == disk_parent,
-                        Disk.disk_name == disk_name,
-                        Folder.folder_parent == folder_parent,
-                        Folder.folder_name == folder_name
-                    )
-                    .first()
-                )
-                if query:
-                    folder, disk = query
-                    self.__update_folder_details(session, folder)
-                    log.info('Updated folder details: %s | %s | %s | %s', disk_parent, disk_name, folder_parent, folder_name)
-                else:
-                    log.warning('Could not find folder in db: %s | %s | %s | %s', disk_parent, disk_name, folder_parent, folder_name)
+            while job is not None and not token.cancelled:
+                folder_id, _ = job
+                progress.folder_index += 1
+                self.__update_queued_folder(session, folder_id, progress)
+                job = queue.pop(FolderPriority.USER)
         except Exception:
             log.exception('Update failed.')
         finally:
-            if session:
-                session.close()
+            session.close()
 
-        if self.__cancel:
+        if token.cancelled:
+            queue.clear()
             log.warning('Update canceled.')
         else:
             log.debug('Update finished.')
 
-        self.__scanning = False
+    def __update_queued_folder(self, session: Session, folder_id: int, progress: Progress) -> None:
+        folder: Optional[Folder] = session.query(Folder).filter(Folder.id_ == folder_id).first()
+        if folder is None:
+            log.warning('Could not find folder in db: %s', folder_id)
+            return
+
+        disk: Disk = folder.disk
+        self.__emit_progress(progress, disk.disk_name, folder)
 
-        self.scan_finished.emit()
+        if not disk.online:
+            log.warning('Skipping folder on offline disk: %s | %s | %s', disk.disk_name, folder.folder_parent, folder.folder_name)
+            return
 
-    def __scan(self, session: Session, mode: ScanConfig.Mode) -> None:
-        self.__scan_disks(session)
-        self.__scan_folders(session, mode)
-        self.__scan_folders_details(session, mode)
+        facets = self.__update_folder_details(session, folder)
+        self.__update_indexes(session, [folder.id_], facets)
+        log.info('Updated folder details: %s | %s | %s', disk.disk_name, folder.folder_parent, folder.folder_name)
+
+    def __serve_user_folders(self, session: Session, disk_id: int, token: CancellationToken) -> None:
+        """Let the folders requested by the user jump ahead of the running scan of their disk."""
+        queue = self.folder_queue(disk_id)
+        job = queue.pop(FolderPriority.USER)
+        while job is not None and not token.cancelled:
+            folder_id, _ = job
+            self.__update_queued_folder(session, folder_id, self.__progress)
+            job = queue.pop(FolderPriority.USER)
+
+    def __scan(self, mode: ScanConfig.Mode, token: CancellationToken) -> None:
+        self.__mode = mode
+        with self.__throttles_lock:
+            self.__throttles.clear()
+        self.__progress = self.Progress()
 
-    def __scan_disks(self, session: Session) -> None:
-        session.query(Disk).update({Disk.online: False})
-        session.commit()
+        try:
+            self.__scheduler.run(Job(Job.Kind.DISKS, 'probe', None, self.__scan_disks, token))
+            self.__scan_folders(mode, token)
+            self.__scan_folders_details(mode, token)
+            self.__scheduler.run(Job(Job.Kind.MAINTENANCE, 'blobs', None, self.__remove_unreferenced_blobs, token))
+            self.__scheduler.run(Job(Job.Kind.MAINTENANCE, 'media', None, self.__remove_unreferenced_media, token))
+        except Exception:
+            log.exception('Scan failed.')
+        finally:
+            # keep the user requests of a canceled scan; the rest will be scanned next time
+            with self.__queues_lock:
+                queues = list(self.__queues.values())
+            for queue in queues:
+                queue.clear(keep=FolderPriority.USER)
+
+    def __remove_unreferenced_blobs(self, token: CancellationToken) -> None:
+        dal.remove_unreferenced_blobs()
+
+    def __remove_unreferenced_media(self, token: CancellationToken) -> None:
+        dal.remove_unreferenced_media()
+
+    def __run_per_disk(self, kind: Job.Kind, disks: List[Tuple[int, str]], func: Callable, token: CancellationToken) -> None:
+        """Run `func(disk_id, token)` for each disk, concurrently, and wait for all of them."""
+        jobs = [
+            self.__scheduler.submit(Job(kind, disk_name, [disk_id], partial(func, disk_id), token))
+            for disk_id, disk_name in disks
+        ]
+        for job in jobs:
+            job.wait()
+
+    def __scan_disks(self, token: CancellationToken) -> None:
+        session = dal.Session()
+        try:
+            session.query(Disk).update({Disk.online: False})
+            session.commit()
 
-        for disk in session.query(Disk):
-            disk.online = disk.path().exists()
+            disks = session.query(Disk).all()
+            states = probe_paths(disk.path() for disk in disks)
+            for disk in disks:
+                disk.set_path_state(states[disk.path()])
 
-        session.commit()
+            session.commit()
+        finally:
+            session.close()
 
-    def __scan_folders(self, session: Session, mode: ScanConfig.Mode) -> None:
+    def __scan_folders(self, mode: ScanConfig.Mode, token: CancellationToken) -> None:
         self.__progress.step_name = 'Folders'
 
         self.__progress.folder_index = 0
-        for disk in session.query(Disk):
-            if not disk.online:
-                log.debug('Skipping offline %s', disk.disk_name)
-                continue
+        disks: List[Tuple[int, str]] = []
+        session = dal.Session()
+        try:
+            for disk in session.query(Disk):
+                if not disk.online:
+                    log.debug('Skipping offline %s', disk.disk_name)
+                    continue
 
-            if (disk.location == Disk.Location.LOCAL and not scan_config.can_scan(mode, ScanConfig.Option.LOCAL_DISKS)):
-                log.debug('Skipping local %s', disk.disk_name)
-                continue
+                if (disk.location == Disk.Location.LOCAL and not scan_config.can_scan(mode, ScanConfig.Option.LOCAL_DISKS)):
+                    log.debug('Skipping local %s', disk.disk_name)
+                    continue
 
-            if (disk.location == Disk.Location.REMOTE and not scan_config.can_scan(mode, ScanConfig.Option.REMOTE_DISKS)):
-                log.debug('Skipping remote %s', disk.disk_name)
-                continue
+                if (disk.location == Disk.Location.REMOTE and not scan_config.can_scan(mode, ScanConfig.Option.REMOTE_DISKS)):
+                    log.debug('Skipping remote %s', disk.disk_name)
+                    continue
 
-            if (not disk.checked and not scan_config.can_scan(mode, ScanConfig.Option.UNCHECKED_DISKS)):
-                log.debug('Skipping unchecked %s', disk.disk_name)
-                continue
+                if (not disk.checked and not scan_config.can_scan(mode, ScanConfig.Option.UNCHECKED_DISKS)):
+                    log.debug('Skipping unchecked %s', disk.disk_name)
+                    continue
 
-            self.__scan_folders_on_disk(mode, session, disk)
+                disks.append((disk.id_, disk.disk_name))
+        finally:
+            session.close()
+
+        self.__run_per_disk(Job.Kind.FOLDERS, disks, partial(self.__scan_folders_on_disk, mode), token)
 
         log.info('Scanned %s folders for basic info in %s.', self.__progress.folder_index, self.elapsed_time_str)
 
-    def __scan_folders_on_disk(self, mode: ScanConfig.Mode, session: Session, disk: Disk) -> None:
-        if self.__cancel:
-            return
+    def __scan_folders_on_disk(self, mode: ScanConfig.Mode, disk_id: int, token: CancellationToken) -> None:
+        session = dal.Session()
+        try:
+            disk: Disk = session.query(Disk).filter(Disk.id_ == disk_id).one()
 
-        log.debug('Scanning %s', disk.disk_name)
+            log.debug('Scanning %s', disk.disk_name)
 
-        (
-            session
-            .query(Folder)
-            .filter(Folder.disk_id == disk.id_)
-            .update({Folder.status: Folder.Status.UNKNOWN})
-        )
-
-        self.__scan_folders_on_path(mode, session, disk, disk.path(), disk.depth)
+            (
+                session
+                .query(Folder)
+                .filter(Folder.disk_id == disk.id_)
+                .update({Folder.status: Folder.Status.UNKNOWN})
+            )
 
-        # delete folders that still have their status set to UNKNOWN
-        # we must use 'session.delete()' to make sqlachemy delete the associated data
-        for folder in session.query(Folder).filter(Folder.disk_id == disk.id_).filter(Folder.status == Folder.Status.UNKNOWN):
-            session.delete(folder)
+            with self.__thread_priority():
+                self.__scan_folders_on_path(mode, session, disk, disk.path(), disk.depth, token)
 
-        session.commit()
+            if token.cancelled:
+                # don't delete the folders that weren't scanned yet
+                return
 
-    def __scan_folders_on_path(self, mode: ScanConfig.Mode, session: Session, disk: Disk, path: Path, depth: int) -> None:
-        if self.__cancel:
+            # delete folders that still have their status set to UNKNOWN
+            # we must use 'session.delete()' to make sqlachemy delete the associated data
+            folders = session.query(Folder).filter(Folder.disk_id == disk.id_).filter(Folder.status == Folder.Status.UNKNOWN).all()
+            folder_ids = [folder.id_ for folder in folders]
+            facets = folder_facets(session, folder_ids)
+            for folder in folders:
+                session.delete(folder)
+            update_facet_index(session, folder_ids, facets)
+            self.__folders_changed(folder_ids)
+
+            session.commit()
+        finally:
+            session.close()
+
+    def __throttle(self, disk: Disk) -> IoThrottle:
+        # the jobs of the disks ask for their throttles concurrently
+        with self.__throttles_lock:
+            throttle = self.__throttles.get(disk.id_)
+            if throttle is None:
+                throttle = IoThrottle(*scan_config.throttle_budget(self.__mode))
+                self.__throttles[disk.id_] = throttle
+            return throttle
+
+    def __scan_folders_on_path(
+        self, mode: ScanConfig.Mode, session: Session, disk: Disk, path: Path, depth: int, token: CancellationToken
+    ) -> None:
+        if token.cancelled:
             return
 
-        self.__progress.disk_name = disk.disk_name
+        throttle = self.__throttle(disk)
 
         for p in path.iterdir():
-            if self.__cancel:
+            if token.cancelled:
                 return
+            throttle.consume()
             if p.is_dir():
                 if depth == 0:
                     self.__update_folder(mode, session, disk, p)
+                    self.__serve_user_folders(session, disk.id_, token)
                     QThread.yieldCurrentThread()
                 else:
                     # if depth == self.depth:
                     #     print(f'publisher: {item.name}')
-                    self.__scan_folders_on_path(mode, session, disk, p, depth - 1)
+                    self.__scan_folders_on_path(mode, session, disk, p, depth - 1, token)
 
     def __update_folder(self, mode: ScanConfig.Mode, session: Session, disk: Disk, path: Path) -> None:
         relative_path = path.relative_to(disk.path())
         folder_parent = str(relative_path.parent)
         folder_name = str(relative_path.name)
 
+        throttle = self.__throttle(disk)
+        throttle.consume()
         modified, created, system_id, _ = get_path_stats(path)
 
         folder: Folder = (
@@ -317,16 +514,17 @@ class ScanWorker(QObject):
                 folder.folder_name = folder_name
                 folder.status = Folder.Status.RENAMED.value
 
+        if folder.status != Folder.Status.OK.value:
+            # the new folders get their id
+            session.flush()
+            update_search_index(session, [folder.id_])
+            self.__folders_changed([folder.id_])
         session.commit()
 
-        self.__progress.folder_parent = folder.folder_parent
-        self.__progress.folder_name = folder.folder_name
         # QThread.msleep(100)
+        self.__emit_progress(self.__progress, disk.disk_name, folder, throttle.rate_str(), count=True)
 
-        self.progress_changed.emit(self.__progress)
-        self.__progress.folder_index += 1
-
-    def __scan_folders_details(self, session: Session, mode: ScanConfig.Mode) -> None:
+    def __scan_folders_details(self, mode: ScanConfig.Mode, token: CancellationToken) -> None:
         if not scan_config.can_scan(mode, ScanConfig.Option.FOLDER_DETAILS):
             log.info('Skipping folder details.')
             return
@@ -334,104 +532,345 @@ class ScanWorker(QObject):
         self.__progress.folder_index = 0
         self.__progress.step_name = 'Folder details'
 
-        query = (
-            session
-            .query(
-                Folder,
-                Disk)
-            .join(Disk)
-            .filter(Disk.online == True)
-        )
+        session = dal.Session()
+        try:
+            query = (
+                session
+                .query(
+                    Folder.id_,
+                    Disk.id_,
+                    Disk.disk_name)
+                .join(Disk)
+                .filter(Disk.online == True)
+            )
 
-        if scan_config.can_scan(mode, ScanConfig.Option.LOCAL_DISKS) and not scan_config.can_scan(mode, ScanConfig.Option.REMOTE_DISKS):
-            query = query.filter(Disk.location == Disk.Location.LOCAL)
-        elif not scan_config.can_scan(mode, ScanConfig.Option.LOCAL_DISKS) and scan_config.can_scan(mode, ScanConfig.Option.REMOTE_DISKS):
-            query = query.filter(Disk.location == Disk.Location.REMOTE)
+            if scan_config.can_scan(mode, ScanConfig.Option.LOCAL_DISKS) and not scan_config.can_scan(mode, ScanConfig.Option.REMOTE_DISKS):
+                query = query.filter(Disk.location == Disk.Location.LOCAL)
+            elif not scan_config.can_scan(mode, ScanConfig.Option.LOCAL_DISKS) and scan_config.can_scan(mode, ScanConfig.Option.REMOTE_DISKS):
+                query = query.filter(Disk.location == Disk.Location.REMOTE)
 
-        if not scan_config.can_scan(mode, ScanConfig.Option.UNCHECKED_DISKS):
-            query = query.filter(Disk.checked == True)
+            if not scan_config.can_scan(mode, ScanConfig.Option.UNCHECKED_DISKS):
+                query = query.filter(Disk.checked == True)
 
-        folder_count = query.count()
+            folders_by_disk: Dict[Tuple[int, str], List[int]] = {}
+            for folder_id, disk_id, disk_name in query:
+                folders_by_disk.setdefault((disk_id, disk_name), []).append(folder_id)
+        finally:
+            session.close()
+
+        folder_count = sum(len(folder_ids) for folder_ids in folders_by_disk.values())
         log.info('Getting details for %s folders.', folder_count)
 
         self.__progress.folder_count = folder_count
 
-        folder: Folder
-        disk: Disk
-        for folder, disk in query:
-            if self.__cancel:
-                break
+        # folders selected or visible in the ui get promoted while the scan runs
+        for (disk_id, _), folder_ids in folders_by_disk.items():
+            self.folder_queue(disk_id).push(folder_ids, FolderPriority.BACKGROUND)
 
-            if folder.status not in [Folder.Status.DELETED.value] or not folder.size:
-                if scan_config.can_scan(mode, ScanConfig.Option.FOLDER_DETAILS):
-                    self.__update_folder_details(session, folder)
+        self.__run_per_disk(Job.Kind.FOLDER_DETAILS, list(folders_by_disk), self.__scan_folders_details_on_disk, token)
 
-            self.__progress.disk_name = disk.disk_name
-            self.__progress.folder_parent = folder.folder_parent
-            self.__progress.folder_name = folder.folder_name
-            self.progress_changed.emit(self.__progress)
-            self.__progress.folder_index += 1
-            # QThread.msleep(100)
+    def __scan_folders_details_on_disk(self, disk_id: int, token: CancellationToken) -> None:
+        queue = self.folder_queue(disk_id)
+        session = dal.Session()
+        try:
+            # indexed together, a statement per batch and each bitmap decoded once per batch instead of per folder
+            folder_ids: List[int] = []
+            facets: Set[FolderFacet] = set()
+            # the videos of each folder are read by the processes of the reader while the folder before it is written
+            read: Optional[FolderDetails] = None
+            with self.__thread_priority():
+                while not token.cancelled:
+                    job = queue.pop()
+                    if job is None:
+                        break
+
+                    folder_id, priority = job
+                    if priority == FolderPriority.USER:
+                        if read is not None:
+                            self.__write_scanned_folder(session, read, folder_ids, facets)
+                            read = None
+                        self.__update_queued_folder(session, folder_id, self.__progress)
+                        continue
+
+                    folder: Optional[Folder] = session.query(Folder).filter(Folder.id_ == folder_id).first()
+                    if folder is None:
+                        continue
+                    disk: Disk = folder.disk
+
+                    throttle = self.__throttle(disk)
+                    details: Optional[FolderDetails] = None
+                    if folder.status not in [Folder.Status.DELETED.value] or not folder.size:
+                        details = ScanWorker.read_folder_details(session, folder, throttle)
+
+                    self.__emit_progress(self.__progress, disk.disk_name, folder, throttle.rate_str(), count=True)
+
+                    if read is not None:
+                        self.__write_scanned_folder(session, read, folder_ids, facets)
+                    read = details
+                    # QThread.msleep(100)
+            if read is not None:
+                self.__write_scanned_folder(session, read, folder_ids, facets)
+            self.__update_indexes(session, folder_ids, facets)
+        finally:
+            session.close()
+
+    def __write_scanned_folder(self, session: Session, details: FolderDetails, folder_ids: List[int], facets: Set[FolderFacet]) -> None:
+        """Write the details of a folder of the scan, updating the indexes of the batch once it's full."""
+        ScanWorker.write_folder_details(session, details)
+        folder_ids.append(details.folder.id_)
+        facets |= details.facets
+        if len(folder_ids) >= UPDATE_BATCH_SIZE:
+            self.__update_indexes(session, folder_ids, facets)
+            folder_ids.clear()
+            facets.clear()
+
+    def __update_folder_details(self, session: Session, folder: Folder, throttle: Optional[IoThrottle] = None) -> Set[FolderFacet]:
+        """Update the details of the folder and return its facets before the update, to update its indexes next."""
+        details = ScanWorker.read_folder_details(session, folder, throttle)
+        ScanWorker.write_folder_details(session, details)
+        return details.facets
 
-    def __update_folder_details(self, session: Session, folder: Folder):
-        path = folder.path()
-        folder.size = get_folder_size(path)
+    @staticmethod
+    def read_folder_details(session: Session, folder: Folder, throttle: Optional[IoThrottle] = None) -> FolderDetails:
+        """Read the files of the folder and start reading its videos, before any write.
+
+        The catalog isn't locked while the files are read, and the videos are
+        read while the session writes the folder before this one.
+        """
+        facets = folder_facets(session, [folder.id_])
+        # one walk for the size, the listing shown while the disk is offline and the file index
+        entries = list_files(folder.path(), throttle, ScanWorker.__file_listing(folder))
+        media = ScanWorker.start_reading_folder_media(session, folder, entries, media_reader, throttle)
+        cover = ScanWorker.read_folder_cover(session, folder, throttle)
+        return FolderDetails(folder, throttle, facets, entries, media, cover)
+
+    @staticmethod
+    def write_folder_details(session: Session, details: FolderDetails) -> None:
+        """Write the details read by read_folder_details(), waiting for the videos; the indexes are updated next."""
+        folder, throttle = details.folder, details.throttle
+        ScanWorker.update_folder_files(session, folder, details.entries)
+        ScanWorker.update_folder_media(session, folder, details.media())
         folder.status = Folder.Status.OK
-        ScanWorker.update_folder_cover(session, folder)
-        ScanWorker.update_folder_images(session, folder)
-        ScanWorker.update_folder_tutorial(session, folder)
+        ScanWorker.update_folder_cover(session, folder, details.cover)
+        ScanWorker.update_folder_images(session, folder, throttle)
+        ScanWorker.update_folder_tutorial(session, folder, throttle)
         session.commit()
 
+    def __update_indexes(self, session: Session, folder_ids: List[int], facets: Set[FolderFacet]) -> None:
+        update_search_index(session, folder_ids)
+        update_facet_index(session, folder_ids, facets)
+        session.commit()
+        self.__folders_changed(folder_ids)
+
     @staticmethod
-    def update_folder_cover(session: Session, folder: Folder) -> None:
-        has_cover: bool = False
+    def __file_listing(folder: Folder) -> Optional[List[FileEntry]]:
+        if folder.file_listing is None:
+            return None
+        try:
+            return decode_file_listing(folder.file_listing)
+        except ValueError as ex:
+            log.warning('Listing all the files of %s: %s', folder.folder_name, ex)
+            return None
 
-        query = session.query(Cover).join(Folder, Folder.cover_id == Cover.id_).filter(Folder.id_ == folder.id_)
+    @staticmethod
+    def update_folder_files(session: Session, folder: Folder, entries: List[FileEntry]) -> None:
+        """Store the listing and update the file index of the folder."""
+        folder.size = folder_size(entries)
+        listing = encode_file_listing(entries)
+        if listing == folder.file_listing and session.query(File.id_).filter(File.folder_id == folder.id_).first() is not None:
+            return
+        folder.file_listing = listing
+
+        files: Dict[Tuple[str, str], File] = {
+            (file.directory, file.name): file
+            for file in session.query(File).filter(File.folder_id == folder.id_)
+        }
+        for entry in entries:
+            if entry.is_dir:
+                continue
+            file = files.pop((entry.parent, entry.name), None)
+            if file is None:
+                session.add(File(
+                    folder_id=folder.id_,
+                    directory=entry.parent,
+                    name=entry.name,
+                    extension=File.extension_of(entry.name),
+                    size=entry.size,
+                    modified=entry.modified,
+                ))
+            elif file.size != entry.size or file.modified != entry.modified:
+                file.size = entry.size
+                file.modified = entry.modified
+        for file in files.values():
+            session.delete(file)
+
+    @staticmethod
+    def read_folder_media(
+        session: Session, folder: Folder, entries: List[FileEntry], reader: MediaReader, throttle: Optional[IoThrottle] = None
+    ) -> Dict[str, Media]:
+        """Return the media of the videos of the listing by path, reading the details of the videos that changed.
 
+        Call it before changing the session: the reader waits for its processes,
+        and a pending write would keep the catalog locked meanwhile. The new
+        media aren't added to the session.
+        """
+        return ScanWorker.start_reading_folder_media(session, folder, entries, reader, throttle)()
+
+    @staticmethod
+    def start_reading_folder_media(
+        session: Session, folder: Folder, entries: List[FileEntry], reader: MediaReader, throttle: Optional[IoThrottle] = None
+    ) -> Callable[[], Dict[str, Media]]:
+        """Start reading the videos of the listing, see read_folder_media(); the result waits for their media."""
+        path = folder.path()
+        stored: Dict[str, File] = {
+            file.path: file
+            for file in (
+                session
+                .query(File)
+                .options(selectinload(File.media))
+                .filter(File.folder_id == folder.id_, File.extension.in_(VIDEO_EXTENSIONS))
+            )
+        }
+
+        result: Dict[str, Media] = {}
+        # the same file keeps its size and time in the listing; only the others need their inode
+        keys: Dict[Tuple[int, int, int, int], List[str]] = {}
+        for entry in entries:
+            if entry.is_dir or File.extension_of(entry.name) not in VIDEO_EXTENSIONS:
+                continue
+            file = stored.get(entry.path)
+            media: Optional[Media] = file.media if file is not None else None
+            if media is not None and media.size == entry.size and media.modified == entry.modified:
+                result[entry.path] = media
+                continue
+            try:
+                stat = os.stat(path / entry.path)
+            except OSError as ex:
+                log.warning("Couldn't stat %s: %s", entry.path, ex)
+                continue
+            keys.setdefault((stat.st_dev, stat.st_ino, stat.st_size, int(stat.st_mtime)), []).append(entry.path)
+
+        known: Dict[Tuple[int, int, int, int], Media] = {
+            ScanWorker.media_key(media): media
+            for media in session.query(Media).filter(Media.inode.in_({inode for _, inode, _, _ in keys}))
+        } if keys else {}
+        missing = [key for key in keys if key not in known]
+        if throttle is not None and missing:
+            throttle.consume(ops=len(missing))
+        details = reader.submit([str(path / keys[key][0]) for key in missing]) if missing else iter(())
+
+        def wait() -> Dict[str, Media]:
+            for key, media_details in zip(missing, details):
+                device, inode, size, modified = key
+                media = Media(device=device, inode=inode, size=size, modified=modified)
+                if media_details is not None:
+                    media.duration = media_details.duration
+                    media.width = media_details.width
+                    media.height = media_details.height
+                    media.codec = media_details.codec
+                known[key] = media
+            for key, file_paths in keys.items():
+                for file_path in file_paths:
+                    result[file_path] = known[key]
+            return result
+
+        return wait
+
+    @staticmethod
+    def media_key(media: Media) -> Tuple[int, int, int, int]:
+        return media.device, media.inode, media.size, media.modified
+
+    @staticmethod
+    def update_folder_media(session: Session, folder: Folder, media: Dict[str, Media]) -> None:
+        """Link the videos of the folder to their media, see read_folder_media(), and total their durations."""
+        new_keys = {path: ScanWorker.media_key(item) for path, item in media.items() if inspect(item).transient}
+        if new_keys:
+            # the media are read before the folder scanned before is written, which may have added the same videos
+            stored: Dict[Tuple[int, int, int, int], Media] = {
+                ScanWorker.media_key(item): item
+                for item in session.query(Media).filter(Media.inode.in_({inode for _, inode, _, _ in new_keys.values()}))
+            }
+            media = {**media, **{path: stored[key] for path, key in new_keys.items() if key in stored}}
+
+        videos: List[File] = (
+            session
+            .query(File)
+            .filter(File.folder_id == folder.id_, File.extension.in_(VIDEO_EXTENSIONS))
+            .all()
+        )
+        for file in videos:
+            file.media = media.get(file.path)
+
+        durations = [file.media.duration for file in videos if file.media is not None and file.media.duration is not None]
+        folder.video_duration = sum(durations) // 1000 if durations else None
+
+    @staticmethod
+    def read_folder_cover(session: Session, folder: Folder, throttle: Optional[IoThrottle] = None) -> Optional[CoverFile]:
+        """Return the cover file of the folder, reading it and making its thumbnails if it changed.
+
+        Call it before changing the session, like read_folder_media(). None if the folder has no cover.
+        """
         for file_format in ScanWorker.COVER_NAMES:
             path: Path = folder.path() / file_format.file_name
-            if path.exists():
-                modified, created, system_id, size = get_path_stats(path)
-
-                cover: Optional[Cover] = query.first()
-                if cover is None:
-                    cover = Cover()
-                    session.add(cover)
-                    session.flush()
-                    folder.cover_id = cover.id_
-                    log.debug('Found cover: %s', path)
-                elif (
-                    cover.size == size
-                    and cover.modified == modified
-                    and cover.created == created
-                    and cover.system_id == system_id):
-                    return
-
-                data = None
-                with open(path, mode='rb') as f:
-                    data = f.read()
-
-                cover.file_format = file_format.value
-                cover.system_id = system_id
-                cover.created = created
-                cover.modified = modified
-                cover.size = size
-                cover.data = data
-
-                has_cover = True
-
-                break
-
-        if not has_cover:
-            cover: Optional[Cover] = query.first()
+            if not path.exists():
+                continue
+            stats = get_path_stats(path)
+
+            cover: Optional[Cover] = folder.cover
+            if (
+                cover is not None
+                and cover.size == stats.size
+                and cover.modified == stats.modified
+                and cover.created == stats.created
+                and cover.system_id == stats.id):
+                # catalogs created before the thumbnails
+                thumbnails = ScanWorker.make_cover_thumbnails(cover.data) if cover.width is None else None
+                return CoverFile(file_format, stats, None, thumbnails)
+
+            data = read_file(path, throttle)
+            return CoverFile(file_format, stats, data, ScanWorker.make_cover_thumbnails(data))
+        return None
+
+    @staticmethod
+    def make_cover_thumbnails(data: Optional[bytes]) -> Tuple[Optional[ImageSize], Tuple[ThumbnailData, ...]]:
+        return make_thumbnails(data) if data is not None else (None, ())
+
+    @staticmethod
+    def update_folder_cover(session: Session, folder: Folder, cover_file: Optional[CoverFile]) -> None:
+        """Store the cover file read by read_folder_cover(), or remove the cover of the folder if None."""
+        cover: Optional[Cover] = folder.cover
+
+        if cover_file is None:
             if cover is not None:
                 folder.cover_id = None
                 session.delete(cover)
+            session.commit()
+            return
+
+        if cover is None:
+            cover = Cover()
+            session.add(cover)
+            session.flush()
+            folder.cover_id = cover.id_
+            log.debug('Found cover: %s', folder.path() / cover_file.file_format.file_name)
+
+        if cover_file.data is not None:
+            cover.file_format = cover_file.file_format.value
+            cover.modified, cover.created, cover.system_id, cover.size = cover_file.stats
+            cover.data = cover_file.data
+
+        if cover_file.thumbnails is not None:
+            image_size, thumbnails = cover_file.thumbnails
+            cover.width, cover.height = image_size if image_size is not None else (0, 0)
+            cover.thumbnails = [
+                Thumbnail(size=thumbnail.size, width=thumbnail.width, height=thumbnail.height, data=thumbnail.data)
+                for thumbnail in thumbnails
+            ]
 
         session.commit()
 
     @staticmethod
-    def update_folder_images(session: Session, folder: Folder) -> None:
+    def update_folder_images(session: Session, folder: Folder, throttle: Optional[IoThrottle] = None) -> None:
         current_images = get_images(folder.path())
 
         image: Image
@@ -451,21 +890,21 @@ class ScanWorker(QObject):
                 ):
                     continue
 
-                image.data = get_image_data(image_path)
+                image.data = get_image_data(image_path, throttle)
                 current_images.remove(image_path)
 
         for image_path in current_images:
             image = Image()
             image.name = image_path.name
             image.modified, image.created, image.system_id, image.size = get_path_stats(image_path)
-            image.data = get_image_data(image_path)
+            image.data = get_image_data(image_path, throttle)
             session.add(image)
             folder.images.append(image)
 
         session.commit()
 
     @staticmethod
-    def update_folder_tutorial(session: Session, folder: Folder) -> None:
+    def update_folder_tutorial(session: Session, folder: Folder, throttle: Optional[IoThrottle] = None) -> None:
         path: Path = folder.path() / ScanWorker.INFO_TC_NAME
 
         if not path.exists():
@@ -485,6 +924,10 @@ class ScanWorker(QObject):
                 and tutorial.modified == modified
                 and tutorial.created == created
                 and tutorial.system_id == system_id):
+                # the tutorials scanned before the descriptions were rendered by the scan
+                if tutorial.description_html is None:
+                    ScanWorker.update_tutorial_description_html(tutorial)
+                    session.commit()
                 return
 
             tutorial.system_id = system_id
@@ -493,8 +936,7 @@ class ScanWorker(QObject):
             tutorial.size = size
 
             try:
-                with open(path, mode='r', encoding='utf-8') as f:
-                    text = f.read()
+                text = read_file(path, throttle).decode('utf-8')
 
                 TutorialData.load_from_string(session, tutorial, text)
                 folder.error = None
@@ -505,8 +947,14 @@ class ScanWorker(QObject):
                 TutorialData.load_from_string(session, tutorial, '')
                 folder.error = 'Parse error\n' + str(ex)
 
+        ScanWorker.update_tutorial_description_html(folder.tutorial)
         session.commit()
 
+    @staticmethod
+    def update_tutorial_description_html(tutorial: Tutorial) -> None:
+        """Render the description now, so the catalog doesn't run Markdown when it shows the tutorial."""
+        tutorial.description_html = description_renderer.to_html(tutorial.description or '')
+
 
 if __name__ == '__main__':
     from tutcatalogpy.catalog.main import run
@@ -0,0 +1,30 @@
+"""Run short tasks of the GUI, like decoding images, in the Qt thread pool."""
+
+import logging
+from typing import Callable, Optional
+
+from PySide2.QtCore import QRunnable, QThreadPool
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class _Task(QRunnable):
+    def __init__(self, func: Callable[[], None]) -> None:
+        super().__init__()
+        self.__func = func
+
+    def run(self) -> None:
+        try:
+            self.__func()
+        except Exception:
+            log.exception('Background task failed.')
+
+
+def run_in_thread_pool(func: Callable[[], None], pool: Optional[QThreadPool] = None) -> None:
+    (pool if pool is not None else QThreadPool.globalInstance()).start(_Task(func))
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
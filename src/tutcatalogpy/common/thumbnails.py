@@ -0,0 +1,74 @@
+"""Downscaled renditions of the covers, made once by the scanner."""
+
+import io
+import logging
+from typing import Final, NamedTuple, Optional, Tuple
+
+from PIL import Image, UnidentifiedImageError
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# the longest side of the thumbnails, in pixels
+THUMBNAIL_SIZES: Final[Tuple[int, ...]] = (96, 300)
+JPEG_QUALITY: Final[int] = 85
+
+
+class ImageSize(NamedTuple):
+    width: int
+    height: int
+
+
+class ThumbnailData(NamedTuple):
+    size: int
+    width: int
+    height: int
+    data: bytes
+
+
+def make_thumbnails(
+    data: bytes, sizes: Tuple[int, ...] = THUMBNAIL_SIZES
+) -> Tuple[Optional[ImageSize], Tuple[ThumbnailData, ...]]:
+    """Return the size of the image and its thumbnails; only images larger than a size get a thumbnail of it.
+
+    The size is None if the data is not an image.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            original = ImageSize(image.width, image.height)
+            sizes = sorted((size for size in sizes if max(original) > size), reverse=True)
+            if sizes:
+                # JPEGs are decoded at a fraction of their size, still larger than the largest thumbnail
+                image.draft(image.mode, (sizes[0], sizes[0]))
+            image.load()
+            thumbnails = []
+            # each thumbnail is made from the larger one before it
+            source = image
+            for size in sizes:
+                source = _downscale(source, size)
+                thumbnails.append(_thumbnail_data(source, size))
+            return original, tuple(reversed(thumbnails))
+    except (UnidentifiedImageError, OSError, ValueError) as ex:
+        log.warning('Could not make thumbnails: %s', str(ex))
+        return None, ()
+
+
+def _downscale(image: Image.Image, size: int) -> Image.Image:
+    thumbnail = image.copy()
+    thumbnail.thumbnail((size, size), Image.LANCZOS)
+    return thumbnail
+
+
+def _thumbnail_data(thumbnail: Image.Image, size: int) -> ThumbnailData:
+    f = io.BytesIO()
+    if thumbnail.mode in ('RGBA', 'LA', 'P'):
+        # keep the transparency
+        thumbnail.save(f, 'PNG', optimize=True)
+    else:
+        thumbnail.convert('RGB').save(f, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    return ThumbnailData(size, thumbnail.width, thumbnail.height, f.getvalue())
+
+
+if __name__ == '__main__':
+    from tutcatalogpy.catalog.main import run
+    run()
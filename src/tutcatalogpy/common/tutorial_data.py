@@ -150,6 +150,7 @@ class TutorialData:
         TutorialData.set_authors(session, tutorial, data.get(TutorialData.AUTHORS_KEY))
 
         tutorial.released = data.get(TutorialData.RELEASED_KEY)
+        tutorial.released_on = TutorialData.released_to_date(tutorial.released)
 
         tutorial.duration = TutorialData.text_to_duration(data.get(TutorialData.DURATION_KEY))
 
@@ -274,6 +275,16 @@ class TutorialData:
             # fastjsonschema doesn't correctly
             raise fastjsonschema.JsonSchemaValueException('data.duration must match ' + TutorialData.DURATION_REGEX)
 
+    @staticmethod
+    def released_to_date(released: Any) -> int:
+        """Return the released text as yyyymmdd, with 00 for a missing month or day, 0 if it isn't a date."""
+        parts = str(released).split('/')
+        if not 1 <= len(parts) <= 3 or not all(part.isdigit() for part in parts):
+            return 0
+        parts += ['0'] * (3 - len(parts))
+        year, month, day = map(int, parts)
+        return year * 10000 + month * 100 + day
+
     @staticmethod
     def duration_to_text(minutes: int) -> str:
         if minutes == 0:
@@ -1,13 +1,12 @@
 import logging
 from pathlib import Path
-from typing import Dict, Final, List, Optional, Tuple
+from typing import Any, Callable, Dict, Final, List, Optional, Set, Tuple
 
-from markdown import Markdown
-from markdown.extensions import admonition, fenced_code, nl2br, sane_lists, tables
-from PySide2.QtCore import QUrl, Qt
+from PySide2.QtCore import QSize, QUrl, Qt
 from PySide2.QtGui import QImage, QTextDocument
 from PySide2.QtWidgets import QFrame
 
+from tutcatalogpy.common.description_renderer import description_renderer
 from tutcatalogpy.common.widgets.growing_text_edit import GrowingTextEdit
 
 log = logging.getLogger(__name__)
@@ -136,10 +135,22 @@ code {{
 }}
 """.format(**DESCRIPTION_STYLE_SHEET_ARGS)
 
+# return the image with the given name, decoded to fit the size, or None if it isn't decoded yet
+ImageResolver = Callable[[str, QSize], Optional[QImage]]
+
 
 class DescriptionView(GrowingTextEdit):
+    """Show a rendered description.
+
+    The images are only asked to the resolver when the document lays them
+    out, so the images that the description doesn't show are never decoded.
+    """
+
     def __init__(self):
         super().__init__()
+        self.__resolver: Optional[ImageResolver] = None
+        # names asked to the resolver; the others will come with add_image()
+        self.__requested: Set[str] = set()
         self.setReadOnly(True)
         self.setFrameShape(QFrame.NoFrame)
         self.viewport().setAutoFillBackground(False)
@@ -148,14 +159,17 @@ class DescriptionView(GrowingTextEdit):
         self.setAttribute(Qt.WA_StyledBackground, True)
 
     def set_content(self, description: str, path: Optional[Path] = None, images: List[Tuple[str, QImage]] = list()) -> None:
-        md = Markdown(extensions=[
-            admonition.AdmonitionExtension(),
-            fenced_code.FencedCodeExtension(),
-            nl2br.Nl2BrExtension(),
-            sane_lists.SaneListExtension(),
-            tables.TableExtension(),
-        ])
-        html = md.convert(description)
+        self.set_html(description_renderer.to_html(description), path, images)
+
+    def set_html(
+        self,
+        html: str,
+        path: Optional[Path] = None,
+        images: List[Tuple[str, QImage]] = list(),
+        resolver: Optional[ImageResolver] = None,
+    ) -> None:
+        self.__resolver = resolver
+        self.__requested = set()
         document = self.document()
         document.clear() # does this clears the cached resources?
         for name, image in images:
@@ -169,6 +183,42 @@ class DescriptionView(GrowingTextEdit):
         # print(html)
         # log.raw_html(html)
 
+    def add_image(self, name: str, image: QImage) -> None:
+        """Add an image that was decoded after the content was set."""
+        document = self.document()
+        self.__add_image_resource(QUrl(name), image)
+        # lay out again, now with the size of the image
+        document.markContentsDirty(0, document.characterCount())
+
+    def clear(self) -> None:
+        self.__resolver = None
+        self.__requested = set()
+        super().clear()
+
+    def image_size(self) -> QSize:
+        """Return the size, in device pixels, the images are decoded to fit."""
+        width = self.viewport().width() * self.devicePixelRatioF()
+        return QSize(max(1, int(width)), 65000)
+
+    def loadResource(self, type_: int, url: QUrl) -> Any:
+        if type_ == QTextDocument.ImageResource and self.__resolver is not None and url.isRelative():
+            name = url.path()
+            if name not in self.__requested:
+                self.__requested.add(name)
+                image = self.__resolver(name, self.image_size())
+                if image is not None:
+                    return self.__add_image_resource(url, image)
+                return None
+        return super().loadResource(type_, url)
+
+    def __add_image_resource(self, url: QUrl, image: QImage) -> QImage:
+        if image.width() > self.viewport().width():
+            # decoded for the device pixels; lay it out in logical pixels
+            image = QImage(image)
+            image.setDevicePixelRatio(self.devicePixelRatioF())
+        self.document().addResource(QTextDocument.ImageResource, url, image)
+        return image
+
 
 if __name__ == '__main__':
     from PySide2.QtWidgets import QApplication, QScrollArea
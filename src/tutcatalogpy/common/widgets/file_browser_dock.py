@@ -1,13 +1,15 @@
 import logging
 from pathlib import Path
-from typing import Final, Optional
+from typing import Final, List, Optional, Set
 
 from PySide2.QtCore import QByteArray, QMargins, QSettings, Qt
 from PySide2.QtWidgets import QFileSystemModel, QGridLayout, QHBoxLayout, QTreeView, QWidget
 from PySide2.QtSvg import QSvgWidget
 
+from tutcatalogpy.common.file_listing import FileEntry
 from tutcatalogpy.common.files import relative_path
 from tutcatalogpy.common.models.file_browser_filter_proxy_model import FileBrowserFilterProxyModel
+from tutcatalogpy.common.models.file_listing_model import FileListingModel
 from tutcatalogpy.common.widgets.dock_widget import DockWidget
 
 log = logging.getLogger(__name__)
@@ -19,12 +21,15 @@ class FileBrowserDock(DockWidget):
     SETTINGS_HEADER_STATE: Final[str] = 'header_state'
 
     DOCK_TITLE: Final[str] = 'File Browser'
+    DOCK_LISTING_TITLE: Final[str] = 'File Browser (last scan)'
     DOCK_OBJECT_NAME: Final[str] = 'file_browser_dock'  # used to identify this dock
 
     OFFLINE_SVG: Final[str] = relative_path(__file__, '../../resources/icons/offline.svg')
     OFFLINE_TIP: Final[str] = 'Offline'
     SVG_ICON_SIZE: Final[int] = 20
 
+    MAX_LISTED_FOLDERS: Final[int] = 50
+
     _dock_icon = relative_path(__file__, '../../resources/icons/file_browser.svg')
     _dock_status_tip = 'Toggle file browser dock'
 
@@ -34,8 +39,10 @@ class FileBrowserDock(DockWidget):
         self.setWindowTitle(self.DOCK_TITLE)
         self.setObjectName(self.DOCK_OBJECT_NAME)
 
+        # one model for all folders, so showing a folder again reuses its listing
         self.__model: Optional[QFileSystemModel] = None
         self.__proxy: Optional[FileBrowserFilterProxyModel] = None
+        self.__listed_paths: Set[str] = set()
 
         self.__setup_widgets()
         self.__setup_actions()
@@ -55,6 +62,16 @@ class FileBrowserDock(DockWidget):
         self.__view.setAlternatingRowColors(True)
         self.__view.setVisible(False)
 
+        # the files of offline folders, as listed by the last scan
+        self.__listing_model = FileListingModel(self)
+        self.__listing_view = QTreeView()
+        layout.addWidget(self.__listing_view, 0, 0)
+
+        self.__listing_view.setModel(self.__listing_model)
+        self.__listing_view.setSortingEnabled(True)
+        self.__listing_view.setAlternatingRowColors(True)
+        self.__listing_view.setVisible(False)
+
         self.__header_state: Optional[QByteArray] = None
 
         self.__offline = QSvgWidget(self.OFFLINE_SVG)
@@ -87,58 +104,80 @@ class FileBrowserDock(DockWidget):
     def set_offline(self, offline: bool) -> None:
         self.__offline.setVisible(offline)
 
-    def set_path(self, path: Optional[Path]) -> None:
-        if path is not None:
-            if path.exists():
-                old_proxy = self.__proxy
-                old_model = self.__model
-
-                header = self.__view.header()
-                if self.__header_state is not None:
-                    header_state = self.__header_state
-                    self.__header_state = None
-                else:
-                    header_state = header.saveState()
-
-                self.__view.setModel(None)
-
-                p = str(path)
-
-                self.__model = QFileSystemModel(self)
-                self.__proxy = FileBrowserFilterProxyModel(self)
-                self.__view.setModel(self.__proxy)
-
-                self.__model.setRootPath(p)
-                self.__proxy.setSourceModel(self.__model)
-                self.__proxy.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
-                self.__view.setRootIndex(self.__proxy.mapFromSource(self.__model.index(p)))
-
-                header.restoreState(header_state)
-
-                if old_proxy:
-                    del old_proxy
+    def set_listing(self, entries: Optional[List[FileEntry]]) -> None:
+        """Show the files of a folder listed by the last scan, e.g. when its disk is offline."""
+        if entries is None:
+            self.__hide_listing()
+            return
 
-                if old_model:
-                    del old_model
-
-                self.__view.setVisible(True)
-
-                log.debug('Showing folder %s', path)
-                return
-
-        if self.__model:
-            self.__header_state = self.__view.header().saveState()
-            self.__view.setModel(None)
+        self.__view.setVisible(False)
+        self.__listing_model.set_entries(entries)
+        header = self.__listing_view.header()
+        if self.__header_state is not None:
+            header.restoreState(self.__header_state)
+        elif self.__model is not None:
+            header.restoreState(self.__view.header().saveState())
+        self.__listing_model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+        self.__listing_view.setVisible(True)
+        self.setWindowTitle(self.DOCK_LISTING_TITLE)
+
+        log.debug('Showing %s listed files', len(entries))
+
+    def __hide_listing(self) -> None:
+        self.__listing_view.setVisible(False)
+        self.__listing_model.set_entries([])
+        self.setWindowTitle(self.DOCK_TITLE)
 
-            del self.__proxy
+    def set_path(self, path: Optional[Path]) -> None:
+        """Show the files of the folder; None or a missing folder hides the files."""
+        self.__hide_listing()
+        if path is None or not path.exists():
+            if self.__view.isVisible():
+                log.debug('File browser cleared')
+            self.__view.setVisible(False)
+            return
+
+        p = str(path)
+        if p not in self.__listed_paths:
+            if len(self.__listed_paths) >= self.MAX_LISTED_FOLDERS:
+                # the model never forgets a listing, nor stops watching its folder
+                self.__delete_model()
+            self.__listed_paths.add(p)
+        if self.__model is None:
+            self.__create_model()
+
+        self.__model.setRootPath(p)
+        self.__view.setRootIndex(self.__proxy.mapFromSource(self.__model.index(p)))
+        self.__view.setVisible(True)
+
+        log.debug('Showing folder %s', path)
+
+    def __create_model(self) -> None:
+        header = self.__view.header()
+        if self.__header_state is not None:
+            header_state = self.__header_state
+            self.__header_state = None
+        else:
+            header_state = header.saveState()
+
+        self.__model = QFileSystemModel(self)
+        self.__proxy = FileBrowserFilterProxyModel(self)
+        self.__proxy.setSourceModel(self.__model)
+        self.__view.setModel(self.__proxy)
+        self.__proxy.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+
+        header.restoreState(header_state)
+
+    def __delete_model(self) -> None:
+        self.__header_state = self.__view.header().saveState()
+        self.__view.setModel(None)
+        if self.__proxy is not None:
+            self.__proxy.deleteLater()
             self.__proxy = None
-
-            del self.__model
+        if self.__model is not None:
+            self.__model.deleteLater()
             self.__model = None
-
-            self.__view.setVisible(False)
-
-        # log.info('File browser cleared')
+        self.__listed_paths.clear()
 
 
 if __name__ == '__main__':
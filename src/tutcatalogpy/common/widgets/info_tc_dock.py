@@ -1,8 +1,8 @@
 import logging
-from typing import Final, List, Optional
+from typing import Dict, Final, Hashable, List, Optional, Tuple
 
 from humanize import naturalsize
-from PySide2.QtCore import Signal
+from PySide2.QtCore import QSize, Signal
 from PySide2.QtGui import QImage
 from PySide2.QtWidgets import QVBoxLayout, QScrollArea, QLabel, QWidget
 from PySide2.QtSvg import QSvgWidget
@@ -10,13 +10,14 @@ from sqlalchemy.sql.schema import Table
 
 from tutcatalogpy.common.db.author import Author
 from tutcatalogpy.common.db.cover import Cover
-from tutcatalogpy.common.db.dal import dal
 from tutcatalogpy.common.db.folder import Folder
 from tutcatalogpy.common.db.image import Image
 from tutcatalogpy.common.db.tag import Tag
 from tutcatalogpy.common.db.tutorial import Tutorial
 from tutcatalogpy.common.db.tutorial_learning_path import TutorialLearningPath
+from tutcatalogpy.common.description_renderer import description_renderer
 from tutcatalogpy.common.files import relative_path
+from tutcatalogpy.common.image_loader import image_loader
 from tutcatalogpy.common.tutorial_data import TutorialData
 from tutcatalogpy.common.widgets.description_view import DescriptionView
 from tutcatalogpy.common.widgets.dock_widget import DockWidget
@@ -49,11 +50,17 @@ class InfoTcDock(DockWidget):
     NO_INFO_TC_TIP: Final[str] = 'No info.tc'
     SVG_ICON_SIZE: Final[int] = 16
 
+    IMAGE_LOADER_GROUP: Final[str] = 'info_tc_dock'
+    IMAGE_LOADER_PREFETCH_GROUP: Final[str] = 'info_tc_dock_prefetch'
+
     _dock_icon: Final[str] = relative_path(__file__, '../../resources/icons/info_tc.svg')
     _dock_status_tip: Final[str] = 'Toggle tutorial info dock'
 
     __folder_id: Optional[int] = None
     __folder: Optional[Folder] = None
+    # names of the description images that are still decoding, by image loader key
+    __pending_images: Dict[Hashable, str] = {}
+    __details_shown: bool = False
 
     tag_clicked = Signal(Table, int)
 
@@ -165,19 +172,36 @@ class InfoTcDock(DockWidget):
         for widget in [
             self.__publisher,
             self.__authors,
+            self.__publisher_tags,
+            self.__personal_tags,
+            self.__learning_paths,
         ]:
             widget.tag_clicked.connect(self.tag_clicked.emit)
 
-    def set_folder(self, folder_id: Optional[int]) -> None:
-        self.__folder_id = folder_id
-        if self.__folder_id is None or dal.session is None:
-            self.__folder = None
-        else:
-            self.__folder = dal.session.query(Folder).filter(Folder.id_ == folder_id).one()
+        image_loader.loaded.connect(self.__on_image_loaded)
+
+    def set_folder(self, folder: Optional[Folder], details: bool = True) -> None:
+        """Show the folder; it should be loaded with Folder.get(details=True).
+
+        Without `details`, the description and its images are left out until show_details().
+        """
+        self.__folder = folder
+        self.__folder_id = None if folder is None else folder.id_
+        self.__details_shown = False
+        image_loader.cancel(self.IMAGE_LOADER_GROUP)
+        self.__pending_images = {}
 
         self.__update_status_icons()
         self.__update_info()
-        log.debug('Show info.tc for folder: %s', folder_id)
+        if details:
+            self.show_details()
+        log.debug('Show info.tc for folder: %s', self.__folder_id)
+
+    def show_details(self) -> None:
+        """Show the description of the folder, if not shown yet."""
+        if self.__folder is not None and not self.__details_shown:
+            self.__details_shown = True
+            self.__update_info_description(self.__folder)
 
     def __update_status_icons(self) -> None:
         if self.__folder is None:
@@ -284,12 +308,12 @@ class InfoTcDock(DockWidget):
                 widget.clear()
 
         self.__update_info_error(folder)
-        self.__update_info_description(folder)
+        self.__description.clear()
 
     def __update_info_learning_paths(self, view: TagsFlowView, tutorial_learning_paths: List[TutorialLearningPath]) -> None:
         view.clear()
         for tlp in tutorial_learning_paths:
-            view.add_tutorial_learning_path(tlp.learning_path.name, tlp.id_)
+            view.add_tutorial_learning_path(tlp.learning_path.name, tlp.learning_path_id)
 
     def __update_info_tags(self, view: TagsFlowView, tags: List[Tag]) -> None:
         view.clear()
@@ -302,20 +326,79 @@ class InfoTcDock(DockWidget):
         self.__error.set_error(folder.error)
         self.__error.setVisible(folder.error is not None)
 
-    def __update_info_description(self, folder: Folder) -> None:
-        tutorial: Tutorial = folder.tutorial
-
-        images = []
+    def prefetch(self, folder: Folder) -> None:
+        """Render the description and decode the images of a folder that might be shown next."""
+        tutorial: Optional[Tutorial] = folder.tutorial
+        if tutorial is None:
+            return
+        text = tutorial.description_html
+        if text is None:
+            description_renderer.render_later(self.__description_key(tutorial), tutorial.description)
+            text = tutorial.description
+        size = self.__description.image_size()
+        for name in self.__image_names(folder):
+            # only the images the description shows
+            if name not in text:
+                continue
+            source = self.__image_source(folder, name, size)
+            if source is not None:
+                key, blob_hash = source
+                image_loader.load(self.IMAGE_LOADER_PREFETCH_GROUP, key, blob_hash, size)
+
+    @staticmethod
+    def __description_key(tutorial: Tutorial) -> Hashable:
+        # the description changes with info.tc
+        return tutorial.id_, tutorial.modified
+
+    @staticmethod
+    def __image_names(folder: Folder) -> List[str]:
+        names = [image.name for image in folder.images]
+        cover: Cover = folder.cover
+        if cover is not None and cover.name is not None:
+            names.append(cover.name)
+        return names
 
+    @staticmethod
+    def __image_source(folder: Folder, name: str, size: QSize) -> Optional[Tuple[Hashable, Optional[str]]]:
+        """Return the image loader key and blob hash of an image of the description, decoded to fit the size."""
         cover: Cover = folder.cover
-        if cover is not None and cover.data is not None and cover.name is not None:
-            images.append((cover.name, QImage.fromData(cover.data)))
+        if cover is not None and cover.name == name:
+            # a thumbnail is enough in a narrow dock
+            rendition = cover.rendition(size.width(), size.height())
+            return (folder.id_, name, cover.modified, rendition.width, size.width()), rendition.blob_hash
 
         image: Image
         for image in folder.images:
-            images.append((image.name, QImage.fromData(image.data)))
+            if image.name == name:
+                return (folder.id_, name, image.modified, size.width()), image.blob_hash
+
+        return None
+
+    def __resolve_image(self, name: str, size: QSize) -> Optional[QImage]:
+        """Return the image if it is decoded, or decode it and add it to the description later."""
+        if self.__folder is None:
+            return None
+        source = self.__image_source(self.__folder, name, size)
+        if source is None:
+            return None
+        key, blob_hash = source
+        image = image_loader.load(self.IMAGE_LOADER_GROUP, key, blob_hash, size)
+        if image is None and blob_hash is not None:
+            self.__pending_images[key] = name
+        return image
+
+    def __update_info_description(self, folder: Folder) -> None:
+        tutorial: Tutorial = folder.tutorial
+
+        html = tutorial.description_html
+        if html is None:
+            html = description_renderer.render(self.__description_key(tutorial), tutorial.description)
+        # the images are resolved when the description lays them out
+        self.__description.set_html(html, resolver=self.__resolve_image)
 
-        self.__description.set_content(tutorial.description, images=images)
+    def __on_image_loaded(self, group: str, key: Hashable, image: QImage) -> None:
+        if group == self.IMAGE_LOADER_GROUP and key in self.__pending_images:
+            self.__description.add_image(self.__pending_images.pop(key), image)
 
 
 if __name__ == '__main__':
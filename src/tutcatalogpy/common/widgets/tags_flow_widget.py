@@ -7,10 +7,10 @@ from PySide2.QtWidgets import QFrame, QItemDelegate, QListView, QStyleOptionView
 from sqlalchemy.sql.schema import Table
 
 from tutcatalogpy.common.db.author import Author
+from tutcatalogpy.common.db.learning_path import LearningPath
 from tutcatalogpy.common.db.publisher import Publisher
 from tutcatalogpy.common.db.search_flag import SearchFlag
 from tutcatalogpy.common.db.tag import Tag
-from tutcatalogpy.common.db.tutorial_learning_path import TutorialLearningPath
 
 MINIMUM_ROW_HEIGHT: Final[int] = 16
 HORIZONTAL_ITEM_SPACING: Final[int] = 0
@@ -59,7 +59,7 @@ class TutorialTagItem(TagItem):
 
 @dataclass
 class TutorialLearningPathItem(TagItem):
-    table = TutorialLearningPath
+    table = LearningPath
 
 
 class TagsModel(QAbstractListModel):
@@ -0,0 +1,226 @@
+"""Generate synthetic disk trees for tests and benchmarks.
+
+The generated tutorial folders look like the real ones: lecture files,
+an optional cover, optional description images and a randomized
+info.tc modeled on examples/info.tc.
+"""
+
+import io
+import os
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Final, List, Sequence, Tuple
+
+import yaml
+from PIL import Image
+
+from tutcatalogpy.common.tutorial_data import TutorialData
+
+PUBLISHERS: Final[List[str]] = [
+    'Some Publisher', 'Art School Videos', 'Watts Atelier', 'Domestika', 'Gumroad',
+    'New Masters Academy', 'Udemy', 'CG Master Academy', 'Schoolism', 'Proko',
+]
+
+AUTHORS: Final[List[str]] = [
+    'Author 1', 'Author 2', 'Raúl Pérez', 'Raul Perez', 'Zoë Smith', 'Jeff Watts',
+    'Ioan Calin', 'Marc Brunet', 'Björn Hurri', 'Stan Prokopenko', 'Anna Łukasik',
+]
+
+WORDS: Final[List[str]] = [
+    'drawing', 'painting', 'anatomy', 'perspective', 'color', 'light', 'portrait',
+    'figure', 'rigging', 'sculpting', 'environment', 'character', 'design', 'digital',
+    'fundamentals', 'advanced', 'masterclass', 'composition', 'gesture', 'texturing',
+]
+
+TAGS: Final[List[str]] = ['bar', 'baz', 'foo', 'blender', 'zbrush', 'photoshop', 'krita', '2d', '3d']
+
+LEVELS: Final[List[str]] = ['', 'beginner', 'intermediate', 'advanced', 'any', 'beginner, intermediate']
+
+FILE_EXTENSIONS: Final[List[str]] = ['.mp4', '.mp4', '.mp4', '.mkv', '.pdf', '.zip', '.txt']
+
+DESCRIPTION_TEMPLATE: Final[str] = """![cover]({cover})
+
+# {title}
+
+## About
+
+{sentence}
+
+* {word1}
+* {word2}
+  * {word3}
+
+First Header  | Second Header
+------------- | -------------
+Content Cell  | Content Cell
+
+!!! note
+    {sentence}
+"""
+
+
+@dataclass
+class CatalogSpec:
+    folder_count: int = 100  # number of tutorial folders
+    depth: int = 0  # levels between the disk and the tutorial folders (see Disk.depth)
+    parents_per_level: int = 10  # sub-folders created on each intermediate level
+    files_per_folder: int = 5
+    file_size: int = 1024  # sparse files, so large values are cheap
+    cover_ratio: float = 0.8
+    png_cover_ratio: float = 0.2  # from the folders with covers
+    cover_size: Tuple[int, int] = (600, 800)
+    cover_variants: int = 16  # identical covers are shared across folders
+    image_ratio: float = 0.3
+    max_images: int = 3
+    info_tc_ratio: float = 0.9
+    invalid_info_tc_ratio: float = 0.01
+    seed: int = 0
+
+
+class CatalogGenerator:
+    def __init__(self, spec: CatalogSpec) -> None:
+        self.spec = spec
+        self.__random = random.Random(spec.seed)
+        self.__images: Dict[Tuple[str, int], bytes] = {}
+
+    def generate(self, disk_path: Path) -> List[Path]:
+        """Create the tree under disk_path and return the tutorial folders."""
+        disk_path.mkdir(parents=True, exist_ok=True)
+        folders: List[Path] = []
+        for index, parent in enumerate(self.__parents(disk_path)):
+            if len(folders) >= self.spec.folder_count:
+                break
+            count = self.__folders_per_parent(index)
+            for _ in range(min(count, self.spec.folder_count - len(folders))):
+                folders.append(self.__make_tutorial_folder(parent, len(folders)))
+        return folders
+
+    def rename(self, folders: List[Path], ratio: float) -> List[Tuple[Path, Path]]:
+        """Rename a fraction of the folders; return (old, new) pairs."""
+        renamed: List[Tuple[Path, Path]] = []
+        for path in self.__random.sample(folders, int(len(folders) * ratio)):
+            new_path = path.with_name(path.name + ' (renamed)')
+            path.rename(new_path)
+            renamed.append((path, new_path))
+        return renamed
+
+    def __parents(self, disk_path: Path) -> List[Path]:
+        parents = [disk_path]
+        for level in range(self.spec.depth):
+            parents = [
+                parent / f'{self.__random.choice(PUBLISHERS)} {level}-{index:03}'
+                for parent in parents
+                for index in range(self.spec.parents_per_level)
+            ]
+        for parent in parents:
+            parent.mkdir(parents=True, exist_ok=True)
+        return parents
+
+    def __folders_per_parent(self, index: int) -> int:
+        parent_count = self.spec.parents_per_level ** self.spec.depth
+        count, extra = divmod(self.spec.folder_count, parent_count)
+        return count + (1 if index < extra else 0)
+
+    def __make_tutorial_folder(self, parent: Path, index: int) -> Path:
+        title = self.__title()
+        path = parent / f'{index:06} - {title}'
+        path.mkdir()
+
+        for file_index in range(self.spec.files_per_folder):
+            extension = self.__random.choice(FILE_EXTENSIONS)
+            with open(path / f'{file_index + 1:02} - {self.__random.choice(WORDS)}{extension}', 'wb') as f:
+                f.truncate(self.spec.file_size)
+
+        cover_name = 'cover.jpg'
+        if self.__random.random() < self.spec.cover_ratio:
+            file_format = 'png' if self.__random.random() < self.spec.png_cover_ratio else 'jpg'
+            cover_name = f'cover.{file_format}'
+            self.__write_image(path / cover_name, file_format)
+
+        image_names: List[str] = []
+        if self.__random.random() < self.spec.image_ratio:
+            for image_index in range(self.__random.randint(1, self.spec.max_images)):
+                name = f'image{image_index + 1:02}.jpg'
+                self.__write_image(path / name, 'jpg')
+                image_names.append(name)
+
+        if self.__random.random() < self.spec.info_tc_ratio:
+            with open(path / TutorialData.FILE_NAME, 'w', encoding='utf-8') as f:
+                if self.__random.random() < self.spec.invalid_info_tc_ratio:
+                    f.write('not: [valid yaml')
+                else:
+                    f.write(self.info_tc(title, cover_name, image_names))
+
+        return path
+
+    def __title(self) -> str:
+        return ' '.join(self.__random.choice(WORDS) for _ in range(self.__random.randint(2, 5))).title()
+
+    def __write_image(self, path: Path, file_format: str) -> None:
+        variant = self.__random.randrange(self.spec.cover_variants)
+        key = (file_format, variant)
+        data = self.__images.get(key)
+        if data is None:
+            rng = random.Random(variant)
+            color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            image = Image.new('RGB', self.spec.cover_size, color)
+            buffer = io.BytesIO()
+            image.save(buffer, 'PNG' if file_format == 'png' else 'JPEG')
+            data = buffer.getvalue()
+            self.__images[key] = data
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def info_tc(self, title: str, cover_name: str = 'cover.jpg', image_names: Sequence[str] = ()) -> str:
+        r = self.__random
+        description = DESCRIPTION_TEMPLATE.format(
+            cover=cover_name,
+            title=title,
+            sentence=' '.join(r.choice(WORDS) for _ in range(r.randint(10, 60))).capitalize() + '.',
+            word1=r.choice(WORDS),
+            word2=r.choice(WORDS),
+            word3=r.choice(WORDS),
+        )
+        description += ''.join(f'\n![image]({name})\n' for name in image_names)
+
+        data = {
+            TutorialData.PUBLISHER_KEY: r.choice(PUBLISHERS),
+            TutorialData.TITLE_KEY: title,
+            TutorialData.AUTHORS_KEY: r.sample(AUTHORS, r.randint(1, 3)),
+            TutorialData.RELEASED_KEY: f'{r.randint(2000, 2021)}/{r.randint(1, 12):02}',
+            TutorialData.DURATION_KEY: f'{r.randint(0, 20)}h {r.randint(0, 59)}m',
+            TutorialData.LEVEL_KEY: r.choice(LEVELS),
+            TutorialData.URL_KEY: f'https://some.site/{title.lower().replace(" ", "-")}',
+            TutorialData.IS_COMPLETE_KEY: r.random() < 0.9,
+            TutorialData.TODO_KEY: r.random() < 0.2,
+            TutorialData.VIEWED_KEY: r.random() < 0.3,
+            TutorialData.IS_ONLINE_KEY: r.random() < 0.1,
+            TutorialData.LEGACY_TAGS_KEY: r.sample(TAGS, r.randint(0, 3)),
+            TutorialData.PERSONAL_TAGS_KEY: r.sample(TAGS, r.randint(0, 2)),
+            TutorialData.LEARNING_PATHS_KEY: [f'Learning Path {r.randint(1, 20)}'] if r.random() < 0.2 else [],
+            TutorialData.RATING_KEY: r.randint(-5, 5),
+            TutorialData.DESCRIPTION_KEY: description,
+        }
+        return yaml.dump(data, allow_unicode=True, sort_keys=False)
+
+
+def generate_catalog(disk_path: Path, spec: CatalogSpec = CatalogSpec()) -> List[Path]:
+    return CatalogGenerator(spec).generate(disk_path)
+
+
+if __name__ == '__main__':
+    import click
+
+    @click.command()
+    @click.argument('path', type=click.Path(file_okay=False))
+    @click.option('-n', '--folders', 'folder_count', default=1000, help='Number of tutorial folders.')
+    @click.option('-d', '--depth', default=0, help='Levels between the disk and the tutorial folders.')
+    @click.option('-f', '--files', 'files_per_folder', default=5, help='Files per tutorial folder.')
+    @click.option('-s', '--seed', default=0, help='Random seed.')
+    def run(path, folder_count, depth, files_per_folder, seed):
+        spec = CatalogSpec(folder_count=folder_count, depth=depth, files_per_folder=files_per_folder, seed=seed)
+        folders = generate_catalog(Path(path), spec)
+        print(f'Generated {len(folders)} folders in {os.path.abspath(path)}')
+
+    run()
@@ -0,0 +1,60 @@
+import json
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Final, Iterator
+
+from pytest import fail, fixture
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+BASELINES_FILE: Final[Path] = Path(__file__).parent / 'baselines.json'
+
+
+class BenchmarkRecorder:
+    def __init__(self, baselines: Dict[str, float], tolerance: float, save: bool) -> None:
+        self.baselines = baselines
+        self.tolerance = tolerance
+        self.save = save
+        self.results: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        yield
+        self.check(name, perf_counter() - start)
+
+    def check(self, name: str, elapsed: float) -> None:
+        self.results[name] = elapsed
+        baseline = self.baselines.get(name)
+        if baseline is None:
+            print(f'\n{name}: {elapsed:.3f}s (no baseline)')
+            return
+
+        print(f'\n{name}: {elapsed:.3f}s (baseline: {baseline:.3f}s, {elapsed / baseline:.2f}x)')
+        if elapsed > baseline * self.tolerance and not self.save:
+            fail(f'{name} took {elapsed:.3f}s, more than {self.tolerance}x the baseline of {baseline:.3f}s')
+
+
+@fixture(scope='session')
+def bench(request) -> Iterator[BenchmarkRecorder]:
+    baselines: Dict[str, float] = {}
+    if BASELINES_FILE.exists():
+        with open(BASELINES_FILE, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    recorder = BenchmarkRecorder(
+        baselines,
+        request.config.getoption('--benchmark-tolerance'),
+        request.config.getoption('--benchmark-save'),
+    )
+    yield recorder
+
+    if recorder.save and recorder.results:
+        baselines.update({name: round(value, 4) for name, value in recorder.results.items()})
+        with open(BASELINES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=4)
+            f.write('\n')
+        log.info('Saved %s baselines to %s', len(recorder.results), BASELINES_FILE)
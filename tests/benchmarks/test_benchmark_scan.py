@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Dict, Final, Iterator, List, Tuple
+
+from pytest import TempPathFactory, fixture, mark
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from catalog_generator import CatalogGenerator, CatalogSpec
+from tutcatalogpy.common.db.dal import dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.scan_config import ScanConfig, scan_config
+from tutcatalogpy.common.scan_worker import ScanWorker
+
+SIZES: Final[List[int]] = [1_000, 10_000, 100_000]
+RENAME_RATIO: Final[float] = 0.2
+DISK_NAME: Final[str] = 'disk'
+
+# the benchmarks use their own scan options, so they don't depend on the user settings
+FOLDERS_ONLY: Final = ScanConfig.Option.LOCAL_DISKS | ScanConfig.Option.REMOTE_DISKS | ScanConfig.Option.UNCHECKED_DISKS
+DETAILS_ONLY: Final = ScanConfig.Option.UNCHECKED_DISKS | ScanConfig.Option.FOLDER_DETAILS
+
+
+@fixture(scope='module')
+def tree_factory(tmp_path_factory: TempPathFactory):
+    trees: Dict[int, Tuple[Path, List[Path]]] = {}
+
+    def make(folder_count: int) -> Tuple[Path, List[Path]]:
+        if folder_count not in trees:
+            root = tmp_path_factory.mktemp(f'tree{folder_count}')
+            spec = CatalogSpec(folder_count=folder_count, depth=1 if folder_count > 1_000 else 0)
+            trees[folder_count] = (root, CatalogGenerator(spec).generate(root / DISK_NAME))
+        return trees[folder_count]
+
+    return make
+
+
+@fixture
+def catalog(tmp_path: Path) -> Iterator[None]:
+    dal.connect(f'sqlite:///{tmp_path}/catalog.db')
+    saved_option = dict(scan_config.option)
+    yield
+    scan_config.option.update(saved_option)
+    dal.disconnect()
+
+
+def add_disk(root: Path, folder_count: int) -> None:
+    session = dal.Session()
+    session.add(Disk(disk_parent=str(root), disk_name=DISK_NAME, index_=1, depth=1 if folder_count > 1_000 else 0))
+    session.commit()
+    session.close()
+
+
+def scan(option: ScanConfig.Option) -> None:
+    scan_config.option[ScanConfig.Mode.NORMAL] = option
+    ScanWorker().scan(ScanConfig.Mode.NORMAL)
+
+
+def folder_count_in_db() -> int:
+    session = dal.Session()
+    count = session.query(Folder).count()
+    session.close()
+    return count
+
+
+@mark.benchmark
+@mark.parametrize('folder_count', SIZES)
+def test_cold_scan(bench, tree_factory, catalog, folder_count: int) -> None:
+    root, _ = tree_factory(folder_count)
+    add_disk(root, folder_count)
+
+    with bench.measure(f'scan_cold[{folder_count}]'):
+        scan(FOLDERS_ONLY)
+
+    assert folder_count_in_db() == folder_count
+
+
+@mark.benchmark
+@mark.parametrize('folder_count', SIZES)
+def test_warm_scan_without_changes(bench, tree_factory, catalog, folder_count: int) -> None:
+    root, _ = tree_factory(folder_count)
+    add_disk(root, folder_count)
+    scan(FOLDERS_ONLY)
+
+    with bench.measure(f'scan_warm[{folder_count}]'):
+        scan(FOLDERS_ONLY)
+
+    assert folder_count_in_db() == folder_count
+
+
+@mark.benchmark
+@mark.parametrize('folder_count', SIZES)
+def test_rename_heavy_scan(bench, tree_factory, catalog, folder_count: int) -> None:
+    root, folders = tree_factory(folder_count)
+    add_disk(root, folder_count)
+    scan(FOLDERS_ONLY)
+
+    renamed = CatalogGenerator(CatalogSpec(seed=folder_count)).rename(folders, RENAME_RATIO)
+    try:
+        with bench.measure(f'scan_renamed[{folder_count}]'):
+            scan(FOLDERS_ONLY)
+
+        assert folder_count_in_db() == folder_count
+    finally:
+        for old_path, new_path in renamed:
+            new_path.rename(old_path)
+
+
+@mark.benchmark
+@mark.parametrize('folder_count', SIZES)
+def test_details_scan(bench, tree_factory, catalog, folder_count: int) -> None:
+    root, _ = tree_factory(folder_count)
+    add_disk(root, folder_count)
+    scan(FOLDERS_ONLY)
+
+    with bench.measure(f'scan_details[{folder_count}]'):
+        scan(DETAILS_ONLY)
+
+    session = dal.Session()
+    assert session.query(Folder).filter(Folder.size == None).count() == 0  # noqa: E711
+    session.close()
@@ -0,0 +1,209 @@
+import random
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Final, Iterator, List
+
+from PySide2.QtCore import Qt
+from pytest import fixture, importorskip, mark
+from sqlalchemy.orm import Query, Session
+from unidecode import unidecode
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from catalog_generator import AUTHORS, TAGS, WORDS
+from tutcatalogpy.catalog.models.tutorials_model import Columns, TutorialsModel
+from tutcatalogpy.catalog.query_language import QueryCompiler, parse
+from tutcatalogpy.common.db.author import Author
+from tutcatalogpy.common.db.dal import dal, tutorial_author_table
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.search_flag import Search, SearchFlag, SearchValue
+from tutcatalogpy.common.db.search_index import fuzzy_matches, matching_folders, search_query, update_search_index
+from tutcatalogpy.common.db.tutorial import Tutorial
+
+FOLDER_COUNT: Final[int] = 100_000
+SEARCHES: Final[List[str]] = ['rigging', 'anatomy figure', 'blender', 'perez', 'advanced color', 'masterclass']
+FUZZY_SEARCH_COUNT: Final[int] = 20
+QUERIES: Final[List[str]] = [
+    'author:perez rating:>=3',
+    'tag:rigging duration:>2h -blender',
+    'released:2019..2021 size:>10GB',
+    '(anatomy OR figure) level:beginner publisher:"publisher 1"',
+]
+QUERY_PLAN_COUNT: Final[int] = 1000
+# what the user does in the tutorials view: sort a column, or toggle a flag of the tags dock
+VIEW_ACTIONS: Final[List] = [
+    (Columns.TITLE, Qt.AscendingOrder, None),
+    (Columns.RELEASED, Qt.DescendingOrder, None),
+    (Columns.SIZE, Qt.DescendingOrder, None),
+    (Columns.DURATION, Qt.AscendingOrder, SearchValue.RATING_AT_LEAST_4),
+    (Columns.DURATION, Qt.AscendingOrder, SearchValue.LEVEL_BEGINNER),
+    (Columns.AUTHORS, Qt.AscendingOrder, SearchValue.DURATION_1H_TO_3H),
+    (Columns.FOLDER_NAME, Qt.DescendingOrder, SearchValue.RELEASED_LAST_10_YEARS),
+]
+# make up the names of the authors and of the series of the tutorials, as varied as real ones
+CONSONANTS: Final[str] = 'bcdfghjklmnprstvwzł'
+VOWELS: Final[str] = 'aeiouyáéëöú'
+
+
+def made_up_name(rnd: random.Random) -> str:
+    syllables = [rnd.choice(CONSONANTS) + rnd.choice(VOWELS) + rnd.choice(['', '', 'n', 'r', 's']) for _ in range(rnd.randint(2, 4))]
+    return ''.join(syllables).capitalize()
+
+
+@fixture(scope='module')
+def catalog(tmp_path_factory) -> Iterator[List[str]]:
+    """A catalog of FOLDER_COUNT tutorials; yield searches of some of their authors, with typos and without accents."""
+    path: Path = tmp_path_factory.mktemp('search') / 'catalog.db'
+    dal.connect(f'sqlite:///{path}')
+    rnd = random.Random(0)
+    authors = AUTHORS + [f'{made_up_name(rnd)} {made_up_name(rnd)}' for _ in range(FOLDER_COUNT // 10)]
+    session = dal.session
+    session.execute(Disk.__table__.insert(), [{'id': 1, 'disk_parent': '/tmp', 'disk_name': 'disk', 'index': 1}])
+    session.execute(Publisher.__table__.insert(), [{'id': i, 'name': f'publisher {i}'} for i in range(1, 51)])
+    session.execute(Author.__table__.insert(), [{'id': i, 'name': name} for i, name in enumerate(authors, 1)])
+    released = [(rnd.randint(2005, 2023), rnd.randint(1, 12)) for _ in range(FOLDER_COUNT)]
+    tutorial_authors = [rnd.randrange(len(authors)) for _ in range(FOLDER_COUNT)]
+    session.execute(Tutorial.__table__.insert(), [
+        {
+            'id': i,
+            'title': ' '.join([made_up_name(rnd)] + rnd.sample(WORDS, 2)).title(),
+            'description': f'{rnd.choice(WORDS)} ' + 'lorem ipsum dolor sit amet ' * 20,
+            'all_authors': f',{authors[tutorial_authors[i - 1]]},',
+            'all_tags': ',' + ','.join(rnd.sample(TAGS, 2)) + ',',
+            'publisher_id': i % 50 + 1,
+            'released': f'{released[i - 1][0]}/{released[i - 1][1]:02}',
+            'released_on': released[i - 1][0] * 10000 + released[i - 1][1] * 100,
+            'duration': rnd.randint(10, 600),
+            'level': rnd.choice([1, 2, 4, 3, 6, 7]),
+            'rating': rnd.randint(0, 5),
+        }
+        for i in range(1, FOLDER_COUNT + 1)
+    ])
+    session.execute(Folder.__table__.insert(), [
+        {
+            'id': i,
+            'disk_id': 1,
+            'tutorial_id': i,
+            'folder_parent': f'publisher {i % 50}',
+            'folder_name': f'tutorial {i} {rnd.choice(WORDS)}',
+            'system_id': str(i),
+            'size': rnd.randint(100, 50_000) * 1000 ** 2,
+        }
+        for i in range(1, FOLDER_COUNT + 1)
+    ])
+    session.execute(tutorial_author_table.insert(), [
+        {'tutorial_id': i, 'author_id': author + 1} for i, author in enumerate(tutorial_authors, 1)
+    ])
+    update_search_index(dal.session, range(1, FOLDER_COUNT + 1))
+    dal.session.commit()
+
+    searches = []
+    for author in rnd.sample(authors, FUZZY_SEARCH_COUNT):
+        typo = rnd.randrange(1, len(author) - 1)
+        searches.append(unidecode(author[:typo] + author[typo + 1:]))
+    yield searches
+    dal.disconnect()
+
+
+def like_search(query: Query, text: str) -> Query:
+    """The search before the index: a LIKE per word over the path of the folder."""
+    for key in text.split():
+        path = Disk.disk_parent + '/' + Disk.disk_name + '/' + Folder.folder_parent + '/' + Folder.folder_name
+        query = query.filter(path.like(f'%{key}%'))
+    return query
+
+
+def fts_search(query: Query, text: str) -> Query:
+    return query.filter(Folder.id_.in_(matching_folders(search_query(text))))
+
+
+def run_searches(session: Session, search: Callable[[Query, str], Query]) -> float:
+    start = perf_counter()
+    for text in SEARCHES:
+        search(session.query(Folder.id_).join(Disk), text).count()
+    return perf_counter() - start
+
+
+@mark.benchmark
+def test_search(bench, catalog) -> None:
+    session = dal.Session()
+    like = run_searches(session, like_search)
+    fts = run_searches(session, fts_search)
+    session.close()
+
+    print(f'\n{len(SEARCHES)} searches over {FOLDER_COUNT} folders: LIKE {like:.3f}s, FTS {fts:.3f}s')
+    bench.check(f'search_like[{FOLDER_COUNT}]', like)
+    bench.check(f'search_fts[{FOLDER_COUNT}]', fts)
+    # the LIKE search only looks at the paths, and still scans every row
+    assert fts < like
+
+
+@mark.benchmark
+def test_fuzzy_search(bench, catalog) -> None:
+    session = dal.Session()
+    start = perf_counter()
+    for text in catalog:
+        assert fuzzy_matches(session, text), text
+    elapsed = perf_counter() - start
+    session.close()
+
+    print(f'\n{len(catalog)} fuzzy searches over {FOLDER_COUNT} folders: {elapsed / len(catalog) * 1000:.1f} ms per search')
+    bench.check(f'search_fuzzy[{FOLDER_COUNT}]', elapsed)
+
+
+@mark.benchmark
+def test_query_language(bench, catalog) -> None:
+    start = perf_counter()
+    for _ in range(QUERY_PLAN_COUNT):
+        for text in QUERIES:
+            QueryCompiler().compile(parse(text))
+    planned = perf_counter() - start
+
+    session = dal.Session()
+    start = perf_counter()
+    for text in QUERIES:
+        session.query(Folder.id_).join(Tutorial).join(Publisher).filter(QueryCompiler().compile(parse(text))).count()
+    searched = perf_counter() - start
+    session.close()
+
+    per_plan = planned / (QUERY_PLAN_COUNT * len(QUERIES))
+    print(f'\n{len(QUERIES)} queries over {FOLDER_COUNT} folders: planned in {per_plan * 1000:.3f} ms, searched in {searched:.3f}s')
+    bench.check(f'query_plan[{QUERY_PLAN_COUNT * len(QUERIES)}]', planned)
+    bench.check(f'search_query_language[{FOLDER_COUNT}]', searched)
+
+
+def run_view_actions(model: TutorialsModel) -> List[List[int]]:
+    """Do the VIEW_ACTIONS and return the first page displayed after each of them."""
+    pages = []
+    for column, order, search_value in VIEW_ACTIONS:
+        for search_flag in dal.session.query(SearchFlag):
+            search_flag.search = Search.INCLUDE if search_flag.value == search_value else Search.IGNORED
+        dal.session.commit()
+        model.sort(column.value, order)
+        pages.append([model.folder(row).id_ for row in range(min(model.rowCount(), model.PAGE_SIZE))])
+    return pages
+
+
+@mark.benchmark
+def test_catalog_snapshot(bench, catalog) -> None:
+    importorskip('numpy')
+    sql_model = TutorialsModel()
+    snapshot_model = TutorialsModel()
+    snapshot_model.set_snapshot_enabled(True)
+
+    with bench.measure(f'snapshot_load[{FOLDER_COUNT}]'):
+        snapshot_model.refresh()
+
+    start = perf_counter()
+    sql_pages = run_view_actions(sql_model)
+    sql = perf_counter() - start
+    start = perf_counter()
+    snapshot_pages = run_view_actions(snapshot_model)
+    snapshot = perf_counter() - start
+
+    print(f'\n{len(VIEW_ACTIONS)} sorts and filters of {FOLDER_COUNT} folders: SQL {sql:.3f}s, in memory {snapshot:.3f}s')
+    bench.check(f'view_actions_sql[{FOLDER_COUNT}]', sql)
+    bench.check(f'view_actions_snapshot[{FOLDER_COUNT}]', snapshot)
+    assert snapshot_pages == sql_pages
+    assert snapshot < sql
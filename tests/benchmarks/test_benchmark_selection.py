@@ -0,0 +1,89 @@
+import os
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Final, Iterator, List
+
+from pytest import fixture, mark
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.db.cover import Cover
+from tutcatalogpy.common.db.dal import dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.image import Image
+from tutcatalogpy.common.db.tutorial import Tutorial
+
+FOLDER_COUNT: Final[int] = 500
+COVER_SIZE: Final[int] = 1_000_000
+IMAGE_SIZE: Final[int] = 200_000
+DESCRIPTION_SIZE: Final[int] = 50_000
+
+
+@fixture(scope='module')
+def catalog(tmp_path_factory) -> Iterator[None]:
+    """A catalog with large covers, images and descriptions."""
+    path: Path = tmp_path_factory.mktemp('selection') / 'catalog.db'
+    dal.connect(f'sqlite:///{path}')
+    session = dal.Session()
+    disk = Disk(disk_parent='/tmp', disk_name='disk', index_=1)
+    session.add(disk)
+    for i in range(FOLDER_COUNT):
+        folder = Folder(disk=disk, folder_parent='', folder_name=f'folder {i}', system_id=str(i))
+        folder.tutorial = Tutorial(title=f'tutorial {i}', description=f'{i} ' + 'x' * DESCRIPTION_SIZE)
+        folder.cover = Cover(file_format=Cover.FileFormat.JPG.value)
+        folder.cover.data = os.urandom(COVER_SIZE)
+        image = Image(name='image.jpg', system_id=str(i))
+        image.data = os.urandom(IMAGE_SIZE)
+        folder.images.append(image)
+        session.add(folder)
+    session.commit()
+    session.close()
+    yield
+    dal.disconnect()
+
+
+def folder_ids() -> List[int]:
+    session = dal.Session()
+    ids = [folder_id for folder_id, in session.query(Folder.id_)]
+    session.close()
+    return ids
+
+
+@mark.benchmark
+def test_list_folders_memory(catalog) -> None:
+    session = dal.Session()
+    tracemalloc.start()
+    folders = session.query(Folder).join(Tutorial).all()
+    titles = [folder.tutorial.title for folder in folders]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    session.close()
+
+    print(f'\nlisting {len(titles)} folders: {peak / 1024 / 1024:.1f} MiB peak')
+    # the descriptions alone would take FOLDER_COUNT * DESCRIPTION_SIZE
+    assert peak < FOLDER_COUNT * DESCRIPTION_SIZE / 2
+
+
+@mark.benchmark
+def test_selection(bench, catalog) -> None:
+    ids = folder_ids()
+    session = dal.Session()
+
+    tracemalloc.start()
+    start = perf_counter()
+    for folder_id in ids:
+        folder = Folder.get(session, folder_id, details=True)
+        assert folder.tutorial.description
+        assert folder.cover.data is not None
+        assert len(folder.images) == 1
+        # a selection change only keeps the current folder
+        session.expunge_all()
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    session.close()
+
+    print(f'\n{len(ids)} selections: {elapsed / len(ids) * 1000:.2f} ms per selection, {peak / 1024 / 1024:.1f} MiB peak')
+    bench.check(f'selection[{FOLDER_COUNT}]', elapsed)
+    assert peak < 10 * COVER_SIZE
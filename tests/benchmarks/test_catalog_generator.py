@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from pytest import fixture, mark
+from sqlalchemy.orm.session import Session
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from catalog_generator import CatalogGenerator, CatalogSpec, generate_catalog
+from tutcatalogpy.common.db.dal import dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.scan_config import ScanConfig
+from tutcatalogpy.common.scan_worker import ScanWorker
+from tutcatalogpy.common.tutorial_data import TutorialData
+
+
+@fixture
+def session() -> Session:
+    dal.connect('sqlite:///:memory:')
+    yield dal.Session()
+    dal.disconnect()
+
+
+@mark.parametrize(
+    'folder_count, depth',
+    [
+        (0, 0),
+        (7, 0),
+        (25, 1),
+        (250, 2),
+    ]
+)
+def test_generate_catalog_folder_count(tmp_path: Path, folder_count: int, depth: int):
+    folders = generate_catalog(tmp_path / 'disk', CatalogSpec(folder_count=folder_count, depth=depth, files_per_folder=1))
+
+    assert len(folders) == folder_count
+    assert len(set(folders)) == folder_count
+    for folder in folders:
+        assert len(folder.relative_to(tmp_path / 'disk').parts) == depth + 1
+
+
+def test_generate_catalog_is_deterministic(tmp_path: Path):
+    spec = CatalogSpec(folder_count=10, files_per_folder=2)
+    folders1 = generate_catalog(tmp_path / 'disk1', spec)
+    folders2 = generate_catalog(tmp_path / 'disk2', spec)
+
+    assert [f.name for f in folders1] == [f.name for f in folders2]
+    for f1, f2 in zip(folders1, folders2):
+        assert sorted(p.name for p in f1.iterdir()) == sorted(p.name for p in f2.iterdir())
+
+
+def test_generated_info_tc_can_be_parsed(tmp_path: Path, session: Session):
+    spec = CatalogSpec(folder_count=20, info_tc_ratio=1, invalid_info_tc_ratio=0)
+    for folder in generate_catalog(tmp_path, spec):
+        with open(folder / TutorialData.FILE_NAME, encoding='utf-8') as f:
+            tutorial = Tutorial()
+            TutorialData.load_from_string(session, tutorial, f.read())
+            assert tutorial.title != ''
+
+
+def test_rename_folders(tmp_path: Path):
+    generator = CatalogGenerator(CatalogSpec(folder_count=10, files_per_folder=0))
+    folders = generator.generate(tmp_path)
+    renamed = generator.rename(folders, 0.5)
+
+    assert len(renamed) == 5
+    for old_path, new_path in renamed:
+        assert not old_path.exists()
+        assert new_path.exists()
+
+
+def test_scan_generated_catalog(tmp_path: Path, session: Session):
+    spec = CatalogSpec(folder_count=30, depth=1, parents_per_level=3)
+    generate_catalog(tmp_path / 'disk', spec)
+
+    session.add(Disk(disk_parent=str(tmp_path), disk_name='disk', index_=0, depth=1))
+    session.commit()
+
+    ScanWorker().scan(ScanConfig.Mode.EXTENDED)
+
+    assert session.query(Folder).count() == 30
+    assert session.query(Folder).filter(Folder.size == None).count() == 0  # noqa: E711
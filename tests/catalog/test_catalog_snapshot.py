@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from PySide2.QtCore import Qt
+from pytest import fixture
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.catalog.models.tutorials_model import Columns, TutorialsModel
+from tutcatalogpy.catalog.tutorial_filters import FieldFilter
+from tutcatalogpy.common.db.author import Author
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.facet_index import rebuild_facet_index
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.search_flag import Search, SearchFlag, SearchValue
+from tutcatalogpy.common.db.search_index import update_search_index
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.tutorial_data import TutorialLevel
+
+pytest.importorskip('numpy')
+
+from tutcatalogpy.catalog.catalog_snapshot import CatalogSnapshot, Flag  # noqa: E402
+
+FOLDER_COUNT = 60
+LEVELS = [TutorialLevel.UNKNOWN, TutorialLevel.BEGINNER, TutorialLevel.ADVANCED, TutorialLevel.ANY]
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    session = dal.session
+    disks = [
+        Disk(disk_parent='/tmp', disk_name='local', index_=1, location=Disk.Location.LOCAL, online=True),
+        Disk(disk_parent='/tmp', disk_name='Remote', index_=2, location=Disk.Location.REMOTE, online=False, checked=False),
+    ]
+    publishers = [Publisher(name=name) for name in ['proko', 'CG Cookie', 'Gumroad', '']]
+    authors = [Author(name=name) for name in ['Jane Doe', 'raúl', 'Ben']]
+    created = datetime(2020, 1, 1)
+    for i in range(FOLDER_COUNT):
+        tutorial_authors = [authors[i % 3]] + ([authors[(i + 1) % 3]] if i % 4 == 0 else [])
+        tutorial = Tutorial(
+            title=['Rigging', 'anatomy', '', 'Éclairage', 'blender basics'][i % 5] + (f' {i // 5}' if i % 5 != 2 else ''),
+            publisher=publishers[i % 4],
+            authors=tutorial_authors,
+            all_authors=f',{",".join(author.name for author in tutorial_authors)},',
+            level=LEVELS[i % 4],
+            rating=i % 7 - 1,
+            duration=(i * 37) % 700,
+            released_on=[0, 20190500, 20211102, 20240000, 20250315][i % 5],
+            is_complete=i % 3 == 0,
+            size=None if i % 6 == 0 else 10,
+        )
+        session.add(Folder(
+            disk=disks[i % 2], folder_parent=f'parent {i % 4}', folder_name=f'Folder {(i * 17) % FOLDER_COUNT:02}',
+            system_id=str(i), tutorial=tutorial, checked=i % 5 != 0, error='error' if i % 8 == 0 else None,
+            size=None if i % 7 == 0 else i * 1000, video_duration=None if i % 3 == 0 else (i * 311) % 20000,
+            created=created + timedelta(hours=(i * 13) % FOLDER_COUNT), modified=created + timedelta(minutes=i),
+        ))
+    # a tutorial without an author isn't listed
+    session.add(Folder(disk=disks[0], folder_parent='', folder_name='no author', system_id='x', tutorial=Tutorial(
+        title='no author', publisher=publishers[0],
+    )))
+    session.flush()
+    update_search_index(session, [folder_id for folder_id, in session.query(Folder.id_)])
+    rebuild_facet_index(session)
+    session.commit()
+    yield dal
+    dal.disconnect()
+
+
+def search_dock(text: str = '', only_show_checked_disks: bool = False, min_duration: int = 0, max_duration: int = 0):
+    return SimpleNamespace(
+        text=text,
+        only_show_checked_disks=only_show_checked_disks,
+        search_files=False,
+        fuzzy=False,
+        min_duration=min_duration,
+        max_duration=max_duration,
+    )
+
+
+def folder_ids(model: TutorialsModel) -> list:
+    return [model.folder(row).id_ for row in range(model.rowCount())]
+
+
+def models():
+    sql_model = TutorialsModel()
+    snapshot_model = TutorialsModel()
+    snapshot_model.set_snapshot_enabled(True)
+    return sql_model, snapshot_model
+
+
+def test_load(dal_: DataAccessLayer) -> None:
+    snapshot = CatalogSnapshot()
+    snapshot.load(dal_.session)
+
+    assert len(snapshot) == FOLDER_COUNT
+    assert snapshot.folder_ids.tolist() == list(range(1, FOLDER_COUNT + 1))
+    assert snapshot.has_flag(Flag.HAS_ERROR).sum() == len(range(0, FOLDER_COUNT, 8))
+    assert snapshot.disk_online().sum() == FOLDER_COUNT // 2
+    assert snapshot.matches(FieldFilter('level', mask=TutorialLevel.BEGINNER)).sum() == FOLDER_COUNT // 2
+    assert snapshot.matches(FieldFilter('rating', 5, 5)).sum() == len(range(6, FOLDER_COUNT, 7))
+    # the folder ids start at 1
+    assert snapshot.in_bitmap(0b1000_0010).tolist()[:8] == [True, False, False, False, False, False, True, False]
+    assert snapshot.total_size(snapshot.rows(snapshot.all_rows())) == sum(
+        i * 1000 for i in range(FOLDER_COUNT) if i % 7 != 0
+    )
+
+
+def test_refresh(dal_: DataAccessLayer) -> None:
+    snapshot = CatalogSnapshot()
+    snapshot.load(dal_.session)
+
+    folder = dal_.session.query(Folder).get(5)
+    folder.tutorial.rating = 5
+    dal_.session.delete(dal_.session.query(Folder).get(7))
+    dal_.session.commit()
+    snapshot.refresh(dal_.session, [5, 7])
+
+    assert len(snapshot) == FOLDER_COUNT - 1
+    assert 7 not in snapshot.folder_ids.tolist()
+    assert snapshot.folder_ids.tolist() == sorted(snapshot.folder_ids.tolist())
+    assert 5 in snapshot.folder_ids[snapshot.matches(FieldFilter('rating', 5, 5))].tolist()
+
+
+@pytest.mark.parametrize('column', [column.value for column in Columns])
+def test_sort_like_the_query(dal_: DataAccessLayer, column: int) -> None:
+    sql_model, snapshot_model = models()
+    for model in (sql_model, snapshot_model):
+        model.search(search_dock('blender OR rigging OR anatomy'))
+
+    for order in (Qt.AscendingOrder, Qt.DescendingOrder):
+        sql_model.sort(column, order)
+        snapshot_model.sort(column, order)
+        assert folder_ids(snapshot_model) == folder_ids(sql_model)
+
+
+@pytest.mark.parametrize('text', ['', 'rigging', '-anatomy', 'level:beginner rating:>=2', 'released:2019..2021', 'size:>20KB'])
+def test_filter_like_the_query(dal_: DataAccessLayer, text: str) -> None:
+    sql_model, snapshot_model = models()
+    for dock in [search_dock(text), search_dock(text, True), search_dock(text, min_duration=60, max_duration=200)]:
+        sql_model.search(dock)
+        snapshot_model.search(dock)
+        assert folder_ids(snapshot_model) == folder_ids(sql_model)
+
+
+def test_filter_tags_like_the_query(dal_: DataAccessLayer) -> None:
+    sql_model, snapshot_model = models()
+    summaries = []
+    snapshot_model.summary_changed.connect(summaries.append)
+    sql_model.summary_changed.connect(summaries.append)
+
+    session = dal_.session
+    session.query(SearchFlag).filter(SearchFlag.value == SearchValue.IS_DISK_ONLINE).one().search = Search.INCLUDE
+    session.query(SearchFlag).filter(SearchFlag.value == SearchValue.HAS_ERROR).one().search = Search.EXCLUDE
+    session.query(SearchFlag).filter(SearchFlag.value == SearchValue.RELEASED_UNKNOWN).one().search = Search.EXCLUDE
+    session.query(Publisher).filter(Publisher.name == 'Gumroad').one().search = Search.EXCLUDE
+    session.query(Author).filter(Author.name == 'Ben').one().search = Search.INCLUDE
+    session.commit()
+    snapshot_model.refresh()
+    sql_model.refresh()
+
+    assert folder_ids(snapshot_model) == folder_ids(sql_model)
+    assert 0 < snapshot_model.rowCount() < FOLDER_COUNT
+    assert summaries[0] == summaries[1]
+
+
+def test_update_folders(dal_: DataAccessLayer) -> None:
+    dal_.session.query(SearchFlag).filter(SearchFlag.value == SearchValue.RATING_5).one().search = Search.INCLUDE
+    dal_.session.commit()
+    model = TutorialsModel()
+    model.set_snapshot_enabled(True)
+    model.refresh()
+    count = model.rowCount()
+
+    folder = dal_.session.query(Folder).filter(Tutorial.rating != 5).join(Tutorial).first()
+    folder.tutorial.rating = 5
+    dal_.session.commit()
+    model.refresh()
+    # not loaded again until the scan says so
+    assert model.rowCount() == count
+
+    model.update_folders([folder.id_])
+    model.refresh()
+    assert model.rowCount() == count + 1
+    assert folder.id_ in folder_ids(model)
+
+
+def test_check_a_folder(dal_: DataAccessLayer) -> None:
+    model = TutorialsModel()
+    model.set_snapshot_enabled(True)
+    model.refresh()
+    index = model.index(0, Columns.CHECKED.value)
+    checked = model.data(index, Qt.CheckStateRole) == Qt.Checked
+
+    model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+    model.sort(Columns.CHECKED.value, Qt.AscendingOrder)
+
+    assert model.folder(0).checked is False
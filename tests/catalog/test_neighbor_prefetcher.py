@@ -0,0 +1,73 @@
+from time import monotonic
+from typing import List
+
+from PySide2.QtCore import QCoreApplication
+from pytest import fixture
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.catalog.neighbor_prefetcher import NeighborPrefetcher
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.tutorial import Tutorial
+
+FOLDER_COUNT = 5
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    session = dal.session
+    disk = Disk(disk_parent='/tmp', disk_name='disk', index_=1)
+    for i in range(FOLDER_COUNT):
+        tutorial = Tutorial(title=f'tutorial {i}', description=f'description {i}')
+        session.add(Folder(disk=disk, folder_parent='', folder_name=f'folder {i}', system_id=str(i), tutorial=tutorial))
+    session.commit()
+    yield dal
+    dal.disconnect()
+
+
+def process_events(app: QCoreApplication, prefetched: List, count: int, timeout: float = 5) -> None:
+    deadline = monotonic() + timeout
+    while len(prefetched) < count and monotonic() < deadline:
+        app.processEvents()
+
+
+def test_prefetch_in_order(app, dal_: DataAccessLayer) -> None:
+    prefetcher = NeighborPrefetcher()
+    prefetched: List[Folder] = []
+    prefetcher.add_handler(prefetched.append)
+
+    prefetcher.prefetch([3, 1, 4])
+    # nothing is loaded until the event loop is idle
+    assert prefetched == []
+    process_events(app, prefetched, 3)
+
+    assert [folder.id_ for folder in prefetched] == [3, 1, 4]
+    assert prefetcher.get(3) is prefetched[0]
+
+
+def test_prefetch_replaces_waiting_folders(app, dal_: DataAccessLayer) -> None:
+    prefetcher = NeighborPrefetcher()
+    prefetched: List[Folder] = []
+    prefetcher.add_handler(prefetched.append)
+
+    prefetcher.prefetch([1, 2])
+    prefetcher.prefetch([5])
+    process_events(app, prefetched, 1)
+    app.processEvents()
+
+    assert [folder.id_ for folder in prefetched] == [5]
+
+
+def test_get_and_clear(app, dal_: DataAccessLayer) -> None:
+    prefetcher = NeighborPrefetcher()
+
+    folder = prefetcher.get(2)
+    assert folder.tutorial.description == folder.folder_name.replace('folder', 'description')
+    assert prefetcher.get(2) is folder
+    assert prefetcher.get(FOLDER_COUNT + 1) is None
+
+    prefetcher.clear()
+    dal_.session.expunge_all()
+    assert prefetcher.get(2) is not folder
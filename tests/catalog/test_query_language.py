@@ -0,0 +1,149 @@
+from pytest import fixture, raises
+from sqlalchemy.orm import Query
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.catalog.query_language import And, Not, Or, QueryCompiler, QueryError, Term, parse, required_text_terms, text_terms
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.search_index import update_search_index
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.tutorial_data import TutorialLevel
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    session = dal.session
+    disk = Disk(disk_parent='/tmp', disk_name='disk', index_=1)
+    tutorials = {
+        'anatomy': Tutorial(
+            title='Figure Anatomy', all_authors=',Raúl Pérez,', all_tags=',drawing,', released='2019/05', released_on=20190500,
+            duration=150, level=TutorialLevel.BEGINNER, rating=4, publisher=Publisher(name='Proko'),
+        ),
+        'rigging': Tutorial(
+            title='Face Rigging in Blender', all_authors=',Jane Doe,', all_tags=',rigging,blender,', released='2021/11/02',
+            released_on=20211102,
+            duration=90, level=TutorialLevel.INTERMEDIATE | TutorialLevel.ADVANCED, rating=2,
+            publisher=Publisher(name='CG Cookie'),
+        ),
+        'zbrush': Tutorial(
+            title='Sculpting in ZBrush', all_authors=',Jane Doe,', all_tags=',sculpting,', released='',
+            duration=0, level=TutorialLevel.ADVANCED, rating=5, publisher=Publisher(name='Gumroad'),
+        ),
+    }
+    sizes = {'anatomy': 5 * 1000 ** 3, 'rigging': 20 * 1000 ** 3, 'zbrush': 1024 ** 3}
+    for name, tutorial in tutorials.items():
+        session.add(Folder(disk=disk, folder_parent='', folder_name=name, system_id=name, size=sizes[name], tutorial=tutorial))
+    session.flush()
+    update_search_index(session, [folder_id for folder_id, in session.query(Folder.id_)])
+    session.commit()
+    yield dal
+    dal.disconnect()
+
+
+def search(text: str) -> list:
+    query: Query = dal.session.query(Folder.folder_name).join(Tutorial).join(Publisher)
+    node = parse(text)
+    if node is not None:
+        query = query.filter(QueryCompiler().compile(node))
+    return sorted(name for name, in query)
+
+
+def test_parse() -> None:
+    assert parse('') is None
+    assert parse('  ') is None
+    assert parse('blender') == Term(None, 'blender', False, 0)
+    assert parse('face "rig in"') == And([Term(None, 'face', False, 0), Term(None, 'rig in', True, 5)])
+    assert parse('author:"raul perez"') == Term('author', 'raul perez', True, 7)
+    assert parse('Rating:>=3') == Term('rating', '>=3', False, 0)
+    assert parse('sci-fi -zbrush') == And([Term(None, 'sci-fi', False, 0), Not(Term(None, 'zbrush', False, 8))])
+
+
+def test_parse_operators() -> None:
+    a, b, c = (Term(None, name, False, position) for name, position in [('a', 0), ('b', 5), ('c', 7)])
+    # AND binds tighter than OR
+    assert parse('a OR b c') == Or([a, And([b, c])])
+    assert parse('a AND b') == And([a, Term(None, 'b', False, 6)])
+    assert parse('NOT (a OR b)') == Not(Or([Term(None, 'a', False, 5), Term(None, 'b', False, 10)]))
+    # the operators are upper case; the words are searched whatever their case
+    assert parse('a or b') == And([a, Term(None, 'or', False, 2), b])
+    # an unclosed parenthesis ends with the text
+    assert parse('-(a b') == Not(And([Term(None, 'a', False, 2), Term(None, 'b', False, 4)]))
+
+
+def test_parse_errors() -> None:
+    with raises(QueryError) as error:
+        parse('a OR')
+    assert error.value.position == 2
+    with raises(QueryError) as error:
+        parse('a) b')
+    assert error.value.position == 1
+    with raises(QueryError):
+        parse('NOT')
+
+
+def test_text_terms() -> None:
+    assert [term.query for term in text_terms(parse('rig "face rig" -zbrush tag:blender OR anatomy'))] == [
+        '"rig"*', '"face rig"', '"anatomy"*',
+    ]
+    assert text_terms(None) == []
+
+
+def test_required_text_terms() -> None:
+    assert [term.query for term in required_text_terms(parse('rig "face rig" -zbrush tag:blender (anatomy OR hands)'))] == [
+        '"rig"*', '"face rig"',
+    ]
+    assert required_text_terms(parse('rig OR anatomy')) == []
+    assert required_text_terms(None) == []
+
+
+def test_search_words_and_text_fields(dal_: DataAccessLayer) -> None:
+    assert search('') == ['anatomy', 'rigging', 'zbrush']
+    assert search('in') == ['rigging', 'zbrush']
+    assert search('raul') == ['anatomy']
+    assert search('author:doe') == ['rigging', 'zbrush']
+    assert search('title:doe') == []
+    assert search('tag:rigging OR tag:drawing') == ['anatomy', 'rigging']
+    assert search('author:doe -blender') == ['zbrush']
+    assert search('path:zbr') == ['zbrush']
+    assert search('publisher:cook') == ['rigging']
+    assert search('" - "') == ['anatomy', 'rigging', 'zbrush']
+
+
+def test_search_fields(dal_: DataAccessLayer) -> None:
+    assert search('level:beginner') == ['anatomy']
+    assert search('level:advanced') == ['rigging', 'zbrush']
+    assert search('level:intermediate,advanced') == ['rigging']
+    assert search('duration:>2h') == ['anatomy']
+    assert search('duration:1h..2h') == ['rigging']
+    assert search('duration:<=1h30m') == ['rigging', 'zbrush']
+    assert search('rating:>=4') == ['anatomy', 'zbrush']
+    assert search('rating:2') == ['rigging']
+    assert search('size:>10GB') == ['rigging']
+    assert search('size:1GiB') == ['zbrush']
+    assert search('size:..5gb') == ['anatomy', 'zbrush']
+
+
+def test_search_released(dal_: DataAccessLayer) -> None:
+    assert search('released:2019..2021') == ['anatomy', 'rigging']
+    assert search('released:2021') == ['rigging']
+    assert search('released:2021-11') == ['rigging']
+    assert search('released:<2020') == ['anatomy']
+    assert search('released:2019/6..') == ['rigging']
+    # the tutorials released in May 2019, without a day, are in the month but not in its days
+    assert search('released:2019/05') == ['anatomy']
+    assert search('released:2019/05/01..2019/05/31') == []
+    assert search('released:>2019') == ['rigging']
+    assert search('released:<=2021/11/01') == ['anatomy']
+
+
+def test_search_field_errors(dal_: DataAccessLayer) -> None:
+    for text in [
+        'colour:red', 'level:expert', 'duration:long', 'size:10XB', 'rating:>=x', 'released:may', 'author:"-"',
+        'size:99999999999999999999TB', 'size:<' + '9' * 400, 'duration:99999999999999999999h', 'rating:99999999999999999999',
+        'rating:-99999999999999999999..0',
+    ]:
+        with raises(QueryError):
+            search(text)
@@ -0,0 +1,77 @@
+from datetime import date
+
+from PySide2.QtCore import QModelIndex, Qt
+from pytest import fixture
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.catalog.models.tags_model import TagsModel
+from tutcatalogpy.catalog.tutorial_filters import level_condition, released_range, search_value_condition
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.search_flag import SearchValue
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.tutorial_data import TutorialLevel
+
+TODAY = date(2026, 3, 15)
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    dal.session.add_all([
+        Tutorial(title='beginner', level=TutorialLevel.BEGINNER, rating=5, duration=45, released_on=20250400),
+        Tutorial(title='any', level=TutorialLevel.ANY, rating=3, duration=120, released_on=20250315),
+        Tutorial(title='advanced', level=TutorialLevel.ADVANCED, rating=-2, duration=700, released_on=20170000),
+        Tutorial(title='unknown', level=TutorialLevel.UNKNOWN, rating=0, duration=0, released_on=0),
+    ])
+    dal.session.commit()
+    yield dal
+    dal.disconnect()
+
+
+def titles(condition) -> list:
+    return sorted(title for title, in dal.session.query(Tutorial.title).filter(condition))
+
+
+def test_released_range() -> None:
+    assert released_range(2020) == (20200000, 20209999)
+    assert released_range(2020, 7) == (20200700, 20200799)
+    assert released_range(2020, 7, 14) == (20200714, 20200714)
+
+
+def test_level_condition(dal_: DataAccessLayer) -> None:
+    assert titles(level_condition(TutorialLevel.BEGINNER)) == ['any', 'beginner']
+    assert titles(level_condition(TutorialLevel.INTERMEDIATE | TutorialLevel.ADVANCED)) == ['any']
+
+
+def test_search_value_condition(dal_: DataAccessLayer) -> None:
+    def search(value: SearchValue) -> list:
+        return titles(search_value_condition(value, TODAY))
+
+    assert search(SearchValue.LEVEL_ADVANCED) == ['advanced', 'any']
+    assert search(SearchValue.RATING_AT_LEAST_3) == ['any', 'beginner']
+    assert search(SearchValue.RATING_5) == ['beginner']
+    assert search(SearchValue.RATING_NEGATIVE) == ['advanced']
+    assert search(SearchValue.DURATION_UNDER_1H) == ['beginner']
+    assert search(SearchValue.DURATION_1H_TO_3H) == ['any']
+    assert search(SearchValue.DURATION_OVER_10H) == ['advanced']
+    # from the start of the month a year ago
+    assert search(SearchValue.RELEASED_LAST_YEAR) == ['any', 'beginner']
+    assert search(SearchValue.RELEASED_LAST_10_YEARS) == ['advanced', 'any', 'beginner']
+    assert search(SearchValue.RELEASED_UNKNOWN) == ['unknown']
+    assert search_value_condition(SearchValue.IS_COMPLETE) is None
+
+
+def test_tags_model_counts_the_tutorials_of_the_flags(dal_: DataAccessLayer) -> None:
+    model = TagsModel()
+    model.refresh()
+
+    labels = {}
+    for row in range(model.rowCount(QModelIndex())):
+        group = model.index(row, 0, QModelIndex())
+        labels[model.data(group, Qt.DisplayRole)] = [
+            model.data(model.index(child, 0, group), Qt.DisplayRole) for child in range(model.rowCount(group))
+        ]
+
+    assert labels['levels [3]'] == ['beginner (2)', 'intermediate (1)', 'advanced (2)']
+    assert 'beginner' not in labels['flags [6]']
+    assert labels['ratings [6]'][0] == '1 star or more (2)'
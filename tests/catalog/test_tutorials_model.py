@@ -0,0 +1,187 @@
+from types import SimpleNamespace
+
+from PySide2.QtCore import Qt
+from pytest import fixture
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.catalog.models.tutorials_model import Columns, TutorialsModel
+from tutcatalogpy.common.db.author import Author
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.search_index import update_search_index
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.file_listing import FileEntry
+from tutcatalogpy.common.scan_worker import ScanWorker
+
+FOLDER_COUNT = 250
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    session = dal.session
+    disk = Disk(disk_parent='/tmp', disk_name='disk', index_=1)
+    publisher = Publisher(name='publisher')
+    author = Author(name='author')
+    for i in range(FOLDER_COUNT):
+        tutorial = Tutorial(title=f'tutorial {i:03}', publisher=publisher, authors=[author])
+        session.add(Folder(disk=disk, folder_parent='', folder_name=f'folder {i:03}', system_id=str(i), tutorial=tutorial))
+    session.flush()
+    update_search_index(session, [folder_id for folder_id, in session.query(Folder.id_)])
+    session.commit()
+    yield dal
+    dal.disconnect()
+
+
+def test_rows_are_fetched_by_pages(dal_: DataAccessLayer) -> None:
+    model = TutorialsModel()
+    model.refresh()
+
+    assert model.rowCount() == FOLDER_COUNT
+    names = [model.folder(row).folder_name for row in range(FOLDER_COUNT)]
+    assert names == [f'folder {i:03}' for i in range(FOLDER_COUNT)]
+    assert model.folder(FOLDER_COUNT) is None
+    assert model.folder(-1) is None
+
+
+def test_refresh_drops_cached_pages(dal_: DataAccessLayer) -> None:
+    model = TutorialsModel()
+    model.refresh()
+    assert model.folder(0).folder_name == 'folder 000'
+
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 000').one()
+    folder.folder_name = 'folder 999'
+    dal_.session.commit()
+    model.refresh()
+
+    assert model.folder(0).folder_name == 'folder 001'
+    assert model.folder(FOLDER_COUNT - 1).folder_name == 'folder 999'
+
+
+def search_dock(
+    text: str = '', search_files: bool = False, fuzzy: bool = False, min_duration: int = 0, max_duration: int = 0
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        text=text,
+        only_show_checked_disks=False,
+        search_files=search_files,
+        fuzzy=fuzzy,
+        min_duration=min_duration,
+        max_duration=max_duration,
+    )
+
+
+def test_search_file_names(dal_: DataAccessLayer) -> None:
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 007').one()
+    ScanWorker.update_folder_files(dal_.session, folder, [FileEntry('lessons/lesson_12_rigging.mp4', 1, 1, False)])
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 008').one()
+    ScanWorker.update_folder_files(dal_.session, folder, [FileEntry('lessonX12.mp4', 1, 1, False)])
+    dal_.session.commit()
+    model = TutorialsModel()
+
+    model.search(search_dock('lesson_12'))
+    assert model.rowCount() == 0
+
+    # by the start of the names, the _ isn't a wildcard
+    model.search(search_dock('LESSON_12', search_files=True))
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 007']
+    model.search(search_dock('rigging', search_files=True))
+    assert model.rowCount() == 0
+
+    # each word matches the path or a file
+    model.search(search_dock('007 lesson_12', search_files=True))
+    assert model.rowCount() == 1
+    model.search(search_dock('008 lesson_12', search_files=True))
+    assert model.rowCount() == 0
+
+
+def test_filter_and_sort_video_duration(dal_: DataAccessLayer) -> None:
+    for name, duration in [('folder 001', 3600), ('folder 002', 5400), ('folder 003', 600)]:
+        dal_.session.query(Folder).filter(Folder.folder_name == name).one().video_duration = duration
+    dal_.session.commit()
+    model = TutorialsModel()
+
+    model.search(search_dock(min_duration=30, max_duration=60))
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 001']
+    assert model.data(model.index(0, Columns.VIDEO_DURATION.value), Qt.DisplayRole) == '1h 00m'
+
+    model.search(search_dock(min_duration=10))
+    model.sort(Columns.VIDEO_DURATION.value, Qt.DescendingOrder)
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 002', 'folder 001', 'folder 003']
+
+
+def test_search_titles_by_prefix_and_sort_by_relevance(dal_: DataAccessLayer) -> None:
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 042').one()
+    folder.tutorial.title = 'Rigging in Blender'
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 043').one()
+    folder.tutorial.description = 'The rigging of the face'
+    update_search_index(dal_.session, [folder.id_ - 1, folder.id_])
+    dal_.session.commit()
+    model = TutorialsModel()
+    model.sort(Columns.RELEVANCE.value, Qt.AscendingOrder)
+
+    model.search(search_dock('rig'))
+    # the title weighs more than the description
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 042', 'folder 043']
+
+    model.search(search_dock('"rigging in"'))
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 042']
+
+
+def test_fuzzy_search(dal_: DataAccessLayer) -> None:
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 042').one()
+    folder.tutorial.title = 'Pintura con Raúl Pérez'
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 043').one()
+    folder.tutorial.title = 'Perspective'
+    update_search_index(dal_.session, [folder.id_ - 1, folder.id_])
+    dal_.session.commit()
+    model = TutorialsModel()
+    model.sort(Columns.RELEVANCE.value, Qt.AscendingOrder)
+
+    model.search(search_dock('raul prez'))
+    assert model.rowCount() == 0
+
+    model.search(search_dock('raul prez', fuzzy=True))
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 042']
+
+    model.search(search_dock('perspectve', fuzzy=True))
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 043']
+
+
+def test_fuzzy_search_with_negated_and_alternative_terms(dal_: DataAccessLayer) -> None:
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 042').one()
+    folder.tutorial.title = 'Blender basics'
+    folder = dal_.session.query(Folder).filter(Folder.folder_name == 'folder 043').one()
+    folder.tutorial.title = 'Blender and ZBrush'
+    update_search_index(dal_.session, [folder.id_ - 1, folder.id_])
+    dal_.session.commit()
+    model = TutorialsModel()
+
+    for fuzzy in [False, True]:
+        model.search(search_dock('blender -zbrush', fuzzy=fuzzy))
+        assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 042']
+
+    # the alternatives match exactly
+    model.search(search_dock('blendr OR zbrush', fuzzy=True))
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 043']
+    model.search(search_dock('blendr zbrush', fuzzy=True))
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 043']
+
+
+def test_search_with_fields(dal_: DataAccessLayer) -> None:
+    for name, rating in [('folder 001', 3), ('folder 002', 5)]:
+        dal_.session.query(Folder).filter(Folder.folder_name == name).one().tutorial.rating = rating
+    dal_.session.commit()
+    model = TutorialsModel()
+
+    model.search(search_dock('tutorial rating:>=3 -002'))
+    assert [model.folder(row).folder_name for row in range(model.rowCount())] == ['folder 001']
+
+    # an invalid search shows nothing rather than everything
+    model.search(search_dock('rating:>=3 OR'))
+    assert model.rowCount() == 0
+
+    model.search(search_dock('rating:>=3'))
+    assert 'tutorial.rating >= 3' in model.search_sql()
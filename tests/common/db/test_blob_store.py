@@ -0,0 +1,129 @@
+import sqlite3
+from pathlib import Path
+
+from pytest import fixture, mark
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.db.blob_store import BlobStore, DirectoryBlobStore, MemoryBlobStore
+from tutcatalogpy.common.db.cover import Cover
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.image import Image
+
+
+@fixture(params=['memory', 'directory'])
+def store(request, tmp_path: Path) -> BlobStore:
+    if request.param == 'memory':
+        return MemoryBlobStore()
+    return DirectoryBlobStore(tmp_path / 'blobs')
+
+
+@fixture
+def file_dal(tmp_path: Path) -> DataAccessLayer:
+    dal.connect(f'sqlite:///{tmp_path}/catalog.db')
+    yield dal
+    dal.disconnect()
+
+
+def test_put_and_get(store: BlobStore):
+    key = store.put(b'cover')
+
+    assert key == BlobStore.key(b'cover')
+    assert store.contains(key)
+    assert store.get(key) == b'cover'
+    assert store.get(BlobStore.key(b'missing')) is None
+
+
+@mark.parametrize('data', [b'', b'image data'])
+def test_map(store: BlobStore, data: bytes):
+    key = store.put(data)
+    with store.map(key) as view:
+        assert bytes(view) == data
+
+    with store.map(BlobStore.key(b'missing')) as view:
+        assert view is None
+
+
+def test_identical_data_is_stored_once(store: BlobStore):
+    key1 = store.put(b'logo')
+    key2 = store.put(b'logo')
+    key3 = store.put(b'other')
+
+    assert key1 == key2
+    assert sorted(store.keys()) == sorted([key1, key3])
+
+
+def test_remove_unreferenced(store: BlobStore):
+    keep = store.put(b'keep')
+    remove = store.put(b'remove')
+
+    assert store.remove_unreferenced({keep}) == 1
+    assert store.contains(keep)
+    assert not store.contains(remove)
+
+
+def test_directory_store_is_sharded(tmp_path: Path):
+    store = DirectoryBlobStore(tmp_path)
+    key = store.put(b'cover')
+
+    assert (tmp_path / key[:2] / key[2:4] / key).read_bytes() == b'cover'
+
+
+def test_covers_and_images_share_blobs(file_dal: DataAccessLayer, tmp_path: Path):
+    session = file_dal.session
+    for _ in range(3):
+        cover = Cover()
+        cover.data = b'same cover'
+        session.add(cover)
+    image = Image(name='image1.jpg', system_id='1')
+    image.data = b'same cover'
+    session.add(image)
+    session.commit()
+
+    file_dal.renew_session()
+    assert [cover.data for cover in file_dal.session.query(Cover)] == [b'same cover'] * 3
+    assert file_dal.session.query(Image).one().data == b'same cover'
+    assert len(list(file_dal.blobs.keys())) == 1
+    assert (tmp_path / 'catalog.db.blobs').is_dir()
+
+
+def test_remove_unreferenced_blobs(file_dal: DataAccessLayer):
+    session = file_dal.session
+    cover = Cover()
+    cover.data = b'old cover'
+    session.add(cover)
+    session.commit()
+
+    cover.data = b'new cover'
+    session.commit()
+
+    assert file_dal.remove_unreferenced_blobs() == 1
+    assert list(file_dal.blobs.keys()) == [BlobStore.key(b'new cover')]
+
+
+def test_migrate_blobs_of_old_catalog(tmp_path: Path):
+    db_path = tmp_path / 'catalog.db'
+    dal.connect(f'sqlite:///{db_path}')
+    dal.disconnect()
+
+    # an old catalog keeps the data in the tables
+    with sqlite3.connect(db_path) as connection:
+        for table in ['cover', 'image']:
+            connection.execute(f'ALTER TABLE {table} DROP COLUMN blob_hash')
+        connection.execute("INSERT INTO cover (file_format, data) VALUES (1, X'0102')")
+        connection.execute('INSERT INTO cover (file_format, data) VALUES (1, NULL)')
+        connection.execute("INSERT INTO image (name, system_id, data) VALUES ('image1.jpg', '1', X'0102')")
+    connection.close()
+
+    dal.connect(f'sqlite:///{db_path}')
+    try:
+        covers = dal.session.query(Cover).order_by(Cover.id_).all()
+        assert [cover.data for cover in covers] == [b'\x01\x02', None]
+        assert dal.session.query(Image).one().data == b'\x01\x02'
+        assert list(dal.blobs.keys()) == [BlobStore.key(b'\x01\x02')]
+        assert dal.migrate_blobs() == 0
+    finally:
+        dal.disconnect()
+
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM cover WHERE data IS NOT NULL').fetchone() == (0,)
+    connection.close()
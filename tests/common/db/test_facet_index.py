@@ -0,0 +1,177 @@
+from pathlib import Path
+from typing import List, Set
+
+from pytest import fixture
+from sqlalchemy.orm import Session
+
+import tutcatalogpy.common.scan_worker
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.db.author import Author
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.facet_index import (
+    Facet, FolderFacet, bitmap_count, bitmap_folder_ids, bitmap_folders, facet_bitmaps, facet_counts, folder_facets,
+    rebuild_facet_index, searched_facets, to_bitmap, update_facet_index
+)
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.learning_path import LearningPath
+from tutcatalogpy.common.db.publisher import Publisher
+from tutcatalogpy.common.db.search_flag import Search
+from tutcatalogpy.common.db.tag import Tag
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.db.tutorial_learning_path import TutorialLearningPath
+from tutcatalogpy.common.scan_config import ScanConfig
+from tutcatalogpy.common.scan_worker import ScanWorker
+from tutcatalogpy.common.tutorial_data import TutorialData
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    yield dal
+    dal.disconnect()
+
+
+def add_folder(session: Session, disk: Disk, name: str, **kwargs) -> Folder:
+    folder = Folder(disk=disk, folder_parent='', folder_name=name, system_id=name, tutorial=Tutorial(**kwargs))
+    session.add(folder)
+    session.flush()
+    return folder
+
+
+def test_bitmaps() -> None:
+    bitmap = to_bitmap([3, 0, 17, 3])
+    assert bitmap == 0b10_0000_0000_0000_1001
+    assert bitmap_folder_ids(bitmap) == [0, 3, 17]
+    assert bitmap_count(bitmap) == 3
+    assert bitmap_folder_ids(0) == []
+
+
+def test_bitmap_folders(dal_: DataAccessLayer) -> None:
+    folder_ids = list(range(1, 100_000, 3))
+    assert [folder_id for folder_id, in dal_.session.execute(bitmap_folders(to_bitmap(folder_ids)))] == folder_ids
+
+
+def test_update_facet_index(dal_: DataAccessLayer) -> None:
+    session = dal_.session
+    disk = Disk(disk_parent='/tmp', disk_name='disk', index_=1)
+    jane, ben = Author(name='Jane'), Author(name='Ben')
+    publisher = Publisher(name='Proko')
+    rigging = Tag(name='rigging')
+    folders = [
+        add_folder(session, disk, 'a', authors=[jane], tags=[rigging], publisher=publisher),
+        add_folder(session, disk, 'b', authors=[jane, ben], publisher=publisher),
+        add_folder(session, disk, 'c', authors=[ben]),
+    ]
+    session.add(TutorialLearningPath(tutorial=folders[2].tutorial, learning_path=LearningPath(name='anatomy', publisher=publisher)))
+    session.commit()
+    rebuild_facet_index(session)
+
+    assert facet_counts(session, Facet.AUTHOR) == {jane.id_: 2, ben.id_: 2}
+    assert facet_bitmaps(session, Facet.TAG) == {rigging.id_: to_bitmap([folders[0].id_])}
+    assert facet_counts(session, Facet.PUBLISHER) == {publisher.id_: 2}
+    assert facet_counts(session, Facet.LEARNING_PATH) == {1: 1}
+
+    # the scanner reads the facets before changing the tutorial
+    facets = folder_facets(session, [folders[0].id_])
+    folders[0].tutorial.authors = [ben]
+    folders[0].tutorial.tags = []
+    update_facet_index(session, [folders[0].id_], facets)
+
+    facets = folder_facets(session, [folders[1].id_])
+    session.delete(folders[1])
+    update_facet_index(session, [folders[1].id_], facets)
+    session.commit()
+
+    assert facet_bitmaps(session, Facet.AUTHOR) == {ben.id_: to_bitmap([folders[0].id_, folders[2].id_])}
+    assert facet_bitmaps(session, Facet.TAG) == {}
+    assert facet_counts(session, Facet.PUBLISHER) == {publisher.id_: 1}
+
+
+def test_searched_facets(dal_: DataAccessLayer) -> None:
+    session = dal_.session
+    disk = Disk(disk_parent='/tmp', disk_name='disk', index_=1)
+    jane, ben = Author(name='Jane'), Author(name='Ben')
+    rigging, drawing = Tag(name='rigging'), Tag(name='drawing')
+    a = add_folder(session, disk, 'a', authors=[jane], tags=[rigging])
+    b = add_folder(session, disk, 'b', authors=[jane, ben], tags=[rigging, drawing])
+    c = add_folder(session, disk, 'c', authors=[ben], tags=[drawing])
+    session.commit()
+    rebuild_facet_index(session)
+
+    assert searched_facets(session) == (None, 0)
+
+    jane.search = Search.INCLUDE
+    rigging.search = Search.INCLUDE
+    assert searched_facets(session) == (to_bitmap([a.id_, b.id_]), 0)
+
+    drawing.search = Search.EXCLUDE
+    assert searched_facets(session) == (to_bitmap([a.id_, b.id_]), to_bitmap([b.id_, c.id_]))
+
+
+def test_scan_updates_the_facet_index(tmp_path: Path, dal_: DataAccessLayer) -> None:
+    disk_path = tmp_path / 'disk'
+    for name, info_tc in [
+        ('one', 'author: [Jane, Ben]\ntags: [rigging]'),
+        ('two', 'author: [Ben]\npublisher: Proko\nlearning_paths:\n  - anatomy'),
+    ]:
+        (disk_path / name).mkdir(parents=True)
+        (disk_path / name / TutorialData.FILE_NAME).write_text(info_tc)
+    dal_.session.add(Disk(disk_parent=str(tmp_path), disk_name='disk', index_=0, online=True, depth=0))
+    dal_.session.commit()
+
+    worker = ScanWorker()
+    worker.scan(ScanConfig.Mode.EXTENDED)
+    worker.wait()
+
+    session = dal_.Session()
+    authors = dict(session.query(Author.name, Author.id_))
+    folders = dict(session.query(Folder.folder_name, Folder.id_))
+    assert facet_bitmaps(session, Facet.AUTHOR) == {
+        authors['Jane']: to_bitmap([folders['one']]),
+        authors['Ben']: to_bitmap([folders['one'], folders['two']]),
+    }
+    assert facet_counts(session, Facet.TAG) == {session.query(Tag.id_).scalar(): 1}
+    assert facet_counts(session, Facet.LEARNING_PATH) == {session.query(LearningPath.id_).scalar(): 1}
+    session.close()
+
+    (disk_path / 'one' / TutorialData.FILE_NAME).unlink()
+    (disk_path / 'one').rmdir()
+    worker.scan(ScanConfig.Mode.EXTENDED)
+    worker.wait()
+
+    session = dal_.Session()
+    assert facet_bitmaps(session, Facet.AUTHOR) == {authors['Ben']: to_bitmap([folders['two']])}
+    assert facet_bitmaps(session, Facet.TAG) == {}
+    session.close()
+
+
+def test_scan_updates_the_facet_index_in_batches(tmp_path: Path, dal_: DataAccessLayer, monkeypatch) -> None:
+    disk_path = tmp_path / 'disk'
+    for name in ['one', 'two', 'three']:
+        (disk_path / name).mkdir(parents=True)
+        (disk_path / name / TutorialData.FILE_NAME).write_text(f'author: [Jane]\ntags: [{name}]')
+    dal_.session.add(Disk(disk_parent=str(tmp_path), disk_name='disk', index_=0, online=True, depth=0))
+    dal_.session.commit()
+    batches: List[int] = []
+
+    def counting_update_facet_index(session: Session, folder_ids: List[int], old_facets: Set[FolderFacet]) -> None:
+        # the scan of the folders updates the folders it deleted, none here
+        if folder_ids:
+            batches.append(len(folder_ids))
+        update_facet_index(session, folder_ids, old_facets)
+
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'UPDATE_BATCH_SIZE', 2)
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'update_facet_index', counting_update_facet_index)
+    worker = ScanWorker()
+    worker.scan(ScanConfig.Mode.EXTENDED)
+    worker.wait()
+    worker.shutdown()
+
+    assert batches == [2, 1]
+    session = dal_.Session()
+    jane = session.query(Author.id_).filter(Author.name == 'Jane').scalar()
+    assert facet_counts(session, Facet.AUTHOR) == {jane: 3}
+    assert sorted(facet_counts(session, Facet.TAG).values()) == [1, 1, 1]
+    session.close()
@@ -48,3 +48,36 @@ def test_connect_with_tutorial(dal_: DataAccessLayer) -> None:
     folder: Folder = dal_.session.query(Folder).one()
 
     assert folder.tutorial.title == 'my tutorial'
+
+
+def test_get_defers_description(dal_: DataAccessLayer) -> None:
+    folder = Folder(folder_parent='/my parent1/my parent2/', folder_name='my folder')
+    folder.tutorial = Tutorial(title='my tutorial', description='my description')
+    dal_.session.add(folder)
+    dal_.session.commit()
+    folder_id = folder.id_
+
+    dal_.renew_session()
+    folder: Folder = Folder.get(dal_.session, folder_id)
+
+    assert folder.tutorial.title == 'my tutorial'
+    assert 'description' not in folder.tutorial.__dict__
+    assert folder.tutorial.description == 'my description'
+
+
+def test_get_with_details(dal_: DataAccessLayer) -> None:
+    folder = Folder(folder_parent='/my parent1/my parent2/', folder_name='my folder')
+    folder.tutorial = Tutorial(title='my tutorial', description='my description')
+    dal_.session.add(folder)
+    dal_.session.commit()
+    folder_id = folder.id_
+
+    dal_.renew_session()
+    folder: Folder = Folder.get(dal_.session, folder_id, details=True)
+
+    assert folder.tutorial.__dict__['description'] == 'my description'
+    assert folder.__dict__['images'] == []
+
+
+def test_get_missing_folder(dal_: DataAccessLayer) -> None:
+    assert Folder.get(dal_.session, 1) is None
@@ -0,0 +1,146 @@
+from pathlib import Path
+from typing import List
+
+from pytest import fixture
+from sqlalchemy.orm import Session
+
+import tutcatalogpy.common.scan_worker
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.search_index import (
+    folder_ranks, fuzzy_matches, matching_folders, normalize_search_text, search_query, trigrams, update_search_index
+)
+from tutcatalogpy.common.db.tutorial import Tutorial
+from tutcatalogpy.common.scan_config import ScanConfig
+from tutcatalogpy.common.scan_worker import ScanWorker
+from tutcatalogpy.common.tutorial_data import TutorialData
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    yield dal
+    dal.disconnect()
+
+
+def add_folder(session: Session, disk: Disk, name: str, **kwargs) -> Folder:
+    folder = Folder(disk=disk, folder_parent='parent', folder_name=name, system_id=name, tutorial=Tutorial(**kwargs))
+    session.add(folder)
+    session.flush()
+    update_search_index(session, [folder.id_])
+    return folder
+
+
+def search(session: Session, text: str) -> list:
+    return sorted(folder_id for folder_id, in session.execute(matching_folders(search_query(text))))
+
+
+def test_search_query() -> None:
+    assert search_query('') is None
+    assert search_query(' - ') is None
+    assert search_query('rig blender') == '"rig"* "blender"*'
+    assert search_query('"face rig" say"s') == '"face rig" "say""s"*'
+    assert search_query('"unclosed phrase') == '"unclosed phrase"'
+
+
+def test_search_index(dal_: DataAccessLayer) -> None:
+    session = dal_.session
+    disk = Disk(disk_parent='/tmp', disk_name='Disk 1', index_=1)
+    blender = add_folder(session, disk, 'blender_course', title='Rigging', all_authors=',Zoë Smith,', all_tags=',3d,')
+    painting = add_folder(session, disk, 'painting', title='Painting', description='Light and *color*')
+    session.commit()
+
+    assert search(session, 'rig') == [blender.id_]
+    assert search(session, 'zoe 3d') == [blender.id_]
+    assert search(session, 'BLENDER') == [blender.id_]
+    assert search(session, 'disk') == [blender.id_, painting.id_]
+    assert search(session, 'color') == [painting.id_]
+    assert search(session, '"and color"') == [painting.id_]
+    assert search(session, '"color and"') == []
+
+    painting.tutorial.title = 'Painting Light'
+    update_search_index(session, [painting.id_])
+    session.commit()
+    ranks = dict(session.execute(folder_ranks('"light"*')).all())
+    assert list(ranks) == [painting.id_]
+
+    disk.disk_name = 'Archive'
+    session.delete(blender)
+    session.commit()
+    assert search(session, 'disk') == []
+    assert search(session, 'archive') == [painting.id_]
+    assert search(session, 'rig') == []
+
+
+def test_index_the_folders_of_an_older_catalog(tmp_path) -> None:
+    path = tmp_path / 'catalog.db'
+    dal.connect(f'sqlite:///{path}')
+    add_folder(dal.session, Disk(disk_parent='/tmp', disk_name='disk', index_=1), 'folder', title='Anatomy')
+    dal.session.execute('DROP TABLE tutorial_search')
+    dal.session.commit()
+    dal.disconnect()
+
+    dal.connect(f'sqlite:///{path}')
+    try:
+        assert len(search(dal.session, 'anatomy')) == 1
+    finally:
+        dal.disconnect()
+
+
+def test_trigrams() -> None:
+    assert normalize_search_text('Raúl_Pérez, ZOË!') == 'raul perez zoe'
+    assert trigrams('Raúl') == {' ra', 'rau', 'aul', 'ul '}
+    assert trigrams('a') == {' a '}
+    assert trigrams('...') == set()
+
+
+def test_fuzzy_matches(dal_: DataAccessLayer) -> None:
+    session = dal_.session
+    disk = Disk(disk_parent='/tmp', disk_name='disk', index_=1)
+    perez = add_folder(session, disk, 'portraits', title='Portrait Painting', all_authors=',Raúl Pérez,')
+    sanchez = add_folder(session, disk, 'landscapes', title='Landscape Painting', all_authors=',Raul Sanchez,')
+    add_folder(session, disk, 'anatomy', title='Anatomy')
+    session.commit()
+
+    matches = fuzzy_matches(session, 'raul perz')
+    assert [folder_id for folder_id, _ in matches] == [perez.id_, sanchez.id_]
+    assert matches[0][1] > matches[1][1] >= 0.5
+    assert [folder_id for folder_id, _ in fuzzy_matches(session, 'LANDSCPE')] == [sanchez.id_]
+    assert fuzzy_matches(session, 'sculpting') == []
+    assert fuzzy_matches(session, '') == []
+
+    session.delete(sanchez)
+    session.commit()
+    assert [folder_id for folder_id, _ in fuzzy_matches(session, 'landscape')] == []
+
+
+def test_scan_indexes_the_folders_in_batches(tmp_path: Path, dal_: DataAccessLayer, monkeypatch) -> None:
+    disk_path = tmp_path / 'disk'
+    for name in ['one', 'two', 'three']:
+        (disk_path / name).mkdir(parents=True)
+        (disk_path / name / TutorialData.FILE_NAME).write_text(f'title: Lesson {name}')
+    dal_.session.add(Disk(disk_parent=str(tmp_path), disk_name='disk', index_=0, online=True, depth=0))
+    dal_.session.commit()
+    batches: List[int] = []
+
+    def counting_update_search_index(session: Session, folder_ids: List[int]) -> None:
+        batches.append(len(folder_ids))
+        update_search_index(session, folder_ids)
+
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'UPDATE_BATCH_SIZE', 2)
+    worker = ScanWorker()
+    worker.scan(ScanConfig.Mode.NORMAL)
+    worker.wait()
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'update_search_index', counting_update_search_index)
+    worker.scan(ScanConfig.Mode.EXTENDED)
+    worker.wait()
+    worker.shutdown()
+
+    assert batches == [2, 1]
+    session = dal_.Session()
+    assert len(search(session, 'lesson')) == 3
+    assert len(search(session, 'three')) == 1
+    session.close()
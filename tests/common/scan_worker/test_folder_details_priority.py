@@ -0,0 +1,167 @@
+import threading
+from pathlib import Path
+from typing import Final, List
+
+from PySide2.QtCore import Qt
+from pytest import fixture
+from sqlalchemy.orm.session import Session
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+import tutcatalogpy.common.scan_worker
+from tutcatalogpy.common.db.dal import dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.file_listing import list_files
+from tutcatalogpy.common.folder_queue import FolderPriority
+from tutcatalogpy.common.scan_config import ScanConfig, scan_config
+from tutcatalogpy.common.scan_worker import ScanWorker
+
+FOLDER_NAMES = ['folder1', 'folder2', 'folder3', 'folder4']
+
+FOLDERS: Final = ScanConfig.Option.LOCAL_DISKS | ScanConfig.Option.UNCHECKED_DISKS
+FOLDERS_AND_DETAILS: Final = FOLDERS | ScanConfig.Option.FOLDER_DETAILS
+
+
+@fixture
+def session(tmp_path: Path, monkeypatch) -> Session:
+    monkeypatch.setitem(scan_config.option, ScanConfig.Mode.NORMAL, FOLDERS)
+    monkeypatch.setitem(scan_config.option, ScanConfig.Mode.EXTENDED, FOLDERS_AND_DETAILS)
+    dal.connect('sqlite:///:memory:')
+    session = dal.Session()
+    session.add(Disk(disk_parent=str(tmp_path), disk_name='disk', index_=0, online=True))
+    session.commit()
+    for name in FOLDER_NAMES:
+        (tmp_path / 'disk' / name).mkdir(parents=True)
+    yield session
+    dal.disconnect()
+
+
+@fixture
+def updated(monkeypatch) -> List[str]:
+    """Names of the folders in the order their details were updated."""
+    names = []
+
+    def recording_list_files(path, throttle=None, previous=None):
+        names.append(path.name)
+        return list_files(path, throttle, previous)
+
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'list_files', recording_list_files)
+    return names
+
+
+def folder_ids(session: Session, names: List[str]) -> List[int]:
+    return [session.query(Folder.id_).filter(Folder.folder_name == name).scalar() for name in names]
+
+
+def test_update_folder_details(session: Session, updated: List[str]):
+    worker = ScanWorker()
+    worker.scan(ScanConfig.Mode.NORMAL)
+    updated.clear()
+
+    worker.update_folder_details(folder_ids(session, ['folder3', 'folder1']))
+    assert worker.wait(10)
+
+    assert updated == ['folder3', 'folder1']
+    assert not worker.scanning
+
+
+def test_visible_and_selected_folders_first(session: Session, updated: List[str]):
+    worker = ScanWorker()
+    worker.scan(ScanConfig.Mode.NORMAL)
+    updated.clear()
+
+    worker.prioritize_folders(folder_ids(session, ['folder4']), FolderPriority.VISIBLE)
+    worker.prioritize_folders(folder_ids(session, ['folder3']), FolderPriority.SELECTED)
+    worker.scan(ScanConfig.Mode.EXTENDED)
+
+    assert updated[:2] == ['folder3', 'folder4']
+    assert sorted(updated) == FOLDER_NAMES
+
+
+def test_user_request_jumps_ahead_of_running_scan(session: Session, updated: List[str]):
+    worker = ScanWorker()
+    worker.scan(ScanConfig.Mode.NORMAL)
+    updated.clear()
+    # the folder that the scan would process last
+    last_id, last_name = session.query(Folder.id_, Folder.folder_name).order_by(Folder.id_.desc()).first()
+    requested = []
+
+    def on_progress_changed(progress: ScanWorker.Progress) -> None:
+        # the user asks for the last folder while the scan is busy with the first one
+        if progress.step_name == 'Folder details' and len(updated) == 1 and not requested:
+            requested.append(last_id)
+            worker.update_folder_details([last_id])
+
+    # the progress is reported from the scan threads
+    worker.progress_changed.connect(on_progress_changed, Qt.DirectConnection)
+    worker.scan(ScanConfig.Mode.EXTENDED)
+    assert worker.wait(10)
+
+    assert requested
+    assert updated[1] == last_name
+    # the scan goes on with the other folders and doesn't update the requested one twice
+    assert sorted(updated) == FOLDER_NAMES
+
+
+def test_user_request_on_other_disk_runs_concurrently(tmp_path: Path, monkeypatch):
+    monkeypatch.setitem(scan_config.option, ScanConfig.Mode.NORMAL, FOLDERS)
+    # only scan the checked disk
+    monkeypatch.setitem(scan_config.option, ScanConfig.Mode.EXTENDED, ScanConfig.Option.LOCAL_DISKS | ScanConfig.Option.FOLDER_DETAILS)
+    # in memory databases don't run jobs concurrently
+    dal.connect(f'sqlite:///{tmp_path}/catalog.db')
+    session = dal.Session()
+    for index, disk_name in enumerate(['slow', 'fast']):
+        session.add(Disk(disk_parent=str(tmp_path), disk_name=disk_name, index_=index, online=True))
+        (tmp_path / disk_name / 'folder').mkdir(parents=True)
+    session.commit()
+
+    worker = ScanWorker()
+    worker.scan(ScanConfig.Mode.NORMAL)
+    fast_folder_id, = session.query(Folder.id_).join(Disk).filter(Disk.disk_name == 'fast').one()
+    fast_folder_updated = threading.Event()
+    slow_disk_waited = []
+
+    def list_files_blocking_on_slow_disk(path, throttle=None, previous=None):
+        if path.parent.name == 'slow':
+            worker.update_folder_details([fast_folder_id])
+            slow_disk_waited.append(fast_folder_updated.wait(10))
+        elif path.parent.name == 'fast':
+            fast_folder_updated.set()
+        return []
+
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'list_files', list_files_blocking_on_slow_disk)
+    session.query(Disk).filter(Disk.disk_name == 'fast').update({Disk.checked: False})
+    session.commit()
+
+    worker.scan(ScanConfig.Mode.EXTENDED)
+    assert worker.wait(10)
+    worker.shutdown()
+    session.close()
+    dal.disconnect()
+
+    assert slow_disk_waited == [True]
+
+
+def test_progress_of_concurrent_disks(tmp_path: Path, monkeypatch):
+    monkeypatch.setitem(scan_config.option, ScanConfig.Mode.NORMAL, FOLDERS)
+    # in memory databases don't run jobs concurrently
+    dal.connect(f'sqlite:///{tmp_path}/catalog.db')
+    session = dal.Session()
+    for index, disk_name in enumerate(['disk1', 'disk2', 'disk3']):
+        session.add(Disk(disk_parent=str(tmp_path), disk_name=disk_name, index_=index, online=True))
+        for name in FOLDER_NAMES:
+            (tmp_path / disk_name / name).mkdir(parents=True)
+    session.commit()
+    session.close()
+
+    worker = ScanWorker()
+    emitted = []
+    worker.progress_changed.connect(emitted.append, Qt.DirectConnection)
+    worker.scan(ScanConfig.Mode.NORMAL)
+    assert worker.wait(10)
+    worker.shutdown()
+    dal.disconnect()
+
+    # each folder is counted once, and each emitted progress is a copy
+    assert sorted(progress.folder_index for progress in emitted) == list(range(3 * len(FOLDER_NAMES)))
+    assert len({id(progress) for progress in emitted}) == len(emitted)
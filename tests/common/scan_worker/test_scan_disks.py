@@ -9,6 +9,7 @@ from tutcatalogpy.common.scan_config import ScanConfig
 from tutcatalogpy.common.scan_worker import ScanWorker
 from tutcatalogpy.common.db.dal import dal
 from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.disk_probe import PathState
 import tutcatalogpy.common.logging_config  # noqa: F401
 
 
@@ -72,3 +73,24 @@ def test_scan_disks_updates_online(tmp_path: Path, session: Session):
     disk_path.mkdir()
     worker.scan(mode)
     assert session.query(Disk).one().online is True
+
+
+def test_scan_disks_marks_unresponsive_disks(tmp_path: Path, session: Session, monkeypatch):
+    DISK_PARENT: Final[str] = str(tmp_path)
+    DISK_NAME: Final[str] = 'foo'
+
+    session.add(Disk(disk_parent=DISK_PARENT, disk_name=DISK_NAME, index_=0, online=True))
+    session.commit()
+
+    monkeypatch.setattr(
+        'tutcatalogpy.common.scan_worker.probe_paths',
+        lambda paths: {path: PathState.UNRESPONSIVE for path in paths}
+    )
+
+    mode = ScanConfig.Mode.STARTUP
+    worker = ScanWorker()
+    worker.scan(mode)
+
+    disk = session.query(Disk).one()
+    assert disk.online is False
+    assert disk.status == Disk.Status.UNRESPONSIVE
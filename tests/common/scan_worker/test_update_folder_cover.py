@@ -0,0 +1,125 @@
+import io
+import sqlite3
+from pathlib import Path
+
+from PIL import Image
+from pytest import fixture
+
+import tutcatalogpy.common.scan_worker
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.db.cover import Cover
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.thumbnail import Thumbnail
+from tutcatalogpy.common.scan_worker import ScanWorker
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    yield dal
+    dal.disconnect()
+
+
+@fixture
+def folder(tmp_path: Path, dal_: DataAccessLayer) -> Folder:
+    folder = Folder(folder_parent=str(tmp_path.parent), folder_name=str(tmp_path.name))
+    dal_.session.add(folder)
+    dal_.session.commit()
+    return folder
+
+
+def save_cover(path: Path, width: int, height: int) -> None:
+    Image.new('RGB', (width, height)).save(path / 'cover.jpg', 'JPEG')
+
+
+def update_cover(dal_: DataAccessLayer, folder: Folder) -> None:
+    ScanWorker.update_folder_cover(dal_.session, folder, ScanWorker.read_folder_cover(dal_.session, folder))
+
+
+def test_update_folder_cover_makes_thumbnails(tmp_path: Path, dal_: DataAccessLayer, folder: Folder) -> None:
+    save_cover(tmp_path, 600, 900)
+
+    update_cover(dal_, folder)
+
+    cover: Cover = folder.cover
+    assert (cover.width, cover.height) == (600, 900)
+    assert [(t.size, t.width, t.height) for t in cover.thumbnails] == [(96, 64, 96), (300, 200, 300)]
+
+    assert cover.rendition(50, 50) is cover.thumbnails[0]
+    assert cover.rendition(200, 1000) is cover.thumbnails[1]
+    assert cover.rendition(250, 500) is cover
+    with Image.open(io.BytesIO(cover.rendition(64, 96).data)) as image:
+        assert image.size == (64, 96)
+
+
+def test_update_folder_cover_of_old_catalog(tmp_path: Path, dal_: DataAccessLayer, folder: Folder) -> None:
+    save_cover(tmp_path, 400, 400)
+    update_cover(dal_, folder)
+    # covers scanned before the thumbnails
+    folder.cover.width = folder.cover.height = None
+    folder.cover.thumbnails = []
+    dal_.session.commit()
+
+    update_cover(dal_, folder)
+
+    assert (folder.cover.width, folder.cover.height) == (400, 400)
+    assert len(folder.cover.thumbnails) == 2
+
+
+def test_remove_cover_removes_thumbnails(tmp_path: Path, dal_: DataAccessLayer, folder: Folder) -> None:
+    save_cover(tmp_path, 400, 400)
+    update_cover(dal_, folder)
+    assert dal_.session.query(Thumbnail).count() == 2
+
+    (tmp_path / 'cover.jpg').unlink()
+    update_cover(dal_, folder)
+
+    assert folder.cover is None
+    assert dal_.session.query(Thumbnail).count() == 0
+    assert dal_.remove_unreferenced_blobs() == 3
+
+
+def test_invalid_cover(tmp_path: Path, dal_: DataAccessLayer, folder: Folder) -> None:
+    (tmp_path / 'cover.jpg').write_bytes(b'not an image')
+
+    update_cover(dal_, folder)
+
+    assert (folder.cover.width, folder.cover.height) == (0, 0)
+    assert folder.cover.thumbnails == []
+    assert folder.cover.rendition(100, 100) is folder.cover
+
+
+def test_read_cover_without_locking_the_catalog(tmp_path: Path, monkeypatch) -> None:
+    database = tmp_path / 'catalog.db'
+    dal.connect(f'sqlite:///{database}')
+    (tmp_path / 'disk' / 'folder').mkdir(parents=True)
+    (tmp_path / 'disk' / 'folder' / 'notes.txt').write_text('notes')
+    save_cover(tmp_path / 'disk' / 'folder', 400, 400)
+    folder = Folder(disk=Disk(disk_parent=str(tmp_path), disk_name='disk', index_=0, online=True), folder_parent='.', folder_name='folder')
+    dal.session.add(folder)
+    dal.session.commit()
+    written = []
+    make_thumbnails = tutcatalogpy.common.scan_worker.make_thumbnails
+
+    def writing_make_thumbnails(data: bytes):
+        # another scan or the GUI writes while the cover is read
+        connection = sqlite3.connect(str(database), timeout=0.1)
+        with connection:
+            written.append(connection.execute('UPDATE disk SET checked = 0').rowcount)
+        connection.close()
+        return make_thumbnails(data)
+
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'make_thumbnails', writing_make_thumbnails)
+    worker = ScanWorker()
+    worker.update_folder_details([folder.id_])
+    assert worker.wait(10)
+    worker.shutdown()
+    dal.session.refresh(folder)
+    width = folder.cover.width
+    dal.disconnect()
+
+    assert written == [1]
+    assert width == 400
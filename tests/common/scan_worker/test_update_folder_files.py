@@ -0,0 +1,67 @@
+from pytest import fixture
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.file import File
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.file_listing import FileEntry, decode_file_listing
+from tutcatalogpy.common.scan_worker import ScanWorker
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    yield dal
+    dal.disconnect()
+
+
+def files(dal_: DataAccessLayer):
+    return sorted((file.path, file.extension, file.size, file.modified) for file in dal_.session.query(File))
+
+
+def test_update_folder_files(dal_: DataAccessLayer) -> None:
+    folder = Folder(folder_parent='/tmp', folder_name='folder')
+    dal_.session.add(folder)
+    dal_.session.commit()
+
+    entries = [
+        FileEntry('chapter 1', 0, 1, True),
+        FileEntry('chapter 1/Lesson_12_Rigging.MP4', 100, 2, False),
+        FileEntry('info.tc', 10, 3, False),
+    ]
+    ScanWorker.update_folder_files(dal_.session, folder, entries)
+    dal_.session.commit()
+
+    assert folder.size == 110
+    assert decode_file_listing(folder.file_listing) == entries
+    assert files(dal_) == [
+        ('chapter 1/Lesson_12_Rigging.MP4', 'mp4', 100, 2),
+        ('info.tc', 'tc', 10, 3),
+    ]
+
+    entries = [
+        FileEntry('chapter 1', 0, 4, True),
+        FileEntry('chapter 1/Lesson_12_Rigging.MP4', 200, 5, False),
+        FileEntry('chapter 1/README', 1, 6, False),
+    ]
+    ScanWorker.update_folder_files(dal_.session, folder, entries)
+    dal_.session.commit()
+
+    assert folder.size == 201
+    assert files(dal_) == [
+        ('chapter 1/Lesson_12_Rigging.MP4', 'mp4', 200, 5),
+        ('chapter 1/README', '', 1, 6),
+    ]
+
+
+def test_files_are_deleted_with_their_folder(dal_: DataAccessLayer) -> None:
+    folder = Folder(folder_parent='/tmp', folder_name='folder')
+    dal_.session.add(folder)
+    dal_.session.commit()
+    ScanWorker.update_folder_files(dal_.session, folder, [FileEntry('lesson.mp4', 1, 1, False)])
+    dal_.session.commit()
+
+    dal_.session.delete(folder)
+    dal_.session.commit()
+
+    assert dal_.session.query(File).count() == 0
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from pytest import fixture
+
+import tutcatalogpy.common.scan_worker
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.db.disk import Disk
+from tutcatalogpy.common.db.file import File
+from tutcatalogpy.common.db.folder import Folder
+from tutcatalogpy.common.db.media import Media
+from tutcatalogpy.common.file_listing import list_files
+from tutcatalogpy.common.media_info import MediaDetails, read_media_details
+from tutcatalogpy.common.scan_config import ScanConfig
+from tutcatalogpy.common.scan_worker import ScanWorker
+
+
+class FakeReader:
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+
+    def read(self, paths: List[str]) -> List[Optional[MediaDetails]]:
+        self.paths.extend(paths)
+        return [MediaDetails(os.path.getsize(path) * 1000, 1920, 1080, 'AVC') if os.path.getsize(path) else None for path in paths]
+
+    def submit(self, paths: List[str]) -> Iterator[Optional[MediaDetails]]:
+        return iter(self.read(paths))
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    yield dal
+    dal.disconnect()
+
+
+def scan(dal_: DataAccessLayer, folder: Folder, reader: FakeReader) -> None:
+    entries = list_files(folder.path())
+    media = ScanWorker.read_folder_media(dal_.session, folder, entries, reader)
+    ScanWorker.update_folder_files(dal_.session, folder, entries)
+    ScanWorker.update_folder_media(dal_.session, folder, media)
+    dal_.session.commit()
+
+
+def test_update_folder_media(tmp_path: Path, dal_: DataAccessLayer) -> None:
+    (tmp_path / 'chapter 1').mkdir()
+    (tmp_path / 'chapter 1' / 'lesson 1.mp4').write_bytes(b'x' * 60)
+    (tmp_path / 'chapter 1' / 'lesson 2.MKV').write_bytes(b'x' * 90)
+    (tmp_path / 'broken.mp4').write_bytes(b'')
+    (tmp_path / 'notes.txt').write_bytes(b'x' * 1000)
+    folder = Folder(folder_parent=str(tmp_path.parent), folder_name=tmp_path.name)
+    dal_.session.add(folder)
+    dal_.session.commit()
+    reader = FakeReader()
+
+    scan(dal_, folder, reader)
+
+    assert sorted(Path(path).name for path in reader.paths) == ['broken.mp4', 'lesson 1.mp4', 'lesson 2.MKV']
+    assert folder.video_duration == 150
+    file = dal_.session.query(File).filter(File.name == 'lesson 1.mp4').one()
+    assert (file.media.width, file.media.height, file.media.codec) == (1920, 1080, 'AVC')
+    assert dal_.session.query(Media).filter(Media.duration == None).count() == 1  # noqa: E711
+
+    # nothing is read again
+    reader.paths.clear()
+    scan(dal_, folder, reader)
+    assert reader.paths == []
+    assert folder.video_duration == 150
+
+    # only the changed and the moved files are looked up, and only the changed ones are read
+    (tmp_path / 'chapter 1' / 'lesson 2.MKV').write_bytes(b'x' * 120)
+    (tmp_path / 'chapter 1' / 'lesson 1.mp4').rename(tmp_path / 'lesson 1.mp4')
+    scan(dal_, folder, reader)
+    assert [Path(path).name for path in reader.paths] == ['lesson 2.MKV']
+    assert folder.video_duration == 180
+
+
+def test_update_folder_media_without_videos(tmp_path: Path, dal_: DataAccessLayer) -> None:
+    (tmp_path / 'notes.txt').write_bytes(b'x')
+    folder = Folder(folder_parent=str(tmp_path.parent), folder_name=tmp_path.name)
+    dal_.session.add(folder)
+    dal_.session.commit()
+    reader = FakeReader()
+
+    scan(dal_, folder, reader)
+
+    assert reader.paths == []
+    assert folder.video_duration is None
+
+
+def test_remove_unreferenced_media(tmp_path: Path, dal_: DataAccessLayer) -> None:
+    (tmp_path / 'lesson 1.mp4').write_bytes(b'x' * 60)
+    (tmp_path / 'lesson 2.mp4').write_bytes(b'x' * 90)
+    folder = Folder(folder_parent=str(tmp_path.parent), folder_name=tmp_path.name)
+    dal_.session.add(folder)
+    dal_.session.commit()
+    scan(dal_, folder, FakeReader())
+    assert dal_.remove_unreferenced_media() == 0
+
+    (tmp_path / 'lesson 2.mp4').unlink()
+    scan(dal_, folder, FakeReader())
+
+    assert dal_.remove_unreferenced_media() == 1
+    assert dal_.session.query(Media).count() == 1
+    assert folder.video_duration == 60
+
+
+def test_same_inode_on_other_disk(tmp_path: Path, dal_: DataAccessLayer, monkeypatch) -> None:
+    folders = []
+    for name in ['disk1', 'disk2']:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'lesson.mp4').write_bytes(b'x' * 60)
+        folders.append(Folder(folder_parent=str(tmp_path), folder_name=name))
+    dal_.session.add_all(folders)
+    dal_.session.commit()
+
+    def stat_on_disk(path) -> os.stat_result:
+        # the same inode, on the device of the disk
+        result = os_stat(path)
+        return os.stat_result((result.st_mode, 1, int(Path(path).parent.name[-1]), *result[3:]))
+
+    os_stat = os.stat
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker.os, 'stat', stat_on_disk)
+    reader = FakeReader()
+    for folder in folders:
+        scan(dal_, folder, reader)
+
+    assert len(reader.paths) == 2
+    assert dal_.session.query(Media).count() == 2
+
+
+def test_same_video_in_the_next_folder(tmp_path: Path, dal_: DataAccessLayer, monkeypatch) -> None:
+    for name in ['folder1', 'folder2']:
+        (tmp_path / 'disk' / name).mkdir(parents=True)
+    (tmp_path / 'disk' / 'folder1' / 'lesson.mp4').write_bytes(b'x' * 60)
+    os.link(tmp_path / 'disk' / 'folder1' / 'lesson.mp4', tmp_path / 'disk' / 'folder2' / 'lesson.mp4')
+    dal_.session.add(Disk(disk_parent=str(tmp_path), disk_name='disk', index_=0, online=True, depth=0))
+    dal_.session.commit()
+    reader = FakeReader()
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'media_reader', reader)
+
+    worker = ScanWorker()
+    worker.scan(ScanConfig.Mode.EXTENDED)
+    assert worker.wait(10)
+
+    # the videos of the second folder are read before the first one is written
+    assert len(reader.paths) == 2
+    assert dal_.session.query(Media).count() == 1
+    assert [folder.video_duration for folder in dal_.session.query(Folder).order_by(Folder.folder_name)] == [60, 60]
+
+
+def test_read_media_without_locking_the_catalog(tmp_path: Path, monkeypatch) -> None:
+    database = tmp_path / 'catalog.db'
+    dal.connect(f'sqlite:///{database}')
+    (tmp_path / 'disk' / 'folder').mkdir(parents=True)
+    (tmp_path / 'disk' / 'folder' / 'lesson.mp4').write_bytes(b'x' * 60)
+    folder = Folder(disk=Disk(disk_parent=str(tmp_path), disk_name='disk', index_=0, online=True), folder_parent='.', folder_name='folder')
+    dal.session.add(folder)
+    dal.session.commit()
+    written = []
+
+    class WritingReader(FakeReader):
+        def read(self, paths: List[str]) -> List[Optional[MediaDetails]]:
+            # another scan or the GUI writes while the videos are read
+            connection = sqlite3.connect(str(database), timeout=0.1)
+            with connection:
+                written.append(connection.execute('UPDATE disk SET checked = 0').rowcount)
+            connection.close()
+            return super().read(paths)
+
+        def shutdown(self) -> None:
+            pass
+
+    monkeypatch.setattr(tutcatalogpy.common.scan_worker, 'media_reader', WritingReader())
+    worker = ScanWorker()
+    worker.update_folder_details([folder.id_])
+    assert worker.wait(10)
+    worker.shutdown()
+    dal.session.refresh(folder)
+    dal.disconnect()
+
+    assert written == [1]
+    assert folder.video_duration == 60
+
+
+def test_read_media_details_of_a_file_without_video(tmp_path: Path) -> None:
+    path = tmp_path / 'notes.mp4'
+    path.write_text('not a video')
+
+    assert read_media_details(str(path)) is None
+    assert read_media_details(str(tmp_path / 'missing.mp4')) is None
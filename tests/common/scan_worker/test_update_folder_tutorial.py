@@ -86,3 +86,46 @@ def test_update_folder_tutorial_from_invalid_info_tc(tmp_path: Path, dal_: DataA
     assert folder.tutorial is not None
     assert folder.tutorial.title == ''
     assert folder.tutorial.size is None
+
+
+def test_update_folder_tutorial_renders_description(tmp_path: Path, dal_: DataAccessLayer) -> None:
+    info_tc = tmp_path / TutorialData.FILE_NAME
+    with open(info_tc, 'w') as f:
+        f.write('title: my tutorial\ndescription: "# My description"\n')
+
+    folder = Folder(folder_parent=str(tmp_path.parent), folder_name=str(tmp_path.name))
+    dal_.session.add(folder)
+    dal_.session.commit()
+
+    dal_.renew_session()
+    folder = dal_.session.query(Folder).one()
+    ScanWorker.update_folder_tutorial(dal_.session, folder)
+
+    assert folder.tutorial.description == '# My description'
+    assert folder.tutorial.description_html == '<h1>My description</h1>'
+
+    with open(info_tc, 'w') as f:
+        f.write('title: my tutorial\ndescription: "# Changed"\n')
+    ScanWorker.update_folder_tutorial(dal_.session, folder)
+
+    assert folder.tutorial.description_html == '<h1>Changed</h1>'
+
+
+def test_update_folder_tutorial_renders_description_of_unchanged_info_tc(tmp_path: Path, dal_: DataAccessLayer) -> None:
+    info_tc = tmp_path / TutorialData.FILE_NAME
+    with open(info_tc, 'w') as f:
+        f.write('title: my tutorial\ndescription: "# My description"\n')
+
+    folder = Folder(folder_parent=str(tmp_path.parent), folder_name=str(tmp_path.name))
+    dal_.session.add(folder)
+    dal_.session.commit()
+    ScanWorker.update_folder_tutorial(dal_.session, folder)
+    # scanned before the description was rendered
+    folder.tutorial.description_html = None
+    dal_.session.commit()
+
+    dal_.renew_session()
+    folder = dal_.session.query(Folder).one()
+    ScanWorker.update_folder_tutorial(dal_.session, folder)
+
+    assert folder.tutorial.description_html == '<h1>My description</h1>'
@@ -0,0 +1,38 @@
+from threading import Thread
+from typing import List
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.description_renderer import DescriptionRenderer
+
+
+def test_render() -> None:
+    renderer = DescriptionRenderer()
+
+    assert renderer.to_html('# Title') == '<h1>Title</h1>'
+    assert renderer.to_html('line 1\nline 2') == '<p>line 1<br />\nline 2</p>'
+
+
+def test_render_is_cached_by_key() -> None:
+    renderer = DescriptionRenderer()
+
+    assert renderer.render(1, 'first') == '<p>first</p>'
+    # the key didn't change, so the description is not rendered again
+    assert renderer.render(1, 'second') == '<p>first</p>'
+    assert renderer.render(2, 'second') == '<p>second</p>'
+
+
+def test_render_in_threads() -> None:
+    renderer = DescriptionRenderer()
+    results: List[str] = []
+
+    def render(i: int) -> None:
+        for _ in range(20):
+            results.append(renderer.to_html(f'*{i}*'))
+
+    threads = [Thread(target=render, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(set(results)) == [f'<p><em>{i}</em></p>' for i in range(4)]
@@ -0,0 +1,58 @@
+import threading
+from pathlib import Path
+
+from pytest import MonkeyPatch, fixture
+
+from tutcatalogpy.common.disk_probe import PathState, probe_paths
+
+TIMEOUT_SEC = 0.2
+
+
+@fixture
+def hanging_path(tmp_path: Path, monkeypatch: MonkeyPatch):
+    """Make `exists()` block for one path, like a stale network mount."""
+    path = tmp_path / 'dead mount'
+    release = threading.Event()
+    original_exists = Path.exists
+
+    def exists(self: Path) -> bool:
+        if self == path:
+            release.wait()
+        return original_exists(self)
+
+    monkeypatch.setattr(Path, 'exists', exists)
+    yield path
+    release.set()
+
+
+def test_probe_online_and_offline_paths(tmp_path: Path):
+    online = tmp_path / 'online'
+    online.mkdir()
+    offline = tmp_path / 'offline'
+
+    states = probe_paths([online, offline], TIMEOUT_SEC)
+
+    assert states == {online: PathState.ONLINE, offline: PathState.OFFLINE}
+
+
+def test_probe_without_paths():
+    assert probe_paths([], TIMEOUT_SEC) == {}
+
+
+def test_probe_hanging_path_is_unresponsive(tmp_path: Path, hanging_path: Path):
+    online = tmp_path / 'online'
+    online.mkdir()
+
+    states = probe_paths([online, hanging_path], TIMEOUT_SEC)
+
+    assert states == {online: PathState.ONLINE, hanging_path: PathState.UNRESPONSIVE}
+
+
+def test_probe_hanging_path_doesnt_start_new_probes(hanging_path: Path):
+    probe_paths([hanging_path], TIMEOUT_SEC)
+    thread_count = threading.active_count()
+
+    states = probe_paths([hanging_path], TIMEOUT_SEC)
+
+    assert states == {hanging_path: PathState.UNRESPONSIVE}
+    assert threading.active_count() == thread_count
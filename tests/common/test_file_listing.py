@@ -0,0 +1,101 @@
+import os
+import zlib
+from pathlib import Path
+
+from pytest import raises
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.file_listing import FileEntry, decode_file_listing, encode_file_listing, folder_size, list_files
+
+
+def test_roundtrip() -> None:
+    entries = [
+        FileEntry('01 - Introduction', 0, 1_600_000_000, True),
+        FileEntry('01 - Introduction/01 - Welcome.mp4', 123_456_789, 1_600_000_010, False),
+        FileEntry('01 - Introduction/02 - Overview.mp4', 0, 1_599_999_000, False),
+        FileEntry('Ünïcödé ✓.txt', 2 ** 40, 0, False),
+        FileEntry('info.tc', 12, 1_700_000_000, False),
+    ]
+
+    assert decode_file_listing(encode_file_listing(entries)) == sorted(entries)
+
+
+def test_roundtrip_empty() -> None:
+    assert decode_file_listing(encode_file_listing([])) == []
+
+
+def test_roundtrip_undecodable_name() -> None:
+    # as listed by os.scandir() for a name that isn't valid UTF-8
+    entries = [FileEntry(os.fsdecode(b'bad \xff name.mp4'), 1, 2, False)]
+
+    assert decode_file_listing(encode_file_listing(entries)) == entries
+
+
+def test_encoding_is_compact() -> None:
+    entries = [FileEntry(f'Chapter {i // 20:02}/Lecture {i:04} - Some title.mp4', 100_000_000 + i, 1_600_000_000 + i, False) for i in range(1000)]
+
+    data = encode_file_listing(entries)
+    naive = zlib.compress(repr(entries).encode())
+    assert len(data) < len(naive) / 2
+    assert decode_file_listing(data) == entries
+
+
+def test_decode_invalid_data() -> None:
+    data = encode_file_listing([FileEntry('file.mp4', 1, 2, False)])
+
+    with raises(ValueError):
+        decode_file_listing(b'')
+    with raises(ValueError):
+        decode_file_listing(b'\x00' + data[1:])
+    with raises(ValueError):
+        decode_file_listing(data[:-3])
+    with raises(ValueError):
+        decode_file_listing(data[:1] + zlib.compress(b'\x00\x10ab'))
+
+
+def test_list_files(tmp_path: Path) -> None:
+    (tmp_path / 'chapter 1').mkdir()
+    (tmp_path / 'chapter 1' / 'lesson 1.mp4').write_bytes(b'x' * 10)
+    (tmp_path / 'chapter 1' / 'lesson 2.mp4').write_bytes(b'x' * 20)
+    (tmp_path / 'info.tc').write_bytes(b'x' * 3)
+    os.utime(tmp_path / 'info.tc', (1_600_000_000, 1_600_000_000))
+
+    entries = list_files(tmp_path)
+
+    assert [(entry.path, entry.size, entry.is_dir) for entry in entries] == [
+        ('chapter 1', 0, True),
+        ('chapter 1/lesson 1.mp4', 10, False),
+        ('chapter 1/lesson 2.mp4', 20, False),
+        ('info.tc', 3, False),
+    ]
+    assert entries[3].modified == 1_600_000_000
+    assert entries[1].name == 'lesson 1.mp4'
+    assert entries[1].parent == 'chapter 1'
+    assert entries[0].parent == ''
+    assert folder_size(entries) == 33
+
+
+def test_list_missing_folder(tmp_path: Path) -> None:
+    assert list_files(tmp_path / 'missing') == []
+
+
+def test_list_only_changed_folders(tmp_path: Path) -> None:
+    for name in ['unchanged', 'changed']:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'lesson 1.mp4').write_bytes(b'x')
+    previous = list_files(tmp_path)
+    # what the listing of the unchanged folder is read from
+    previous = [entry._replace(size=100) if entry.path == 'unchanged/lesson 1.mp4' else entry for entry in previous]
+
+    (tmp_path / 'changed' / 'lesson 2.mp4').write_bytes(b'xx')
+    os.utime(tmp_path / 'changed', (0, 0))
+    entries = list_files(tmp_path, previous=previous)
+
+    assert [(entry.path, entry.size) for entry in entries] == [
+        ('changed', 0),
+        ('changed/lesson 1.mp4', 1),
+        ('changed/lesson 2.mp4', 2),
+        ('unchanged', 0),
+        ('unchanged/lesson 1.mp4', 100),
+    ]
+    assert entries[0].modified == 0
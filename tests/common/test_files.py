@@ -3,7 +3,8 @@ from typing import List, Set
 
 from pytest import mark
 
-from tutcatalogpy.common.files import get_images
+from tutcatalogpy.common.files import READ_CHUNK_SIZE, get_images, read_file
+from tutcatalogpy.common.io_throttle import IoThrottle
 
 
 @mark.parametrize(
@@ -27,3 +28,20 @@ def test_get_images(tmp_path: Path, files: List[str], results: Set[str]):
 
     images = get_images(tmp_path)
     assert {Path(image).name for image in images} == results
+
+
+def test_read_file_with_throttle(tmp_path: Path):
+    data = bytes(range(256)) * (READ_CHUNK_SIZE // 128 + 1)
+    path = tmp_path / 'file.bin'
+    path.write_bytes(data)
+
+    sizes = []
+
+    class RecordingThrottle(IoThrottle):
+        def consume(self, size: int = 0, ops: int = 1) -> None:
+            sizes.append(size)
+
+    assert read_file(path, RecordingThrottle()) == data
+    assert read_file(path) == data
+    # one call per chunk and one for the final empty read
+    assert sizes == [READ_CHUNK_SIZE, READ_CHUNK_SIZE, len(data) - 2 * READ_CHUNK_SIZE, 0]
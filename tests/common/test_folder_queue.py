@@ -0,0 +1,102 @@
+from tutcatalogpy.common.folder_queue import FolderPriority, FolderQueue
+
+
+def pop_all(queue: FolderQueue, lowest: FolderPriority = FolderPriority.BACKGROUND):
+    result = []
+    job = queue.pop(lowest)
+    while job is not None:
+        result.append(job)
+        job = queue.pop(lowest)
+    return result
+
+
+def test_empty_queue():
+    queue = FolderQueue()
+    assert len(queue) == 0
+    assert queue.pop() is None
+
+
+def test_fifo_within_priority():
+    queue = FolderQueue()
+    queue.push([3, 1, 2], FolderPriority.BACKGROUND)
+    assert [folder_id for folder_id, _ in pop_all(queue)] == [3, 1, 2]
+
+
+def test_priority_order():
+    queue = FolderQueue()
+    queue.push([1, 2], FolderPriority.BACKGROUND)
+    queue.push([3], FolderPriority.VISIBLE)
+    queue.push([4], FolderPriority.USER)
+    queue.push([5], FolderPriority.SELECTED)
+
+    assert pop_all(queue) == [
+        (4, FolderPriority.USER),
+        (5, FolderPriority.SELECTED),
+        (3, FolderPriority.VISIBLE),
+        (1, FolderPriority.BACKGROUND),
+        (2, FolderPriority.BACKGROUND),
+    ]
+
+
+def test_folder_is_queued_once_with_best_priority():
+    queue = FolderQueue()
+    queue.push([1, 2], FolderPriority.BACKGROUND)
+    queue.push([2], FolderPriority.USER)
+    queue.push([2], FolderPriority.VISIBLE)
+
+    assert len(queue) == 2
+    assert pop_all(queue) == [(2, FolderPriority.USER), (1, FolderPriority.BACKGROUND)]
+
+
+def test_pop_lowest_priority():
+    queue = FolderQueue()
+    queue.push([1], FolderPriority.BACKGROUND)
+    queue.push([2], FolderPriority.USER)
+
+    assert pop_all(queue, FolderPriority.USER) == [(2, FolderPriority.USER)]
+    assert 1 in queue
+
+
+def test_promote():
+    queue = FolderQueue()
+    queue.push([1, 2, 3], FolderPriority.BACKGROUND)
+    queue.promote([3], FolderPriority.VISIBLE)
+    # doesn't lower the priority
+    queue.promote([3], FolderPriority.BACKGROUND)
+
+    assert pop_all(queue) == [
+        (3, FolderPriority.VISIBLE),
+        (1, FolderPriority.BACKGROUND),
+        (2, FolderPriority.BACKGROUND),
+    ]
+
+
+def test_promote_before_push():
+    queue = FolderQueue()
+    queue.promote([2], FolderPriority.SELECTED)
+    assert len(queue) == 0
+
+    queue.push([1, 2], FolderPriority.BACKGROUND)
+    assert pop_all(queue) == [(2, FolderPriority.SELECTED), (1, FolderPriority.BACKGROUND)]
+
+
+def test_discard():
+    queue = FolderQueue()
+    queue.push([1, 2], FolderPriority.BACKGROUND)
+    queue.discard(1)
+    assert pop_all(queue) == [(2, FolderPriority.BACKGROUND)]
+
+
+def test_clear():
+    queue = FolderQueue()
+    queue.push([1, 2], FolderPriority.BACKGROUND)
+    queue.push([3], FolderPriority.USER)
+    queue.promote([4], FolderPriority.VISIBLE)
+
+    queue.clear(keep=FolderPriority.USER)
+    queue.push([4], FolderPriority.BACKGROUND)
+    assert pop_all(queue) == [(3, FolderPriority.USER), (4, FolderPriority.BACKGROUND)]
+
+    queue.push([1], FolderPriority.USER)
+    queue.clear()
+    assert queue.pop() is None
@@ -0,0 +1,106 @@
+import io
+from time import monotonic
+from typing import Hashable, List, Tuple
+
+from PIL import Image
+from PySide2.QtCore import QCoreApplication, QSize, QThreadPool
+from PySide2.QtGui import QImage
+from pytest import fixture
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.db.dal import DataAccessLayer, dal
+from tutcatalogpy.common.image_loader import ImageLoader, decode_image
+
+
+@fixture
+def dal_() -> DataAccessLayer:
+    dal.connect('sqlite:///:memory:')
+    yield dal
+    dal.disconnect()
+
+
+@fixture
+def loader(app: QCoreApplication) -> ImageLoader:
+    pool = QThreadPool()
+    yield ImageLoader(pool=pool)
+    pool.waitForDone()
+
+
+def image_data(width: int, height: int) -> bytes:
+    f = io.BytesIO()
+    Image.new('RGB', (width, height)).save(f, 'PNG')
+    return f.getvalue()
+
+
+def wait_for(app: QCoreApplication, loaded: List, count: int, timeout: float = 5) -> None:
+    deadline = monotonic() + timeout
+    while len(loaded) < count and monotonic() < deadline:
+        app.processEvents()
+
+
+def test_decode_image_scaled() -> None:
+    data = image_data(800, 600)
+
+    assert decode_image(data).size() == QSize(800, 600)
+    assert decode_image(data, QSize(100, 100)).size() == QSize(100, 75)
+    assert decode_image(data, QSize(1000, 1000)).size() == QSize(800, 600)
+    assert decode_image(b'not an image').isNull()
+
+
+def test_load_in_background(app, dal_: DataAccessLayer, loader: ImageLoader) -> None:
+    blob_hash = dal_.blobs.put(image_data(400, 200))
+    loaded: List[Tuple[str, Hashable, QImage]] = []
+    loader.loaded.connect(lambda *args: loaded.append(args))
+
+    assert loader.load('group', 'key', blob_hash, QSize(100, 100)) is None
+    wait_for(app, loaded, 1)
+
+    assert [(group, key, image.size()) for group, key, image in loaded] == [('group', 'key', QSize(100, 50))]
+    # the second time, the image comes from the cache
+    assert loader.load('group', 'key', blob_hash).size() == QSize(100, 50)
+
+
+def test_drop_cancelled_requests(app, dal_: DataAccessLayer, loader: ImageLoader) -> None:
+    blob_hash = dal_.blobs.put(image_data(10, 10))
+    loaded: List[Tuple[str, Hashable, QImage]] = []
+    loader.loaded.connect(lambda *args: loaded.append(args))
+
+    loader.load('group', 'old', blob_hash)
+    loader.load('other group', 'other', blob_hash)
+    loader.cancel('group')
+    loader.load('group', 'new', blob_hash)
+    wait_for(app, loaded, 2)
+    app.processEvents()
+
+    assert sorted(key for _, key, _ in loaded) == ['new', 'other']
+    assert 'old' not in loader.cache
+
+
+def test_decode_repeated_requests_once(app, dal_: DataAccessLayer, loader: ImageLoader) -> None:
+    blob_hash = dal_.blobs.put(image_data(10, 10))
+    loaded: List[Tuple[str, Hashable, QImage]] = []
+    loader.loaded.connect(lambda *args: loaded.append(args))
+
+    # e.g. a view painting a tile several times while it decodes
+    for _ in range(3):
+        loader.load('group', 'key', blob_hash)
+    wait_for(app, loaded, 1)
+    app.processEvents()
+
+    assert [key for _, key, _ in loaded] == ['key']
+
+
+def test_share_decoding_between_groups(app, dal_: DataAccessLayer, loader: ImageLoader) -> None:
+    blob_hash = dal_.blobs.put(image_data(10, 10))
+    loaded: List[Tuple[str, Hashable, QImage]] = []
+    loader.loaded.connect(lambda *args: loaded.append(args))
+
+    # e.g. a prefetch, then the dock showing the image
+    loader.load('prefetch', 'key', blob_hash)
+    loader.cancel('prefetch')
+    loader.load('dock', 'key', blob_hash)
+    wait_for(app, loaded, 1)
+    app.processEvents()
+
+    assert [(group, key) for group, key, _ in loaded] == [('dock', 'key')]
+    assert 'key' in loader.cache
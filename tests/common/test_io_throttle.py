@@ -0,0 +1,90 @@
+from typing import List
+
+from pytest import fixture, mark
+
+from tutcatalogpy.common.io_throttle import IoThrottle
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_unlimited_throttle_never_sleeps(clock: FakeClock):
+    throttle = IoThrottle(clock=clock, sleep=clock.sleep)
+    for _ in range(1000):
+        throttle.consume(1024 * 1024)
+
+    assert not throttle.throttled
+    assert clock.sleeps == []
+    assert throttle.rate_str().endswith('ops/s')
+
+
+def test_bytes_budget(clock: FakeClock):
+    throttle = IoThrottle(bytes_per_sec=1000, clock=clock, sleep=clock.sleep)
+    throttle.consume(1000)
+    assert clock.sleeps == []
+
+    throttle.consume(500)
+    assert clock.sleeps == [0.5]
+
+    # 10 seconds of reads take 10 seconds in total
+    for _ in range(20):
+        throttle.consume(500)
+    assert sum(clock.sleeps) == 10.5
+
+
+@mark.parametrize('ops_per_sec', [1, 10, 100])
+def test_ops_budget(clock: FakeClock, ops_per_sec: int):
+    throttle = IoThrottle(ops_per_sec=ops_per_sec, clock=clock, sleep=clock.sleep)
+    start = clock.now
+    for _ in range(ops_per_sec * 5):
+        throttle.consume()
+
+    # the first second worth of operations is free
+    assert clock.now - start == 4
+    assert throttle.rate_str().endswith('(throttled)')
+
+
+def test_budget_refills_while_idle(clock: FakeClock):
+    throttle = IoThrottle(bytes_per_sec=1000, clock=clock, sleep=clock.sleep)
+    throttle.consume(1000)
+    clock.now += 0.5
+    throttle.consume(500)
+    assert clock.sleeps == []
+
+    # the bucket doesn't grow beyond one second of budget
+    clock.now += 60
+    throttle.consume(1500)
+    assert clock.sleeps == [0.5]
+
+
+def test_rate(clock: FakeClock):
+    throttle = IoThrottle(clock=clock, sleep=clock.sleep)
+    assert throttle.rate() == (0.0, 0.0)
+
+    clock.now += 1
+    throttle.consume(1000, 10)
+    assert throttle.rate() == (1000.0, 10.0)
+
+    clock.now += 1
+    throttle.consume(3000, 30)
+    assert throttle.rate() == (2000.0, 20.0)
+
+    # the rate of the last complete window is kept until the next one completes
+    clock.now += 1
+    throttle.consume(0, 0)
+    assert throttle.rate() == (2000.0, 20.0)
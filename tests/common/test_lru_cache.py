@@ -0,0 +1,63 @@
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.lru_cache import LruCache
+
+
+def make_cache(max_size: int) -> LruCache:
+    return LruCache(max_size, len)
+
+
+def test_get_and_put() -> None:
+    cache = make_cache(10)
+    cache.put('a', b'123')
+
+    assert cache.get('a') == b'123'
+    assert cache.get('b') is None
+    assert 'a' in cache
+    assert cache.size == 3
+
+
+def test_evict_least_recently_used() -> None:
+    cache = make_cache(10)
+    cache.put('a', b'1234')
+    cache.put('b', b'1234')
+    cache.get('a')
+    cache.put('c', b'1234')
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert cache.size == 8
+
+
+def test_replace_value() -> None:
+    cache = make_cache(10)
+    cache.put('a', b'1234')
+    cache.put('a', b'12')
+
+    assert cache.get('a') == b'12'
+    assert cache.size == 2
+    assert len(cache) == 1
+
+
+def test_value_larger_than_cache() -> None:
+    cache = make_cache(10)
+    cache.put('a', b'1234')
+    cache.put('b', b'12345678901')
+
+    assert 'b' not in cache
+    assert 'a' in cache
+
+
+def test_remove_and_clear() -> None:
+    cache = make_cache(10)
+    cache.put('a', b'1234')
+    cache.put('b', b'1234')
+
+    cache.remove('a')
+    cache.remove('missing')
+    assert 'a' not in cache
+    assert cache.size == 4
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
@@ -0,0 +1,167 @@
+import threading
+from typing import List, Optional
+
+from PySide2.QtCore import Qt
+from pytest import fixture, mark
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.scan_jobs import CancellationToken, Job, JobScheduler
+
+TIMEOUT_SEC = 10
+
+
+@fixture
+def scheduler():
+    scheduler = JobScheduler()
+    yield scheduler
+    scheduler.shutdown()
+
+
+def make_job(disk_ids: Optional[List[int]], func=lambda token: None, name: str = '') -> Job:
+    return Job(Job.Kind.FOLDER_DETAILS, name, disk_ids, func)
+
+
+@mark.parametrize(
+    'disks1, disks2, conflict',
+    [
+        ([1], [1], True),
+        ([1], [2], False),
+        ([1, 2], [2, 3], True),
+        (None, [1], True),
+        ([1], None, True),
+        (None, None, True),
+        ([], None, False),
+        ([], [1], False),
+    ]
+)
+def test_conflicts_with(disks1, disks2, conflict: bool):
+    assert make_job(disks1).conflicts_with(make_job(disks2)) == conflict
+    assert make_job(disks2).conflicts_with(make_job(disks1)) == conflict
+
+
+def test_run_in_calling_thread(scheduler: JobScheduler):
+    threads = []
+    job = make_job([1], lambda token: threads.append(threading.current_thread()))
+    scheduler.run(job)
+
+    assert threads == [threading.current_thread()]
+    assert job.done
+    assert not scheduler.busy
+
+
+def test_jobs_on_different_disks_run_concurrently(scheduler: JobScheduler):
+    barrier = threading.Barrier(2, timeout=TIMEOUT_SEC)
+    passed = []
+
+    def func(token: CancellationToken) -> None:
+        barrier.wait()
+        passed.append(True)
+
+    scheduler.submit(make_job([1], func))
+    scheduler.submit(make_job([2], func))
+
+    assert scheduler.wait(TIMEOUT_SEC)
+    assert passed == [True, True]
+
+
+def test_max_workers(scheduler: JobScheduler):
+    threads = set()
+
+    def func(token: CancellationToken) -> None:
+        threads.add(threading.current_thread().name)
+
+    scheduler.max_workers = 1
+    for disk_id in range(4):
+        scheduler.submit(make_job([disk_id], func))
+    assert scheduler.wait(TIMEOUT_SEC)
+    assert len(threads) == 1
+
+    # a larger pool replaces the single thread
+    barrier = threading.Barrier(2, timeout=TIMEOUT_SEC)
+    scheduler.max_workers = 2
+    scheduler.submit(make_job([1], lambda token: barrier.wait()))
+    scheduler.submit(make_job([2], lambda token: barrier.wait()))
+    assert scheduler.wait(TIMEOUT_SEC)
+    assert not barrier.broken
+
+
+def test_jobs_on_same_disk_run_in_order(scheduler: JobScheduler):
+    release = threading.Event()
+    order = []
+
+    def first(token: CancellationToken) -> None:
+        release.wait(TIMEOUT_SEC)
+        order.append('first')
+
+    scheduler.submit(make_job([1], first))
+    scheduler.submit(make_job([1, 2], lambda token: order.append('second')))
+    # conflicts with the second job, which was submitted earlier
+    scheduler.submit(make_job([2], lambda token: order.append('third')))
+    scheduler.submit(make_job([3], lambda token: order.append('other disk')))
+
+    third_disk_done = scheduler.wait(0.5)
+    assert not third_disk_done
+    release.set()
+
+    assert scheduler.wait(TIMEOUT_SEC)
+    assert order == ['other disk', 'first', 'second', 'third']
+
+
+def test_run_waits_for_conflicting_jobs(scheduler: JobScheduler):
+    order = []
+    started = threading.Event()
+
+    def first(token: CancellationToken) -> None:
+        started.set()
+        threading.Event().wait(0.2)
+        order.append('pool')
+
+    scheduler.submit(make_job([1], first))
+    started.wait(TIMEOUT_SEC)
+    scheduler.run(make_job(None, lambda token: order.append('exclusive')))
+
+    assert order == ['pool', 'exclusive']
+
+
+def test_cancel_all(scheduler: JobScheduler):
+    started = threading.Event()
+    cancelled = []
+
+    def running(token: CancellationToken) -> None:
+        started.set()
+        while not token.cancelled:
+            threading.Event().wait(0.01)
+        cancelled.append(True)
+
+    running_job = scheduler.submit(make_job([1], running))
+    pending_job = scheduler.submit(make_job([1], lambda token: cancelled.append(False)))
+    started.wait(TIMEOUT_SEC)
+    scheduler.cancel_all()
+
+    assert scheduler.wait(TIMEOUT_SEC)
+    assert cancelled == [True]
+    assert running_job.done and pending_job.done
+
+
+def test_failing_job_does_not_stop_the_scheduler(scheduler: JobScheduler):
+    def fail(token: CancellationToken) -> None:
+        raise RuntimeError('failed')
+
+    scheduler.submit(make_job([1], fail))
+    job = scheduler.submit(make_job([1]))
+
+    assert scheduler.wait(TIMEOUT_SEC)
+    assert job.done
+
+
+def test_busy_changed(scheduler: JobScheduler):
+    changes = []
+    scheduler.busy_changed.connect(changes.append, Qt.DirectConnection)
+
+    scheduler.run(make_job([1]))
+    scheduler.submit(make_job([1]))
+    assert scheduler.wait(TIMEOUT_SEC)
+    # nothing to cancel
+    scheduler.cancel_all()
+
+    assert changes == [True, False, True, False]
@@ -0,0 +1,41 @@
+import io
+
+from PIL import Image
+
+import tutcatalogpy.common.logging_config  # noqa: F401
+from tutcatalogpy.common.thumbnails import ImageSize, make_thumbnails
+
+
+def image_data(width: int, height: int, mode: str = 'RGB', file_format: str = 'JPEG') -> bytes:
+    f = io.BytesIO()
+    Image.new(mode, (width, height)).save(f, file_format)
+    return f.getvalue()
+
+
+def test_make_thumbnails() -> None:
+    size, thumbnails = make_thumbnails(image_data(600, 800), (96, 300))
+
+    assert size == ImageSize(600, 800)
+    assert [(t.size, t.width, t.height) for t in thumbnails] == [(96, 72, 96), (300, 225, 300)]
+    with Image.open(io.BytesIO(thumbnails[0].data)) as image:
+        assert image.format == 'JPEG'
+        assert image.size == (72, 96)
+
+
+def test_make_thumbnails_of_small_image() -> None:
+    size, thumbnails = make_thumbnails(image_data(200, 100), (96, 300))
+
+    assert size == ImageSize(200, 100)
+    assert [(t.size, t.width, t.height) for t in thumbnails] == [(96, 96, 48)]
+
+
+def test_make_thumbnails_keeps_transparency() -> None:
+    _, thumbnails = make_thumbnails(image_data(400, 400, 'RGBA', 'PNG'), (96,))
+
+    with Image.open(io.BytesIO(thumbnails[0].data)) as image:
+        assert image.format == 'PNG'
+        assert image.mode == 'RGBA'
+
+
+def test_make_thumbnails_of_invalid_data() -> None:
+    assert make_thumbnails(b'not an image') == (None, ())
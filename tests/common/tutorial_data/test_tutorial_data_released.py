@@ -67,3 +67,44 @@ def test_load_from_string_reads_released(text: str, released: str, dal_: DataAcc
 def test_load_from_string_detects_invalid_released(text: str) -> None:
     with raises(fastjsonschema.JsonSchemaValueException, match='^data.released must .*'):
         TutorialData.load_from_string(None, None, text)
+
+
+@mark.parametrize(
+    'released, date',
+    [
+        ('', 0),
+        (1900, 19000000),
+        ('2199', 21990000),
+        ('2000/01', 20000100),
+        ('2199/12/31', 21991231),
+        ('x', 0),
+    ]
+)
+def test_released_to_date(released, date: int) -> None:
+    assert TutorialData.released_to_date(released) == date
+
+
+def test_load_from_string_reads_released_date(dal_: DataAccessLayer) -> None:
+    tutorial = Tutorial()
+    dal_.session.add(tutorial)
+
+    TutorialData.load_from_string(dal_.session, tutorial, 'released: 2020/07')
+    dal_.session.commit()
+
+    assert tutorial.released_on == 20200700
+
+
+def test_connect_converts_the_released_dates_of_old_catalogs(tmp_path) -> None:
+    db_path = tmp_path / 'catalog.db'
+    dal.connect(f'sqlite:///{db_path}')
+    dal.session.add_all([Tutorial(released='2020/07'), Tutorial(released='2021/01/15'), Tutorial(released='')])
+    dal.session.commit()
+    dal.session.query(Tutorial).update({Tutorial.released_on: None})
+    dal.session.commit()
+    dal.disconnect()
+
+    dal.connect(f'sqlite:///{db_path}')
+    try:
+        assert [date for date, in dal.session.query(Tutorial.released_on).order_by(Tutorial.id_)] == [20200700, 20210115, 0]
+    finally:
+        dal.disconnect()
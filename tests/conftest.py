@@ -0,0 +1,32 @@
+import os
+
+from pytest import fixture, mark
+from PySide2.QtWidgets import QApplication
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup('benchmark')
+    group.addoption('--benchmark', action='store_true', default=False, help='run the benchmarks from tests/benchmarks')
+    group.addoption('--benchmark-save', action='store_true', default=False, help='store the measured timings as the new baselines')
+    group.addoption('--benchmark-tolerance', type=float, default=1.5, help='fail if a timing exceeds its baseline by this factor')
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line('markers', 'benchmark: slow benchmark, only runs with --benchmark')
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    if config.getoption('--benchmark'):
+        return
+
+    skip = mark.skip(reason='benchmarks only run with --benchmark')
+    for item in items:
+        if item.get_closest_marker('benchmark') is not None:
+            item.add_marker(skip)
+
+
+@fixture(scope='session')
+def app() -> QApplication:
+    # a GUI application, as the file icons need one, shared by the tests using the event loop
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return QApplication.instance() or QApplication([])